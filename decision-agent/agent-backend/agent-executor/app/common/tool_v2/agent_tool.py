@@ -22,6 +22,10 @@ from app.domain.vo.agentvo.agent_config_vos import AgentSkillVo
 from app.domain.constant.agent_version import AGENT_VERSION_V0
 
 from app.utils.common import get_dolphin_var_value
+from app.driven.infrastructure.http_client import (
+    UPSTREAM_AGENT_EXECUTOR,
+    http_client_registry,
+)
 
 # Import from common module using relative import
 from .common import parse_kwargs
@@ -185,7 +189,9 @@ headers: {json.dumps(headers, ensure_ascii=False)}
             "session_id", str(uuid.uuid4())
         )
 
-        async with aiohttp.ClientSession(timeout=agent_tool_timeout) as session:
+        async with http_client_registry.session(
+            UPSTREAM_AGENT_EXECUTOR, timeout=agent_tool_timeout
+        ) as session:
             async with session.request(
                 method,
                 url,
@@ -7,6 +7,10 @@ import aiohttp
 from dolphin.core.context.context import Context
 from app.common.config import Config
 from app.common.stand_log import StandLogger
+from app.driven.infrastructure.http_client import (
+    UPSTREAM_API_TOOL,
+    http_client_registry,
+)
 
 # Import from common module using relative import
 from .common import parse_kwargs, ToolMapInfo, COLORS, APIToolResponse
@@ -262,12 +266,13 @@ class APITool(APIToolInputHandler):
         )
 
         # 6. 发送请求
-        async with aiohttp.ClientSession(
+        async with http_client_registry.session(
+            UPSTREAM_API_TOOL,
             timeout=aiohttp.ClientTimeout(
                 total=toolTimeout,
                 sock_connect=30,  # 建立连接超时
                 sock_read=toolTimeout,  # 读取数据超时
-            )
+            ),
         ) as session:
             async with session.request(
                 "POST",
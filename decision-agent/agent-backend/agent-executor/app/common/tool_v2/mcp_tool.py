@@ -14,6 +14,10 @@ from app.domain.enum.common.user_account_header_key import (
     has_user_account,
     has_user_account_type,
 )
+from app.driven.infrastructure.http_client import (
+    UPSTREAM_AGENT_OPERATOR_INTEGRATION,
+    http_client_registry,
+)
 
 # Import from common module using relative import
 from .common import parse_kwargs
@@ -194,8 +198,9 @@ url: {url}
 body: {json.dumps(body, ensure_ascii=False)}
 """
         )
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=300)
+        async with http_client_registry.session(
+            UPSTREAM_AGENT_OPERATOR_INTEGRATION,
+            timeout=aiohttp.ClientTimeout(total=300),
         ) as session:
             async with session.request(
                 method, url, headers=headers, json=body
@@ -233,8 +238,8 @@ async def get_mcp_tools(mcp_info: dict) -> Dict[str, MCPTool]:
     url = f"http://{HOST_AGENT_OPERATOR}:{PORT_AGENT_OPERATOR}/api/agent-operator-integration/internal-v1/mcp/proxy/{mcp_server_id}/tools"
     method = "GET"
 
-    async with aiohttp.ClientSession(
-        timeout=aiohttp.ClientTimeout(total=300)
+    async with http_client_registry.session(
+        UPSTREAM_AGENT_OPERATOR_INTEGRATION, timeout=aiohttp.ClientTimeout(total=300)
     ) as session:
         async with session.request(method, url) as response:
             if response.status != 200:
@@ -13,6 +13,7 @@ from .models import (
     OpenSearchConfig,
     ServicesConfig,
     MemoryConfig,
+    HttpClientConfig,
     LocalDevConfig,
     OuterLLMConfig,
     FeaturesConfig,
@@ -31,6 +32,7 @@ __all__ = [
     "OpenSearchConfig",
     "ServicesConfig",
     "MemoryConfig",
+    "HttpClientConfig",
     "LocalDevConfig",
     "OuterLLMConfig",
     "FeaturesConfig",
@@ -16,6 +16,7 @@ from .models import (
     GraphDBConfig,
     ServicesConfig,
     MemoryConfig,
+    HttpClientConfig,
     LocalDevConfig,
     OuterLLMConfig,
     FeaturesConfig,
@@ -36,6 +37,7 @@ class ConfigState:
         self.graphdb: Optional[GraphDBConfig] = None
         self.services: Optional[ServicesConfig] = None
         self.memory: Optional[MemoryConfig] = None
+        self.http_client: Optional[HttpClientConfig] = None
         self.local_dev: Optional[LocalDevConfig] = None
         self.outer_llm: Optional[OuterLLMConfig] = None
         self.features: Optional[FeaturesConfig] = None
@@ -59,6 +61,7 @@ class ConfigInitializer:
         state.graphdb = GraphDBConfig.from_dict(config.get("graphdb", {}))
         state.services = ServicesConfig.from_dict(config.get("services", {}))
         state.memory = MemoryConfig.from_dict(config.get("memory", {}))
+        state.http_client = HttpClientConfig.from_dict(config.get("http_client", {}))
         state.local_dev = LocalDevConfig.from_dict(config.get("local_dev", {}))
         state.outer_llm = OuterLLMConfig.from_dict(config.get("outer_llm", {}))
         state.features = FeaturesConfig.from_dict(config.get("features", {}))
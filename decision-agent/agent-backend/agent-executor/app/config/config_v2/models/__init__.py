@@ -7,6 +7,7 @@ from .app_config import AppConfig
 from .database_config import RdsConfig, RedisConfig, GraphDBConfig, OpenSearchConfig
 from .service_config import ServicesConfig
 from .memory_config import MemoryConfig
+from .http_client_config import HttpClientConfig
 from .local_dev_config import LocalDevConfig
 from .outer_llm_config import OuterLLMConfig
 from .feature_config import FeaturesConfig
@@ -24,6 +25,7 @@ __all__ = [
     "OpenSearchConfig",
     "ServicesConfig",
     "MemoryConfig",
+    "HttpClientConfig",
     "LocalDevConfig",
     "OuterLLMConfig",
     "FeaturesConfig",
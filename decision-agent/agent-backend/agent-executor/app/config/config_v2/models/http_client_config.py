@@ -0,0 +1,61 @@
+"""
+HTTP客户端连接池相关配置
+"""
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class HttpClientConfig:
+    """HTTP客户端连接池配置
+
+    每个上游服务（agent_factory、mf_model_api等）使用独立的连接池，
+    upstreams中可以按上游名称覆盖limit、limit_per_host、connect_timeout、timeout
+    """
+
+    # 每个上游连接池的最大连接数（0表示不限制）
+    limit: int = 100
+
+    # 连接池内同一host:port的最大连接数（0表示不限制）
+    limit_per_host: int = 0
+
+    # DNS解析结果缓存时间（秒）
+    ttl_dns_cache: int = 300
+
+    # 空闲连接保活时间（秒）
+    keepalive_timeout: float = 30.0
+
+    # 建立连接超时（秒），调用方可以在单次请求中覆盖
+    connect_timeout: float = 10.0
+
+    # 默认请求总超时（秒），调用方可以在单次请求中覆盖
+    timeout: float = 300.0
+
+    # 按上游名称覆盖以上配置
+    upstreams: dict = field(default_factory=dict)
+
+    def get_upstream_options(self, upstream: str) -> dict:
+        """获取指定上游的连接池配置（合并upstreams中的覆盖项）"""
+        options = {
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "connect_timeout": self.connect_timeout,
+            "timeout": self.timeout,
+        }
+        for key, value in (self.upstreams.get(upstream) or {}).items():
+            if key in options and value is not None:
+                options[key] = type(options[key])(value)
+        return options
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HttpClientConfig":
+        """从字典创建配置对象"""
+        return cls(
+            limit=int(data.get("limit", 100)),
+            limit_per_host=int(data.get("limit_per_host", 0)),
+            ttl_dns_cache=int(data.get("ttl_dns_cache", 300)),
+            keepalive_timeout=float(data.get("keepalive_timeout", 30.0)),
+            connect_timeout=float(data.get("connect_timeout", 10.0)),
+            timeout=float(data.get("timeout", 300.0)),
+            upstreams=dict(data.get("upstreams") or {}),
+        )
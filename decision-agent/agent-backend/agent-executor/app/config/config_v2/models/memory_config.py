@@ -18,6 +18,27 @@ class MemoryConfig:
     # 召回记忆重排序评分阈值
     rerank_threshold: float = 0.1
 
+    # 记忆构建队列最大长度（待发送的批次数）
+    build_queue_size: int = 1000
+
+    # 记忆构建worker数量
+    build_workers: int = 4
+
+    # 同一用户/Agent的记忆构建请求合并窗口（秒）
+    build_coalesce_window: float = 1.0
+
+    # 单次记忆构建请求最多包含的消息数
+    build_max_batch_messages: int = 50
+
+    # 队列满时的处理策略: drop_newest-丢弃新请求, drop_oldest-丢弃最早的请求, spill-写入本地文件
+    build_overflow_policy: str = "drop_oldest"
+
+    # spill策略下的本地文件目录
+    build_spill_dir: str = ""
+
+    # 关闭时等待队列处理完成的最长时间（秒）
+    build_drain_timeout: float = 10.0
+
     @classmethod
     def from_dict(cls, data: dict) -> "MemoryConfig":
         """从字典创建配置对象"""
@@ -25,4 +46,11 @@ class MemoryConfig:
             limit=int(data.get("limit", 50)),
             threshold=float(data.get("threshold", 0.5)),
             rerank_threshold=float(data.get("rerank_threshold", 0.1)),
+            build_queue_size=int(data.get("build_queue_size", 1000)),
+            build_workers=int(data.get("build_workers", 4)),
+            build_coalesce_window=float(data.get("build_coalesce_window", 1.0)),
+            build_max_batch_messages=int(data.get("build_max_batch_messages", 50)),
+            build_overflow_policy=data.get("build_overflow_policy", "drop_oldest"),
+            build_spill_dir=data.get("build_spill_dir", ""),
+            build_drain_timeout=float(data.get("build_drain_timeout", 10.0)),
         )
@@ -1,9 +1,15 @@
 from .agent_cache_constants import (
     AGENT_CACHE_TTL,
     AGENT_CACHE_DATA_UPDATE_PASS_SECOND,
+    AGENT_CACHE_LOCAL_MAX_SIZE,
+    AGENT_CACHE_LOCAL_TTL,
+    AGENT_CACHE_INVALIDATE_CHANNEL,
 )
 
 __all__ = [
     "AGENT_CACHE_TTL",
     "AGENT_CACHE_DATA_UPDATE_PASS_SECOND",
+    "AGENT_CACHE_LOCAL_MAX_SIZE",
+    "AGENT_CACHE_LOCAL_TTL",
+    "AGENT_CACHE_INVALIDATE_CHANNEL",
 ]
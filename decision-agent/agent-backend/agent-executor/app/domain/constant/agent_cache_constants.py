@@ -9,3 +9,14 @@ AGENT_CACHE_TTL = 60  # 60秒
 # 缓存数据更新触发阈值，单位：秒
 # 当发现缓存 TTL 减少的时间超过此值时，触发缓存数据更新
 AGENT_CACHE_DATA_UPDATE_PASS_SECOND = 10  # 10秒
+
+# 进程内 L1 缓存配置
+# L1 缓存最大条目数（LRU 淘汰）
+AGENT_CACHE_LOCAL_MAX_SIZE = 1000
+
+# L1 缓存有效期，单位：秒
+# 不超过缓存数据更新阈值，保证 L1 中的数据不会比 Redis 中旧太多
+AGENT_CACHE_LOCAL_TTL = AGENT_CACHE_DATA_UPDATE_PASS_SECOND
+
+# 缓存失效广播频道，缓存更新时通知其他副本删除 L1 中的旧数据
+AGENT_CACHE_INVALIDATE_CHANNEL = "agent_executor:agent_cache:invalidate"
@@ -1,5 +1,5 @@
 # -*- coding:utf-8 -*-
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime
 
 from app.domain.vo.agent_cache import AgentCacheIdVO
@@ -22,3 +22,7 @@ class AgentCacheEntity:
     cache_data: CacheDataVo  # 缓存数据结构
     cache_data_last_set_timestamp: int
     created_at: datetime
+
+    def copy(self) -> "AgentCacheEntity":
+        """拷贝缓存实体（cache_data 浅拷贝）"""
+        return replace(self, cache_data=self.cache_data.copy())
@@ -21,3 +21,16 @@ class CacheDataVo:
         self.tools_info_dict = {}
         self.skill_agent_info_dict = {}
         self.llm_config_dict = {}
+
+    def copy(self) -> "CacheDataVo":
+        """浅拷贝缓存数据
+
+        复制各字典本身，字典中的值共享引用。
+        用于从进程内缓存取出数据时，避免不同请求之间互相修改字典。
+        """
+        cache_data = CacheDataVo()
+        cache_data.agent_config = dict(self.agent_config)
+        cache_data.tools_info_dict = dict(self.tools_info_dict)
+        cache_data.skill_agent_info_dict = dict(self.skill_agent_info_dict)
+        cache_data.llm_config_dict = dict(self.llm_config_dict)
+        return cache_data
@@ -1,4 +1,5 @@
 import sys
+from typing import Optional
 
 import aiohttp
 from circuitbreaker import circuit
@@ -11,6 +12,10 @@ from app.common.stand_log import StandLogger
 from app.utils.common import GetFailureThreshold, GetRecoveryTimeout
 from app.utils.observability.trace_wrapper import internal_span
 from app.infra.common.infra_constant.const import HTTP_REQUEST_TIMEOUT
+from app.driven.infrastructure.http_client import (
+    UPSTREAM_AGENT_FACTORY,
+    http_client_registry,
+)
 from opentelemetry.trace import Span
 
 
@@ -24,6 +29,13 @@ class AgentFactoryService:
     def set_headers(self, headers):
         self.headers = headers
 
+    def _effective_headers(self, request_headers: Optional[dict]) -> dict:
+        """返回本次调用使用的headers
+
+        并发调用时应显式传入request_headers，避免修改共享单例的self.headers
+        """
+        return request_headers if request_headers is not None else self.headers
+
     @circuit(
         failure_threshold=GetFailureThreshold(), recovery_timeout=GetRecoveryTimeout()
     )
@@ -36,8 +48,8 @@ class AgentFactoryService:
         )
 
         timeout = aiohttp.ClientTimeout(total=HTTP_REQUEST_TIMEOUT)
-        async with aiohttp.ClientSession(
-            headers=self.headers, timeout=timeout
+        async with http_client_registry.session(
+            UPSTREAM_AGENT_FACTORY, headers=self.headers, timeout=timeout
         ) as session:
             async with session.get(url) as response:
                 if response.status != 200:
@@ -111,17 +123,25 @@ class AgentFactoryService:
     @circuit(
         failure_threshold=GetFailureThreshold(), recovery_timeout=GetRecoveryTimeout()
     )
-    async def get_agent_config_by_key(self, agent_key) -> dict:
+    async def get_agent_config_by_key(
+        self, agent_key, request_headers: Optional[dict] = None
+    ) -> dict:
         """
         根据agent_key获取agent配置
+
+        Args:
+            agent_key: agent key
+            request_headers: 本次请求的headers，为None时使用set_headers设置的headers
         """
         url = self._basic_url + "/api/agent-factory/internal/v3/agent/by-key/{}".format(
             agent_key
         )
 
         timeout = aiohttp.ClientTimeout(total=HTTP_REQUEST_TIMEOUT)
-        async with aiohttp.ClientSession(
-            headers=self.headers, timeout=timeout
+        async with http_client_registry.session(
+            UPSTREAM_AGENT_FACTORY,
+            headers=self._effective_headers(request_headers),
+            timeout=timeout,
         ) as session:
             async with session.get(url) as response:
                 if response.status != 200:
@@ -161,8 +181,8 @@ class AgentFactoryService:
             data = {"agent_id": agent_id, "user_id": user_id}
 
         timeout = aiohttp.ClientTimeout(total=HTTP_REQUEST_TIMEOUT)
-        async with aiohttp.ClientSession(
-            headers=self.headers, timeout=timeout
+        async with http_client_registry.session(
+            UPSTREAM_AGENT_FACTORY, headers=self.headers, timeout=timeout
         ) as session:
             async with session.post(url, json=data) as response:
                 if response.status != 200:
@@ -193,8 +213,8 @@ class AgentFactoryService:
         )
 
         timeout = aiohttp.ClientTimeout(total=HTTP_REQUEST_TIMEOUT)
-        async with aiohttp.ClientSession(
-            headers=self.headers, timeout=timeout
+        async with http_client_registry.session(
+            UPSTREAM_AGENT_FACTORY, headers=self.headers, timeout=timeout
         ) as session:
             async with session.get(url) as response:
                 if response.status != 200:
@@ -212,6 +232,4 @@ class AgentFactoryService:
                 return res
 
 
-
-
 agent_factory_service = AgentFactoryService()
@@ -10,6 +10,10 @@ from app.common import errors
 from app.common.config import Config
 from app.common.errors import CodeException
 from app.utils.common import GetFailureThreshold, GetRecoveryTimeout
+from app.driven.infrastructure.http_client import (
+    UPSTREAM_AGENT_MEMORY,
+    http_client_registry,
+)
 
 
 class AgentMemoryService:
@@ -51,7 +55,9 @@ class AgentMemoryService:
             body["metadata"] = metadata
 
         try:
-            async with aiohttp.ClientSession(headers=headers) as session:
+            async with http_client_registry.session(
+                UPSTREAM_AGENT_MEMORY, headers=headers
+            ) as session:
                 timeout = ClientTimeout(total=60)
 
                 async with session.post(
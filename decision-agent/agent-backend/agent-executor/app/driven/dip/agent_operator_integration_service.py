@@ -14,6 +14,11 @@ from app.common.stand_log import StandLogger
 from app.common.struct_logger.error_log_class import get_error_log_json
 from app.utils.common import GetFailureThreshold, GetRecoveryTimeout
 from app.infra.common.infra_constant.const import HTTP_REQUEST_TIMEOUT
+from app.driven.infrastructure.http_client import (
+    UPSTREAM_AGENT_OPERATOR_INTEGRATION,
+    UPSTREAM_OBJECT_STORAGE,
+    http_client_registry,
+)
 
 
 class AgentOperatorIntegrationService:
@@ -54,7 +59,9 @@ class AgentOperatorIntegrationService:
         self._host = Config.services.agent_operator_integration.host
         self._port = Config.services.agent_operator_integration.port
         self._basic_url = "http://{}:{}".format(self._host, self._port)
-        self._skill_api_base_url = self._basic_url + "/api/agent-operator-integration/internal-v1"
+        self._skill_api_base_url = (
+            self._basic_url + "/api/agent-operator-integration/internal-v1"
+        )
 
         self.headers = {}
 
@@ -74,7 +81,9 @@ class AgentOperatorIntegrationService:
             "page_size": 100,
         }
 
-        async with aiohttp.ClientSession(headers=self.headers) as session:
+        async with http_client_registry.session(
+            UPSTREAM_AGENT_OPERATOR_INTEGRATION, headers=self.headers
+        ) as session:
             async with session.get(url, params=params, ssl=False) as response:
                 if response.status != HTTPStatus.OK:
                     err = self._host + " get_tool_box_list error: {}".format(
@@ -101,7 +110,9 @@ class AgentOperatorIntegrationService:
             "page_size": 100,
         }
 
-        async with aiohttp.ClientSession(headers=self.headers) as session:
+        async with http_client_registry.session(
+            UPSTREAM_AGENT_OPERATOR_INTEGRATION, headers=self.headers
+        ) as session:
             async with session.get(url, params=params, ssl=False) as response:
                 if response.status != HTTPStatus.OK:
                     err = self._host + " get_tool_list error: {}".format(
@@ -122,7 +133,14 @@ class AgentOperatorIntegrationService:
     @circuit(
         failure_threshold=GetFailureThreshold(), recovery_timeout=GetRecoveryTimeout()
     )
-    async def get_tool_info(self, box_id, tool_id) -> dict | None:
+    async def get_tool_info(
+        self, box_id, tool_id, request_headers: Optional[dict] = None
+    ) -> dict | None:
+        """获取工具信息，工具不可用时返回None
+
+        request_headers为本次请求的headers，并发调用时应显式传入，
+        为None时使用set_headers设置的headers
+        """
         # if Config.LOCAL_DEV_AARON:
         #     return self.get_mock_tool_info()
 
@@ -131,7 +149,10 @@ class AgentOperatorIntegrationService:
         )
 
         try:
-            async with aiohttp.ClientSession(headers=self.headers) as session:
+            async with http_client_registry.session(
+                UPSTREAM_AGENT_OPERATOR_INTEGRATION,
+                headers=self._effective_headers(request_headers),
+            ) as session:
                 async with session.get(url, ssl=False) as response:
                     if response.status != HTTPStatus.OK:
                         err = (
@@ -173,7 +194,9 @@ class AgentOperatorIntegrationService:
             basic_url=self._basic_url, mcp_server_id=mcp_server_id
         )
 
-        async with aiohttp.ClientSession(headers=self.headers) as session:
+        async with http_client_registry.session(
+            UPSTREAM_AGENT_OPERATOR_INTEGRATION, headers=self.headers
+        ) as session:
             async with session.get(url, ssl=False) as response:
                 if response.status != HTTPStatus.OK:
                     err = self._host + " get_mcp_tools error: {}".format(
@@ -200,7 +223,9 @@ class AgentOperatorIntegrationService:
         without mutating the shared singleton's ``self.headers``.
         """
         source = request_headers if request_headers is not None else self.headers
-        return {k: v for k, v in source.items() if k.lower() not in self._HOP_BY_HOP_HEADERS}
+        return {
+            k: v for k, v in source.items() if k.lower() not in self._HOP_BY_HOP_HEADERS
+        }
 
     async def get_skill_content(
         self, skill_id: str, request_headers: Optional[dict] = None
@@ -211,9 +236,13 @@ class AgentOperatorIntegrationService:
         """
         url = self._skill_api_base_url + f"/skills/{skill_id}/content"
         timeout = aiohttp.ClientTimeout(total=HTTP_REQUEST_TIMEOUT)
-        StandLogger.info(f"get_skill_content header={self._effective_headers(request_headers)},url={url}")
-        async with aiohttp.ClientSession(
-            headers=self._effective_headers(request_headers), timeout=timeout
+        StandLogger.info(
+            f"get_skill_content header={self._effective_headers(request_headers)},url={url}"
+        )
+        async with http_client_registry.session(
+            UPSTREAM_AGENT_OPERATOR_INTEGRATION,
+            headers=self._effective_headers(request_headers),
+            timeout=timeout,
         ) as session:
             async with session.get(url) as response:
                 if response.status != 200:
@@ -243,9 +272,13 @@ class AgentOperatorIntegrationService:
         url = self._skill_api_base_url + f"/skills/{skill_id}/files/read"
         payload = {"rel_path": rel_path}
         timeout = aiohttp.ClientTimeout(total=HTTP_REQUEST_TIMEOUT)
-        StandLogger.info(f"read_skill_file_meta header={self._effective_headers(request_headers)},url={url},payload={payload}")
-        async with aiohttp.ClientSession(
-            headers=self._effective_headers(request_headers), timeout=timeout
+        StandLogger.info(
+            f"read_skill_file_meta header={self._effective_headers(request_headers)},url={url},payload={payload}"
+        )
+        async with http_client_registry.session(
+            UPSTREAM_AGENT_OPERATOR_INTEGRATION,
+            headers=self._effective_headers(request_headers),
+            timeout=timeout,
         ) as session:
             async with session.post(url, json=payload) as response:
                 if response.status != 200:
@@ -273,9 +306,10 @@ class AgentOperatorIntegrationService:
         timeout = aiohttp.ClientTimeout(total=HTTP_REQUEST_TIMEOUT)
         # SSL verification is disabled because the pre-signed URL already carries
         # an HMAC signature guaranteeing authenticity and integrity of the content.
-        connector = aiohttp.TCPConnector(ssl=False)
-        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
-            async with session.get(url) as response:
+        async with http_client_registry.session(
+            UPSTREAM_OBJECT_STORAGE, timeout=timeout
+        ) as session:
+            async with session.get(url, ssl=False) as response:
                 if response.status != 200:
                     err = f"download_text_by_url error [{response.status}]: {url}"
                     error_log = log_oper.get_error_log(err, sys._getframe())
@@ -347,9 +381,13 @@ class AgentOperatorIntegrationService:
             payload["timeout"] = extra["timeout"]
 
         timeout = aiohttp.ClientTimeout(total=HTTP_REQUEST_TIMEOUT)
-        StandLogger.info(f"execute_skill_script header={self._effective_headers(request_headers)},url={url},payload={payload}")
-        async with aiohttp.ClientSession(
-            headers=self._effective_headers(request_headers), timeout=timeout
+        StandLogger.info(
+            f"execute_skill_script header={self._effective_headers(request_headers)},url={url},payload={payload}"
+        )
+        async with http_client_registry.session(
+            UPSTREAM_AGENT_OPERATOR_INTEGRATION,
+            headers=self._effective_headers(request_headers),
+            timeout=timeout,
         ) as session:
             async with session.post(url, json=payload) as response:
                 if response.status != 200:
@@ -2,7 +2,6 @@
 import json
 import sys
 
-import aiohttp
 from circuitbreaker import circuit
 
 import app.common.stand_log as log_oper
@@ -12,6 +11,10 @@ from app.common.errors import CodeException
 from app.common.stand_log import StandLogger
 from app.utils.common import GetFailureThreshold, GetRecoveryTimeout
 from app.domain.enum.common.user_account_header_key import set_user_account_id
+from app.driven.infrastructure.http_client import (
+    UPSTREAM_MF_MODEL_API,
+    http_client_registry,
+)
 
 
 class ModelApiService(object):
@@ -71,7 +74,7 @@ class ModelApiService(object):
         StandLogger.info("call llm body = {}".format(req))
         StandLogger.info("call llm header = {}".format(headers))
 
-        async with aiohttp.ClientSession() as session:
+        async with http_client_registry.session(UPSTREAM_MF_MODEL_API) as session:
             async with session.post(url, json=req, headers=headers) as response:
                 if response.status != 200:
                     err = self._host + " 调用大模型失败 error: {}".format(
@@ -174,7 +177,7 @@ class ModelApiService(object):
         url = self._basic_url + "/api/private/mf-model-api/v1/chat/completions"
         StandLogger.info("call llm body = {}".format(req))
         StandLogger.info("call llm header = {}".format(headers))
-        async with aiohttp.ClientSession() as session:
+        async with http_client_registry.session(UPSTREAM_MF_MODEL_API) as session:
             async with session.post(url, json=req, headers=headers) as response:
                 if response.status != 200:
                     res = await response.content.read()
@@ -1,5 +1,6 @@
-"""Redis 基础设施模块"""
+"""基础设施模块（Redis、HTTP客户端连接池）"""
 
+from .http_client import HttpClientRegistry, http_client_registry
 from .redis import RedisPool, RedisLock
 
-__all__ = ["RedisPool", "RedisLock"]
+__all__ = ["RedisPool", "RedisLock", "HttpClientRegistry", "http_client_registry"]
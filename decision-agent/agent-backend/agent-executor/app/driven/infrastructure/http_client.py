@@ -0,0 +1,215 @@
+"""HTTP客户端连接池
+
+所有driven适配器通过http_client_registry获取aiohttp.ClientSession，
+同一个上游服务共用一个TCPConnector，复用keep-alive连接并缓存DNS解析结果，
+避免每次调用都重新建立TCP/TLS连接。
+
+用法:
+    async with http_client_registry.session(
+        "agent_factory", headers=headers, timeout=timeout
+    ) as session:
+        async with session.get(url) as response:
+            ...
+
+session()返回的ClientSession不持有连接池（connector_owner=False），
+关闭session不会关闭连接；连接池在应用关闭时由close()统一释放。
+"""
+
+import time
+from asyncio import AbstractEventLoop, get_running_loop
+from typing import Dict, Optional
+
+import aiohttp
+
+from app.common.config import Config
+from app.utils.observability.observability_metric import (
+    counter_add,
+    histogram_record,
+    up_down_counter_add,
+)
+
+METRIC_REQUEST_DURATION = "agent_executor.http_client.request.duration"
+METRIC_REQUEST_IN_FLIGHT = "agent_executor.http_client.request.in_flight"
+METRIC_CONNECTION_CREATED = "agent_executor.http_client.connection.created"
+METRIC_CONNECTION_REUSED = "agent_executor.http_client.connection.reused"
+METRIC_POOL_WAIT = "agent_executor.http_client.pool.wait"
+
+# 上游服务名称
+UPSTREAM_AGENT_FACTORY = "agent_factory"
+UPSTREAM_AGENT_OPERATOR_INTEGRATION = "agent_operator_integration"
+UPSTREAM_AGENT_EXECUTOR = "agent_executor"
+UPSTREAM_AGENT_MEMORY = "agent_memory"
+UPSTREAM_MF_MODEL_API = "mf_model_api"
+# 用户配置的外部API工具
+UPSTREAM_API_TOOL = "api_tool"
+# 对象存储预签名URL下载
+UPSTREAM_OBJECT_STORAGE = "object_storage"
+# 联网搜索
+UPSTREAM_WEB_SEARCH = "web_search"
+
+
+def _build_trace_config(upstream: str) -> aiohttp.TraceConfig:
+    """构造记录连接池和请求耗时指标的TraceConfig"""
+    attributes = {"upstream": upstream}
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_request_start(session, ctx, params):
+        ctx.start = time.monotonic()
+        up_down_counter_add(METRIC_REQUEST_IN_FLIGHT, 1, attributes)
+
+    async def on_request_end(session, ctx, params):
+        up_down_counter_add(METRIC_REQUEST_IN_FLIGHT, -1, attributes)
+        histogram_record(
+            METRIC_REQUEST_DURATION,
+            (time.monotonic() - ctx.start) * 1000,
+            {**attributes, "status": params.response.status},
+        )
+
+    async def on_request_exception(session, ctx, params):
+        up_down_counter_add(METRIC_REQUEST_IN_FLIGHT, -1, attributes)
+        histogram_record(
+            METRIC_REQUEST_DURATION,
+            (time.monotonic() - ctx.start) * 1000,
+            {**attributes, "status": "error"},
+        )
+
+    async def on_connection_queued_start(session, ctx, params):
+        # 连接池已满，请求开始排队等待空闲连接
+        ctx.queued_at = time.monotonic()
+
+    async def on_connection_queued_end(session, ctx, params):
+        histogram_record(
+            METRIC_POOL_WAIT, (time.monotonic() - ctx.queued_at) * 1000, attributes
+        )
+
+    async def on_connection_create_end(session, ctx, params):
+        counter_add(METRIC_CONNECTION_CREATED, attributes=attributes)
+
+    async def on_connection_reuseconn(session, ctx, params):
+        counter_add(METRIC_CONNECTION_REUSED, attributes=attributes)
+
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    trace_config.on_connection_queued_start.append(on_connection_queued_start)
+    trace_config.on_connection_queued_end.append(on_connection_queued_end)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+    trace_config.freeze()
+    return trace_config
+
+
+class HttpClientRegistry:
+    """按上游服务管理aiohttp连接池
+
+    - 每个上游服务一个TCPConnector，连接数上限、DNS缓存、keep-alive、超时可配置
+    - 连接池与事件循环绑定：在其他事件循环（如后台线程）中使用时会为该循环单独创建连接池
+    - 请求耗时、在途请求数、新建/复用连接数、连接池排队耗时通过指标导出
+    """
+
+    def __init__(self, config=None):
+        """初始化
+
+        Args:
+            config: HttpClientConfig，为None时使用Config.http_client
+        """
+        self._config = config
+        self._connectors: Dict[AbstractEventLoop, Dict[str, aiohttp.TCPConnector]] = {}
+        self._trace_configs: Dict[str, aiohttp.TraceConfig] = {}
+
+    @property
+    def config(self):
+        return self._config if self._config is not None else Config.http_client
+
+    def get_connector(self, upstream: str) -> aiohttp.TCPConnector:
+        """获取上游服务的连接池（不存在或已关闭时创建）
+
+        Args:
+            upstream: 上游服务名称
+        """
+        loop = get_running_loop()
+        connectors = self._connectors.get(loop)
+        if connectors is None:
+            # 清理已关闭的事件循环遗留的连接池
+            for closed_loop in [k for k in self._connectors if k.is_closed()]:
+                del self._connectors[closed_loop]
+            connectors = self._connectors[loop] = {}
+
+        connector = connectors.get(upstream)
+        if connector is None or connector.closed:
+            config = self.config
+            options = config.get_upstream_options(upstream)
+            connector = aiohttp.TCPConnector(
+                limit=options["limit"],
+                limit_per_host=options["limit_per_host"],
+                ttl_dns_cache=config.ttl_dns_cache,
+                keepalive_timeout=config.keepalive_timeout,
+            )
+            connectors[upstream] = connector
+        return connector
+
+    def _get_trace_config(self, upstream: str) -> aiohttp.TraceConfig:
+        trace_config = self._trace_configs.get(upstream)
+        if trace_config is None:
+            trace_config = self._trace_configs[upstream] = _build_trace_config(upstream)
+        return trace_config
+
+    def session(
+        self,
+        upstream: str,
+        headers: Optional[dict] = None,
+        timeout: Optional[aiohttp.ClientTimeout] = None,
+    ) -> aiohttp.ClientSession:
+        """创建使用共享连接池的ClientSession
+
+        必须在事件循环中调用。创建session本身没有网络开销，可以每次调用创建一个
+
+        Args:
+            upstream: 上游服务名称
+            headers: session默认headers
+            timeout: 超时配置，为None时使用该上游的默认配置
+        """
+        if timeout is None:
+            options = self.config.get_upstream_options(upstream)
+            timeout = aiohttp.ClientTimeout(
+                total=options["timeout"], sock_connect=options["connect_timeout"]
+            )
+
+        return aiohttp.ClientSession(
+            headers=headers,
+            timeout=timeout,
+            connector=self.get_connector(upstream),
+            connector_owner=False,
+            trace_configs=[self._get_trace_config(upstream)],
+        )
+
+    def stats(self) -> Dict[str, dict]:
+        """当前事件循环中各连接池的使用情况（用于调试）"""
+        try:
+            loop = get_running_loop()
+        except RuntimeError:
+            return {}
+
+        result = {}
+        for upstream, connector in self._connectors.get(loop, {}).items():
+            result[upstream] = {
+                "limit": connector.limit,
+                "limit_per_host": connector.limit_per_host,
+                "closed": connector.closed,
+            }
+        return result
+
+    async def close(self) -> None:
+        """关闭当前事件循环中的所有连接池"""
+        try:
+            loop = get_running_loop()
+        except RuntimeError:
+            return
+
+        connectors = self._connectors.pop(loop, {})
+        for connector in connectors.values():
+            await connector.close()
+
+
+# 进程级共享实例，在FastAPI lifespan中关闭
+http_client_registry = HttpClientRegistry()
@@ -6,5 +6,8 @@
 # HTTP请求超时时间（秒）
 HTTP_REQUEST_TIMEOUT = 10
 
+# 并发获取skill（工具、子Agent）信息时的最大并发数
+SKILL_RESOLVE_CONCURRENCY = 8
+
 # 最终回答默认变量名
 FINAL_ANSWER_DEFAULT_VAR = "answer"
@@ -266,3 +266,25 @@ class RedisCache:
         except Exception as e:
             logger.error(f"执行Lua脚本失败: {e}")
             raise
+
+    async def publish(self, channel: str, message: str) -> int:
+        """发布消息到频道
+
+        Args:
+            channel: 频道名称
+            message: 消息内容
+
+        Returns:
+            收到消息的订阅者数量，失败返回0
+
+        Example:
+            >>> cache = RedisCache()
+            >>> await cache.publish("cache:invalidate", "user:123")
+            2
+        """
+        try:
+            async with redis_pool.acquire(self.db, "write") as conn:
+                return await conn.publish(channel, message)
+        except Exception as e:
+            logger.error(f"发布消息失败 channel={channel}: {e}")
+            return 0
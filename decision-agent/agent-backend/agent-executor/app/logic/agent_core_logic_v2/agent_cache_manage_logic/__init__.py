@@ -8,11 +8,18 @@
 模块结构：
 - manager.py: AgentCacheManager主类
 - agent_cache_service.py: Redis缓存服务
+- local_cache.py: 进程内L1缓存和并发加载合并
+- invalidation.py: L1缓存失效广播订阅
 - create_cache.py: 缓存创建逻辑
 - update_cache_data.py: 缓存数据更新逻辑
 """
 
 from .agent_cache_service import AgentCacheService
+from .invalidation import agent_cache_invalidation_listener
 from .manager import AgentCacheManager
 
-__all__ = ["AgentCacheService", "AgentCacheManager"]
+__all__ = [
+    "AgentCacheService",
+    "AgentCacheManager",
+    "agent_cache_invalidation_listener",
+]
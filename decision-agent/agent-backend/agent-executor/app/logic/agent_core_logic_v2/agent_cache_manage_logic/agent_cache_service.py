@@ -2,17 +2,26 @@
 """Agent缓存服务
 
 负责Agent缓存数据的缓存操作，使用PICKLE序列化存储
+Redis前有一层进程内L1缓存，缓存更新时通过Redis pub/sub通知其他副本失效
 """
 
 import logging
 from typing import Optional
 
-from app.domain.constant import AGENT_CACHE_TTL
+from app.domain.constant import AGENT_CACHE_INVALIDATE_CHANNEL, AGENT_CACHE_TTL
 from app.domain.entity.agent_cache import AgentCacheEntity
 from app.domain.vo.agent_cache import AgentCacheIdVO
 from app.infra.common.util.redis_cache import RedisCache
 from app.infra.common.util.redis_cache.redis_cache import SerializationType
 
+from .invalidation import build_invalidation_message
+from .local_cache import (
+    LocalAgentCache,
+    SingleFlight,
+    agent_cache_single_flight,
+    local_agent_cache,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,19 +31,38 @@ class AgentCacheService:
     负责：
     1. Agent缓存数据的序列化和反序列化
     2. Redis缓存操作（保存、加载、更新TTL、删除）
+    3. 进程内L1缓存的读写和失效广播
 
     存储策略：
     - 存储在 {cache_id} key中，包含创建DolphinAgent所需的所有静态数据
+    - 加载时优先读L1缓存，未命中时同一个key的并发加载只访问一次Redis
     """
 
-    def __init__(self, redis_db: int = 3):
+    def __init__(
+        self,
+        redis_db: int = 3,
+        local_cache: Optional[LocalAgentCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+    ):
         """初始化缓存服务
 
         Args:
             redis_db: Redis数据库编号，默认为3
+            local_cache: L1缓存，默认使用进程级共享实例
+            single_flight: 并发加载合并器，默认使用进程级共享实例
         """
         self.redis_cache = RedisCache(db=redis_db)
         self.redis_db = redis_db
+        self.local_cache = local_agent_cache if local_cache is None else local_cache
+        self.single_flight = (
+            agent_cache_single_flight if single_flight is None else single_flight
+        )
+
+    async def _broadcast_invalidation(self, key: str) -> None:
+        """通知其他副本删除L1缓存中的旧数据"""
+        await self.redis_cache.publish(
+            AGENT_CACHE_INVALIDATE_CHANNEL, build_invalidation_message(key)
+        )
 
     async def save(
         self, cache_entity: AgentCacheEntity, ttl: int = AGENT_CACHE_TTL
@@ -64,6 +92,9 @@ class AgentCacheService:
                 )
                 return False
 
+            self.local_cache.put(key, cache_entity)
+            await self._broadcast_invalidation(key)
+
             logger.info(
                 f"成功保存Agent缓存: cache_id={cache_entity.cache_id_vo}, ttl={ttl}"
             )
@@ -88,7 +119,16 @@ class AgentCacheService:
         try:
             key = cache_id_vo.to_redis_key()
 
-            data = await self.redis_cache.get(key)
+            data = self.local_cache.get(key)
+            if data:
+                logger.debug(f"命中Agent L1缓存: cache_id={cache_id_vo}")
+                return data
+
+            data = await self.single_flight.do(
+                f"load:{key}",
+                lambda: self._load_from_redis(key),
+                share=lambda entity: entity.copy(),
+            )
 
             if not data:
                 logger.debug(f"Agent缓存不存在: cache_id={cache_id_vo}")
@@ -104,6 +144,13 @@ class AgentCacheService:
             )
             return None
 
+    async def _load_from_redis(self, key: str) -> Optional[AgentCacheEntity]:
+        """从Redis加载并写入L1缓存"""
+        data = await self.redis_cache.get(key)
+        if data:
+            self.local_cache.put(key, data)
+        return data
+
     async def update_ttl(self, cache_id_vo: AgentCacheIdVO, ttl: int) -> bool:
         """更新TTL
 
@@ -183,7 +230,9 @@ class AgentCacheService:
         """
         try:
             key = cache_id_vo.to_redis_key()
+            self.local_cache.invalidate(key)
             success = await self.redis_cache.delete(key)
+            await self._broadcast_invalidation(key)
 
             if success:
                 logger.info(f"成功删除Agent缓存: cache_id={cache_id_vo}")
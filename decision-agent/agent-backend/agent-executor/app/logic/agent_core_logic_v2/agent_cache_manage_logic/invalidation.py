@@ -0,0 +1,123 @@
+# -*- coding:utf-8 -*-
+"""Agent缓存失效广播
+
+缓存保存/删除时通过Redis pub/sub广播失效消息，其他副本收到后删除L1缓存中的旧数据
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from typing import Optional, Union
+
+from app.domain.constant import AGENT_CACHE_INVALIDATE_CHANNEL
+from app.driven.infrastructure.redis import redis_pool
+
+from .local_cache import LocalAgentCache, local_agent_cache
+
+logger = logging.getLogger(__name__)
+
+# 当前进程标识，用于忽略自己发出的失效消息
+INSTANCE_ID = uuid.uuid4().hex
+
+
+def build_invalidation_message(key: str) -> str:
+    """构造失效消息
+
+    Args:
+        key: 缓存key（Redis key）
+
+    Returns:
+        JSON格式的消息
+    """
+    return json.dumps({"key": key, "source": INSTANCE_ID})
+
+
+class AgentCacheInvalidationListener:
+    """订阅失效广播并删除L1缓存
+
+    连接断开时会自动重连；重连期间可能错过失效消息，因此重连后清空L1缓存
+    """
+
+    def __init__(
+        self,
+        local_cache: LocalAgentCache = local_agent_cache,
+        redis_db: int = 3,
+        channel: str = AGENT_CACHE_INVALIDATE_CHANNEL,
+        retry_interval: float = 3.0,
+    ):
+        """初始化监听器
+
+        Args:
+            local_cache: 需要维护的L1缓存
+            redis_db: Redis数据库编号
+            channel: 失效广播频道
+            retry_interval: 断线重连间隔（秒）
+        """
+        self.local_cache = local_cache
+        self.redis_db = redis_db
+        self.channel = channel
+        self.retry_interval = retry_interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """在后台开始监听"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止监听"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def handle_message(self, data: Union[bytes, str]) -> None:
+        """处理一条失效消息
+
+        Args:
+            data: 消息内容
+        """
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning(f"无法解析Agent缓存失效消息: {data!r}")
+            return
+
+        if message.get("source") == INSTANCE_ID:
+            return
+
+        key = message.get("key")
+        if key:
+            self.local_cache.invalidate(key)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with redis_pool.acquire(self.redis_db, "write") as conn:
+                    pubsub = conn.pubsub()
+                    await pubsub.subscribe(self.channel)
+                    # 订阅建立前可能错过了失效消息
+                    self.local_cache.clear()
+                    logger.info(f"已订阅Agent缓存失效频道: {self.channel}")
+                    try:
+                        async for message in pubsub.listen():
+                            if message.get("type") == "message":
+                                self.handle_message(message.get("data"))
+                    finally:
+                        await pubsub.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    f"Agent缓存失效订阅中断，{self.retry_interval}秒后重连: {e}"
+                )
+                self.local_cache.clear()
+                await asyncio.sleep(self.retry_interval)
+
+
+agent_cache_invalidation_listener = AgentCacheInvalidationListener()
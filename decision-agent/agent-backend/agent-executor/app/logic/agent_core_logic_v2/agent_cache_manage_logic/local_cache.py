@@ -0,0 +1,179 @@
+# -*- coding:utf-8 -*-
+"""Agent缓存进程内L1缓存
+
+在Redis缓存前增加一层进程内缓存，避免每次/run都从Redis拉取并反序列化完整的AgentCacheEntity
+
+- LocalAgentCache: 有容量上限、带TTL的LRU缓存
+- SingleFlight: 合并同一个key的并发加载/创建，只执行一次
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.domain.constant import AGENT_CACHE_LOCAL_MAX_SIZE, AGENT_CACHE_LOCAL_TTL
+from app.domain.entity.agent_cache import AgentCacheEntity
+from app.utils.observability.observability_metric import counter_add
+
+METRIC_L1_HIT = "agent_executor.agent_cache.l1.hit"
+METRIC_L1_MISS = "agent_executor.agent_cache.l1.miss"
+METRIC_L1_EVICTION = "agent_executor.agent_cache.l1.eviction"
+METRIC_L1_INVALIDATION = "agent_executor.agent_cache.l1.invalidation"
+METRIC_SINGLE_FLIGHT_SHARED = "agent_executor.agent_cache.single_flight.shared"
+
+
+class LocalAgentCache:
+    """进程内L1缓存（LRU + TTL）
+
+    - 超过max_size时淘汰最久未使用的条目
+    - 条目超过ttl后视为过期，下次访问时删除
+    - 存入和取出时都会拷贝实体，调用方修改返回值不会影响缓存中的数据
+    """
+
+    def __init__(
+        self,
+        max_size: int = AGENT_CACHE_LOCAL_MAX_SIZE,
+        ttl: float = AGENT_CACHE_LOCAL_TTL,
+    ):
+        """初始化L1缓存
+
+        Args:
+            max_size: 最大条目数
+            ttl: 条目有效期（秒）
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, AgentCacheEntity]]" = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[AgentCacheEntity]:
+        """获取缓存
+
+        Args:
+            key: 缓存key
+
+        Returns:
+            AgentCacheEntity的拷贝，不存在或已过期时返回None
+        """
+        item = self._entries.get(key)
+        if item is None:
+            counter_add(METRIC_L1_MISS)
+            return None
+
+        expire_at, entity = item
+        if expire_at <= time.monotonic():
+            del self._entries[key]
+            counter_add(METRIC_L1_MISS)
+            counter_add(METRIC_L1_EVICTION, attributes={"reason": "expired"})
+            return None
+
+        self._entries.move_to_end(key)
+        counter_add(METRIC_L1_HIT)
+        return entity.copy()
+
+    def put(self, key: str, entity: AgentCacheEntity) -> None:
+        """写入缓存
+
+        Args:
+            key: 缓存key
+            entity: Agent缓存实体
+        """
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl, entity.copy())
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            counter_add(METRIC_L1_EVICTION, attributes={"reason": "capacity"})
+
+    def invalidate(self, key: str) -> bool:
+        """删除指定缓存
+
+        Args:
+            key: 缓存key
+
+        Returns:
+            是否删除了条目
+        """
+        if self._entries.pop(key, None) is None:
+            return False
+        counter_add(METRIC_L1_INVALIDATION)
+        return True
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._entries.clear()
+
+
+class _LeaderCancelledError(Exception):
+    """执行调用的请求被取消（如客户端断开），等待者需要重新发起调用"""
+
+
+class SingleFlight:
+    """合并同一个key的并发调用
+
+    第一个调用者执行函数，其余并发调用者等待并共享同一个结果（或异常）。
+    执行者被取消时不会把取消传递给等待者，由等待者重新发起调用（其中一个成为新的执行者）
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, "asyncio.Future[Any]"] = {}
+
+    async def do(
+        self,
+        key: str,
+        func: Callable[[], Awaitable[Any]],
+        share: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        """执行或等待同一个key的调用
+
+        Args:
+            key: 调用key
+            func: 无参异步函数
+            share: 等待者拿到结果前对结果的处理（如拷贝），None表示直接共享
+
+        Returns:
+            func的返回值
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            counter_add(METRIC_SINGLE_FLIGHT_SHARED)
+            # shield: 等待者被取消时不影响正在执行的调用
+            try:
+                result = await asyncio.shield(future)
+            except _LeaderCancelledError:
+                return await self.do(key, func, share)
+            if share is not None and result is not None:
+                return share(result)
+            return result
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelledError())
+            future.exception()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # 标记异常已被读取，避免没有等待者时打印"exception was never retrieved"
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._calls.pop(key, None)
+
+
+# 进程级共享实例：所有AgentCacheService共用同一个L1缓存
+local_agent_cache = LocalAgentCache()
+agent_cache_single_flight = SingleFlight()
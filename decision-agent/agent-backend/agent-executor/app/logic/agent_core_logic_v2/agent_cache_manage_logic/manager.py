@@ -10,6 +10,7 @@ from app.domain.vo.agent_cache import AgentCacheIdVO
 from app.domain.entity.agent_cache import AgentCacheEntity
 from app.domain.vo.agentvo import AgentConfigVo
 from .agent_cache_service import AgentCacheService
+from .local_cache import agent_cache_single_flight
 
 
 class AgentCacheManager:
@@ -47,14 +48,27 @@ class AgentCacheManager:
         """
         from .create_cache import create_cache
 
-        return await create_cache(
-            manager=self,
+        cache_id_vo = AgentCacheIdVO(
             account_id=account_id,
             account_type=account_type,
             agent_id=agent_id,
             agent_version=agent_version,
-            agent_config=agent_config,
-            headers=headers,
+            agent_config_version_flag=str(agent_config.get_config_last_set_timestamp()),
+        )
+
+        # 同一个缓存的并发创建只执行一次warmup，其余请求共享结果
+        return await agent_cache_single_flight.do(
+            f"create:{cache_id_vo.to_redis_key()}",
+            lambda: create_cache(
+                manager=self,
+                account_id=account_id,
+                account_type=account_type,
+                agent_id=agent_id,
+                agent_version=agent_version,
+                agent_config=agent_config,
+                headers=headers,
+            ),
+            share=lambda entity: entity.copy(),
         )
 
     async def update_cache_data(
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any, TYPE_CHECKING
 
 from app.common.config import Config
@@ -12,6 +13,7 @@ from app.domain.enum.common.user_account_header_key import (
 )
 from app.domain.vo.agentvo import AgentConfigVo
 from app.domain.vo.agentvo.agent_config_vos import SkillVo, AgentSkillVo
+from app.infra.common.infra_constant.const import SKILL_RESOLVE_CONCURRENCY
 
 if TYPE_CHECKING:
     from ...agent_core_v2 import AgentCoreV2
@@ -27,8 +29,26 @@ async def process_skills_agents(
     if not skills:
         return
 
+    # 1. 从缓存中获取agent_info
+    agent_infos = {}
     for agent_skill_cfg in skills.agents:
-        # 0. 设置agent_factory_service的headers
+        agent_info = ac.cache_handler.get_skill_agent_info_dict(
+            agent_skill_cfg.agent_key
+        )
+        if agent_info:
+            agent_infos[agent_skill_cfg.agent_key] = agent_info
+
+    # 2. 缓存中没有的agent_info, 并发从agent_factory_service获取（相同agent只获取一次）
+    missing_keys = list(
+        dict.fromkeys(
+            agent_skill_cfg.agent_key
+            for agent_skill_cfg in skills.agents
+            if agent_skill_cfg.agent_key not in agent_infos
+        )
+    )
+
+    if missing_keys:
+        # 构造本次请求的headers，显式传给service，避免并发时修改共享单例的headers
         service_headers = {}
         user_id = get_user_account_id(headers) or ""
         visitor_type = get_user_account_type(headers) or ""
@@ -36,24 +56,27 @@ async def process_skills_agents(
         set_user_account_id(service_headers, user_id)
         set_user_account_type(service_headers, visitor_type)
         set_biz_domain_id(service_headers, biz_domain_id)
-        agent_factory_service.set_headers(service_headers)
 
-        # 1. 从缓存中获取agent_info
-        agent_info = ac.cache_handler.get_skill_agent_info_dict(
-            agent_skill_cfg.agent_key
+        semaphore = asyncio.Semaphore(SKILL_RESOLVE_CONCURRENCY)
+
+        async def fetch_agent_info(agent_key):
+            async with semaphore:
+                return await agent_factory_service.get_agent_config_by_key(
+                    agent_key, request_headers=service_headers
+                )
+
+        results = await asyncio.gather(
+            *[fetch_agent_info(agent_key) for agent_key in missing_keys]
         )
 
-        # 2. 如果缓存中没有agent_info, 则从agent_factory_service获取
-        if not agent_info:
-            agent_info = await agent_factory_service.get_agent_config_by_key(
-                agent_skill_cfg.agent_key
-            )
-            # agent["agent_info"] = _agent_info
+        for agent_key, agent_info in zip(missing_keys, results):
+            agent_infos[agent_key] = agent_info
 
             if ac.is_warmup:
-                ac.cache_handler.set_skill_agent_info_dict(
-                    agent_skill_cfg.agent_key, agent_info
-                )
+                ac.cache_handler.set_skill_agent_info_dict(agent_key, agent_info)
+
+    for agent_skill_cfg in skills.agents:
+        agent_info = agent_infos.get(agent_skill_cfg.agent_key)
 
         # 3. 设置agent_info到agent (使用inner_dto存储动态属性)
         agent_skill_cfg.inner_dto.agent_info = agent_info
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any, Dict, TYPE_CHECKING
 
 from .agent_skills import process_skills_agents
@@ -23,11 +24,12 @@ async def process_skills(
     if temp_files is None:
         temp_files = {}
 
-    # 1. tools skill
-    await process_skills_tools(ac, context_variables, headers, skills)
-
-    # 2. agents skill
-    await process_skills_agents(ac, agent_config, skills, temp_files, headers)
-
-    # 3. mcps skill
-    await process_skills_mcps(skills)
+    # tools、agents、mcps三类skill互不依赖，并发处理
+    await asyncio.gather(
+        # 1. tools skill
+        process_skills_tools(ac, context_variables, headers, skills),
+        # 2. agents skill
+        process_skills_agents(ac, agent_config, skills, temp_files, headers),
+        # 3. mcps skill
+        process_skills_mcps(skills),
+    )
@@ -1,3 +1,4 @@
+import asyncio
 import sys
 import app.common.stand_log as log_oper
 from typing import TYPE_CHECKING
@@ -17,6 +18,7 @@ from app.domain.enum.common.user_account_header_key import (
     set_user_account_type,
 )
 from app.domain.vo.agentvo.agent_config_vos import SkillVo
+from app.infra.common.infra_constant.const import SKILL_RESOLVE_CONCURRENCY
 
 if TYPE_CHECKING:
     from ...agent_core_v2 import AgentCoreV2
@@ -31,9 +33,24 @@ async def process_skills_tools(
     if not skills:
         return
 
-    available_tools = []
-
+    # 1. 从缓存中获取tool_info
+    tool_infos = {}
     for tool in skills.tools:
+        tool_info = ac.cache_handler.get_tools_info_dict(tool.tool_id)
+        if tool_info:
+            tool_infos[(tool.tool_box_id, tool.tool_id)] = tool_info
+
+    # 2. 缓存中没有的tool_info, 并发从agent_operator_integration_service获取（相同工具只获取一次）
+    missing_keys = list(
+        dict.fromkeys(
+            (tool.tool_box_id, tool.tool_id)
+            for tool in skills.tools
+            if (tool.tool_box_id, tool.tool_id) not in tool_infos
+        )
+    )
+
+    if missing_keys:
+        # 构造本次请求的headers，显式传给service，避免并发时修改共享单例的headers
         service_headers = {}
         user_id = get_user_account_id(headers) or ""
         visitor_type = get_user_account_type(headers) or ""
@@ -41,19 +58,27 @@ async def process_skills_tools(
         set_user_account_id(service_headers, user_id)
         set_user_account_type(service_headers, visitor_type)
         set_biz_domain_id(service_headers, biz_domain_id)
-        agent_operator_integration_service.set_headers(service_headers)
 
-        # 1. 从缓存中获取tool_info
-        tool_info = ac.cache_handler.get_tools_info_dict(tool.tool_id)
+        semaphore = asyncio.Semaphore(SKILL_RESOLVE_CONCURRENCY)
 
-        # 2. 如果缓存中没有tool_info, 则从agent_operator_integration_service获取
-        if not tool_info:
-            tool_info = await agent_operator_integration_service.get_tool_info(
-                tool.tool_box_id, tool.tool_id
-            )
+        async def fetch_tool_info(tool_box_id, tool_id):
+            async with semaphore:
+                return await agent_operator_integration_service.get_tool_info(
+                    tool_box_id, tool_id, request_headers=service_headers
+                )
+
+        results = await asyncio.gather(*[fetch_tool_info(*key) for key in missing_keys])
+
+        for (tool_box_id, tool_id), tool_info in zip(missing_keys, results):
+            tool_infos[(tool_box_id, tool_id)] = tool_info
 
             if tool_info and ac.is_warmup:
-                ac.cache_handler.set_tools_info_dict(tool.tool_id, tool_info)
+                ac.cache_handler.set_tools_info_dict(tool_id, tool_info)
+
+    available_tools = []
+
+    for tool in skills.tools:
+        tool_info = tool_infos.get((tool.tool_box_id, tool.tool_id))
 
         if not tool_info:
             err = "工具不可用，已移除问题工具: tool_box_id={}, tool_id={}".format(
@@ -0,0 +1,374 @@
+"""记忆构建队列
+
+Agent运行结束后的记忆构建请求放入进程内的异步队列，由固定数量的worker发送给agent-memory：
+
+- 同一用户/Agent在合并窗口内的多次请求合并为一次调用（消息按顺序拼接）
+- 队列有长度上限，满时按策略丢弃新请求、丢弃最早的请求或写入本地文件（spill）
+- 关闭时停止接收新请求，在drain_timeout内处理完队列，剩余请求写入spill文件或丢弃
+- 队列深度、排队耗时、调用耗时、合并/丢弃/失败次数通过指标导出
+"""
+
+import asyncio
+import json
+import os
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.common.config import Config
+from app.common.stand_log import StandLogger
+from app.driven.dip.agent_memory_service import agent_memory_service
+from app.utils.observability.observability_metric import (
+    counter_add,
+    histogram_record,
+    up_down_counter_add,
+)
+
+METRIC_QUEUE_DEPTH = "agent_executor.memory_build.queue.depth"
+METRIC_QUEUE_LATENCY = "agent_executor.memory_build.queue.latency"
+METRIC_REQUEST_DURATION = "agent_executor.memory_build.request.duration"
+METRIC_COALESCED = "agent_executor.memory_build.coalesced"
+METRIC_DROPPED = "agent_executor.memory_build.dropped"
+METRIC_SPILLED = "agent_executor.memory_build.spilled"
+METRIC_FAILED = "agent_executor.memory_build.failed"
+
+OVERFLOW_DROP_NEWEST = "drop_newest"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_SPILL = "spill"
+
+SPILL_FILE_NAME = "memory_build_spill.jsonl"
+
+
+@dataclass
+class MemoryBuildBatch:
+    """一次记忆构建调用（可能由多次请求合并而成）"""
+
+    user_id: str
+    agent_id: str
+    headers: Dict[str, str]
+    messages: List[dict] = field(default_factory=list)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return self.user_id, self.agent_id
+
+    def to_dict(self) -> dict:
+        return {
+            "user_id": self.user_id,
+            "agent_id": self.agent_id,
+            "headers": self.headers,
+            "messages": self.messages,
+        }
+
+
+async def _send_to_agent_memory(batch: MemoryBuildBatch) -> None:
+    await agent_memory_service.build_memory(
+        messages=batch.messages,
+        agent_id=batch.agent_id,
+        user_id=batch.user_id,
+        headers=batch.headers,
+    )
+
+
+class MemoryBuildQueue:
+    """记忆构建异步队列
+
+    submit()只能在队列所在的事件循环中同步调用，其他线程中调用时会转交给该事件循环
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 1000,
+        workers: int = 4,
+        coalesce_window: float = 1.0,
+        max_batch_messages: int = 50,
+        overflow_policy: str = OVERFLOW_DROP_OLDEST,
+        spill_dir: str = "",
+        drain_timeout: float = 10.0,
+        send: Optional[Callable[[MemoryBuildBatch], Awaitable[None]]] = None,
+    ):
+        """初始化队列
+
+        Args:
+            queue_size: 队列最大长度（批次数）
+            workers: worker数量
+            coalesce_window: 合并窗口（秒）
+            max_batch_messages: 单个批次最多包含的消息数
+            overflow_policy: 队列满时的处理策略
+            spill_dir: spill文件目录
+            drain_timeout: 关闭时等待队列处理完成的最长时间（秒）
+            send: 发送批次的函数，默认调用agent-memory
+        """
+        if overflow_policy == OVERFLOW_SPILL and not spill_dir:
+            StandLogger.warn("记忆构建队列未配置spill目录，队列满时将丢弃新请求")
+            overflow_policy = OVERFLOW_DROP_NEWEST
+
+        self.queue_size = queue_size
+        self.workers = workers
+        self.coalesce_window = coalesce_window
+        self.max_batch_messages = max_batch_messages
+        self.overflow_policy = overflow_policy
+        self.spill_dir = spill_dir
+        self.drain_timeout = drain_timeout
+        self._send = send or _send_to_agent_memory
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional["asyncio.Queue[MemoryBuildBatch]"] = None
+        self._pending: Dict[Tuple[str, str], MemoryBuildBatch] = {}
+        self._worker_tasks: List[asyncio.Task] = []
+        self._closing = False
+        self._closing_event: Optional[asyncio.Event] = None
+
+    @classmethod
+    def from_config(cls, memory_config) -> "MemoryBuildQueue":
+        """根据MemoryConfig创建队列"""
+        return cls(
+            queue_size=memory_config.build_queue_size,
+            workers=memory_config.build_workers,
+            coalesce_window=memory_config.build_coalesce_window,
+            max_batch_messages=memory_config.build_max_batch_messages,
+            overflow_policy=memory_config.build_overflow_policy,
+            spill_dir=memory_config.build_spill_dir,
+            drain_timeout=memory_config.build_drain_timeout,
+        )
+
+    @property
+    def started(self) -> bool:
+        return bool(self._worker_tasks)
+
+    @property
+    def spill_path(self) -> str:
+        return os.path.join(self.spill_dir, SPILL_FILE_NAME)
+
+    def qsize(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        """在当前事件循环中启动worker，并重新提交上次spill的请求"""
+        if self.started:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._pending.clear()
+        self._closing = False
+        self._closing_event = asyncio.Event()
+        self._worker_tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+        self._restore_spilled()
+
+    async def stop(self) -> None:
+        """停止接收新请求并处理完队列中的请求
+
+        超过drain_timeout仍未处理完时，剩余请求写入spill文件（未配置时丢弃）
+        """
+        if not self.started:
+            return
+
+        self._closing = True
+        # 唤醒正在等待合并窗口的worker，立即发送
+        self._closing_event.set()
+        try:
+            await asyncio.wait_for(self._queue.join(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            StandLogger.warn(
+                f"记忆构建队列关闭超时，剩余{self._queue.qsize()}个批次未处理"
+            )
+
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+        while not self._queue.empty():
+            batch = self._queue.get_nowait()
+            self._queue.task_done()
+            up_down_counter_add(METRIC_QUEUE_DEPTH, -1)
+            self._discard_on_shutdown(batch)
+        self._pending.clear()
+
+    def submit(
+        self,
+        user_id: str,
+        agent_id: str,
+        messages: List[dict],
+        headers: Dict[str, str],
+    ) -> None:
+        """提交记忆构建请求（不阻塞）
+
+        Args:
+            user_id: 用户id
+            agent_id: Agent id
+            messages: 消息列表
+            headers: 调用agent-memory的headers
+        """
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if self.started and running_loop is not self._loop:
+            if not self._loop.is_closed():
+                # 其他线程/事件循环中提交，转交给队列所在的事件循环
+                self._loop.call_soon_threadsafe(
+                    self._submit, user_id, agent_id, messages, headers
+                )
+                return
+            # 队列所在的事件循环已关闭（未正常stop），在当前事件循环中重新启动
+            self._worker_tasks = []
+
+        if not self.started:
+            if running_loop is None:
+                counter_add(METRIC_DROPPED, attributes={"reason": "not_started"})
+                StandLogger.warn("记忆构建队列未启动，已丢弃记忆构建请求")
+                return
+            self.start()
+
+        self._submit(user_id, agent_id, messages, headers)
+
+    def _submit(
+        self,
+        user_id: str,
+        agent_id: str,
+        messages: List[dict],
+        headers: Dict[str, str],
+    ) -> None:
+        if self._closing:
+            self._discard_on_shutdown(
+                MemoryBuildBatch(user_id, agent_id, dict(headers), list(messages))
+            )
+            return
+
+        key = (user_id, agent_id)
+
+        # 1. 合并到同一用户/Agent尚未发送的批次
+        batch = self._pending.get(key)
+        if (
+            batch is not None
+            and len(batch.messages) + len(messages) <= self.max_batch_messages
+        ):
+            batch.messages.extend(messages)
+            counter_add(METRIC_COALESCED)
+            return
+
+        # 2. 新建批次
+        batch = MemoryBuildBatch(user_id, agent_id, dict(headers), list(messages))
+        if self._queue.full():
+            if self.overflow_policy == OVERFLOW_SPILL:
+                self._spill(batch)
+                return
+            if self.overflow_policy == OVERFLOW_DROP_OLDEST:
+                oldest = self._queue.get_nowait()
+                self._queue.task_done()
+                up_down_counter_add(METRIC_QUEUE_DEPTH, -1)
+                if self._pending.get(oldest.key) is oldest:
+                    del self._pending[oldest.key]
+            counter_add(METRIC_DROPPED, attributes={"reason": "queue_full"})
+            if self.overflow_policy == OVERFLOW_DROP_NEWEST:
+                return
+
+        self._queue.put_nowait(batch)
+        self._pending[key] = batch
+        up_down_counter_add(METRIC_QUEUE_DEPTH, 1)
+
+    async def _worker(self) -> None:
+        while True:
+            batch = await self._queue.get()
+            try:
+                up_down_counter_add(METRIC_QUEUE_DEPTH, -1)
+
+                # 等待合并窗口结束，期间同一用户/Agent的请求会合并到该批次；关闭时立即发送
+                wait = batch.enqueued_at + self.coalesce_window - time.monotonic()
+                if wait > 0 and not self._closing:
+                    try:
+                        await asyncio.wait_for(self._closing_event.wait(), wait)
+                    except asyncio.TimeoutError:
+                        pass
+
+                if self._pending.get(batch.key) is batch:
+                    del self._pending[batch.key]
+
+                histogram_record(
+                    METRIC_QUEUE_LATENCY, (time.monotonic() - batch.enqueued_at) * 1000
+                )
+                await self._send_batch(batch)
+
+                if self._has_spilled() and self._queue.qsize() < self.queue_size // 2:
+                    self._restore_spilled()
+            except asyncio.CancelledError:
+                # 关闭超时被取消，正在处理的批次按关闭策略处理
+                self._discard_on_shutdown(batch)
+                raise
+            finally:
+                self._queue.task_done()
+
+    async def _send_batch(self, batch: MemoryBuildBatch) -> None:
+        start = time.monotonic()
+        try:
+            await self._send(batch)
+            StandLogger.info(
+                f"记忆构建完成: agent_id={batch.agent_id}, messages={len(batch.messages)}"
+            )
+        except Exception as e:
+            # 记忆构建失败不应影响主流程
+            counter_add(METRIC_FAILED)
+            StandLogger.error(
+                f"记忆构建失败: {str(e)}, traceback: {traceback.format_exc()}"
+            )
+        finally:
+            histogram_record(METRIC_REQUEST_DURATION, (time.monotonic() - start) * 1000)
+
+    def _discard_on_shutdown(self, batch: MemoryBuildBatch) -> None:
+        """关闭时无法发送的批次写入spill文件（未配置时丢弃）"""
+        if self.spill_dir:
+            self._spill(batch)
+        else:
+            counter_add(METRIC_DROPPED, attributes={"reason": "shutdown"})
+
+    def _has_spilled(self) -> bool:
+        return bool(self.spill_dir) and os.path.exists(self.spill_path)
+
+    def _spill(self, batch: MemoryBuildBatch) -> None:
+        """将批次追加写入spill文件"""
+        try:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(batch.to_dict(), ensure_ascii=False) + "\n")
+            counter_add(METRIC_SPILLED)
+        except OSError as e:
+            counter_add(METRIC_DROPPED, attributes={"reason": "spill_error"})
+            StandLogger.error(f"记忆构建请求写入spill文件失败: {str(e)}")
+
+    def _restore_spilled(self) -> None:
+        """读取spill文件并重新提交（写入队列失败的请求会再次spill）"""
+        if not self._has_spilled():
+            return
+
+        restoring_path = self.spill_path + ".restoring"
+        try:
+            os.replace(self.spill_path, restoring_path)
+            with open(restoring_path, encoding="utf-8") as f:
+                lines = f.readlines()
+            os.remove(restoring_path)
+        except OSError as e:
+            StandLogger.error(f"读取记忆构建spill文件失败: {str(e)}")
+            return
+
+        for line in lines:
+            try:
+                item = json.loads(line)
+            except ValueError:
+                continue
+            self._submit(
+                item.get("user_id", ""),
+                item.get("agent_id", ""),
+                item.get("messages", []),
+                item.get("headers", {}),
+            )
+
+
+# 进程级共享实例，在FastAPI lifespan中启动和关闭
+memory_build_queue = MemoryBuildQueue.from_config(Config.memory)
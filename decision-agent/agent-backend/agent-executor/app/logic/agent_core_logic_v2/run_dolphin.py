@@ -238,6 +238,4 @@ async def run_dolphin(
     dialog_log_handler = DialogLogHandler(agent, config, headers)
     dialog_log_handler.save_dialog_logs()
 
-    ac.memory_handler.start_memory_build_thread(
-        config, context_variables, headers, output
-    )
+    ac.memory_handler.start_memory_build(config, context_variables, headers, output)
@@ -1,8 +1,12 @@
-import aiohttp
 import json
 from typing import AsyncGenerator
 import uuid
 
+from app.driven.infrastructure.http_client import (
+    UPSTREAM_WEB_SEARCH,
+    http_client_registry,
+)
+
 answer_prompt = """
 
 <references>
@@ -94,7 +98,7 @@ async def get_search_results(request, headers):
             "messages": [{"role": "user", "content": request["query"]}],
         }
         headers = {"Authorization": request["api_key"]}
-        async with aiohttp.ClientSession() as session:
+        async with http_client_registry.session(UPSTREAM_WEB_SEARCH) as session:
             async with session.post(url, headers=headers, json=data) as response:
                 return await response.json()
     else:
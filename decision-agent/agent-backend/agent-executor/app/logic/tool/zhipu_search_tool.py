@@ -2,6 +2,11 @@ import uuid
 import aiohttp
 import logging
 
+from app.driven.infrastructure.http_client import (
+    UPSTREAM_WEB_SEARCH,
+    http_client_registry,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,7 +22,7 @@ async def zhipu_search_tool(inputs, props, resource, data_source_config, context
     }
     headers = {"Authorization": props.get("api_key")}
 
-    async with aiohttp.ClientSession() as session:
+    async with http_client_registry.session(UPSTREAM_WEB_SEARCH) as session:
         try:
             async with session.post(url, json=data, headers=headers) as response:
                 # Handle successful responses (2xx status codes)
@@ -8,6 +8,11 @@ from opentelemetry.instrumentation.aiohttp_client import AioHttpClientInstrument
 from pydantic import BaseModel, Field
 
 from app.common.config import Config, observability_config, server_info
+from app.driven.infrastructure.http_client import http_client_registry
+from app.logic.agent_core_logic_v2.agent_cache_manage_logic import (
+    agent_cache_invalidation_listener,
+)
+from app.logic.agent_core_logic_v2.memory_build_queue import memory_build_queue
 from app.utils.observability.observability import (
     init_observability,
     shutdown_observability,
@@ -23,8 +28,13 @@ async def lifespan(app: FastAPI):
     # 启动时执行
     init_observability(server_info, observability_config)
     AioHttpClientInstrumentor().instrument()
+    agent_cache_invalidation_listener.start()
+    memory_build_queue.start()
     yield
     # 关闭时执行
+    await memory_build_queue.stop()
+    await agent_cache_invalidation_listener.stop()
+    await http_client_registry.close()
     shutdown_observability()
 
 
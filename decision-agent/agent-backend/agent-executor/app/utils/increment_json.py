@@ -3,6 +3,176 @@ import json
 from typing import Any, AsyncGenerator, Dict, List
 
 
+class IncrementalJsonDiffer:
+    """有状态的增量 JSON 差异计算器
+
+    Dolphin 的输出生成器每次 yield 的是同一个（被原地修改的）完整 JSON。
+    旧实现每个 chunk 都通过 json.loads(json.dumps(...)) 深拷贝整棵树，再对整棵树做比较，
+    长回答下 CPU 开销为 O(n²)。
+
+    本类只保存一棵"影子树"：字典/列表按结构镜像，叶子节点（字符串、数字等不可变对象）
+    直接持有引用，不复制任何字符串内容。每个 chunk 只沿着实际发生变化的路径更新影子树：
+
+    - 未变化的叶子通过对象身份（``is``）在 O(1) 内跳过；
+    - 追加的字符串只比较长度和前缀，输出新增部分；
+    - 新增的子树只对该子树建立影子。
+
+    输出格式与 ``compare_values`` 完全一致（seq_id/key/content/action）。
+    """
+
+    def __init__(self) -> None:
+        self._shadow: Any = None
+        self._started = False
+        self.seq_id = 0
+
+    def diff(self, current: Any) -> List[Dict[str, Any]]:
+        """计算当前 JSON 与上一次状态之间的差异，并更新内部状态
+
+        Args:
+            current: 当前完整的 JSON 对象
+
+        Returns:
+            List[Dict[str, Any]]: 差异列表，每个差异包含seq_id, key, content, action
+        """
+        changes: List[Dict[str, Any]] = []
+
+        if not self._started:
+            self._started = True
+            if isinstance(current, dict):
+                # 第一次处理，直接返回完整JSON
+                for key, value in current.items():
+                    self._emit(changes, [key], value, "upsert")
+            else:
+                self._emit(changes, [], current, "upsert")
+            self._shadow = _snapshot(current)
+            return changes
+
+        self._shadow = self._diff_value(self._shadow, current, [], changes)
+        return changes
+
+    def end(self) -> Dict[str, Any]:
+        """生成结束标记"""
+        return {"seq_id": self.seq_id, "key": [], "content": None, "action": "end"}
+
+    def _emit(
+        self,
+        changes: List[Dict[str, Any]],
+        keys: List[Any],
+        content: Any,
+        action: str,
+    ) -> None:
+        changes.append(
+            {
+                "seq_id": self.seq_id,
+                "key": keys,
+                "content": content,
+                "action": action,
+            }
+        )
+        self.seq_id += 1
+
+    def _diff_value(
+        self,
+        prev: Any,
+        curr: Any,
+        parent_keys: List[Any],
+        changes: List[Dict[str, Any]],
+    ) -> Any:
+        """比较影子节点与当前值，输出差异并返回更新后的影子节点"""
+        # 同一个不可变对象，必然未变化
+        if prev is curr:
+            return prev
+
+        if isinstance(curr, dict) and isinstance(prev, dict):
+            self._diff_dict(prev, curr, parent_keys, changes)
+            return prev
+
+        if isinstance(curr, list) and isinstance(prev, list):
+            self._diff_list(prev, curr, parent_keys, changes)
+            return prev
+
+        if isinstance(curr, str) and isinstance(prev, str):
+            # 相等比较会先比较长度；startswith 需要逐字符比较前缀，代价与前缀长度成正比（memcmp，常数很小）
+            if curr == prev:
+                return curr
+            if curr.startswith(prev):
+                self._emit(changes, parent_keys, curr[len(prev) :], "append")
+            else:
+                self._emit(changes, parent_keys, curr, "upsert")
+            return curr
+
+        if curr == prev:
+            return prev
+
+        self._emit(changes, parent_keys, curr, "upsert")
+        return _snapshot(curr)
+
+    def _diff_dict(
+        self,
+        prev: Dict[Any, Any],
+        curr: Dict[Any, Any],
+        parent_keys: List[Any],
+        changes: List[Dict[str, Any]],
+    ) -> None:
+        # 处理新增的键
+        common_keys = []
+        for key, value in curr.items():
+            if key in prev:
+                common_keys.append(key)
+                continue
+            self._emit(changes, parent_keys + [key], value, "upsert")
+            prev[key] = _snapshot(value)
+
+        # 处理删除的键
+        if len(prev) > len(curr):
+            for key in [key for key in prev if key not in curr]:
+                self._emit(changes, parent_keys + [key], None, "remove")
+                del prev[key]
+
+        # 处理共有的键
+        for key in common_keys:
+            prev[key] = self._diff_value(
+                prev[key], curr[key], parent_keys + [key], changes
+            )
+
+    def _diff_list(
+        self,
+        prev: List[Any],
+        curr: List[Any],
+        parent_keys: List[Any],
+        changes: List[Dict[str, Any]],
+    ) -> None:
+        curr_len = len(curr)
+        prev_len = len(prev)
+
+        # 处理交集部分的变化（列表元素整体 upsert，与 compare_values 保持一致）
+        # 影子树与当前值共享叶子引用，未变化元素的比较只需身份检查
+        for i in range(min(curr_len, prev_len)):
+            if curr[i] != prev[i]:
+                self._emit(changes, parent_keys + [i], curr[i], "upsert")
+                prev[i] = _snapshot(curr[i])
+
+        # 处理新增的元素
+        if curr_len > prev_len:
+            for i in range(prev_len, curr_len):
+                self._emit(changes, parent_keys + [i], curr[i], "append")
+                prev.append(_snapshot(curr[i]))
+        # 处理删除的元素
+        elif curr_len < prev_len:
+            for i in range(curr_len, prev_len):
+                self._emit(changes, parent_keys + [i], None, "remove")
+            del prev[curr_len:]
+
+
+def _snapshot(value: Any) -> Any:
+    """为值建立影子节点：复制容器结构，叶子节点仅保存引用"""
+    if isinstance(value, dict):
+        return {key: _snapshot(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_snapshot(item) for item in value]
+    return value
+
+
 async def incremental_async_generator(
     full_json_gen: AsyncGenerator[Dict[str, Any], None],
 ) -> AsyncGenerator[Dict[str, Any], None]:
@@ -14,44 +184,14 @@ async def incremental_async_generator(
     Yields:
         Dict[str, Any]: 包含seq_id, key, content, action的增量更新字典
     """
-    previous_json = None
-    seq_id = 0
+    differ = IncrementalJsonDiffer()
 
     async for current_json in full_json_gen:
-        if previous_json is None:
-            if not isinstance(current_json, dict):
-                yield {
-                    "seq_id": seq_id,
-                    "key": [],
-                    "content": current_json,
-                    "action": "upsert",
-                }
-                seq_id += 1
-            else:
-                # 第一次处理，直接返回完整JSON
-                for key, value in current_json.items():
-                    yield {
-                        "seq_id": seq_id,
-                        "key": [key],
-                        "content": value,
-                        "action": "upsert",
-                    }
-                    seq_id += 1
-            # 使用序列化/反序列化代替深拷贝
-            previous_json = json.loads(json.dumps(current_json))
-            continue
-
-        # 比较当前JSON与之前JSON的差异
-        changes = find_differences(previous_json, current_json, seq_id)
-        for change in changes:
+        for change in differ.diff(current_json):
             yield change
-            seq_id += 1
-
-        # 更新previous_json
-        previous_json = json.loads(json.dumps(current_json))
 
     # 标记结束
-    yield {"seq_id": seq_id, "key": [], "content": None, "action": "end"}
+    yield differ.end()
 
 
 def compare_values(
@@ -8,6 +8,10 @@ from app.utils.observability.observability_log import (
     init_log_provider,
     shutdown_log_provider,
 )
+from app.utils.observability.observability_metric import (
+    init_meter_provider,
+    shutdown_meter_provider,
+)
 from app.utils.observability.observability_trace import init_trace_provider
 
 
@@ -18,8 +22,10 @@ def init_observability(server_info: ServerInfo, setting: ObservabilitySetting):
 
     if setting.trace.trace_enabled:
         init_trace_provider(server_info, setting.trace)
+        init_meter_provider(server_info, setting.trace)
 
 
 def shutdown_observability() -> None:
     """关闭可观测性组件"""
     shutdown_log_provider()
+    shutdown_meter_provider()
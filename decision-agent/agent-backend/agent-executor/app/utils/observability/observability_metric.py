@@ -0,0 +1,248 @@
+# -*- coding:utf-8 -*-
+
+"""Python 实现的可观测性指标模块。
+
+指标通过 OpenTelemetry Metrics API 记录。启用追踪时 init_meter_provider 设置 MeterProvider，
+指标定期通过 OTLP（与追踪相同的 endpoint，路径 /v1/metrics）导出；未设置时为空实现，记录开销可忽略。
+
+同时在进程内保留一份指标快照（get_metric_snapshot），便于调试和单元测试读取。
+"""
+
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from opentelemetry import metrics
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+from opentelemetry.sdk.resources import Resource
+
+from app.utils.observability.observability_setting import ServerInfo, TraceSetting
+
+_METER_NAME = "agent-executor"
+_EXPORT_INTERVAL_MILLIS = 15000
+
+_meter_provider: Optional[MeterProvider] = None
+
+_instruments: Dict[Tuple[str, str], Any] = {}
+_snapshot: Dict[str, Dict[Tuple[Tuple[str, Any], ...], Any]] = {}
+_lock = threading.Lock()
+
+
+def _get_instrument(kind: str, name: str, unit: str, description: str) -> Any:
+    key = (kind, name)
+    instrument = _instruments.get(key)
+    if instrument is not None:
+        return instrument
+
+    with _lock:
+        instrument = _instruments.get(key)
+        if instrument is None:
+            meter = metrics.get_meter(_METER_NAME)
+            if kind == "counter":
+                instrument = meter.create_counter(
+                    name, unit=unit, description=description
+                )
+            elif kind == "up_down_counter":
+                instrument = meter.create_up_down_counter(
+                    name, unit=unit, description=description
+                )
+            else:
+                instrument = meter.create_histogram(
+                    name, unit=unit, description=description
+                )
+            _instruments[key] = instrument
+    return instrument
+
+
+def _attributes_key(
+    attributes: Optional[Dict[str, Any]],
+) -> Tuple[Tuple[str, Any], ...]:
+    if not attributes:
+        return ()
+    return tuple(sorted(attributes.items()))
+
+
+def counter_add(
+    name: str,
+    value: int = 1,
+    attributes: Optional[Dict[str, Any]] = None,
+    unit: str = "1",
+    description: str = "",
+) -> None:
+    """单调递增计数器
+
+    Args:
+        name: 指标名称
+        value: 增加值
+        attributes: 指标属性
+        unit: 单位
+        description: 描述
+    """
+    _get_instrument("counter", name, unit, description).add(value, attributes)
+
+    attributes_key = _attributes_key(attributes)
+    with _lock:
+        values = _snapshot.setdefault(name, {})
+        values[attributes_key] = values.get(attributes_key, 0) + value
+
+
+def up_down_counter_add(
+    name: str,
+    value: int,
+    attributes: Optional[Dict[str, Any]] = None,
+    unit: str = "1",
+    description: str = "",
+) -> None:
+    """可增可减计数器（如队列深度、在用连接数）
+
+    Args:
+        name: 指标名称
+        value: 变化值，可为负数
+        attributes: 指标属性
+        unit: 单位
+        description: 描述
+    """
+    _get_instrument("up_down_counter", name, unit, description).add(value, attributes)
+
+    attributes_key = _attributes_key(attributes)
+    with _lock:
+        values = _snapshot.setdefault(name, {})
+        values[attributes_key] = values.get(attributes_key, 0) + value
+
+
+def histogram_record(
+    name: str,
+    value: float,
+    attributes: Optional[Dict[str, Any]] = None,
+    unit: str = "ms",
+    description: str = "",
+) -> None:
+    """直方图（如耗时分布）
+
+    Args:
+        name: 指标名称
+        value: 记录值
+        attributes: 指标属性
+        unit: 单位
+        description: 描述
+    """
+    _get_instrument("histogram", name, unit, description).record(value, attributes)
+
+    attributes_key = _attributes_key(attributes)
+    with _lock:
+        values = _snapshot.setdefault(name, {})
+        stat = values.get(attributes_key)
+        if stat is None:
+            stat = values[attributes_key] = {"count": 0, "sum": 0.0, "max": value}
+        stat["count"] += 1
+        stat["sum"] += value
+        stat["max"] = max(stat["max"], value)
+
+
+def get_metric_value(name: str, attributes: Optional[Dict[str, Any]] = None) -> Any:
+    """读取进程内指标值
+
+    Args:
+        name: 指标名称
+        attributes: 指标属性
+
+    Returns:
+        计数器返回数值，直方图返回 {"count", "sum", "max"}，不存在时返回 None
+    """
+    with _lock:
+        return _snapshot.get(name, {}).get(_attributes_key(attributes))
+
+
+def get_metric_snapshot() -> Dict[str, Dict[str, Any]]:
+    """获取进程内全部指标快照
+
+    Returns:
+        {指标名称: {属性字符串: 值}}
+    """
+    with _lock:
+        return {
+            name: {
+                ",".join(f"{k}={v}" for k, v in attributes_key): (
+                    dict(value) if isinstance(value, dict) else value
+                )
+                for attributes_key, value in values.items()
+            }
+            for name, values in _snapshot.items()
+        }
+
+
+def reset_metric_snapshot() -> None:
+    """清空进程内指标快照（仅用于测试）"""
+    with _lock:
+        _snapshot.clear()
+
+
+def init_meter_provider(server_info: ServerInfo, setting: TraceSetting) -> None:
+    """初始化指标导出器
+
+    Args:
+        server_info: 服务器信息
+        setting: 追踪配置设置（指标与追踪共用 OTLP endpoint）
+    """
+    global _meter_provider
+
+    from app.common.stand_log import StandLogger
+
+    try:
+        otlp_endpoint = setting.otlp_endpoint.strip()
+        if not otlp_endpoint:
+            StandLogger.warn(
+                "[OTel] ❌ OTLP endpoint is empty, metrics will not be exported"
+            )
+            return
+
+        from opentelemetry.exporter.otlp.proto.http.metric_exporter import (
+            OTLPMetricExporter,
+        )
+
+        if not otlp_endpoint.startswith("http://") and not otlp_endpoint.startswith(
+            "https://"
+        ):
+            otlp_endpoint = f"http://{otlp_endpoint}"
+        otlp_endpoint = otlp_endpoint.rstrip("/")
+        if otlp_endpoint.endswith("/v1/traces"):
+            otlp_endpoint = otlp_endpoint[: -len("/v1/traces")]
+        if not otlp_endpoint.endswith("/v1/metrics"):
+            otlp_endpoint = f"{otlp_endpoint}/v1/metrics"
+
+        resource_attributes = {
+            "service.name": server_info.server_name,
+            "service.version": server_info.server_version,
+        }
+        if setting.environment:
+            resource_attributes["deployment.environment"] = setting.environment
+        pod_name = os.getenv("POD_NAME")
+        if pod_name:
+            resource_attributes["pod.name"] = pod_name
+
+        reader = PeriodicExportingMetricReader(
+            OTLPMetricExporter(endpoint=otlp_endpoint),
+            export_interval_millis=_EXPORT_INTERVAL_MILLIS,
+        )
+        _meter_provider = MeterProvider(
+            resource=Resource.create(resource_attributes), metric_readers=[reader]
+        )
+        # 已创建的指标（通过全局代理 Meter）在设置后自动转发到该 MeterProvider
+        metrics.set_meter_provider(_meter_provider)
+
+    except Exception as e:
+        StandLogger.error(
+            f"[OTel] ❌ Error initializing meter provider: {type(e).__name__}: {e}"
+        )
+
+
+def shutdown_meter_provider() -> None:
+    """导出剩余指标并关闭 MeterProvider"""
+    global _meter_provider
+    if _meter_provider is None:
+        return
+    try:
+        _meter_provider.shutdown()
+    finally:
+        _meter_provider = None
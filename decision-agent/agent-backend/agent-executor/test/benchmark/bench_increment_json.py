@@ -0,0 +1,81 @@
+"""增量 JSON 输出性能基准
+
+对比旧实现（每个 chunk 深拷贝 + 全树比较）与 IncrementalJsonDiffer 在长回答上的 CPU 开销。
+模拟 Dolphin 输出：同一个 JSON 对象被原地修改，answer 文本逐 token 增长，progress 列表偶尔追加。
+
+运行方式（在 agent-executor 目录下）：
+    python -m test.benchmark.bench_increment_json
+    python -m test.benchmark.bench_increment_json --tokens 10000 100000 --legacy-max 20000
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Iterator
+
+from app.utils.increment_json import IncrementalJsonDiffer, find_differences
+
+
+def transcript(tokens: int) -> Iterator[Any]:
+    """生成模拟的 Dolphin 输出序列（同一个对象被原地修改）"""
+    output = {
+        "answer": {"answer": "", "think": ""},
+        "progress": [],
+        "status": "running",
+    }
+    for i in range(tokens):
+        if i % 1000 == 0:
+            output["progress"].append({"stage": "llm", "index": i, "answer": ""})
+        output["answer"]["answer"] += f"tok{i % 10} "
+        output["progress"][-1]["answer"] += "x"
+        yield output
+    output["status"] = "completed"
+    yield output
+
+
+def run_legacy(tokens: int) -> float:
+    """旧实现：每个 chunk 深拷贝并对整棵树求差异，返回累计耗时（秒）"""
+    previous = None
+    elapsed = 0.0
+    for current in transcript(tokens):
+        start = time.perf_counter()
+        if previous is not None:
+            find_differences(previous, current, 0)
+        previous = json.loads(json.dumps(current))
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def run_differ(tokens: int) -> float:
+    """IncrementalJsonDiffer，返回累计耗时（秒）"""
+    differ = IncrementalJsonDiffer()
+    elapsed = 0.0
+    for current in transcript(tokens):
+        start = time.perf_counter()
+        differ.diff(current)
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tokens", type=int, nargs="+", default=[10000, 50000, 100000])
+    parser.add_argument(
+        "--legacy-max",
+        type=int,
+        default=20000,
+        help="旧实现为 O(n²)，超过该 token 数时跳过",
+    )
+    args = parser.parse_args()
+
+    # 只统计差异计算本身的耗时，不含模拟生产者拼接字符串的开销
+    print(f"{'tokens':>8} {'legacy(s)':>10} {'differ(s)':>10} {'us/token':>9}")
+    for tokens in args.tokens:
+        legacy = run_legacy(tokens) if tokens <= args.legacy_max else None
+        differ = run_differ(tokens)
+        legacy_text = f"{legacy:10.2f}" if legacy is not None else f"{'skipped':>10}"
+        print(f"{tokens:>8} {legacy_text} {differ:10.2f} {differ / tokens * 1e6:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
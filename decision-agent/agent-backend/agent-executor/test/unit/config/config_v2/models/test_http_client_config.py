@@ -0,0 +1,49 @@
+"""单元测试 - config/config_v2/models/http_client_config 模块"""
+
+
+class TestHttpClientConfig:
+    """测试 HttpClientConfig 数据类"""
+
+    def test_default_values(self):
+        """测试默认值"""
+        from app.config.config_v2.models.http_client_config import HttpClientConfig
+
+        config = HttpClientConfig()
+
+        assert config.limit == 100
+        assert config.limit_per_host == 0
+        assert config.ttl_dns_cache == 300
+        assert config.upstreams == {}
+
+    def test_from_dict(self):
+        """测试从字典创建"""
+        from app.config.config_v2.models.http_client_config import HttpClientConfig
+
+        config = HttpClientConfig.from_dict(
+            {
+                "limit": "50",
+                "connect_timeout": 5,
+                "upstreams": {"mf_model_api": {"limit": 200}},
+            }
+        )
+
+        assert config.limit == 50
+        assert config.connect_timeout == 5.0
+        assert config.timeout == 300.0
+        assert config.upstreams == {"mf_model_api": {"limit": 200}}
+
+    def test_get_upstream_options(self):
+        """测试按上游合并覆盖配置"""
+        from app.config.config_v2.models.http_client_config import HttpClientConfig
+
+        config = HttpClientConfig(
+            limit=100,
+            timeout=300.0,
+            upstreams={"mf_model_api": {"limit": "200", "unknown": 1}},
+        )
+
+        options = config.get_upstream_options("mf_model_api")
+        assert options["limit"] == 200
+        assert options["timeout"] == 300.0
+        assert "unknown" not in options
+        assert config.get_upstream_options("agent_factory")["limit"] == 100
@@ -99,3 +99,24 @@ class TestMemoryConfig:
 
         config = MemoryConfig(limit=0)
         assert config.limit == 0
+
+    def test_build_queue_from_dict(self):
+        """测试记忆构建队列配置"""
+        from app.config.config_v2.models.memory_config import MemoryConfig
+
+        default_config = MemoryConfig.from_dict({})
+        assert default_config.build_workers == 4
+        assert default_config.build_overflow_policy == "drop_oldest"
+
+        config = MemoryConfig.from_dict(
+            {
+                "build_queue_size": "10",
+                "build_coalesce_window": 2,
+                "build_overflow_policy": "spill",
+                "build_spill_dir": "/tmp/spill",
+            }
+        )
+        assert config.build_queue_size == 10
+        assert config.build_coalesce_window == 2.0
+        assert config.build_overflow_policy == "spill"
+        assert config.build_spill_dir == "/tmp/spill"
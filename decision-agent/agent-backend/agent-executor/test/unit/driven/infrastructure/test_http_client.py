@@ -0,0 +1,114 @@
+"""单元测试 - driven/infrastructure/http_client 模块"""
+
+import pytest
+from aiohttp import web
+
+from app.config.config_v2.models.http_client_config import HttpClientConfig
+from app.driven.infrastructure.http_client import HttpClientRegistry
+from app.utils.observability.observability_metric import get_metric_value
+
+
+@pytest.fixture
+async def server_url():
+    """启动本地HTTP服务"""
+
+    async def handle(request):
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/ping", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}/ping"
+    await runner.cleanup()
+
+
+class TestHttpClientRegistry:
+    """测试 HttpClientRegistry 类"""
+
+    @pytest.mark.asyncio
+    async def test_connection_reused_across_sessions(self, server_url):
+        """测试不同session共用同一上游的连接池，复用keep-alive连接"""
+        registry = HttpClientRegistry(HttpClientConfig())
+        attributes = {"upstream": "test_reuse"}
+        created_before = (
+            get_metric_value(
+                "agent_executor.http_client.connection.created", attributes
+            )
+            or 0
+        )
+
+        for _ in range(3):
+            async with registry.session("test_reuse") as session:
+                async with session.get(server_url) as response:
+                    assert await response.json() == {"ok": True}
+
+        connector = registry.get_connector("test_reuse")
+        # 关闭session不会关闭共享连接池
+        assert not connector.closed
+        assert (
+            get_metric_value(
+                "agent_executor.http_client.connection.created", attributes
+            )
+            == created_before + 1
+        )
+        assert get_metric_value(
+            "agent_executor.http_client.connection.reused", attributes
+        )
+        duration = get_metric_value(
+            "agent_executor.http_client.request.duration",
+            {**attributes, "status": 200},
+        )
+        assert duration["count"] >= 3
+        assert (
+            get_metric_value("agent_executor.http_client.request.in_flight", attributes)
+            == 0
+        )
+
+        await registry.close()
+        assert connector.closed
+
+    @pytest.mark.asyncio
+    async def test_connector_per_upstream(self):
+        """测试每个上游使用独立连接池，并应用上游覆盖配置"""
+        registry = HttpClientRegistry(
+            HttpClientConfig(limit=100, upstreams={"model": {"limit": 7}})
+        )
+
+        default_connector = registry.get_connector("factory")
+        model_connector = registry.get_connector("model")
+
+        assert default_connector is not model_connector
+        assert registry.get_connector("factory") is default_connector
+        assert default_connector.limit == 100
+        assert model_connector.limit == 7
+        assert registry.stats()["model"]["limit"] == 7
+
+        await registry.close()
+        assert registry.stats() == {}
+
+    @pytest.mark.asyncio
+    async def test_recreate_after_close(self):
+        """测试连接池关闭后再次使用时重新创建"""
+        registry = HttpClientRegistry(HttpClientConfig())
+        connector = registry.get_connector("factory")
+        await registry.close()
+
+        new_connector = registry.get_connector("factory")
+        assert new_connector is not connector
+        assert not new_connector.closed
+        await registry.close()
+
+    @pytest.mark.asyncio
+    async def test_session_default_timeout(self):
+        """测试未指定超时时使用上游配置的超时"""
+        registry = HttpClientRegistry(HttpClientConfig(timeout=60, connect_timeout=3))
+
+        async with registry.session("factory") as session:
+            assert session.timeout.total == 60
+            assert session.timeout.sock_connect == 3
+
+        await registry.close()
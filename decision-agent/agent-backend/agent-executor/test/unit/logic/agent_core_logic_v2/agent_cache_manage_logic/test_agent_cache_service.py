@@ -8,6 +8,17 @@ from unittest.mock import AsyncMock, MagicMock, patch
 class TestAgentCacheService:
     """测试 AgentCacheService 类"""
 
+    @pytest.fixture(autouse=True)
+    def clear_local_cache(self):
+        """每个用例前后清空进程级L1缓存，避免用例间互相影响"""
+        from app.logic.agent_core_logic_v2.agent_cache_manage_logic.local_cache import (
+            local_agent_cache,
+        )
+
+        local_agent_cache.clear()
+        yield
+        local_agent_cache.clear()
+
     @pytest.fixture
     def mock_redis_cache(self):
         """创建 mock RedisCache"""
@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""单元测试 - agent_cache_manage_logic/local_cache 和 invalidation 模块"""
+
+import asyncio
+import json
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.domain.entity.agent_cache import AgentCacheEntity
+from app.domain.vo.agent_cache import AgentCacheIdVO, CacheDataVo
+from app.logic.agent_core_logic_v2.agent_cache_manage_logic.invalidation import (
+    INSTANCE_ID,
+    AgentCacheInvalidationListener,
+    build_invalidation_message,
+)
+from app.logic.agent_core_logic_v2.agent_cache_manage_logic.local_cache import (
+    LocalAgentCache,
+    SingleFlight,
+)
+from app.utils.observability.observability_metric import get_metric_value
+
+
+def make_entity(agent_id: str = "agent") -> AgentCacheEntity:
+    cache_data = CacheDataVo()
+    cache_data.tools_info_dict["tool"] = {"name": "tool"}
+    return AgentCacheEntity(
+        cache_id_vo=AgentCacheIdVO(
+            account_id="account",
+            account_type="user",
+            agent_id=agent_id,
+            agent_version="v1",
+            agent_config_version_flag="1",
+        ),
+        agent_id=agent_id,
+        agent_version="v1",
+        cache_data=cache_data,
+        cache_data_last_set_timestamp=0,
+        created_at=datetime.now(),
+    )
+
+
+class TestLocalAgentCache:
+    """测试 LocalAgentCache 类"""
+
+    def test_get_returns_copy(self):
+        """测试取出的是拷贝，修改不影响缓存"""
+        cache = LocalAgentCache(max_size=10, ttl=60)
+        cache.put("k", make_entity())
+
+        first = cache.get("k")
+        first.cache_data.tools_info_dict["other"] = {}
+
+        second = cache.get("k")
+        assert "other" not in second.cache_data.tools_info_dict
+        assert second.cache_data.tools_info_dict["tool"] == {"name": "tool"}
+
+    def test_miss(self):
+        """测试未命中"""
+        cache = LocalAgentCache(max_size=10, ttl=60)
+        assert cache.get("missing") is None
+
+    def test_lru_eviction(self):
+        """测试超过容量时淘汰最久未使用的条目"""
+        cache = LocalAgentCache(max_size=2, ttl=60)
+        eviction_before = (
+            get_metric_value(
+                "agent_executor.agent_cache.l1.eviction", {"reason": "capacity"}
+            )
+            or 0
+        )
+
+        cache.put("a", make_entity("a"))
+        cache.put("b", make_entity("b"))
+        assert cache.get("a") is not None
+        cache.put("c", make_entity("c"))
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert (
+            get_metric_value(
+                "agent_executor.agent_cache.l1.eviction", {"reason": "capacity"}
+            )
+            == eviction_before + 1
+        )
+
+    def test_ttl_expire(self):
+        """测试条目过期"""
+        cache = LocalAgentCache(max_size=10, ttl=5)
+        with patch(
+            "app.logic.agent_core_logic_v2.agent_cache_manage_logic.local_cache.time.monotonic",
+            return_value=100.0,
+        ):
+            cache.put("k", make_entity())
+        with patch(
+            "app.logic.agent_core_logic_v2.agent_cache_manage_logic.local_cache.time.monotonic",
+            return_value=106.0,
+        ):
+            assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_disabled(self):
+        """测试容量为0时不缓存"""
+        cache = LocalAgentCache(max_size=0, ttl=60)
+        cache.put("k", make_entity())
+        assert cache.get("k") is None
+
+    def test_invalidate(self):
+        """测试删除指定条目"""
+        cache = LocalAgentCache(max_size=10, ttl=60)
+        cache.put("k", make_entity())
+        assert cache.invalidate("k") is True
+        assert cache.invalidate("k") is False
+        assert cache.get("k") is None
+
+
+class TestSingleFlight:
+    """测试 SingleFlight 类"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_result(self):
+        """测试并发调用只执行一次"""
+        single_flight = SingleFlight()
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"value": 1}
+
+        results = await asyncio.gather(
+            *[single_flight.do("k", load, share=dict) for _ in range(5)]
+        )
+
+        assert calls == 1
+        assert all(result == {"value": 1} for result in results)
+        # 等待者拿到的是拷贝
+        assert len({id(result) for result in results}) == 5
+
+    @pytest.mark.asyncio
+    async def test_exception_propagates_to_waiters(self):
+        """测试异常传递给所有等待者，且之后可以重新调用"""
+        single_flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            single_flight.do("k", fail),
+            single_flight.do("k", fail),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+
+        async def ok():
+            return 2
+
+        assert await single_flight.do("k", ok) == 2
+
+    @pytest.mark.asyncio
+    async def test_leader_cancelled_waiter_takes_over(self):
+        """测试执行者被取消时等待者不被取消，而是重新执行"""
+        single_flight = SingleFlight()
+        started = asyncio.Event()
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            started.set()
+            await asyncio.sleep(0.05)
+            return calls
+
+        leader = asyncio.create_task(single_flight.do("k", load))
+        await started.wait()
+        waiter = asyncio.create_task(single_flight.do("k", load))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+
+        assert await waiter == 2
+        assert leader.cancelled()
+        assert calls == 2
+
+
+class TestAgentCacheInvalidationListener:
+    """测试 AgentCacheInvalidationListener 类"""
+
+    def test_handle_message_from_other_instance(self):
+        """测试收到其他副本的失效消息时删除L1缓存"""
+        cache = LocalAgentCache(max_size=10, ttl=60)
+        cache.put("k", make_entity())
+        listener = AgentCacheInvalidationListener(local_cache=cache)
+
+        listener.handle_message(json.dumps({"key": "k", "source": "other"}))
+
+        assert cache.get("k") is None
+
+    def test_ignore_own_message(self):
+        """测试忽略自己发出的失效消息"""
+        cache = LocalAgentCache(max_size=10, ttl=60)
+        cache.put("k", make_entity())
+        listener = AgentCacheInvalidationListener(local_cache=cache)
+
+        listener.handle_message(build_invalidation_message("k"))
+
+        assert cache.get("k") is not None
+        assert json.loads(build_invalidation_message("k"))["source"] == INSTANCE_ID
+
+    def test_ignore_invalid_message(self):
+        """测试忽略无法解析的消息"""
+        listener = AgentCacheInvalidationListener(
+            local_cache=LocalAgentCache(max_size=10, ttl=60)
+        )
+        listener.handle_message(b"not json")
+
+
+class TestAgentCacheServiceWithLocalCache:
+    """测试 AgentCacheService 的L1缓存行为"""
+
+    @pytest.mark.asyncio
+    async def test_load_hits_local_cache(self):
+        """测试第二次加载命中L1，不再访问Redis"""
+        mock_redis_cache = AsyncMock()
+        mock_redis_cache.get.return_value = make_entity()
+
+        with patch(
+            "app.logic.agent_core_logic_v2.agent_cache_manage_logic.agent_cache_service.RedisCache",
+            return_value=mock_redis_cache,
+        ):
+            from app.logic.agent_core_logic_v2.agent_cache_manage_logic.agent_cache_service import (
+                AgentCacheService,
+            )
+
+            service = AgentCacheService(
+                local_cache=LocalAgentCache(max_size=10, ttl=60),
+                single_flight=SingleFlight(),
+            )
+            cache_id_vo = make_entity().cache_id_vo
+
+            first = await service.load(cache_id_vo)
+            second = await service.load(cache_id_vo)
+
+            assert first is not None
+            assert second is not None
+            assert mock_redis_cache.get.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_load_single_redis_call(self):
+        """测试并发未命中只访问一次Redis"""
+        mock_redis_cache = AsyncMock()
+
+        async def slow_get(key):
+            await asyncio.sleep(0.01)
+            return make_entity()
+
+        mock_redis_cache.get.side_effect = slow_get
+
+        with patch(
+            "app.logic.agent_core_logic_v2.agent_cache_manage_logic.agent_cache_service.RedisCache",
+            return_value=mock_redis_cache,
+        ):
+            from app.logic.agent_core_logic_v2.agent_cache_manage_logic.agent_cache_service import (
+                AgentCacheService,
+            )
+
+            service = AgentCacheService(
+                local_cache=LocalAgentCache(max_size=10, ttl=60),
+                single_flight=SingleFlight(),
+            )
+            cache_id_vo = make_entity().cache_id_vo
+
+            results = await asyncio.gather(
+                *[service.load(cache_id_vo) for _ in range(10)]
+            )
+
+            assert all(result is not None for result in results)
+            assert mock_redis_cache.get.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_save_broadcasts_invalidation(self):
+        """测试保存时写入L1并广播失效消息"""
+        mock_redis_cache = AsyncMock()
+        mock_redis_cache.set.return_value = True
+
+        with patch(
+            "app.logic.agent_core_logic_v2.agent_cache_manage_logic.agent_cache_service.RedisCache",
+            return_value=mock_redis_cache,
+        ):
+            from app.logic.agent_core_logic_v2.agent_cache_manage_logic.agent_cache_service import (
+                AgentCacheService,
+            )
+
+            local_cache = LocalAgentCache(max_size=10, ttl=60)
+            service = AgentCacheService(local_cache=local_cache)
+            entity = make_entity()
+
+            assert await service.save(entity) is True
+
+            key = entity.cache_id_vo.to_redis_key()
+            assert local_cache.get(key) is not None
+            channel, message = mock_redis_cache.publish.await_args.args
+            assert channel == "agent_executor:agent_cache:invalidate"
+            assert json.loads(message)["key"] == key
@@ -115,6 +115,56 @@ class TestProcessSkillsAgents:
                                             headers={"x-user-id": "user123"},
                                         )
 
+    @pytest.mark.asyncio
+    async def test_process_skills_agents_concurrent(
+        self, mock_agent_core, mock_agent_config, mock_skills
+    ):
+        """测试并发获取agent信息：相同agent只获取一次，headers显式传入"""
+        agent_skills = []
+        for agent_key in ["agent_a", "agent_b", "agent_a"]:
+            skill = MagicMock()
+            skill.agent_key = agent_key
+            skill.inner_dto = MagicMock()
+            skill.data_source_config = None
+            skill.datasource_config = None
+            skill.llm_config = None
+            agent_skills.append(skill)
+        mock_skills.agents = agent_skills
+
+        async def get_agent_config_by_key(agent_key, request_headers=None):
+            return {"agent_key": agent_key}
+
+        with patch(
+            "app.logic.agent_core_logic_v2.input_handler_pkg.process_skill_pkg.agent_skills.agent_factory_service"
+        ) as mock_service:
+            mock_service.get_agent_config_by_key = AsyncMock(
+                side_effect=get_agent_config_by_key
+            )
+            from app.logic.agent_core_logic_v2.input_handler_pkg.process_skill_pkg.agent_skills import (
+                process_skills_agents,
+            )
+
+            await process_skills_agents(
+                mock_agent_core,
+                mock_agent_config,
+                mock_skills,
+                temp_files={},
+                headers={"x-account-id": "user123", "x-account-type": "user"},
+            )
+
+        assert mock_service.get_agent_config_by_key.await_count == 2
+        mock_service.set_headers.assert_not_called()
+        request_headers = mock_service.get_agent_config_by_key.await_args.kwargs[
+            "request_headers"
+        ]
+        assert request_headers["x-account-id"] == "user123"
+        assert [skill.inner_dto.agent_info for skill in agent_skills] == [
+            {"agent_key": "agent_a"},
+            {"agent_key": "agent_b"},
+            {"agent_key": "agent_a"},
+        ]
+        assert mock_agent_core.cache_handler.set_skill_agent_info_dict.call_count == 2
+
     @pytest.mark.asyncio
     async def test_process_skills_agents_with_cached_info(
         self, mock_agent_core, mock_agent_config, mock_skills, mock_agent_skill
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 """单元测试 - process_skill_pkg/tool_skills 模块"""
 
+import asyncio
+
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
 
@@ -268,3 +270,67 @@ class TestProcessSkillsTools:
 
         assert len(mock_skills.tools) == 1
         assert mock_skills.tools[0].tool_id == "tool-available"
+
+    @pytest.mark.asyncio
+    async def test_process_skills_tools_concurrent(self, mock_agent_core, mock_skills):
+        """测试并发获取tool信息：有并发上限、相同工具只获取一次、保持原有顺序"""
+
+        class MockTool:
+            def __init__(self, tool_id):
+                self.tool_id = tool_id
+                self.tool_box_id = "toolbox123"
+
+        mock_skills.tools = [MockTool(f"tool{i}") for i in range(6)] + [
+            MockTool("tool0")
+        ]
+
+        running = 0
+        max_running = 0
+
+        async def get_tool_info(tool_box_id, tool_id, request_headers=None):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"name": tool_id, "use_rule": f"rule-{tool_id}"}
+
+        with patch(
+            "app.logic.agent_core_logic_v2.input_handler_pkg.process_skill_pkg.tool_skills.agent_operator_integration_service"
+        ) as mock_service:
+            mock_service.get_tool_info = AsyncMock(side_effect=get_tool_info)
+
+            with patch(
+                "app.logic.agent_core_logic_v2.input_handler_pkg.process_skill_pkg.tool_skills.SKILL_RESOLVE_CONCURRENCY",
+                2,
+            ):
+                from app.logic.agent_core_logic_v2.input_handler_pkg.process_skill_pkg.tool_skills import (
+                    process_skills_tools,
+                )
+
+                context_variables = {"self_config": {}}
+                await process_skills_tools(
+                    mock_agent_core,
+                    context_variables=context_variables,
+                    headers={"x-account-id": "user123", "x-account-type": "user"},
+                    skills=mock_skills,
+                )
+
+        assert mock_service.get_tool_info.await_count == 6
+        assert max_running == 2
+        # headers显式传入，不再修改共享单例
+        mock_service.set_headers.assert_not_called()
+        request_headers = mock_service.get_tool_info.await_args.kwargs[
+            "request_headers"
+        ]
+        assert request_headers["x-account-id"] == "user123"
+        assert [tool.tool_id for tool in mock_skills.tools] == [
+            "tool0",
+            "tool1",
+            "tool2",
+            "tool3",
+            "tool4",
+            "tool5",
+            "tool0",
+        ]
+        assert context_variables["self_config"]["tool_rules"]["tool3"] == "rule-tool3"
@@ -1,6 +1,6 @@
 """单元测试 - logic/agent_core_logic_v2/memory 模块"""
 
-from unittest.mock import Mock, patch, AsyncMock
+from unittest.mock import Mock, patch
 
 
 class TestMemoryHandler:
@@ -36,378 +36,111 @@ class TestMemoryHandler:
         # Mock final result
         self.mock_final_result = {"final_answer": "This is the answer"}
 
-    @patch("app.logic.agent_core_logic_v2.memory.threading.Thread")
-    @patch("app.logic.agent_core_logic_v2.memory.StandLogger")
-    def test_start_memory_build_thread_enabled(self, mock_logger, mock_thread_class):
-        """测试启动记忆构建线程 - 功能启用"""
+    @patch("app.logic.agent_core_logic_v2.memory.memory_build_queue")
+    def test_start_memory_build_enabled(self, mock_queue):
+        """测试提交记忆构建请求 - 功能启用"""
         handler = self.MemoryHandler()
 
-        mock_thread = Mock()
-        mock_thread_class.return_value = mock_thread
-
-        handler.start_memory_build_thread(
+        handler.start_memory_build(
             agent_config=self.mock_config,
             agent_input=self.mock_agent_input,
             headers=self.mock_headers,
             final_result=self.mock_final_result,
         )
 
-        # Verify thread was created and started
-        mock_thread_class.assert_called_once()
-        call_kwargs = mock_thread_class.call_args[1]
-        assert call_kwargs["daemon"] is True
-        assert call_kwargs["target"] == handler.build_memory
-
-        mock_thread.start.assert_called_once()
-        mock_logger.info.assert_called_once_with("记忆构建线程已启动")
-
-    @patch("app.logic.agent_core_logic_v2.memory.threading.Thread")
-    @patch("app.logic.agent_core_logic_v2.memory.StandLogger")
-    def test_start_memory_build_thread_disabled(self, mock_logger, mock_thread_class):
-        """测试启动记忆构建线程 - 功能未启用"""
+        mock_queue.submit.assert_called_once()
+        call_kwargs = mock_queue.submit.call_args[1]
+        assert call_kwargs["user_id"] == "user_123"
+        assert call_kwargs["agent_id"] == "test_agent_123"
+        assert call_kwargs["headers"]["x-account-id"] == "user_123"
+        assert call_kwargs["headers"]["x-account-type"] == "premium"
+        assert call_kwargs["messages"] == [
+            {
+                "role": "user",
+                "content": "query: test value\ncustom_field: test value\n",
+            },
+            {"role": "assistant", "content": "This is the answer"},
+        ]
+
+    @patch("app.logic.agent_core_logic_v2.memory.memory_build_queue")
+    def test_start_memory_build_disabled(self, mock_queue):
+        """测试提交记忆构建请求 - 功能未启用"""
         self.mock_config.memory = {"is_enabled": False}
         handler = self.MemoryHandler()
 
-        handler.start_memory_build_thread(
+        handler.start_memory_build(
             agent_config=self.mock_config,
             agent_input=self.mock_agent_input,
             headers=self.mock_headers,
             final_result=self.mock_final_result,
         )
 
-        # Verify thread was not created
-        mock_thread_class.assert_not_called()
+        mock_queue.submit.assert_not_called()
 
-    @patch("app.logic.agent_core_logic_v2.memory.threading.Thread")
-    @patch("app.logic.agent_core_logic_v2.memory.StandLogger")
-    def test_start_memory_build_thread_none_memory(
-        self, mock_logger, mock_thread_class
-    ):
-        """测试启动记忆构建线程 - memory为None"""
+    @patch("app.logic.agent_core_logic_v2.memory.memory_build_queue")
+    def test_start_memory_build_none_memory(self, mock_queue):
+        """测试提交记忆构建请求 - memory为None"""
         self.mock_config.memory = None
         handler = self.MemoryHandler()
 
-        handler.start_memory_build_thread(
+        handler.start_memory_build(
             agent_config=self.mock_config,
             agent_input=self.mock_agent_input,
             headers=self.mock_headers,
             final_result=self.mock_final_result,
         )
 
-        # Verify thread was not created
-        mock_thread_class.assert_not_called()
+        mock_queue.submit.assert_not_called()
 
-    @patch("app.logic.agent_core_logic_v2.memory.threading.Thread")
-    @patch("app.logic.agent_core_logic_v2.memory.asyncio.new_event_loop")
-    @patch("app.logic.agent_core_logic_v2.memory.asyncio.set_event_loop")
-    @patch("app.logic.agent_core_logic_v2.memory.agent_memory_service")
-    @patch("app.logic.agent_core_logic_v2.memory.StandLogger")
-    @patch("app.logic.agent_core_logic_v2.memory.get_user_account_id")
     @patch("app.logic.agent_core_logic_v2.memory.get_user_account_type")
-    def test_build_memory_success(
-        self,
-        mock_get_type,
-        mock_get_id,
-        mock_logger,
-        mock_memory_service,
-        mock_set_loop,
-        mock_new_loop,
-        mock_thread_class,
-    ):
-        """测试成功构建记忆"""
-        mock_get_id.return_value = "user_123"
-        mock_get_type.return_value = "premium"
-
-        # Mock the async build_memory method
-        mock_memory_service.build_memory = AsyncMock()
-
-        mock_loop = Mock()
-        mock_new_loop.return_value = mock_loop
-        mock_loop.run_until_complete = Mock()
-
-        handler = self.MemoryHandler()
-
-        handler.build_memory(
-            agent_config=self.mock_config,
-            agent_input=self.mock_agent_input,
-            headers=self.mock_headers,
-            final_result=self.mock_final_result,
-        )
-
-        # Verify event loop was created and used
-        mock_new_loop.assert_called_once()
-        mock_set_loop.assert_called_once_with(mock_loop)
-        mock_loop.run_until_complete.assert_called_once()
-        mock_loop.close.assert_called_once()
-
-        # Verify logger was called
-        mock_logger.info.assert_called()
-
-    @patch("app.logic.agent_core_logic_v2.memory.threading.Thread")
-    @patch("app.logic.agent_core_logic_v2.memory.get_user_account_id")
-    @patch("app.logic.agent_core_logic_v2.memory.get_user_account_type")
-    @patch("app.logic.agent_core_logic_v2.memory.agent_memory_service")
-    @patch("app.logic.agent_core_logic_v2.memory.StandLogger")
-    @patch("app.logic.agent_core_logic_v2.memory.asyncio")
-    def test_build_memory_no_fields(
-        self,
-        mock_asyncio,
-        mock_logger,
-        mock_memory_service,
-        mock_get_type,
-        mock_get_id,
-        mock_thread_class,
-    ):
-        """测试没有输入字段时构建记忆"""
-        # Create a new config with empty fields for this test
-        test_config = Mock()
-        test_config.agent_id = "test_agent_123"
-        test_config.agent_run_id = "run_789"
-        test_config.memory = {"is_enabled": True}
-        test_config.input = {"fields": []}
-        test_config.output = Mock()
-        test_config.output.get_final_answer_var = Mock(return_value="final_answer")
-
-        mock_get_id.return_value = "user_123"
-        mock_get_type.return_value = "premium"
-
-        # Mock the async build_memory method
-        mock_memory_service.build_memory = AsyncMock()
-
-        mock_loop = Mock()
-        mock_asyncio.new_event_loop.return_value = mock_loop
-
-        handler = self.MemoryHandler()
-
-        # Should not raise exception
-        handler.build_memory(
-            agent_config=test_config,
-            agent_input=self.mock_agent_input,
-            headers=self.mock_headers,
-            final_result=self.mock_final_result,
-        )
-
-    @patch("app.logic.agent_core_logic_v2.memory.threading.Thread")
-    @patch("app.logic.agent_core_logic_v2.memory.get_user_account_id")
-    @patch("app.logic.agent_core_logic_v2.memory.get_user_account_type")
-    @patch("app.logic.agent_core_logic_v2.memory.agent_memory_service")
-    @patch("app.logic.agent_core_logic_v2.memory.get_dolphin_var_final_value")
-    @patch("app.logic.agent_core_logic_v2.memory.StandLogger")
-    @patch("app.logic.agent_core_logic_v2.memory.asyncio")
-    def test_build_memory_final_result_error(
-        self,
-        mock_asyncio,
-        mock_logger,
-        mock_get_final_value,
-        mock_memory_service,
-        mock_get_type,
-        mock_get_id,
-        mock_thread_class,
-    ):
-        """测试获取最终结果失败时的处理"""
-        mock_get_id.return_value = "user_123"
-        mock_get_type.return_value = "premium"
-        mock_get_final_value.side_effect = Exception("Failed to get value")
-
-        # Mock the async build_memory method
-        mock_memory_service.build_memory = AsyncMock()
-
-        mock_loop = Mock()
-        mock_asyncio.new_event_loop.return_value = mock_loop
-
-        handler = self.MemoryHandler()
-
-        # Should handle error gracefully
-        handler.build_memory(
-            agent_config=self.mock_config,
-            agent_input=self.mock_agent_input,
-            headers=self.mock_headers,
-            final_result=self.mock_final_result,
-        )
-
-        # Verify error was logged
-        assert mock_logger.error.called
-
-    @patch("app.logic.agent_core_logic_v2.memory.threading.Thread")
-    @patch("app.logic.agent_core_logic_v2.memory.get_user_account_id")
-    @patch("app.logic.agent_core_logic_v2.memory.get_user_account_type")
-    @patch("app.logic.agent_core_logic_v2.memory.agent_memory_service")
-    @patch("app.logic.agent_core_logic_v2.memory.StandLogger")
-    @patch("app.logic.agent_core_logic_v2.memory.asyncio")
-    @patch("app.logic.agent_core_logic_v2.memory.o11y_logger")
-    def test_build_memory_exception(
-        self,
-        mock_o11y_logger,
-        mock_asyncio,
-        mock_logger,
-        mock_memory_service,
-        mock_get_type,
-        mock_get_id,
-        mock_thread_class,
-    ):
-        """测试构建记忆时的异常处理"""
-        mock_get_id.return_value = "user_123"
-        mock_get_type.return_value = "premium"
-
-        # Mock the async build_memory method
-        mock_memory_service.build_memory = AsyncMock()
-
-        # Make loop.run_until_complete raise exception
-        mock_loop = Mock()
-        mock_asyncio.new_event_loop.return_value = mock_loop
-        mock_loop.run_until_complete.side_effect = Exception("Build failed")
-
-        handler = self.MemoryHandler()
-
-        # Should handle exception gracefully
-        handler.build_memory(
-            agent_config=self.mock_config,
-            agent_input=self.mock_agent_input,
-            headers=self.mock_headers,
-            final_result=self.mock_final_result,
-        )
-
-        # Verify errors were logged
-        assert mock_logger.error.called
-
-    @patch("app.logic.agent_core_logic_v2.memory.threading.Thread")
     @patch("app.logic.agent_core_logic_v2.memory.get_user_account_id")
-    @patch("app.logic.agent_core_logic_v2.memory.get_user_account_type")
-    @patch("app.logic.agent_core_logic_v2.memory.agent_memory_service")
-    @patch("app.logic.agent_core_logic_v2.memory.StandLogger")
-    @patch("app.logic.agent_core_logic_v2.memory.asyncio")
-    def test_build_memory_with_unknown_user(
-        self,
-        mock_asyncio,
-        mock_logger,
-        mock_memory_service,
-        mock_get_type,
-        mock_get_id,
-        mock_thread_class,
+    @patch("app.logic.agent_core_logic_v2.memory.memory_build_queue")
+    def test_start_memory_build_with_unknown_user(
+        self, mock_queue, mock_get_id, mock_get_type
     ):
-        """测试未知用户ID时构建记忆"""
+        """测试未知用户ID时提交记忆构建请求"""
         mock_get_id.return_value = None
         mock_get_type.return_value = None
-
-        # Mock the async build_memory method
-        mock_memory_service.build_memory = AsyncMock()
-
-        mock_loop = Mock()
-        mock_asyncio.new_event_loop.return_value = mock_loop
-
         handler = self.MemoryHandler()
 
-        handler.build_memory(
+        handler.start_memory_build(
             agent_config=self.mock_config,
             agent_input=self.mock_agent_input,
-            headers={},  # Empty headers
+            headers={},
             final_result=self.mock_final_result,
         )
 
-        # Verify memory service was called with "unknown" user
-        mock_loop.run_until_complete.assert_called_once()
-        mock_memory_service.build_memory.assert_called_once()
-        call_kwargs = mock_memory_service.build_memory.call_args[1]
+        call_kwargs = mock_queue.submit.call_args[1]
         assert call_kwargs["user_id"] == "unknown"
 
-    @patch("app.logic.agent_core_logic_v2.memory.threading.Thread")
-    @patch("app.logic.agent_core_logic_v2.memory.get_user_account_id")
-    @patch("app.logic.agent_core_logic_v2.memory.get_user_account_type")
-    @patch("app.logic.agent_core_logic_v2.memory.agent_memory_service")
+    @patch("app.logic.agent_core_logic_v2.memory.o11y_logger")
     @patch("app.logic.agent_core_logic_v2.memory.StandLogger")
-    @patch("app.logic.agent_core_logic_v2.memory.asyncio")
-    def test_build_memory_empty_final_result(
-        self,
-        mock_asyncio,
-        mock_logger,
-        mock_memory_service,
-        mock_get_type,
-        mock_get_id,
-        mock_thread_class,
+    @patch("app.logic.agent_core_logic_v2.memory.memory_build_queue")
+    def test_start_memory_build_exception(
+        self, mock_queue, mock_logger, mock_o11y_logger
     ):
-        """测试空最终结果时构建记忆"""
-        mock_get_id.return_value = "user_123"
-        mock_get_type.return_value = "premium"
-
-        # Mock the async build_memory method
-        mock_memory_service.build_memory = AsyncMock()
-
-        mock_loop = Mock()
-        mock_asyncio.new_event_loop.return_value = mock_loop
-
+        """测试提交失败时不影响主流程"""
+        mock_queue.submit.side_effect = Exception("submit failed")
         handler = self.MemoryHandler()
 
-        handler.build_memory(
+        handler.start_memory_build(
             agent_config=self.mock_config,
             agent_input=self.mock_agent_input,
             headers=self.mock_headers,
-            final_result={},  # Empty final result
-        )
-
-        # Should still complete without error
-        mock_loop.close.assert_called_once()
-
-    @patch("app.logic.agent_core_logic_v2.memory.threading.Thread")
-    @patch("app.logic.agent_core_logic_v2.memory.get_user_account_id")
-    @patch("app.logic.agent_core_logic_v2.memory.get_user_account_type")
-    @patch("app.logic.agent_core_logic_v2.memory.agent_memory_service")
-    @patch("app.logic.agent_core_logic_v2.memory.StandLogger")
-    @patch("app.logic.agent_core_logic_v2.memory.asyncio")
-    def test_build_memory_file_field_skipped(
-        self,
-        mock_asyncio,
-        mock_logger,
-        mock_memory_service,
-        mock_get_type,
-        mock_get_id,
-        mock_thread_class,
-    ):
-        """测试文件类型字段被跳过"""
-        mock_get_id.return_value = "user_123"
-        mock_get_type.return_value = "premium"
-
-        # Mock the async build_memory method
-        mock_memory_service.build_memory = AsyncMock()
-
-        # Create a new config with file field
-        test_config = Mock()
-        test_config.agent_id = "test_agent_123"
-        test_config.agent_run_id = "run_789"
-        test_config.memory = {"is_enabled": True}
-        test_config.input = {
-            "fields": [
-                {"name": "query", "type": "string"},
-                {"name": "file_upload", "type": "file"},  # Should be skipped
-            ]
-        }
-        test_config.output = Mock()
-        test_config.output.get_final_answer_var = Mock(return_value="final_answer")
-
-        mock_loop = Mock()
-        mock_asyncio.new_event_loop.return_value = mock_loop
-
-        handler = self.MemoryHandler()
-
-        handler.build_memory(
-            agent_config=test_config,
-            agent_input=self.mock_agent_input,
-            headers=self.mock_headers,
             final_result=self.mock_final_result,
         )
 
-        # Should complete without error
-        mock_loop.close.assert_called_once()
+        assert mock_logger.error.called
 
-    @patch("app.logic.agent_core_logic_v2.memory.threading.Thread")
-    @patch("app.logic.agent_core_logic_v2.memory.StandLogger")
-    def test_start_memory_build_with_span(self, mock_logger, mock_thread_class):
-        """测试带span参数启动记忆构建线程"""
+    @patch("app.logic.agent_core_logic_v2.memory.memory_build_queue")
+    def test_start_memory_build_with_span(self, mock_queue):
+        """测试带span参数提交记忆构建请求"""
         mock_span = Mock()
         mock_span.is_recording = Mock(return_value=True)
 
         handler = self.MemoryHandler()
 
-        handler.start_memory_build_thread(
+        handler.start_memory_build(
             agent_config=self.mock_config,
             agent_input=self.mock_agent_input,
             headers=self.mock_headers,
@@ -415,138 +148,55 @@ class TestMemoryHandler:
             span=mock_span,
         )
 
-        # Verify thread was created
-        mock_thread_class.assert_called_once()
-
-    @patch("app.logic.agent_core_logic_v2.memory.threading.Thread")
-    @patch("app.logic.agent_core_logic_v2.memory.get_user_account_id")
-    @patch("app.logic.agent_core_logic_v2.memory.get_user_account_type")
-    @patch("app.logic.agent_core_logic_v2.memory.agent_memory_service")
-    @patch("app.logic.agent_core_logic_v2.memory.StandLogger")
-    @patch("app.logic.agent_core_logic_v2.memory.asyncio")
-    def test_build_memory_with_span(
-        self,
-        mock_asyncio,
-        mock_logger,
-        mock_memory_service,
-        mock_get_type,
-        mock_get_id,
-        mock_thread_class,
-    ):
-        """测试带span参数构建记忆"""
-        mock_span = Mock()
-        mock_span.is_recording = Mock(return_value=True)
-
-        mock_get_id.return_value = "user_123"
-        mock_get_type.return_value = "premium"
-
-        # Mock the async build_memory method
-        mock_memory_service.build_memory = AsyncMock()
-
-        mock_loop = Mock()
-        mock_asyncio.new_event_loop.return_value = mock_loop
+        mock_queue.submit.assert_called_once()
 
+    def test_build_messages_no_fields(self):
+        """测试没有输入字段时构建消息"""
+        self.mock_config.input = {"fields": []}
         handler = self.MemoryHandler()
 
-        handler.build_memory(
-            agent_config=self.mock_config,
-            agent_input=self.mock_agent_input,
-            headers=self.mock_headers,
-            final_result=self.mock_final_result,
-            span=mock_span,
+        messages = handler.build_messages(
+            self.mock_config, self.mock_agent_input, self.mock_final_result
         )
 
-        # Verify completion
-        mock_loop.close.assert_called_once()
+        assert messages[0] == {"role": "user", "content": ""}
 
-    @patch("app.logic.agent_core_logic_v2.memory.threading.Thread")
-    @patch("app.logic.agent_core_logic_v2.memory.get_user_account_id")
-    @patch("app.logic.agent_core_logic_v2.memory.get_user_account_type")
-    @patch("app.logic.agent_core_logic_v2.memory.agent_memory_service")
+    @patch("app.logic.agent_core_logic_v2.memory.get_dolphin_var_final_value")
     @patch("app.logic.agent_core_logic_v2.memory.StandLogger")
-    @patch("app.logic.agent_core_logic_v2.memory.asyncio")
-    @patch("app.logic.agent_core_logic_v2.memory.o11y_logger")
-    def test_build_memory_loop_close_always_called(
-        self,
-        mock_o11y_logger,
-        mock_asyncio,
-        mock_logger,
-        mock_memory_service,
-        mock_get_type,
-        mock_get_id,
-        mock_thread_class,
-    ):
-        """测试无论成功失败，event loop都会被关闭"""
-        mock_get_id.return_value = "user_123"
-        mock_get_type.return_value = "premium"
+    def test_build_messages_final_result_error(self, mock_logger, mock_get_final_value):
+        """测试获取最终结果失败时的处理"""
+        mock_get_final_value.side_effect = Exception("Failed to get value")
+        handler = self.MemoryHandler()
 
-        # Mock the async build_memory method
-        mock_memory_service.build_memory = AsyncMock()
+        messages = handler.build_messages(
+            self.mock_config, self.mock_agent_input, self.mock_final_result
+        )
 
-        mock_loop = Mock()
-        mock_asyncio.new_event_loop.return_value = mock_loop
-        mock_loop.run_until_complete.side_effect = Exception("Build failed")
+        assert mock_logger.error.called
+        assert len(messages) == 1
 
+    def test_build_messages_empty_final_result(self):
+        """测试空最终结果时只包含用户消息"""
         handler = self.MemoryHandler()
 
-        handler.build_memory(
-            agent_config=self.mock_config,
-            agent_input=self.mock_agent_input,
-            headers=self.mock_headers,
-            final_result=self.mock_final_result,
-        )
+        messages = handler.build_messages(self.mock_config, self.mock_agent_input, {})
 
-        # Verify loop was still closed despite error
-        mock_loop.close.assert_called_once()
+        assert [message["role"] for message in messages] == ["user"]
 
-    @patch("app.logic.agent_core_logic_v2.memory.threading.Thread")
-    @patch("app.logic.agent_core_logic_v2.memory.get_user_account_id")
-    @patch("app.logic.agent_core_logic_v2.memory.get_user_account_type")
-    @patch("app.logic.agent_core_logic_v2.memory.agent_memory_service")
-    @patch("app.logic.agent_core_logic_v2.memory.StandLogger")
-    @patch("app.logic.agent_core_logic_v2.memory.asyncio")
-    def test_build_memory_with_default_inputs(
-        self,
-        mock_asyncio,
-        mock_logger,
-        mock_memory_service,
-        mock_get_type,
-        mock_get_id,
-        mock_thread_class,
-    ):
-        """测试包含默认输入字段时构建记忆"""
-        mock_get_id.return_value = "user_123"
-        mock_get_type.return_value = "premium"
-
-        # Mock the async build_memory method
-        mock_memory_service.build_memory = AsyncMock()
-
-        # Create a new config with default inputs
-        test_config = Mock()
-        test_config.agent_id = "test_agent_123"
-        test_config.agent_run_id = "run_789"
-        test_config.memory = {"is_enabled": True}
-        test_config.input = {
+    def test_build_messages_skip_file_and_default_inputs(self):
+        """测试文件类型字段和默认输入字段被跳过"""
+        self.mock_config.input = {
             "fields": [
                 {"name": "query", "type": "string"},
-                {"name": "history", "type": "list"},  # Default input
-                {"name": "tool", "type": "dict"},  # Default input
+                {"name": "file_upload", "type": "file"},
+                {"name": "history", "type": "list"},
+                {"name": "tool", "type": "dict"},
             ]
         }
-        test_config.output = Mock()
-        test_config.output.get_final_answer_var = Mock(return_value="final_answer")
-
-        mock_loop = Mock()
-        mock_asyncio.new_event_loop.return_value = mock_loop
-
         handler = self.MemoryHandler()
 
-        handler.build_memory(
-            agent_config=test_config,
-            agent_input=self.mock_agent_input,
-            headers=self.mock_headers,
-            final_result=self.mock_final_result,
+        messages = handler.build_messages(
+            self.mock_config, self.mock_agent_input, self.mock_final_result
         )
 
-        # Should complete without error, default inputs should be skipped
-        mock_loop.close.assert_called_once()
+        assert messages[0]["content"] == "query: test value\n"
@@ -0,0 +1,240 @@
+"""单元测试 - logic/agent_core_logic_v2/memory_build_queue 模块"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.logic.agent_core_logic_v2.memory_build_queue import (
+    SPILL_FILE_NAME,
+    MemoryBuildQueue,
+)
+from app.utils.observability.observability_metric import get_metric_value
+
+HEADERS = {"x-account-id": "user"}
+
+
+def message(content: str) -> dict:
+    return {"role": "user", "content": content}
+
+
+class RecordingSender:
+    """记录发送的批次"""
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.batches = []
+
+    async def __call__(self, batch):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.batches.append(batch)
+
+
+class TestMemoryBuildQueue:
+    """测试 MemoryBuildQueue 类"""
+
+    @pytest.mark.asyncio
+    async def test_coalesce_same_user_agent(self):
+        """测试合并窗口内同一用户/Agent的请求合并为一次调用"""
+        sender = RecordingSender()
+        queue = MemoryBuildQueue(workers=2, coalesce_window=0.05, send=sender)
+        queue.start()
+
+        queue.submit("u1", "a1", [message("1")], HEADERS)
+        queue.submit("u1", "a1", [message("2")], HEADERS)
+        queue.submit("u2", "a1", [message("3")], HEADERS)
+        await queue.stop()
+
+        batches = {batch.key: batch for batch in sender.batches}
+        assert len(sender.batches) == 2
+        assert batches[("u1", "a1")].messages == [message("1"), message("2")]
+        assert batches[("u2", "a1")].messages == [message("3")]
+
+    @pytest.mark.asyncio
+    async def test_max_batch_messages(self):
+        """测试批次消息数达到上限后新建批次"""
+        sender = RecordingSender()
+        queue = MemoryBuildQueue(
+            workers=1, coalesce_window=0.05, max_batch_messages=2, send=sender
+        )
+        queue.start()
+
+        for i in range(3):
+            queue.submit("u1", "a1", [message(str(i))], HEADERS)
+        await queue.stop()
+
+        assert [len(batch.messages) for batch in sender.batches] == [2, 1]
+
+    @pytest.mark.asyncio
+    async def test_drop_newest_when_full(self):
+        """测试队列满时丢弃新请求"""
+        sender = RecordingSender()
+        queue = MemoryBuildQueue(
+            queue_size=1,
+            workers=1,
+            coalesce_window=10,
+            overflow_policy="drop_newest",
+            drain_timeout=1,
+            send=sender,
+        )
+        queue.start()
+        # worker取走第一个批次并等待合并窗口
+        queue.submit("u0", "a", [message("0")], HEADERS)
+        await asyncio.sleep(0)
+
+        queue.submit("u1", "a", [message("1")], HEADERS)
+        queue.submit("u2", "a", [message("2")], HEADERS)
+        await queue.stop()
+
+        assert [batch.user_id for batch in sender.batches] == ["u0", "u1"]
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_when_full(self):
+        """测试队列满时丢弃最早的请求"""
+        sender = RecordingSender()
+        queue = MemoryBuildQueue(
+            queue_size=1,
+            workers=1,
+            coalesce_window=10,
+            overflow_policy="drop_oldest",
+            drain_timeout=1,
+            send=sender,
+        )
+        queue.start()
+        queue.submit("u0", "a", [message("0")], HEADERS)
+        await asyncio.sleep(0)
+
+        dropped_before = (
+            get_metric_value(
+                "agent_executor.memory_build.dropped", {"reason": "queue_full"}
+            )
+            or 0
+        )
+        queue.submit("u1", "a", [message("1")], HEADERS)
+        queue.submit("u2", "a", [message("2")], HEADERS)
+        # 被丢弃的批次不再接收合并
+        queue.submit("u2", "a", [message("3")], HEADERS)
+        await queue.stop()
+
+        assert [batch.user_id for batch in sender.batches] == ["u0", "u2"]
+        assert sender.batches[1].messages == [message("2"), message("3")]
+        assert (
+            get_metric_value(
+                "agent_executor.memory_build.dropped", {"reason": "queue_full"}
+            )
+            == dropped_before + 1
+        )
+
+    @pytest.mark.asyncio
+    async def test_spill_and_restore(self, tmp_path):
+        """测试队列满和关闭超时时写入spill文件，重新启动后恢复"""
+        sender = RecordingSender(delay=0.05)
+        queue = MemoryBuildQueue(
+            queue_size=1,
+            workers=1,
+            coalesce_window=10,
+            overflow_policy="spill",
+            spill_dir=str(tmp_path),
+            drain_timeout=0.01,
+            send=sender,
+        )
+        queue.start()
+        queue.submit("u0", "a", [message("0")], HEADERS)
+        await asyncio.sleep(0)
+        queue.submit("u1", "a", [message("1")], HEADERS)
+        queue.submit("u2", "a", [message("2")], HEADERS)
+
+        spilled = (tmp_path / SPILL_FILE_NAME).read_text().splitlines()
+        assert [json.loads(line)["user_id"] for line in spilled] == ["u2"]
+
+        # 关闭超时，正在发送和队列中剩余的批次也写入spill文件
+        await queue.stop()
+        assert sender.batches == []
+        spilled = (tmp_path / SPILL_FILE_NAME).read_text().splitlines()
+        assert sorted(json.loads(line)["user_id"] for line in spilled) == [
+            "u0",
+            "u1",
+            "u2",
+        ]
+
+        sender.delay = 0
+        queue.queue_size = 10
+        queue.drain_timeout = 1
+        queue.start()
+        await queue.stop()
+
+        assert sorted(batch.user_id for batch in sender.batches) == ["u0", "u1", "u2"]
+        assert not (tmp_path / SPILL_FILE_NAME).exists()
+
+    @pytest.mark.asyncio
+    async def test_send_failure_does_not_stop_worker(self):
+        """测试发送失败不影响后续请求"""
+        sent = []
+
+        async def send(batch):
+            if batch.user_id == "bad":
+                raise RuntimeError("boom")
+            sent.append(batch.user_id)
+
+        queue = MemoryBuildQueue(workers=1, coalesce_window=0, send=send)
+        queue.start()
+        queue.submit("bad", "a", [message("0")], HEADERS)
+        queue.submit("good", "a", [message("1")], HEADERS)
+        await queue.stop()
+
+        assert sent == ["good"]
+
+    @pytest.mark.asyncio
+    async def test_worker_pool_bounded(self):
+        """测试并发调用数不超过worker数量"""
+        running = 0
+        max_running = 0
+
+        async def send(batch):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        queue = MemoryBuildQueue(workers=2, coalesce_window=0, send=send)
+        queue.start()
+        for i in range(6):
+            queue.submit(f"u{i}", "a", [message(str(i))], HEADERS)
+        await queue.stop()
+
+        assert max_running == 2
+
+    @pytest.mark.asyncio
+    async def test_submit_after_stop_dropped(self):
+        """测试关闭期间提交的请求被丢弃"""
+        sender = RecordingSender()
+        queue = MemoryBuildQueue(workers=1, coalesce_window=0, send=sender)
+        queue.start()
+        queue._closing = True
+        queue.submit("u", "a", [message("0")], HEADERS)
+        await queue.stop()
+
+        assert sender.batches == []
+
+    def test_submit_without_loop_dropped(self):
+        """测试未启动且没有事件循环时丢弃请求"""
+        queue = MemoryBuildQueue(send=RecordingSender())
+        queue.submit("u", "a", [message("0")], HEADERS)
+        assert not queue.started
+
+    @pytest.mark.asyncio
+    async def test_submit_from_other_thread(self):
+        """测试在其他线程中提交时转交给队列所在的事件循环"""
+        sender = RecordingSender()
+        queue = MemoryBuildQueue(workers=1, coalesce_window=0, send=sender)
+        queue.start()
+
+        await asyncio.get_running_loop().run_in_executor(
+            None, queue.submit, "u", "a", [message("0")], HEADERS
+        )
+        await asyncio.sleep(0)
+        await queue.stop()
+
+        assert [batch.user_id for batch in sender.batches] == ["u"]
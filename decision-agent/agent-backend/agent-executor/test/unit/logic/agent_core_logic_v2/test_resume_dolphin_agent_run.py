@@ -13,7 +13,7 @@ async def test_resume_dolphin_agent_run_accepts_injected_span():
     )
 
     mock_agent_core = MagicMock()
-    mock_agent_core.memory_handler.start_memory_build_thread = MagicMock()
+    mock_agent_core.memory_handler.start_memory_build = MagicMock()
 
     mock_agent = MagicMock()
     mock_agent.resume = AsyncMock()
@@ -58,4 +58,4 @@ async def test_resume_dolphin_agent_run_accepts_injected_span():
     assert results == [{}]
     mock_agent.resume.assert_awaited_once()
     mock_dialog_log_handler.return_value.save_dialog_logs.assert_called_once()
-    mock_agent_core.memory_handler.start_memory_build_thread.assert_called_once()
+    mock_agent_core.memory_handler.start_memory_build.assert_called_once()
@@ -28,9 +28,12 @@ class TestInitObservability:
         mock_init_log.assert_called_once_with(server_info, setting.log)
         mock_init_trace.assert_not_called()
 
+    @patch("app.utils.observability.observability.init_meter_provider")
     @patch("app.utils.observability.observability.init_log_provider")
     @patch("app.utils.observability.observability.init_trace_provider")
-    def test_init_with_trace_enabled(self, mock_init_trace, mock_init_log):
+    def test_init_with_trace_enabled(
+        self, mock_init_trace, mock_init_log, mock_init_meter
+    ):
         """测试启用追踪时初始化"""
         from app.utils.observability.observability_setting import (
             ObservabilitySetting,
@@ -49,6 +52,7 @@ class TestInitObservability:
 
         mock_init_log.assert_not_called()
         mock_init_trace.assert_called_once_with(server_info, setting.trace)
+        mock_init_meter.assert_called_once_with(server_info, setting.trace)
 
     @patch("app.utils.observability.observability.init_log_provider")
     @patch("app.utils.observability.observability.init_trace_provider")
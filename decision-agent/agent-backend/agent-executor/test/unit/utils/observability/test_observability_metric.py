@@ -0,0 +1,91 @@
+"""单元测试 - utils/observability/observability_metric 模块"""
+
+from unittest.mock import MagicMock, patch
+
+from app.utils.observability import observability_metric
+from app.utils.observability.observability_metric import (
+    counter_add,
+    get_metric_snapshot,
+    get_metric_value,
+    histogram_record,
+    init_meter_provider,
+    reset_metric_snapshot,
+    shutdown_meter_provider,
+    up_down_counter_add,
+)
+from app.utils.observability.observability_setting import ServerInfo, TraceSetting
+
+
+class TestObservabilityMetric:
+    def setup_method(self):
+        reset_metric_snapshot()
+
+    def teardown_method(self):
+        reset_metric_snapshot()
+
+    def test_counter_add(self):
+        counter_add("test.counter")
+        counter_add("test.counter", 2)
+        counter_add("test.counter", attributes={"reason": "x"})
+
+        assert get_metric_value("test.counter") == 3
+        assert get_metric_value("test.counter", {"reason": "x"}) == 1
+
+    def test_up_down_counter_add(self):
+        up_down_counter_add("test.depth", 3)
+        up_down_counter_add("test.depth", -1)
+
+        assert get_metric_value("test.depth") == 2
+
+    def test_histogram_record(self):
+        histogram_record("test.latency", 10)
+        histogram_record("test.latency", 30)
+
+        assert get_metric_value("test.latency") == {
+            "count": 2,
+            "sum": 40.0,
+            "max": 30,
+        }
+
+    def test_snapshot(self):
+        counter_add("test.counter", attributes={"b": 2, "a": 1})
+
+        assert get_metric_snapshot() == {"test.counter": {"a=1,b=2": 1}}
+
+    def test_missing_metric(self):
+        assert get_metric_value("test.missing") is None
+
+
+class TestInitMeterProvider:
+    @patch("app.utils.observability.observability_metric.metrics.set_meter_provider")
+    @patch("app.utils.observability.observability_metric.MeterProvider")
+    @patch("app.utils.observability.observability_metric.PeriodicExportingMetricReader")
+    def test_exports_to_otlp_metrics_endpoint(
+        self, m_reader, m_meter_provider, m_set_meter_provider
+    ):
+        provider = MagicMock()
+        m_meter_provider.return_value = provider
+
+        with patch(
+            "opentelemetry.exporter.otlp.proto.http.metric_exporter.OTLPMetricExporter"
+        ) as m_exporter:
+            init_meter_provider(
+                ServerInfo(server_name="test-service", server_version="1.0.0"),
+                TraceSetting(
+                    trace_enabled=True, otlp_endpoint="otelcol:4318/v1/traces"
+                ),
+            )
+
+        m_exporter.assert_called_once_with(endpoint="http://otelcol:4318/v1/metrics")
+        m_reader.assert_called_once()
+        m_set_meter_provider.assert_called_once_with(provider)
+
+        shutdown_meter_provider()
+        provider.shutdown.assert_called_once()
+        assert observability_metric._meter_provider is None
+
+    @patch("app.utils.observability.observability_metric.metrics.set_meter_provider")
+    def test_empty_endpoint_skips_export(self, m_set_meter_provider):
+        init_meter_provider(ServerInfo(), TraceSetting(trace_enabled=True))
+
+        m_set_meter_provider.assert_not_called()
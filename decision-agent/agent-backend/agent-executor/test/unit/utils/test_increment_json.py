@@ -1,8 +1,11 @@
 """单元测试 - utils/increment_json 模块"""
 
+import json
+
 import pytest
 
 from app.utils.increment_json import (
+    IncrementalJsonDiffer,
     compare_values,
     find_differences,
     incremental_async_generator,
@@ -341,3 +344,87 @@ class TestRestoreFullJson:
 
         restored = await restore_full_json(update_gen())
         assert restored == original
+
+
+class TestIncrementalJsonDiffer:
+    """测试 IncrementalJsonDiffer 有状态差异计算"""
+
+    def test_in_place_mutation(self):
+        """测试原地修改的同一个对象也能正确计算差异"""
+        answer = {"answer": {"text": "he"}, "progress": []}
+        differ = IncrementalJsonDiffer()
+        differ.diff(answer)
+
+        answer["answer"]["text"] += "llo"
+        answer["progress"].append({"stage": "llm"})
+        changes = differ.diff(answer)
+
+        assert changes == [
+            {
+                "seq_id": 2,
+                "key": ["answer", "text"],
+                "content": "llo",
+                "action": "append",
+            },
+            {
+                "seq_id": 3,
+                "key": ["progress", 0],
+                "content": {"stage": "llm"},
+                "action": "append",
+            },
+        ]
+
+        answer["progress"][0]["status"] = "completed"
+        changes = differ.diff(answer)
+        assert len(changes) == 1
+        assert changes[0]["key"] == ["progress", 0]
+        assert changes[0]["action"] == "upsert"
+        assert changes[0]["content"] == {"stage": "llm", "status": "completed"}
+
+    def test_unchanged_returns_no_changes(self):
+        """测试未变化时不输出差异"""
+        answer = {"a": "x", "b": [1, {"c": None}]}
+        differ = IncrementalJsonDiffer()
+        differ.diff(answer)
+        assert differ.diff(answer) == []
+
+    def test_matches_stateless_compare(self):
+        """测试输出与 compare_values 一致"""
+        states = [
+            {"a": "x", "b": [1, 2], "c": {"d": 1}},
+            {"a": "xyz", "b": [1, 3, 4], "c": {"e": 2}},
+            {"a": "new", "b": [1], "c": "replaced"},
+        ]
+        differ = IncrementalJsonDiffer()
+        differ.diff(states[0])
+        for prev, curr in zip(states, states[1:]):
+            seq_id = differ.seq_id
+            expected = compare_values(prev, curr, seq_id, [])
+            actual = differ.diff(curr)
+
+            def key(change):
+                return str(change["key"]), change["action"]
+
+            assert sorted((key(c), c["content"]) for c in actual) == sorted(
+                (key(c), c["content"]) for c in expected
+            )
+
+    @pytest.mark.asyncio
+    async def test_round_trip_with_in_place_mutation(self):
+        """测试原地修改场景下的往返转换"""
+        answer = {"answer": {"text": ""}, "status": "running"}
+
+        async def full_gen():
+            for i in range(20):
+                answer["answer"]["text"] += f"token{i} "
+                yield answer
+            answer["status"] = "done"
+            yield answer
+
+        async def wire_gen():
+            # 模拟序列化传输，避免与生成器共享对象引用
+            async for change in incremental_async_generator(full_gen()):
+                yield json.loads(json.dumps(change))
+
+        restored = await restore_full_json(wire_gen())
+        assert restored == json.loads(json.dumps(answer))
@@ -13,6 +13,18 @@ class FAISSConfig(BaseModel):
         False, description="Whether to normalize L2 vectors (only applicable for euclidean distance)"
     )
     embedding_model_dims: int = Field(1536, description="Dimension of the embedding vector")
+    checkpoint_interval: float = Field(30.0, description="Seconds between background checkpoints of the index")
+    checkpoint_wal_ops: int = Field(
+        1000, description="Number of write-ahead log records that triggers a checkpoint before the interval"
+    )
+    compact_ratio: float = Field(
+        0.2, description="Fraction of deleted vectors in the index that triggers compaction at checkpoint time"
+    )
+    filter_mode: str = Field(
+        "prefilter",
+        description="'prefilter' restricts the search to vectors matching user_id/agent_id/run_id, "
+        "'postfilter' filters the results of a search over the whole index",
+    )
 
     @model_validator(mode="before")
     @classmethod
@@ -22,6 +34,14 @@ class FAISSConfig(BaseModel):
             raise ValueError("Invalid distance_strategy. Must be one of: 'euclidean', 'inner_product', 'cosine'")
         return values
 
+    @model_validator(mode="before")
+    @classmethod
+    def validate_filter_mode(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        filter_mode = values.get("filter_mode")
+        if filter_mode and filter_mode not in ["prefilter", "postfilter"]:
+            raise ValueError("Invalid filter_mode. Must be one of: 'prefilter', 'postfilter'")
+        return values
+
     @model_validator(mode="before")
     @classmethod
     def validate_extra_fields(cls, values: Dict[str, Any]) -> Dict[str, Any]:
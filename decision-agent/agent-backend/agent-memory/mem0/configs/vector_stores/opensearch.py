@@ -18,6 +18,16 @@ class OpenSearchConfig(BaseModel):
         "RequestsHttpConnection", description="Connection class for OpenSearch"
     )
     pool_maxsize: int = Field(20, description="Maximum number of connections in the pool")
+    knn_engine: str = Field(
+        "lucene",
+        description="k-NN engine used when creating the index; 'lucene' and 'faiss' support efficient filtering, "
+        "'nmslib' does not",
+    )
+    filter_mode: str = Field(
+        "auto",
+        description="'efficient' puts filters inside the k-NN query, 'postfilter' filters the k-NN results, "
+        "'auto' uses efficient filtering when the index engine supports it",
+    )
 
     @model_validator(mode="before")
     @classmethod
@@ -28,6 +38,22 @@ class OpenSearchConfig(BaseModel):
 
         return values
 
+    @model_validator(mode="before")
+    @classmethod
+    def validate_filter_mode(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        filter_mode = values.get("filter_mode")
+        if filter_mode and filter_mode not in ["auto", "efficient", "postfilter"]:
+            raise ValueError("Invalid filter_mode. Must be one of: 'auto', 'efficient', 'postfilter'")
+        return values
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_knn_engine(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        knn_engine = values.get("knn_engine")
+        if knn_engine and knn_engine not in ["lucene", "faiss", "nmslib"]:
+            raise ValueError("Invalid knn_engine. Must be one of: 'lucene', 'faiss', 'nmslib'")
+        return values
+
     @model_validator(mode="before")
     @classmethod
     def validate_extra_fields(cls, values: Dict[str, Any]) -> Dict[str, Any]:
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Literal, Optional, Dict, Any
+from typing import Literal, Optional, Dict, Any, List
 
 from mem0.configs.embeddings.base import BaseEmbedderConfig
 
@@ -30,3 +30,26 @@ class EmbeddingBase(ABC):
             list: The embedding vector.
         """
         pass
+
+    def embed_batch(
+        self,
+        texts: List[str],
+        memory_action: Optional[Literal["add", "search", "update"]] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> List[list]:
+        """
+        Get the embeddings for a list of texts.
+
+        Providers whose API accepts an input array should override this to send a single request.
+        The default implementation calls `embed` once per text.
+
+        Args:
+            texts (list[str]): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+            context (optional): Context information like user_id and visitor_type. Defaults to None.
+        Returns:
+            list: The embedding vectors, in the same order as `texts`.
+        """
+        if context is None:
+            return [self.embed(text, memory_action) for text in texts]
+        return [self.embed(text, memory_action, context) for text in texts]
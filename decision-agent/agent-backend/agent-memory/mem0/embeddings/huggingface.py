@@ -1,5 +1,5 @@
 import logging
-from typing import Literal, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from openai import OpenAI
 from sentence_transformers import SentenceTransformer
@@ -39,3 +39,27 @@ class HuggingFaceEmbedding(EmbeddingBase):
             return self.client.embeddings.create(input=text, model="tei").data[0].embedding
         else:
             return self.model.encode(text, convert_to_numpy=True).tolist()
+
+    def embed_batch(
+        self,
+        texts: List[str],
+        memory_action: Optional[Literal["add", "search", "update"]] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> List[list]:
+        """
+        Get the embeddings for a list of texts using Hugging Face in a single call.
+
+        Args:
+            texts (list[str]): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+            context (optional): Context information like user_id and visitor_type. Unused. Defaults to None.
+        Returns:
+            list: The embedding vectors, in the same order as `texts`.
+        """
+        if not texts:
+            return []
+        if self.config.huggingface_base_url:
+            response = self.client.embeddings.create(input=texts, model="tei")
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        else:
+            return self.model.encode(texts, convert_to_numpy=True).tolist()
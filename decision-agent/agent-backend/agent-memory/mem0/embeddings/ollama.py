@@ -1,6 +1,6 @@
 import subprocess
 import sys
-from typing import Literal, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from mem0.configs.embeddings.base import BaseEmbedderConfig
 from mem0.embeddings.base import EmbeddingBase
@@ -51,3 +51,27 @@ class OllamaEmbedding(EmbeddingBase):
         """
         response = self.client.embeddings(model=self.config.model, prompt=text)
         return response["embedding"]
+
+    def embed_batch(
+        self,
+        texts: List[str],
+        memory_action: Optional[Literal["add", "search", "update"]] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> List[list]:
+        """
+        Get the embeddings for a list of texts using Ollama's batch embed endpoint.
+
+        Args:
+            texts (list[str]): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+            context (optional): Context information like user_id and visitor_type. Unused. Defaults to None.
+        Returns:
+            list: The embedding vectors, in the same order as `texts`.
+        """
+        if not texts:
+            return []
+        if not hasattr(self.client, "embed"):
+            # Older ollama clients only expose the single-prompt embeddings API
+            return [self.embed(text, memory_action) for text in texts]
+        response = self.client.embed(model=self.config.model, input=texts)
+        return list(response["embeddings"])
@@ -1,12 +1,15 @@
 import os
 import warnings
-from typing import Literal, Optional, Dict, Any
+from typing import Literal, Optional, Dict, Any, List
 
 from openai import OpenAI
 
 from mem0.configs.embeddings.base import BaseEmbedderConfig
 from mem0.embeddings.base import EmbeddingBase
 
+# Maximum number of inputs accepted by a single embeddings request
+MAX_BATCH_SIZE = 2048
+
 
 class OpenAIEmbedding(EmbeddingBase):
     def __init__(self, config: Optional[BaseEmbedderConfig] = None):
@@ -48,21 +51,55 @@ class OpenAIEmbedding(EmbeddingBase):
             list: The embedding vector.
         """
         text = text.replace("\n", " ")
-
-        # Build extra_headers from context
-        extra_headers = {}
-        if context:
-            if context.get("user_id"):
-                extra_headers["x-account-id"] = context["user_id"]
-            if context.get("visitor_type"):
-                extra_headers["x-account-type"] = context["visitor_type"]
         return (
             self.client.embeddings.create(
                 input=[text],
                 model=self.config.model,
                 dimensions=self.config.embedding_dims,
-                extra_headers=extra_headers,
+                extra_headers=self._build_extra_headers(context),
             )
             .data[0]
             .embedding
         )
+
+    def embed_batch(
+        self,
+        texts: List[str],
+        memory_action: Optional[Literal["add", "search", "update"]] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> List[list]:
+        """
+        Get the embeddings for a list of texts using OpenAI, sending them as one input array per request.
+
+        Args:
+            texts (list[str]): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+            context (optional): Context information like user_id and visitor_type. Defaults to None.
+        Returns:
+            list: The embedding vectors, in the same order as `texts`.
+        """
+        texts = [text.replace("\n", " ") for text in texts]
+        extra_headers = self._build_extra_headers(context)
+
+        embeddings = []
+        for start in range(0, len(texts), MAX_BATCH_SIZE):
+            response = self.client.embeddings.create(
+                input=texts[start : start + MAX_BATCH_SIZE],
+                model=self.config.model,
+                dimensions=self.config.embedding_dims,
+                extra_headers=extra_headers,
+            )
+            # The API does not guarantee the order of data, use index to restore it
+            embeddings.extend(item.embedding for item in sorted(response.data, key=lambda item: item.index))
+        return embeddings
+
+    @staticmethod
+    def _build_extra_headers(context: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Build extra_headers from context"""
+        extra_headers = {}
+        if context:
+            if context.get("user_id"):
+                extra_headers["x-account-id"] = context["user_id"]
+            if context.get("visitor_type"):
+                extra_headers["x-account-type"] = context["visitor_type"]
+        return extra_headers
@@ -284,7 +284,7 @@ class Memory(MemoryBase):
 
     def _add_to_vector_store(self, messages, metadata, filters, infer):
         if not infer:
-            returned_memories = []
+            valid_messages = []
             for message_dict in messages:
                 if (
                     not isinstance(message_dict, dict)
@@ -297,6 +297,14 @@ class Memory(MemoryBase):
                 if message_dict["role"] == "system":
                     continue
 
+                valid_messages.append(message_dict)
+
+            # Embed all messages in one request
+            msg_embeddings = {}
+            self._embed_missing([m["content"] for m in valid_messages], msg_embeddings, "add")
+
+            returned_memories = []
+            for message_dict in valid_messages:
                 per_msg_meta = deepcopy(metadata)
                 per_msg_meta["role"] = message_dict["role"]
 
@@ -305,7 +313,6 @@ class Memory(MemoryBase):
                     per_msg_meta["actor_id"] = actor_name
 
                 msg_content = message_dict["content"]
-                msg_embeddings = self.embedding_model.embed(msg_content, "add")
                 mem_id = self._create_memory(msg_content, msg_embeddings, per_msg_meta)
 
                 returned_memories.append(
@@ -347,10 +354,11 @@ class Memory(MemoryBase):
             return []
 
         retrieved_old_memory = []
+        # Embed all facts in one request, then search with the cached vectors
         new_message_embeddings = {}
+        self._embed_missing(new_retrieved_facts, new_message_embeddings, "add")
         for new_mem in new_retrieved_facts:
-            messages_embeddings = self.embedding_model.embed(new_mem, "add")
-            new_message_embeddings[new_mem] = messages_embeddings
+            messages_embeddings = new_message_embeddings[new_mem]
             existing_memories = self.vector_store.search(
                 query=new_mem,
                 vectors=messages_embeddings,
@@ -392,6 +400,18 @@ class Memory(MemoryBase):
             logger.error(f"Invalid JSON response: {e}")
             new_memories_with_actions = {}
 
+        # The texts chosen by the LLM may differ from the extracted facts, embed them in one request as well
+        action_texts = [
+            resp.get("text")
+            for resp in new_memories_with_actions.get("memory", [])
+            if isinstance(resp, dict) and resp.get("text") and resp.get("event") in ("ADD", "UPDATE")
+        ]
+        try:
+            self._embed_missing(action_texts, new_message_embeddings, "add")
+        except Exception as e:
+            # Fall back to embedding each memory in _create_memory/_update_memory
+            logger.error(f"Error embedding memory action texts: {e}")
+
         returned_memories = []
         try:
             for resp in new_memories_with_actions.get("memory", []):
@@ -801,6 +821,14 @@ class Memory(MemoryBase):
         capture_event("mem0.history", self, {"memory_id": memory_id, "sync_type": "sync"})
         return self.db.get_history(memory_id)
 
+    def _embed_missing(self, texts, existing_embeddings, memory_action):
+        """Embed the texts that are not in existing_embeddings with a single embed_batch call and add them to it."""
+        missing = [text for text in dict.fromkeys(texts) if text not in existing_embeddings]
+        if not missing:
+            return
+        embeddings = self.embedding_model.embed_batch(missing, memory_action)
+        existing_embeddings.update(zip(missing, embeddings))
+
     def _create_memory(self, data, existing_embeddings, metadata=None):
         logger.debug(f"Creating memory with {data=}")
         if data in existing_embeddings:
@@ -1120,7 +1148,7 @@ class AsyncMemory(MemoryBase):
         context: Optional[Dict[str, Any]] = None,
     ):
         if not infer:
-            returned_memories = []
+            valid_messages = []
             for message_dict in messages:
                 if (
                     not isinstance(message_dict, dict)
@@ -1133,6 +1161,14 @@ class AsyncMemory(MemoryBase):
                 if message_dict["role"] == "system":
                     continue
 
+                valid_messages.append(message_dict)
+
+            # Embed all messages in one request
+            msg_embeddings = {}
+            await self._embed_missing([m["content"] for m in valid_messages], msg_embeddings, "add", context)
+
+            returned_memories = []
+            for message_dict in valid_messages:
                 per_msg_meta = deepcopy(metadata)
                 per_msg_meta["role"] = message_dict["role"]
 
@@ -1141,7 +1177,6 @@ class AsyncMemory(MemoryBase):
                     per_msg_meta["actor_id"] = actor_name
 
                 msg_content = message_dict["content"]
-                msg_embeddings = await asyncio.to_thread(self.embedding_model.embed, msg_content, "add", context)
                 mem_id = await self._create_memory(msg_content, msg_embeddings, per_msg_meta, context)
 
                 returned_memories.append(
@@ -1187,11 +1222,12 @@ class AsyncMemory(MemoryBase):
             new_retrieved_facts = []
 
         retrieved_old_memory = []
+        # Embed all facts in one request, then search with the cached vectors
         new_message_embeddings = {}
+        await self._embed_missing(new_retrieved_facts, new_message_embeddings, "add", context)
 
         async def process_fact_for_search(new_mem_content):
-            embeddings = await asyncio.to_thread(self.embedding_model.embed, new_mem_content, "add", context)
-            new_message_embeddings[new_mem_content] = embeddings
+            embeddings = new_message_embeddings[new_mem_content]
             existing_mems = await asyncio.to_thread(
                 self.vector_store.search,
                 query=new_mem_content,
@@ -1247,6 +1283,18 @@ class AsyncMemory(MemoryBase):
             logger.error(f"Invalid JSON response: {e}")
             new_memories_with_actions = {}
 
+        # The texts chosen by the LLM may differ from the extracted facts, embed them in one request as well
+        action_texts = [
+            resp.get("text")
+            for resp in new_memories_with_actions.get("memory", [])
+            if isinstance(resp, dict) and resp.get("text") and resp.get("event") in ("ADD", "UPDATE")
+        ]
+        try:
+            await self._embed_missing(action_texts, new_message_embeddings, "add", context)
+        except Exception as e:
+            # Fall back to embedding each memory in _create_memory/_update_memory
+            logger.error(f"Error embedding memory action texts (async): {e}")
+
         returned_memories = []
         try:
             memory_tasks = []
@@ -1258,9 +1306,10 @@ class AsyncMemory(MemoryBase):
                         continue
                     event_type = resp.get("event")
 
+                    # Only prepare the changes here, they are written to the vector store in one bulk request below
                     if event_type == "ADD":
                         task = asyncio.create_task(
-                            self._create_memory(
+                            self._prepare_create_memory(
                                 data=action_text,
                                 existing_embeddings=new_message_embeddings,
                                 metadata=deepcopy(metadata),
@@ -1270,7 +1319,7 @@ class AsyncMemory(MemoryBase):
                         memory_tasks.append((task, resp, "ADD", None))
                     elif event_type == "UPDATE":
                         task = asyncio.create_task(
-                            self._update_memory(
+                            self._prepare_update_memory(
                                 memory_id=temp_uuid_mapping[resp["id"]],
                                 data=action_text,
                                 existing_embeddings=new_message_embeddings,
@@ -1280,7 +1329,9 @@ class AsyncMemory(MemoryBase):
                         )
                         memory_tasks.append((task, resp, "UPDATE", temp_uuid_mapping[resp["id"]]))
                     elif event_type == "DELETE":
-                        task = asyncio.create_task(self._delete_memory(memory_id=temp_uuid_mapping[resp.get("id")]))
+                        task = asyncio.create_task(
+                            self._prepare_delete_memory(memory_id=temp_uuid_mapping[resp.get("id")])
+                        )
                         memory_tasks.append((task, resp, "DELETE", temp_uuid_mapping[resp.get("id")]))
                     elif event_type == "NONE":
                         logger.info("NOOP for Memory (async).")
@@ -1291,9 +1342,19 @@ class AsyncMemory(MemoryBase):
                 "Created memory tasks, tasks: %s",
                 memory_tasks
                 )
+            prepared = []
             for task, resp, event_type, mem_id in memory_tasks:
                 try:
-                    result_id = await task
+                    prepared.append((await task, resp, event_type, mem_id))
+                except Exception as e:
+                    logger.error(f"Error awaiting memory task (async): {e}")
+
+            failed_ids = await self._apply_memory_changes([change for change, _, _, _ in prepared])
+            for change, resp, event_type, mem_id in prepared:
+                result_id = change["memory_id"]
+                if result_id in failed_ids:
+                    continue
+                try:
                     if event_type == "ADD":
                         returned_memories.append({"id": result_id, "memory": resp.get("text"), "event": event_type})
                     elif event_type == "UPDATE":
@@ -1308,7 +1369,7 @@ class AsyncMemory(MemoryBase):
                     elif event_type == "DELETE":
                         returned_memories.append({"id": mem_id, "memory": resp.get("text"), "event": event_type})
                 except Exception as e:
-                    logger.error(f"Error awaiting memory task (async): {e}")
+                    logger.error(f"Error collecting memory result (async): {e}")
         except Exception as e:
             logger.error(f"Error in memory processing loop (async): {e}")
 
@@ -1696,7 +1757,28 @@ class AsyncMemory(MemoryBase):
         capture_event("mem0.history", self, {"memory_id": memory_id, "sync_type": "async"})
         return await asyncio.to_thread(self.db.get_history, memory_id)
 
+    async def _embed_missing(self, texts, existing_embeddings, memory_action, context=None):
+        """Embed the texts that are not in existing_embeddings with a single embed_batch call and add them to it."""
+        missing = [text for text in dict.fromkeys(texts) if text not in existing_embeddings]
+        if not missing:
+            return
+        embeddings = await asyncio.to_thread(self.embedding_model.embed_batch, missing, memory_action, context)
+        existing_embeddings.update(zip(missing, embeddings))
+
     async def _create_memory(self, data, existing_embeddings, metadata=None, context=None):
+        change = await self._prepare_create_memory(data, existing_embeddings, metadata=metadata, context=context)
+
+        await asyncio.to_thread(
+            self.vector_store.insert,
+            vectors=[change["vector"]],
+            ids=[change["memory_id"]],
+            payloads=[change["payload"]],
+        )
+
+        await self._record_memory_change(change)
+        return change["memory_id"]
+
+    async def _prepare_create_memory(self, data, existing_embeddings, metadata=None, context=None):
         logger.debug(f"Creating memory with {data=}")
         if data in existing_embeddings:
             embeddings = existing_embeddings[data]
@@ -1709,26 +1791,67 @@ class AsyncMemory(MemoryBase):
         metadata["hash"] = hashlib.md5(data.encode()).hexdigest()
         metadata["created_at"] = datetime.now(pytz.timezone("Asia/Shanghai")).isoformat()
 
-        await asyncio.to_thread(
-            self.vector_store.insert,
-            vectors=[embeddings],
-            ids=[memory_id],
-            payloads=[metadata],
-        )
+        return {
+            "event": "ADD",
+            "memory_id": memory_id,
+            "vector": embeddings,
+            "payload": metadata,
+            "history": (
+                (memory_id, None, data, "ADD"),
+                {
+                    "created_at": metadata.get("created_at"),
+                    "actor_id": metadata.get("actor_id"),
+                    "role": metadata.get("role"),
+                },
+            ),
+        }
+
+    async def _apply_memory_changes(self, changes):
+        """
+        Write prepared ADD/UPDATE/DELETE changes to the vector store with one bulk_write call,
+        then record history for the changes that succeeded.
 
-        await asyncio.to_thread(
-            self.db.add_history,
-            memory_id,
-            None,
-            data,
-            "ADD",
-            created_at=metadata.get("created_at"),
-            actor_id=metadata.get("actor_id"),
-            role=metadata.get("role"),
-        )
+        Returns:
+            set: IDs of the memories whose change failed.
+        """
+        if not changes:
+            return set()
 
-        capture_event("mem0._create_memory", self, {"memory_id": memory_id, "sync_type": "async"})
-        return memory_id
+        try:
+            failed_ids = await asyncio.to_thread(
+                self.vector_store.bulk_write,
+                inserts=[
+                    {"vector_id": c["memory_id"], "vector": c["vector"], "payload": c["payload"]}
+                    for c in changes
+                    if c["event"] == "ADD"
+                ],
+                updates=[
+                    {"vector_id": c["memory_id"], "vector": c["vector"], "payload": c["payload"]}
+                    for c in changes
+                    if c["event"] == "UPDATE"
+                ],
+                deletes=[c["memory_id"] for c in changes if c["event"] == "DELETE"],
+            )
+        except Exception as e:
+            logger.error(f"Error writing memory changes to vector store (async): {e}")
+            return {c["memory_id"] for c in changes}
+
+        failed_ids = set(failed_ids or [])
+        for change in changes:
+            if change["memory_id"] in failed_ids:
+                continue
+            try:
+                await self._record_memory_change(change)
+            except Exception as e:
+                logger.error(f"Error recording memory history (async): {change['memory_id']}, Error: {e}")
+        return failed_ids
+
+    async def _record_memory_change(self, change):
+        args, kwargs = change["history"]
+        await asyncio.to_thread(self.db.add_history, *args, **kwargs)
+
+        event_name = {"ADD": "_create_memory", "UPDATE": "_update_memory", "DELETE": "_delete_memory"}[change["event"]]
+        capture_event(f"mem0.{event_name}", self, {"memory_id": change["memory_id"], "sync_type": "async"})
 
     async def _create_procedural_memory(self, messages, metadata=None, llm=None, prompt=None, context=None):
         """
@@ -1782,6 +1905,22 @@ class AsyncMemory(MemoryBase):
         return result
 
     async def _update_memory(self, memory_id, data, existing_embeddings, metadata=None, context=None):
+        change = await self._prepare_update_memory(
+            memory_id, data, existing_embeddings, metadata=metadata, context=context
+        )
+
+        await asyncio.to_thread(
+            self.vector_store.update,
+            vector_id=memory_id,
+            vector=change["vector"],
+            payload=change["payload"],
+        )
+        logger.info(f"Updating memory with ID {memory_id=} with {data=}")
+
+        await self._record_memory_change(change)
+        return memory_id
+
+    async def _prepare_update_memory(self, memory_id, data, existing_embeddings, metadata=None, context=None):
         logger.info(f"Updating memory with {data=}")
 
         try:
@@ -1816,47 +1955,46 @@ class AsyncMemory(MemoryBase):
         else:
             embeddings = await asyncio.to_thread(self.embedding_model.embed, data, "update", context)
 
-        await asyncio.to_thread(
-            self.vector_store.update,
-            vector_id=memory_id,
-            vector=embeddings,
-            payload=new_metadata,
-        )
-        logger.info(f"Updating memory with ID {memory_id=} with {data=}")
+        return {
+            "event": "UPDATE",
+            "memory_id": memory_id,
+            "vector": embeddings,
+            "payload": new_metadata,
+            "history": (
+                (memory_id, prev_value, data, "UPDATE"),
+                {
+                    "created_at": new_metadata["created_at"],
+                    "updated_at": new_metadata["updated_at"],
+                    "actor_id": new_metadata.get("actor_id"),
+                    "role": new_metadata.get("role"),
+                },
+            ),
+        }
 
-        await asyncio.to_thread(
-            self.db.add_history,
-            memory_id,
-            prev_value,
-            data,
-            "UPDATE",
-            created_at=new_metadata["created_at"],
-            updated_at=new_metadata["updated_at"],
-            actor_id=new_metadata.get("actor_id"),
-            role=new_metadata.get("role"),
-        )
-        capture_event("mem0._update_memory", self, {"memory_id": memory_id, "sync_type": "async"})
+    async def _delete_memory(self, memory_id):
+        change = await self._prepare_delete_memory(memory_id)
+
+        await asyncio.to_thread(self.vector_store.delete, vector_id=memory_id)
+        await self._record_memory_change(change)
         return memory_id
 
-    async def _delete_memory(self, memory_id):
+    async def _prepare_delete_memory(self, memory_id):
         logger.info(f"Deleting memory with {memory_id=}")
         existing_memory = await asyncio.to_thread(self.vector_store.get, vector_id=memory_id)
         prev_value = existing_memory.payload["data"]
 
-        await asyncio.to_thread(self.vector_store.delete, vector_id=memory_id)
-        await asyncio.to_thread(
-            self.db.add_history,
-            memory_id,
-            prev_value,
-            None,
-            "DELETE",
-            actor_id=existing_memory.payload.get("actor_id"),
-            role=existing_memory.payload.get("role"),
-            is_deleted=1,
-        )
-
-        capture_event("mem0._delete_memory", self, {"memory_id": memory_id, "sync_type": "async"})
-        return memory_id
+        return {
+            "event": "DELETE",
+            "memory_id": memory_id,
+            "history": (
+                (memory_id, prev_value, None, "DELETE"),
+                {
+                    "actor_id": existing_memory.payload.get("actor_id"),
+                    "role": existing_memory.payload.get("role"),
+                    "is_deleted": 1,
+                },
+            ),
+        }
 
     async def reset(self):
         pass
@@ -56,3 +56,41 @@ class VectorStoreBase(ABC):
     def reset(self):
         """Reset by delete the collection and recreate it."""
         pass
+
+    def insert_many(self, vectors, payloads=None, ids=None):
+        """Insert vectors in as few requests as the store allows. Defaults to insert."""
+        return self.insert(vectors, payloads=payloads, ids=ids)
+
+    def update_many(self, updates):
+        """Update several vectors. Each item is a dict with vector_id and optional vector/payload."""
+        for item in updates:
+            self.update(item["vector_id"], vector=item.get("vector"), payload=item.get("payload"))
+
+    def delete_many(self, vector_ids):
+        """Delete several vectors by ID."""
+        for vector_id in vector_ids:
+            self.delete(vector_id)
+
+    def bulk_write(self, inserts=None, updates=None, deletes=None):
+        """Apply inserts, updates and deletes together.
+
+        Stores with a bulk API override this to send a single request.
+
+        Args:
+            inserts (list): Dicts with vector_id, vector and payload.
+            updates (list): Dicts with vector_id and optional vector/payload.
+            deletes (list): Vector IDs.
+        Returns:
+            list: IDs whose operation failed.
+        """
+        if inserts:
+            self.insert_many(
+                vectors=[item["vector"] for item in inserts],
+                payloads=[item["payload"] for item in inserts],
+                ids=[item["vector_id"] for item in inserts],
+            )
+        if updates:
+            self.update_many(updates)
+        if deletes:
+            self.delete_many(deletes)
+        return []
@@ -1,6 +1,10 @@
+import atexit
 import logging
+import math
 import os
 import pickle
+import shutil
+import threading
 import uuid
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -24,6 +28,16 @@ from mem0.vector_stores.base import VectorStoreBase
 
 logger = logging.getLogger(__name__)
 
+# Write-ahead log record types: (op, vector_id, faiss_id, vector_bytes, payload)
+WAL_UPSERT = "upsert"
+WAL_PAYLOAD = "payload"
+WAL_DELETE = "delete"
+
+# Payload keys with an inverted index, used to restrict the FAISS search to matching vectors
+PREFILTER_KEYS = ("user_id", "agent_id", "run_id")
+# Above this fraction of the index, checking the ID selector costs more than over-fetching and filtering
+PREFILTER_MAX_FRACTION = 0.1
+
 
 class OutputData(BaseModel):
     id: Optional[str]  # memory id
@@ -39,10 +53,17 @@ class FAISS(VectorStoreBase):
         distance_strategy: str = "euclidean",
         normalize_L2: bool = False,
         embedding_model_dims: int = 1536,
+        checkpoint_interval: float = 30.0,
+        checkpoint_wal_ops: int = 1000,
+        compact_ratio: float = 0.2,
+        filter_mode: str = "prefilter",
     ):
         """
         Initialize the FAISS vector store.
 
+        Writes are appended to a write-ahead log and applied in memory; a background thread
+        periodically writes a snapshot of the index and docstore and truncates the log.
+
         Args:
             collection_name (str): Name of the collection.
             path (str, optional): Path for local FAISS database. Defaults to None.
@@ -50,29 +71,90 @@ class FAISS(VectorStoreBase):
                 Defaults to "euclidean".
             normalize_L2 (bool, optional): Whether to normalize L2 vectors. Only applicable for euclidean distance.
                 Defaults to False.
+            checkpoint_interval (float, optional): Seconds between background checkpoints. Defaults to 30.
+            checkpoint_wal_ops (int, optional): Number of logged operations that triggers a checkpoint early.
+                Defaults to 1000.
+            compact_ratio (float, optional): Fraction of deleted vectors in the index that triggers compaction
+                at checkpoint time. Defaults to 0.2.
+            filter_mode (str, optional): 'prefilter' restricts the search to the vectors matching the
+                user_id/agent_id/run_id filters; 'postfilter' searches the whole index and filters the results.
+                Defaults to "prefilter".
         """
         self.collection_name = collection_name
         self.path = path or f"/tmp/faiss/{collection_name}"
         self.distance_strategy = distance_strategy
         self.normalize_L2 = normalize_L2
         self.embedding_model_dims = embedding_model_dims
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint_wal_ops = checkpoint_wal_ops
+        self.compact_ratio = compact_ratio
+        self.filter_mode = filter_mode
 
         # Initialize storage structures
         self.index = None
         self.docstore = {}
+        # FAISS int64 id <-> memory id; FAISS ids are allocated from next_index and never reused
         self.index_to_id = {}
+        self.id_to_index = {}
+        self.next_index = 0
+        # FAISS ids of deleted or replaced vectors still present in the index until compact()
+        self.tombstones = set()
+        # (payload key, value) -> FAISS ids of live vectors, for PREFILTER_KEYS
+        self.filter_ids = {}
+
+        self._lock = threading.RLock()
+        self._checkpoint_lock = threading.Lock()
+        self._wal = None
+        self._wal_ops = 0
+        self._dirty = False
+        self._checkpoint_requested = threading.Event()
+        self._closed = threading.Event()
+        self._checkpoint_thread = None
 
         # Create directory if it doesn't exist
         if self.path:
-            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            os.makedirs(self.path, exist_ok=True)
 
             # Try to load existing index if available
-            index_path = f"{self.path}/{collection_name}.faiss"
-            docstore_path = f"{self.path}/{collection_name}.pkl"
-            if os.path.exists(index_path) and os.path.exists(docstore_path):
-                self._load(index_path, docstore_path)
-            else:
-                self.create_col(collection_name)
+            if os.path.exists(self._index_path) and os.path.exists(self._docstore_path):
+                self._load(self._index_path, self._docstore_path)
+            if self.index is None:
+                self.index = self._build_index(self.distance_strategy)
+
+            # Apply writes that were logged after the last checkpoint
+            self._replay_wal()
+            self._open_wal()
+
+            self._checkpoint_thread = threading.Thread(
+                target=self._checkpoint_loop, name=f"faiss-checkpoint-{collection_name}", daemon=True
+            )
+            self._checkpoint_thread.start()
+            # Unregistered by close() so that closed stores can be garbage-collected
+            atexit.register(self.close)
+        else:
+            self.create_col(collection_name)
+
+    @property
+    def _index_path(self) -> str:
+        return f"{self.path}/{self.collection_name}.faiss"
+
+    @property
+    def _docstore_path(self) -> str:
+        return f"{self.path}/{self.collection_name}.pkl"
+
+    @property
+    def _wal_path(self) -> str:
+        return f"{self.path}/{self.collection_name}.wal"
+
+    @property
+    def _rotated_wal_path(self) -> str:
+        # Log segment covered by a checkpoint that is being written
+        return f"{self.path}/{self.collection_name}.wal.1"
+
+    def _build_index(self, distance_strategy: str):
+        if distance_strategy.lower() == "inner_product" or distance_strategy.lower() == "cosine":
+            return faiss.IndexIDMap2(faiss.IndexFlatIP(self.embedding_model_dims))
+        return faiss.IndexIDMap2(faiss.IndexFlatL2(self.embedding_model_dims))
 
     def _load(self, index_path: str, docstore_path: str):
         """
@@ -83,31 +165,291 @@ class FAISS(VectorStoreBase):
             docstore_path (str): Path to docstore pickle file.
         """
         try:
-            self.index = faiss.read_index(index_path)
+            index = faiss.read_index(index_path)
             with open(docstore_path, "rb") as f:
-                self.docstore, self.index_to_id = pickle.load(f)
+                state = pickle.load(f)
+
+            if isinstance(state, dict):
+                self.docstore = state["docstore"]
+                self.index_to_id = state["index_to_id"]
+                self.tombstones = state["tombstones"]
+                self.next_index = state["next_index"]
+            else:
+                # Snapshot written before the index was ID-mapped: (docstore, position -> id)
+                self.docstore, self.index_to_id = state
+
+            if not isinstance(index, faiss.IndexIDMap2):
+                index = self._convert_flat_index(index)
+
+            self.index = index
+            self.id_to_index = {vector_id: index_id for index_id, vector_id in self.index_to_id.items()}
+            for index_id, vector_id in self.index_to_id.items():
+                self._add_filter_ids(index_id, self.docstore[vector_id])
             logger.info(f"Loaded FAISS index from {index_path} with {self.index.ntotal} vectors")
         except Exception as e:
             logger.warning(f"Failed to load FAISS index: {e}")
 
+            self.index = None
             self.docstore = {}
             self.index_to_id = {}
+            self.id_to_index = {}
+            self.tombstones = set()
+            self.filter_ids = {}
+            self.next_index = 0
+
+    def _convert_flat_index(self, flat_index):
+        """Copy the live vectors of a position-addressed flat index into an ID-mapped index."""
+        index = self._build_index(self.distance_strategy)
+        vectors = flat_index.reconstruct_n(0, flat_index.ntotal) if flat_index.ntotal else None
+
+        index_to_id = {}
+        positions = []
+        for position, vector_id in sorted(self.index_to_id.items()):
+            if position < flat_index.ntotal and vector_id in self.docstore:
+                index_to_id[len(positions)] = vector_id
+                positions.append(position)
+
+        if positions:
+            index.add_with_ids(vectors[positions], np.arange(len(positions), dtype=np.int64))
+
+        self.index_to_id = index_to_id
+        self.tombstones = set()
+        self.next_index = len(positions)
+        self._dirty = True
+        logger.info(f"Converted FAISS index {self.collection_name} to an ID-mapped index")
+        return index
+
+    def _replay_wal(self):
+        """Apply the write-ahead log on top of the loaded snapshot."""
+        # Vectors already in the index were covered by the snapshot; only their mappings may be missing
+        present = set(faiss.vector_to_array(self.index.id_map).tolist())
+        replayed = 0
+
+        for wal_path in (self._rotated_wal_path, self._wal_path):
+            if not os.path.exists(wal_path):
+                continue
+            with open(wal_path, "rb") as f:
+                while True:
+                    try:
+                        op, vector_id, index_id, vector, payload = pickle.load(f)
+                    except EOFError:
+                        break
+                    except Exception as e:
+                        # Torn write at the end of the log
+                        logger.warning(f"Stopped replaying {wal_path} at a corrupt record: {e}")
+                        break
 
-    def _save(self):
-        """Save FAISS index and docstore to disk."""
-        if not self.path or not self.index:
+                    if op == WAL_UPSERT:
+                        if index_id in present:
+                            self._apply_mapping(vector_id, index_id, payload)
+                        else:
+                            vectors_np = np.frombuffer(vector, dtype=np.float32).reshape(1, -1)
+                            self._apply_upserts([vector_id], [index_id], vectors_np, [payload])
+                            present.add(index_id)
+                    elif op == WAL_PAYLOAD:
+                        if vector_id in self.docstore:
+                            self._apply_payload(vector_id, payload)
+                    elif op == WAL_DELETE:
+                        self._apply_delete(vector_id)
+                    replayed += 1
+
+        # Vectors no mapping refers to, e.g. left by an interrupted checkpoint
+        self.tombstones |= present - self.index_to_id.keys()
+        if replayed:
+            self._dirty = True
+            logger.info(f"Replayed {replayed} write-ahead log records for {self.collection_name}")
+
+    def _open_wal(self):
+        if self._wal is not None:
+            self._wal.close()
+        self._wal = open(self._wal_path, "ab")
+        self._wal_ops = 0
+
+    def _write_wal(self, records):
+        """Append records to the write-ahead log. Must be called with the lock held."""
+        self._dirty = True
+        if self._wal is None:
             return
 
-        try:
-            os.makedirs(self.path, exist_ok=True)
-            index_path = f"{self.path}/{self.collection_name}.faiss"
-            docstore_path = f"{self.path}/{self.collection_name}.pkl"
+        for record in records:
+            pickle.dump(record, self._wal, protocol=pickle.HIGHEST_PROTOCOL)
+        self._wal.flush()
+
+        self._wal_ops += len(records)
+        if self._wal_ops >= self.checkpoint_wal_ops:
+            self._checkpoint_requested.set()
+
+    def _rotate_wal(self):
+        """Move the current log aside so writes can continue while a checkpoint is written."""
+        self._wal.close()
+        if os.path.exists(self._rotated_wal_path):
+            # A previous checkpoint failed; keep its segment and append the current one
+            with open(self._rotated_wal_path, "ab") as dst, open(self._wal_path, "rb") as src:
+                shutil.copyfileobj(src, dst)
+            os.remove(self._wal_path)
+        else:
+            os.replace(self._wal_path, self._rotated_wal_path)
+        self._wal = open(self._wal_path, "ab")
+        self._wal_ops = 0
+
+    def _add_filter_ids(self, index_id: int, payload: Dict):
+        for key in PREFILTER_KEYS:
+            value = payload.get(key)
+            if isinstance(value, (str, int)):
+                self.filter_ids.setdefault((key, value), set()).add(index_id)
+
+    def _remove_filter_ids(self, index_id: int, payload: Dict):
+        for key in PREFILTER_KEYS:
+            value = payload.get(key)
+            ids = self.filter_ids.get((key, value)) if isinstance(value, (str, int)) else None
+            if ids is not None:
+                ids.discard(index_id)
+                if not ids:
+                    del self.filter_ids[(key, value)]
+
+    def _apply_mapping(self, vector_id: str, index_id: int, payload: Dict):
+        old_index_id = self.id_to_index.get(vector_id)
+        if old_index_id is not None:
+            self._remove_filter_ids(old_index_id, self.docstore[vector_id])
+            if old_index_id != index_id:
+                self.index_to_id.pop(old_index_id, None)
+                self.tombstones.add(old_index_id)
+
+        self.index_to_id[index_id] = vector_id
+        self.id_to_index[vector_id] = index_id
+        self.docstore[vector_id] = payload
+        self._add_filter_ids(index_id, payload)
+        self.next_index = max(self.next_index, index_id + 1)
+
+    def _apply_payload(self, vector_id: str, payload: Dict):
+        index_id = self.id_to_index[vector_id]
+        self._remove_filter_ids(index_id, self.docstore[vector_id])
+        self.docstore[vector_id] = payload
+        self._add_filter_ids(index_id, payload)
+
+    def _apply_upserts(self, ids: List[str], index_ids: List[int], vectors_np, payloads: List[Dict]):
+        self.index.add_with_ids(vectors_np, np.asarray(index_ids, dtype=np.int64))
+        for vector_id, index_id, payload in zip(ids, index_ids, payloads):
+            self._apply_mapping(vector_id, int(index_id), payload)
+
+    def _apply_delete(self, vector_id: str) -> bool:
+        index_id = self.id_to_index.pop(vector_id, None)
+        if index_id is None:
+            return False
+
+        self.index_to_id.pop(index_id, None)
+        self._remove_filter_ids(index_id, self.docstore.pop(vector_id))
+        self.tombstones.add(index_id)
+        return True
 
-            faiss.write_index(self.index, index_path)
-            with open(docstore_path, "wb") as f:
-                pickle.dump((self.docstore, self.index_to_id), f)
-        except Exception as e:
-            logger.warning(f"Failed to save FAISS index: {e}")
+    def checkpoint(self):
+        """
+        Write a snapshot of the index and docstore and truncate the write-ahead log.
+
+        Runs in the background automatically; call it directly to force a snapshot.
+
+        Inserts, deletes and searches pause while the raw vectors, ids and docstore are copied
+        under the lock (a memory copy proportional to the index size, about 0.1s for 50k
+        1536-dimensional vectors). Rebuilding the index from the copy and writing it to disk
+        happen outside the lock.
+        """
+        if not self.path or self._wal is None:
+            return
+
+        with self._checkpoint_lock:
+            with self._lock:
+                if not self._dirty or self.index is None:
+                    return
+                snapshot = self._copy_index_arrays()
+                state = {
+                    "docstore": dict(self.docstore),
+                    "index_to_id": dict(self.index_to_id),
+                    "tombstones": set(self.tombstones),
+                    "next_index": self.next_index,
+                }
+                self._rotate_wal()
+                self._dirty = False
+
+            try:
+                index = self._index_from_arrays(*snapshot)
+                # The index is written first: on load, vectors in the index without a mapping are
+                # mapped again by the log replay or become tombstones
+                faiss.write_index(index, f"{self._index_path}.tmp")
+                os.replace(f"{self._index_path}.tmp", self._index_path)
+                with open(f"{self._docstore_path}.tmp", "wb") as f:
+                    pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(f"{self._docstore_path}.tmp", self._docstore_path)
+                os.remove(self._rotated_wal_path)
+            except Exception as e:
+                logger.warning(f"Failed to save FAISS index: {e}")
+                with self._lock:
+                    self._dirty = True
+
+    def _copy_index_arrays(self):
+        """Copy the vectors and FAISS ids of the index. Must be called with the lock held."""
+        flat = faiss.downcast_index(self.index.index)
+        return (
+            self.index.d,
+            self.index.metric_type,
+            faiss.vector_to_array(flat.codes),
+            faiss.vector_to_array(self.index.id_map),
+        )
+
+    @staticmethod
+    def _index_from_arrays(dimension: int, metric_type: int, codes, index_ids):
+        index = faiss.IndexIDMap2(faiss.IndexFlat(dimension, metric_type))
+        if len(index_ids):
+            index.add_with_ids(codes.view(np.float32).reshape(-1, dimension), index_ids)
+        return index
+
+    def compact(self) -> int:
+        """
+        Remove deleted and replaced vectors from the FAISS index.
+
+        Returns:
+            int: Number of vectors removed.
+        """
+        with self._lock:
+            if self.index is None or not self.tombstones:
+                return 0
+
+            removed = self.index.remove_ids(np.fromiter(self.tombstones, dtype=np.int64))
+            self.tombstones.clear()
+            self._dirty = True
+
+        logger.info(f"Compacted {removed} vectors from collection {self.collection_name}")
+        return removed
+
+    def _checkpoint_loop(self):
+        while not self._closed.is_set():
+            self._checkpoint_requested.wait(self.checkpoint_interval)
+            self._checkpoint_requested.clear()
+            if self._closed.is_set():
+                break
+
+            try:
+                if self.index is not None and len(self.tombstones) > self.compact_ratio * self.index.ntotal:
+                    self.compact()
+                self.checkpoint()
+            except Exception as e:
+                logger.warning(f"FAISS background checkpoint failed: {e}")
+
+    def close(self):
+        """Stop the background checkpoint thread and write a final checkpoint."""
+        if self._closed.is_set():
+            return
+
+        self._closed.set()
+        atexit.unregister(self.close)
+        self._checkpoint_requested.set()
+        if self._checkpoint_thread is not None and self._checkpoint_thread is not threading.current_thread():
+            self._checkpoint_thread.join()
+
+        self.checkpoint()
+        with self._lock:
+            if self._wal is not None:
+                self._wal.close()
+                self._wal = None
 
     def _parse_output(self, scores, ids, limit=None) -> List[OutputData]:
         """
@@ -164,15 +506,26 @@ class FAISS(VectorStoreBase):
         """
         distance_strategy = distance or self.distance_strategy
 
-        # Create index based on distance strategy
-        if distance_strategy.lower() == "inner_product" or distance_strategy.lower() == "cosine":
-            self.index = faiss.IndexFlatIP(self.embedding_model_dims)
-        else:
-            self.index = faiss.IndexFlatL2(self.embedding_model_dims)
+        with self._lock:
+            # Create index based on distance strategy
+            self.index = self._build_index(distance_strategy)
+
+            self.collection_name = name
+            self.docstore = {}
+            self.index_to_id = {}
+            self.id_to_index = {}
+            self.tombstones = set()
+            self.filter_ids = {}
+            self.next_index = 0
+            self._dirty = True
 
-        self.collection_name = name
+            if self._wal is not None:
+                # Start an empty log for the new collection
+                self._wal.close()
+                self._wal = open(self._wal_path, "wb")
+                self._wal_ops = 0
 
-        self._save()
+        self.checkpoint()
 
         return self
 
@@ -207,14 +560,16 @@ class FAISS(VectorStoreBase):
         if self.normalize_L2 and self.distance_strategy.lower() == "euclidean":
             faiss.normalize_L2(vectors_np)
 
-        self.index.add(vectors_np)
-
-        starting_idx = len(self.index_to_id)
-        for i, (vector_id, payload) in enumerate(zip(ids, payloads)):
-            self.docstore[vector_id] = payload.copy()
-            self.index_to_id[starting_idx + i] = vector_id
-
-        self._save()
+        payloads = [payload.copy() for payload in payloads]
+        with self._lock:
+            index_ids = list(range(self.next_index, self.next_index + len(vectors)))
+            self._write_wal(
+                [
+                    (WAL_UPSERT, vector_id, index_id, vectors_np[i].tobytes(), payload)
+                    for i, (vector_id, index_id, payload) in enumerate(zip(ids, index_ids, payloads))
+                ]
+            )
+            self._apply_upserts(ids, index_ids, vectors_np, payloads)
 
         logger.info(f"Inserted {len(vectors)} vectors into collection {self.collection_name}")
 
@@ -224,6 +579,12 @@ class FAISS(VectorStoreBase):
         """
         Search for similar vectors.
 
+        In 'prefilter' mode, user_id/agent_id/run_id filters restrict the FAISS search to the
+        matching vectors with an ID selector when they select at most PREFILTER_MAX_FRACTION of
+        the index. Other filters, and all filters otherwise, are applied to the results, so the
+        number of candidates is grown until `limit` results are found or every candidate has
+        been searched.
+
         Args:
             query (str): Query (not used, kept for API compatibility).
             vectors (List[list]): List of vectors to search.
@@ -244,21 +605,73 @@ class FAISS(VectorStoreBase):
         if self.normalize_L2 and self.distance_strategy.lower() == "euclidean":
             faiss.normalize_L2(query_vectors)
 
-        fetch_k = limit * 2 if filters else limit
-        scores, indices = self.index.search(query_vectors, fetch_k)
+        with self._lock:
+            params = None
+            candidates = self.index.ntotal
+            live = len(self.index_to_id)
+
+            if filters and self.filter_mode == "prefilter":
+                selected_ids, remaining = self._select_filter_ids(filters)
+                if selected_ids is not None and len(selected_ids) <= PREFILTER_MAX_FRACTION * candidates:
+                    # Selected ids are all live, so no over-fetch is needed for tombstones
+                    candidates = live = len(selected_ids)
+                    filters = remaining
+                    params = faiss.SearchParameters(
+                        sel=faiss.IDSelectorBatch(np.fromiter(selected_ids, dtype=np.int64, count=len(selected_ids)))
+                    )
+                elif selected_ids is not None:
+                    # Large selection: post-filter, sizing the first fetch by the share of matching vectors
+                    live = len(selected_ids)
+
+            if live == 0:
+                return []
+
+            # Start from the number of candidates expected to contain `limit` live vectors
+            fetch_k = min(candidates, math.ceil(limit * candidates / live) * (2 if filters else 1))
+            while True:
+                scores, indices = self.index.search(query_vectors, fetch_k, params=params)
+                matched = []
+                for score, index_id in zip(scores[0], indices[0]):
+                    vector_id = self.index_to_id.get(int(index_id))
+                    if vector_id is None:
+                        continue
+                    if filters and not self._apply_filters(self.docstore[vector_id], filters):
+                        continue
+                    matched.append((vector_id, float(score)))
+                    if len(matched) >= limit:
+                        break
+                if len(matched) >= limit or fetch_k >= candidates:
+                    break
+                fetch_k = min(candidates, fetch_k * 4)
+
+            return [
+                OutputData(id=vector_id, score=score, payload=self.docstore[vector_id].copy())
+                for vector_id, score in matched
+            ]
 
-        results = self._parse_output(scores[0], indices[0], limit)
+    def _select_filter_ids(self, filters: Dict):
+        """
+        Resolve the PREFILTER_KEYS filters to the FAISS ids of matching live vectors.
 
-        if filters:
-            filtered_results = []
-            for result in results:
-                if self._apply_filters(result.payload, filters):
-                    filtered_results.append(result)
-                    if len(filtered_results) >= limit:
-                        break
-            results = filtered_results[:limit]
+        Returns:
+            tuple: (set of FAISS ids, or None when no filter could be resolved; filters left to apply to results)
+        """
+        selected_ids = None
+        remaining = {}
+        for key, value in filters.items():
+            values = value if isinstance(value, list) else [value]
+            if key not in PREFILTER_KEYS or not all(isinstance(v, (str, int)) for v in values):
+                remaining[key] = value
+                continue
 
-        return results
+            if len(values) == 1:
+                # Not copied: only read while the lock is held
+                ids = self.filter_ids.get((key, values[0]), set())
+            else:
+                ids = set().union(*(self.filter_ids.get((key, v), set()) for v in values))
+            selected_ids = ids if selected_ids is None else selected_ids & ids
+
+        return selected_ids, remaining
 
     def _apply_filters(self, payload: Dict, filters: Dict) -> bool:
         """
@@ -290,27 +703,39 @@ class FAISS(VectorStoreBase):
         """
         Delete a vector by ID.
 
+        The vector is removed from the FAISS index by the next compaction.
+
         Args:
             vector_id (str): ID of the vector to delete.
         """
         if self.index is None:
             raise ValueError("Collection not initialized. Call create_col first.")
 
-        index_to_delete = None
-        for idx, vid in self.index_to_id.items():
-            if vid == vector_id:
-                index_to_delete = idx
-                break
+        with self._lock:
+            if vector_id in self.id_to_index:
+                self._write_wal([(WAL_DELETE, vector_id, None, None, None)])
+                self._apply_delete(vector_id)
+                logger.info(f"Deleted vector {vector_id} from collection {self.collection_name}")
+            else:
+                logger.warning(f"Vector {vector_id} not found in collection {self.collection_name}")
+
+    def delete_many(self, vector_ids: List[str]):
+        """
+        Delete vectors by ID.
 
-        if index_to_delete is not None:
-            self.docstore.pop(vector_id, None)
-            self.index_to_id.pop(index_to_delete, None)
+        Args:
+            vector_ids (List[str]): IDs of the vectors to delete.
+        """
+        if self.index is None:
+            raise ValueError("Collection not initialized. Call create_col first.")
 
-            self._save()
+        with self._lock:
+            existing = [vector_id for vector_id in vector_ids if vector_id in self.id_to_index]
+            self._write_wal([(WAL_DELETE, vector_id, None, None, None) for vector_id in existing])
+            for vector_id in existing:
+                self._apply_delete(vector_id)
 
-            logger.info(f"Deleted vector {vector_id} from collection {self.collection_name}")
-        else:
-            logger.warning(f"Vector {vector_id} not found in collection {self.collection_name}")
+        logger.info(f"Deleted {len(existing)} vectors from collection {self.collection_name}")
 
     def update(
         self,
@@ -329,20 +754,18 @@ class FAISS(VectorStoreBase):
         if self.index is None:
             raise ValueError("Collection not initialized. Call create_col first.")
 
-        if vector_id not in self.docstore:
-            raise ValueError(f"Vector {vector_id} not found")
-
-        current_payload = self.docstore[vector_id].copy()
+        with self._lock:
+            if vector_id not in self.docstore:
+                raise ValueError(f"Vector {vector_id} not found")
 
-        if payload is not None:
-            self.docstore[vector_id] = payload.copy()
-            current_payload = self.docstore[vector_id].copy()
+            current_payload = payload.copy() if payload is not None else self.docstore[vector_id].copy()
 
-        if vector is not None:
-            self.delete(vector_id)
-            self.insert([vector], [current_payload], [vector_id])
-        else:
-            self._save()
+            if vector is not None:
+                # The new vector gets a new FAISS id, the old one becomes a tombstone
+                self.insert([vector], [current_payload], [vector_id])
+            else:
+                self._write_wal([(WAL_PAYLOAD, vector_id, None, None, current_payload)])
+                self._apply_payload(vector_id, current_payload)
 
         logger.info(f"Updated vector {vector_id} in collection {self.collection_name}")
 
@@ -359,15 +782,14 @@ class FAISS(VectorStoreBase):
         if self.index is None:
             raise ValueError("Collection not initialized. Call create_col first.")
 
-        if vector_id not in self.docstore:
+        payload = self.docstore.get(vector_id)
+        if payload is None:
             return None
 
-        payload = self.docstore[vector_id].copy()
-
         return OutputData(
             id=vector_id,
             score=None,
-            payload=payload,
+            payload=payload.copy(),
         )
 
     def list_cols(self) -> List[str]:
@@ -394,23 +816,29 @@ class FAISS(VectorStoreBase):
         """
         Delete a collection.
         """
-        if self.path:
-            try:
-                index_path = f"{self.path}/{self.collection_name}.faiss"
-                docstore_path = f"{self.path}/{self.collection_name}.pkl"
-
-                if os.path.exists(index_path):
-                    os.remove(index_path)
-                if os.path.exists(docstore_path):
-                    os.remove(docstore_path)
-
-                logger.info(f"Deleted collection {self.collection_name}")
-            except Exception as e:
-                logger.warning(f"Failed to delete collection: {e}")
-
-        self.index = None
-        self.docstore = {}
-        self.index_to_id = {}
+        with self._checkpoint_lock, self._lock:
+            if self.path:
+                try:
+                    for file_path in (self._index_path, self._docstore_path, self._rotated_wal_path):
+                        if os.path.exists(file_path):
+                            os.remove(file_path)
+                    if self._wal is not None:
+                        self._wal.close()
+                        self._wal = open(self._wal_path, "wb")
+                        self._wal_ops = 0
+
+                    logger.info(f"Deleted collection {self.collection_name}")
+                except Exception as e:
+                    logger.warning(f"Failed to delete collection: {e}")
+
+            self.index = None
+            self.docstore = {}
+            self.index_to_id = {}
+            self.id_to_index = {}
+            self.tombstones = set()
+            self.filter_ids = {}
+            self.next_index = 0
+            self._dirty = False
 
     def col_info(self) -> Dict:
         """
@@ -424,7 +852,8 @@ class FAISS(VectorStoreBase):
 
         return {
             "name": self.collection_name,
-            "count": self.index.ntotal,
+            "count": len(self.index_to_id),
+            "tombstones": len(self.tombstones),
             "dimension": self.index.d,
             "distance": self.distance_strategy,
         }
@@ -446,7 +875,10 @@ class FAISS(VectorStoreBase):
         results = []
         count = 0
 
-        for vector_id, payload in self.docstore.items():
+        with self._lock:
+            items = list(self.docstore.items())
+
+        for vector_id, payload in items:
             if filters and not self._apply_filters(payload, filters):
                 continue
 
@@ -3,7 +3,8 @@ import time
 from typing import Any, Dict, List, Optional
 
 try:
-    from opensearchpy import OpenSearch, RequestsHttpConnection
+    from opensearchpy import NotFoundError, OpenSearch, RequestsHttpConnection
+    from opensearchpy.helpers import bulk, scan
 except ImportError:
     raise ImportError("OpenSearch requires extra dependencies. Install with `pip install opensearch-py`") from None
 
@@ -14,6 +15,9 @@ from mem0.vector_stores.base import VectorStoreBase
 
 logger = logging.getLogger(__name__)
 
+# k-NN engines that support filters inside the knn query (efficient k-NN filtering)
+EFFICIENT_FILTER_ENGINES = ("lucene", "faiss")
+
 
 class OutputData(BaseModel):
     id: str
@@ -39,7 +43,89 @@ class OpenSearchDB(VectorStoreBase):
 
         self.collection_name = config.collection_name
         self.embedding_model_dims = config.embedding_model_dims
+        self.knn_engine = config.knn_engine
+        self.filter_mode = config.filter_mode
         self.create_col(self.collection_name, self.embedding_model_dims)
+        self.efficient_filter = self._use_efficient_filter(self.filter_mode)
+
+    def _use_efficient_filter(self, filter_mode: str) -> bool:
+        """Decide whether filters go inside the knn query, based on the engine of the existing index."""
+        if filter_mode != "auto":
+            return filter_mode == "efficient"
+
+        try:
+            engine = self._index_engine(self.collection_name)
+        except Exception as e:
+            logger.warning(f"Failed to read k-NN engine of {self.collection_name}, using post-filtering: {e}")
+            return False
+
+        if engine not in EFFICIENT_FILTER_ENGINES:
+            logger.info(
+                f"Index {self.collection_name} uses the {engine} engine, which does not support efficient "
+                f"k-NN filtering; run `python -m src.interfaces.cli.vector_store reindex` to enable it"
+            )
+        return engine in EFFICIENT_FILTER_ENGINES
+
+    def _index_engine(self, index: str) -> str:
+        """k-NN engine of an index (or of the index behind an alias)."""
+        mapping = self.client.indices.get_mapping(index=index)
+        # Keyed by the concrete index name, which differs from collection_name after a reindex
+        vector_field = next(iter(mapping.values()))["mappings"]["properties"]["vector_field"]
+        return vector_field.get("method", {}).get("engine", "nmslib")
+
+    def reindex_knn_engine(self) -> str:
+        """Copy the collection into a new index that uses `knn_engine` and make collection_name point to it.
+
+        The engine of an existing index cannot be changed, and nmslib indices (the engine used before
+        knn_engine was configurable) do not support efficient k-NN filtering. The new index is named
+        "<collection_name>_<engine>_<timestamp>", collection_name becomes an alias of it and the old index
+        is deleted. Run it when no memory builds are writing to the index, otherwise writes made during the
+        copy are lost.
+
+        Returns:
+            str: Name of the index behind collection_name afterwards.
+        """
+        sources = list(self.client.indices.get(index=self.collection_name).keys())
+        if len(sources) != 1:
+            raise RuntimeError(f"{self.collection_name} resolves to {len(sources)} indices, expected one")
+        source = sources[0]
+
+        if self._index_engine(source) == self.knn_engine:
+            logger.info(f"Index {source} already uses the {self.knn_engine} engine")
+            return source
+
+        dest = f"{self.collection_name}_{self.knn_engine}_{int(time.time())}"
+        self.create_col(dest, self.embedding_model_dims)
+        response = self.client.reindex(
+            body={"source": {"index": source}, "dest": {"index": dest}},
+            wait_for_completion=True,
+            refresh=True,
+            request_timeout=3600,
+        )
+        if response.get("failures"):
+            self.client.indices.delete(index=dest)
+            raise RuntimeError(f"Reindex of {source} into {dest} failed: {response['failures'][:5]}")
+
+        if source == self.collection_name:
+            # An alias cannot take the name of an existing index
+            self.client.indices.delete(index=source)
+            self.client.indices.update_aliases(
+                body={"actions": [{"add": {"index": dest, "alias": self.collection_name}}]}
+            )
+        else:
+            self.client.indices.update_aliases(
+                body={
+                    "actions": [
+                        {"remove": {"index": source, "alias": self.collection_name}},
+                        {"add": {"index": dest, "alias": self.collection_name}},
+                    ]
+                }
+            )
+            self.client.indices.delete(index=source)
+
+        logger.info(f"Reindexed {response.get('total', 0)} documents from {source} into {dest}")
+        self.efficient_filter = self._use_efficient_filter(self.filter_mode)
+        return dest
 
     def create_index(self) -> None:
         """Create OpenSearch index with proper mappings if it doesn't exist."""
@@ -75,7 +161,7 @@ class OpenSearchDB(VectorStoreBase):
                     "vector_field": {
                         "type": "knn_vector",
                         "dimension": vector_size,
-                        "method": {"engine": "nmslib", "name": "hnsw", "space_type": "cosinesimil"},
+                        "method": {"engine": self.knn_engine, "name": "hnsw", "space_type": "cosinesimil"},
                     },
                     "payload": {"type": "object"},
                     "id": {"type": "keyword"},
@@ -107,19 +193,24 @@ class OpenSearchDB(VectorStoreBase):
         self, vectors: List[List[float]], payloads: Optional[List[Dict]] = None, ids: Optional[List[str]] = None
     ) -> List[OutputData]:
         """Insert vectors into the index."""
+        return self.insert_many(vectors, payloads=payloads, ids=ids)
+
+    def insert_many(
+        self, vectors: List[List[float]], payloads: Optional[List[Dict]] = None, ids: Optional[List[str]] = None
+    ) -> List[OutputData]:
+        """Insert vectors with a single _bulk request, using our id as the document _id."""
         if not ids:
             ids = [str(i) for i in range(len(vectors))]
 
         if payloads is None:
             payloads = [{} for _ in range(len(vectors))]
 
-        for i, (vec, id_) in enumerate(zip(vectors, ids)):
-            body = {
-                "vector_field": vec,
-                "payload": payloads[i],
-                "id": id_,
-            }
-            self.client.index(index=self.collection_name, body=body)
+        inserts = [
+            {"vector_id": id_, "vector": vec, "payload": payloads[i]} for i, (vec, id_) in enumerate(zip(vectors, ids))
+        ]
+        failed_ids = self.bulk_write(inserts=inserts)
+        if failed_ids:
+            raise RuntimeError(f"Failed to insert vectors into {self.collection_name}: {failed_ids}")
 
         results = []
 
@@ -128,22 +219,12 @@ class OpenSearchDB(VectorStoreBase):
     def search(
         self, query: str, vectors: List[float], limit: int = 5, filters: Optional[Dict] = None
     ) -> List[OutputData]:
-        """Search for similar vectors using OpenSearch k-NN search with optional filters."""
-
-        # Base KNN query
-        knn_query = {
-            "knn": {
-                "vector_field": {
-                    "vector": vectors,
-                    "k": limit * 2,
-                }
-            }
-        }
+        """Search for similar vectors using OpenSearch k-NN search with optional filters.
 
-        # Start building the full query
-        # Just Return limit results
-        query_body = {"size": limit, "query": None}
-        # query_body = {"size": limit * 2, "query": None}
+        With efficient filtering the filters are applied during the k-NN search, so `limit` matching
+        documents are returned even when few documents in the index match. Otherwise the top
+        `limit * 2` neighbours are filtered afterwards.
+        """
 
         # Prepare filter conditions if applicable
         filter_clauses = []
@@ -153,11 +234,36 @@ class OpenSearchDB(VectorStoreBase):
                 if value:
                     filter_clauses.append({"term": {f"payload.{key}.keyword": value}})
 
-        # Combine knn with filters if needed
-        if filter_clauses:
-            query_body["query"] = {"bool": {"must": knn_query, "filter": filter_clauses}}
+        if filter_clauses and self.efficient_filter:
+            query_body = {
+                "size": limit,
+                "query": {
+                    "knn": {
+                        "vector_field": {
+                            "vector": vectors,
+                            "k": limit,
+                            "filter": {"bool": {"filter": filter_clauses}},
+                        }
+                    }
+                },
+            }
         else:
-            query_body["query"] = knn_query
+            # Base KNN query
+            knn_query = {
+                "knn": {
+                    "vector_field": {
+                        "vector": vectors,
+                        "k": limit * 2,
+                    }
+                }
+            }
+
+            # Just Return limit results
+            query_body = {"size": limit, "query": knn_query}
+
+            # Combine knn with filters if needed
+            if filter_clauses:
+                query_body["query"] = {"bool": {"must": knn_query, "filter": filter_clauses}}
 
         # Execute search
         response = self.client.search(index=self.collection_name, body=query_body)
@@ -170,47 +276,118 @@ class OpenSearchDB(VectorStoreBase):
         return results
 
     def delete(self, vector_id: str) -> None:
-        """Delete a vector by custom ID."""
-        # First, find the document by custom ID
-        search_query = {"query": {"term": {"id": vector_id}}}
-
-        response = self.client.search(index=self.collection_name, body=search_query)
-        hits = response.get("hits", {}).get("hits", [])
-
-        if not hits:
-            return
-
-        opensearch_id = hits[0]["_id"]
+        """Delete a vector by ID."""
+        self.delete_many([vector_id])
 
-        # Delete using the actual document ID
-        self.client.delete(index=self.collection_name, id=opensearch_id)
+    def delete_many(self, vector_ids: List[str]) -> None:
+        """Delete vectors by ID with a single _bulk request."""
+        self.bulk_write(deletes=vector_ids)
 
     def update(self, vector_id: str, vector: Optional[List[float]] = None, payload: Optional[Dict] = None) -> None:
-        """Update a vector and its payload using the custom 'id' field."""
+        """Update a vector and its payload by ID."""
+        self.update_many([{"vector_id": vector_id, "vector": vector, "payload": payload}])
+
+    def update_many(self, updates: List[Dict]) -> None:
+        """Update vectors and payloads with a single _bulk request."""
+        self.bulk_write(updates=updates)
+
+    def bulk_write(
+        self,
+        inserts: Optional[List[Dict]] = None,
+        updates: Optional[List[Dict]] = None,
+        deletes: Optional[List[str]] = None,
+    ) -> List[str]:
+        """Apply inserts, updates and deletes in a single _bulk request.
+
+        Documents indexed before our id became the _id are not found by _id; their
+        updates/deletes are retried against the _id found by a term query on `id`.
+
+        Args:
+            inserts (list): Dicts with vector_id, vector and payload.
+            updates (list): Dicts with vector_id and optional vector/payload.
+            deletes (list): Vector IDs.
+        Returns:
+            list: IDs whose operation failed. Deleting or updating a missing document is not a failure.
+        """
+        actions = []
+        for item in inserts or []:
+            actions.append(
+                {
+                    "_op_type": "index",
+                    "_index": self.collection_name,
+                    "_id": item["vector_id"],
+                    "_source": {"vector_field": item["vector"], "payload": item["payload"], "id": item["vector_id"]},
+                }
+            )
+        for item in updates or []:
+            doc = self._build_update_doc(item.get("vector"), item.get("payload"))
+            if doc:
+                actions.append(
+                    {"_op_type": "update", "_index": self.collection_name, "_id": item["vector_id"], "doc": doc}
+                )
+        for vector_id in deletes or []:
+            actions.append({"_op_type": "delete", "_index": self.collection_name, "_id": vector_id})
+
+        if not actions:
+            return []
 
-        # First, find the document by custom ID
-        search_query = {"query": {"term": {"id": vector_id}}}
+        _, errors = bulk(self.client, actions, raise_on_error=False, raise_on_exception=False)
+
+        failed_ids = []
+        not_found = {}
+        for error in errors:
+            op_type, info = next(iter(error.items()))
+            if info.get("status") == 404 and op_type in ("update", "delete"):
+                not_found[info["_id"]] = op_type
+            else:
+                logger.error(f"Bulk {op_type} failed for {info.get('_id')}: {info.get('error')}")
+                failed_ids.append(info.get("_id"))
+
+        if not_found:
+            updates_by_id = {item["vector_id"]: item for item in updates or []}
+            failed_ids.extend(self._retry_legacy_documents(not_found, updates_by_id))
+        return failed_ids
+
+    def _retry_legacy_documents(self, not_found: Dict[str, str], updates: Dict[str, Dict]) -> List[str]:
+        """Retry updates/deletes of documents whose _id is not our id."""
+        legacy_ids = self._find_legacy_ids(list(not_found))
+        actions = []
+        for vector_id, opensearch_id in legacy_ids.items():
+            if not_found[vector_id] == "delete":
+                actions.append({"_op_type": "delete", "_index": self.collection_name, "_id": opensearch_id})
+            else:
+                update = updates[vector_id]
+                doc = self._build_update_doc(update.get("vector"), update.get("payload"))
+                actions.append({"_op_type": "update", "_index": self.collection_name, "_id": opensearch_id, "doc": doc})
+
+        if not actions:
+            return []
 
+        _, errors = bulk(self.client, actions, raise_on_error=False, raise_on_exception=False)
+        opensearch_to_vector_id = {v: k for k, v in legacy_ids.items()}
+        failed_ids = []
+        for error in errors:
+            op_type, info = next(iter(error.items()))
+            if info.get("status") == 404:
+                continue
+            logger.error(f"Bulk {op_type} failed for {info.get('_id')}: {info.get('error')}")
+            failed_ids.append(opensearch_to_vector_id.get(info.get("_id"), info.get("_id")))
+        return failed_ids
+
+    def _find_legacy_ids(self, vector_ids: List[str]) -> Dict[str, str]:
+        """Find the OpenSearch _id of documents indexed with an auto-generated _id."""
+        search_query = {"query": {"terms": {"id": vector_ids}}, "size": len(vector_ids), "_source": ["id"]}
         response = self.client.search(index=self.collection_name, body=search_query)
-        hits = response.get("hits", {}).get("hits", [])
+        return {hit["_source"]["id"]: hit["_id"] for hit in response["hits"]["hits"] if hit["_source"].get("id")}
 
-        if not hits:
-            return
-
-        opensearch_id = hits[0]["_id"]  # The actual document ID in OpenSearch
-
-        # Prepare updated fields
+    @staticmethod
+    def _build_update_doc(vector: Optional[List[float]], payload: Optional[Dict]) -> Dict:
         doc = {}
         if vector is not None:
             doc["vector_field"] = vector
         if payload is not None:
             doc["payload"] = payload
-
-        if doc:
-            try:
-                response = self.client.update(index=self.collection_name, id=opensearch_id, body={"doc": doc})
-            except Exception:
-                pass
+        return doc
 
     def get(self, vector_id: str) -> Optional[OutputData]:
         """Retrieve a vector by ID."""
@@ -221,26 +398,94 @@ class OpenSearchDB(VectorStoreBase):
                 self.create_col(self.collection_name, self.embedding_model_dims)
                 return None
 
-            search_query = {"query": {"term": {"id": vector_id}}}
-            response = self.client.search(index=self.collection_name, body=search_query)
+            try:
+                response = self.client.get(index=self.collection_name, id=vector_id)
+                source = response["_source"]
+            except NotFoundError:
+                # Document indexed before our id became the _id
+                search_query = {"query": {"term": {"id": vector_id}}}
+                response = self.client.search(index=self.collection_name, body=search_query)
 
-            hits = response["hits"]["hits"]
+                hits = response["hits"]["hits"]
 
-            if not hits:
-                return None
+                if not hits:
+                    return None
+                source = hits[0]["_source"]
 
-            return OutputData(id=hits[0]["_source"].get("id"), score=1.0, payload=hits[0]["_source"].get("payload", {}))
+            return OutputData(id=source.get("id"), score=1.0, payload=source.get("payload", {}))
         except Exception as e:
             logger.error(f"Error retrieving vector {vector_id}: {str(e)}")
             return None
 
+    def migrate_document_ids(self, batch_size: int = 500) -> int:
+        """Reindex documents whose _id is not our id so that they can be accessed by _id directly.
+
+        Safe to run repeatedly; already migrated documents are skipped. Run it when no memory
+        builds are writing to the index, otherwise an update made during the scroll can be
+        overwritten by the copied document.
+        Run it through ``python -m src.interfaces.cli.vector_store migrate-ids``.
+
+        Args:
+            batch_size (int): Number of documents per scroll page and _bulk request.
+        Returns:
+            int: Number of migrated documents.
+        """
+        migrated = 0
+        pending = []
+
+        def flush():
+            nonlocal migrated
+            # Index the copies first and only delete originals whose copy was written
+            _, errors = bulk(
+                self.client,
+                [
+                    {"_op_type": "index", "_index": self.collection_name, "_id": source["id"], "_source": source}
+                    for _, source in pending
+                ],
+                raise_on_error=False,
+                raise_on_exception=False,
+            )
+            failed_ids = set()
+            for error in errors:
+                op_type, info = next(iter(error.items()))
+                logger.error(f"Migrate {op_type} failed for {info.get('_id')}: {info.get('error')}")
+                failed_ids.add(info.get("_id"))
+
+            deletes = [
+                {"_op_type": "delete", "_index": self.collection_name, "_id": opensearch_id}
+                for opensearch_id, source in pending
+                if source["id"] not in failed_ids
+            ]
+            deleted, errors = bulk(self.client, deletes, raise_on_error=False, raise_on_exception=False)
+            for error in errors:
+                op_type, info = next(iter(error.items()))
+                logger.error(f"Migrate {op_type} failed for {info.get('_id')}: {info.get('error')}")
+            migrated += deleted
+            pending.clear()
+
+        for hit in scan(self.client, index=self.collection_name, query={"query": {"match_all": {}}}, size=batch_size):
+            vector_id = hit["_source"].get("id")
+            if not vector_id or hit["_id"] == vector_id:
+                continue
+
+            pending.append((hit["_id"], hit["_source"]))
+            if len(pending) >= batch_size:
+                flush()
+
+        if pending:
+            flush()
+
+        logger.info(f"Migrated {migrated} documents in {self.collection_name} to use id as _id")
+        return migrated
+
     def list_cols(self) -> List[str]:
         """List all collections (indices)."""
         return list(self.client.indices.get_alias().keys())
 
     def delete_col(self) -> None:
-        """Delete a collection (index)."""
-        self.client.indices.delete(index=self.collection_name)
+        """Delete a collection (index), including the index behind it if collection_name is an alias."""
+        for index in self.client.indices.get(index=self.collection_name).keys():
+            self.client.indices.delete(index=index)
 
     def col_info(self, name: str) -> Any:
         """Get information about a collection (index)."""
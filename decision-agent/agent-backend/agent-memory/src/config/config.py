@@ -107,6 +107,12 @@ class Config:
             os.getenv("EMBEDDING_MODEL_DIMS")
             or self.config["vector_store"]["embedding_model_dims"]
         )
+        self.config["vector_store"]["knn_engine"] = os.getenv(
+            "OPENSEARCH_KNN_ENGINE"
+        ) or self.config["vector_store"].get("knn_engine", "lucene")
+        self.config["vector_store"]["filter_mode"] = os.getenv(
+            "OPENSEARCH_FILTER_MODE"
+        ) or self.config["vector_store"].get("filter_mode", "auto")
 
         # rerank
         self.config["rerank"]["rerank_url"] = (
@@ -190,6 +196,8 @@ class Config:
                 "user": vector_config.get("user", ""),
                 "password": vector_config.get("password", ""),
                 "embedding_model_dims": vector_config.get("embedding_model_dims", 768),
+                "knn_engine": vector_config.get("knn_engine", "lucene"),
+                "filter_mode": vector_config.get("filter_mode", "auto"),
             },
         )
 
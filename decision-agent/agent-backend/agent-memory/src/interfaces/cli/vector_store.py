@@ -0,0 +1,77 @@
+"""向量库维护命令
+
+一次性的维护任务，在没有记忆构建写入时执行（如升级窗口内、服务停止写入后）：
+
+    # 把旧文档的 OpenSearch _id 迁移为记忆 id（可重复执行，已迁移的文档会跳过）
+    python -m src.interfaces.cli.vector_store migrate-ids --batch-size 500
+
+    # 把索引重建为 vector_store.knn_engine 配置的引擎（如旧的 nmslib 索引迁到 lucene，以启用过滤下推），
+    # 完成后 collection_name 成为新索引的别名
+    python -m src.interfaces.cli.vector_store reindex
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from src.utils.logger import logger
+
+
+def create_vector_store():
+    """按服务配置创建向量库实例"""
+    from mem0.utils.factory import VectorStoreFactory
+    from src.config import memory_config
+
+    vector_store = memory_config.vector_store
+    return VectorStoreFactory.create(vector_store.provider, vector_store.config)
+
+
+def migrate_ids(vector_store, batch_size: int) -> int:
+    """迁移文档 _id，返回迁移成功的文档数"""
+    if not hasattr(vector_store, "migrate_document_ids"):
+        raise ValueError(
+            f"{type(vector_store).__name__} does not support document id migration"
+        )
+    migrated = vector_store.migrate_document_ids(batch_size=batch_size)
+    logger.info("Migrated {} documents to use memory id as _id", migrated)
+    return migrated
+
+
+def reindex(vector_store) -> str:
+    """按配置的 k-NN 引擎重建索引，返回重建后的索引名"""
+    if not hasattr(vector_store, "reindex_knn_engine"):
+        raise ValueError(f"{type(vector_store).__name__} does not support reindexing")
+    index = vector_store.reindex_knn_engine()
+    logger.info("Collection now served by index {}", index)
+    return index
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser(
+        "migrate-ids", help="Use memory id as the OpenSearch document _id"
+    )
+    migrate_parser.add_argument("--batch-size", type=int, default=500)
+    subparsers.add_parser(
+        "reindex", help="Rebuild the index with the configured k-NN engine"
+    )
+
+    args = parser.parse_args(argv)
+    vector_store = create_vector_store()
+    try:
+        if args.command == "migrate-ids":
+            migrate_ids(vector_store, args.batch_size)
+        elif args.command == "reindex":
+            reindex(vector_store)
+    except ValueError as e:
+        logger.error("{}", e)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""按用户过滤的向量检索基准
+
+对比 FAISS 向量库三种过滤方式在共享索引上的召回率和延迟：
+- legacy: 旧实现，固定取 limit * 2 个候选后在 Python 中过滤
+- postfilter: 全索引检索，候选数不足时自适应扩大
+- prefilter: 通过 user_id 的 ID selector 只检索该用户的向量
+
+模拟数据中一个重度用户占一半记忆，其余记忆分散在大量轻度用户上。
+召回率以该用户全部向量上的暴力检索结果为准。
+
+OpenSearch 的 efficient k-NN filtering 需要真实集群（lucene/faiss 引擎），不在本基准范围内。
+
+运行方式（在 agent-memory 目录下）：
+    python -m tests.benchmark.bench_filtered_search
+    python -m tests.benchmark.bench_filtered_search --size 200000 --queries 200
+"""
+
+import argparse
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from mem0.vector_stores.faiss import FAISS
+
+
+def build_store(path: str, size: int, dims: int, light_users: int, seed: int):
+    """构造共享索引，返回 (store, 向量, 每条向量的 user_id)"""
+    rng = np.random.default_rng(seed)
+    vectors = rng.random((size, dims), dtype=np.float32)
+    # 一半属于重度用户，其余均匀分给轻度用户
+    users = np.where(
+        rng.random(size) < 0.5,
+        "heavy",
+        np.char.add("light-", rng.integers(0, light_users, size).astype(str)),
+    )
+
+    store = FAISS("bench", path=path, embedding_model_dims=dims, checkpoint_interval=3600)
+    batch = 10000
+    for start in range(0, size, batch):
+        end = min(start + batch, size)
+        store.insert(
+            vectors[start:end].tolist(),
+            [{"user_id": str(user)} for user in users[start:end]],
+            [str(i) for i in range(start, end)],
+        )
+    return store, vectors, users
+
+
+def legacy_search(store: FAISS, query: np.ndarray, limit: int, filters: Dict) -> List:
+    """旧实现：固定取 limit * 2 个候选再过滤"""
+    scores, indices = store.index.search(query.reshape(1, -1), limit * 2)
+    results = store._parse_output(scores[0], indices[0])
+    return [result for result in results if store._apply_filters(result.payload, filters)][:limit]
+
+
+def run(
+    search: Callable, queries: np.ndarray, user: str, truth: List[set], limit: int
+) -> Dict[str, float]:
+    """返回平均召回率、平均结果数和每次查询耗时（毫秒）"""
+    recall = 0.0
+    returned = 0
+    start = time.perf_counter()
+    for query, expected in zip(queries, truth):
+        results = search(query, limit, {"user_id": user})
+        ids = {result.id for result in results}
+        recall += len(ids & expected) / len(expected) if expected else 1.0
+        returned += len(results)
+    elapsed = time.perf_counter() - start
+    return {
+        "recall": recall / len(queries),
+        "returned": returned / len(queries),
+        "ms": elapsed / len(queries) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--dims", type=int, default=128)
+    parser.add_argument("--light-users", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as path:
+        store, vectors, users = build_store(
+            path, args.size, args.dims, args.light_users, args.seed
+        )
+        rng = np.random.default_rng(args.seed + 1)
+        queries = rng.random((args.queries, args.dims), dtype=np.float32)
+
+        print(
+            f"{'user':>8} {'memories':>9} {'mode':>11} {'recall':>7} {'returned':>9} {'ms/query':>9}"
+        )
+        for user in ("heavy", "light-0"):
+            member = np.flatnonzero(users == user)
+            # 暴力检索该用户全部向量作为基准
+            truth = []
+            for query in queries:
+                distances = ((vectors[member] - query) ** 2).sum(axis=1)
+                nearest = member[np.argsort(distances)[: args.limit]]
+                truth.append({str(i) for i in nearest})
+
+            modes = {
+                "legacy": lambda q, limit, filters: legacy_search(store, q, limit, filters),
+                "postfilter": None,
+                "prefilter": None,
+            }
+            for mode, search in modes.items():
+                if search is None:
+                    store.filter_mode = mode
+                    search = lambda q, limit, filters: store.search(None, q, limit, filters)
+                stat = run(search, queries, user, truth, args.limit)
+                print(
+                    f"{user:>8} {len(member):>9} {mode:>11} {stat['recall']:7.3f} "
+                    f"{stat['returned']:9.2f} {stat['ms']:9.3f}"
+                )
+
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
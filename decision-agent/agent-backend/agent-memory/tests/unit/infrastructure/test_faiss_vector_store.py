@@ -0,0 +1,225 @@
+import gc
+import os
+import pickle
+import sys
+import weakref
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../.."))
+
+import faiss
+import numpy as np
+import pytest
+
+from mem0.vector_stores.faiss import FAISS
+
+DIMS = 4
+
+
+def vec(*values):
+    return [float(v) for v in values]
+
+
+def open_store(path, **kwargs):
+    kwargs.setdefault("checkpoint_interval", 3600)
+    kwargs.setdefault("checkpoint_wal_ops", 10000)
+    return FAISS(collection_name="memories", path=str(path), embedding_model_dims=DIMS, **kwargs)
+
+
+def crash(store):
+    """Stop the store like a killed process: no final checkpoint, the log stays on disk."""
+    store._closed.set()
+    store._checkpoint_requested.set()
+    store._checkpoint_thread.join()
+    store._wal.close()
+    store._wal = None
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = open_store(tmp_path)
+    yield store
+    store.close()
+
+
+class TestFaissDurability:
+    def test_replay_after_crash_without_checkpoint(self, tmp_path):
+        store = open_store(tmp_path)
+        store.insert([vec(1, 0, 0, 0), vec(0, 1, 0, 0)], [{"data": "a"}, {"data": "b"}], ["a", "b"])
+        store.update("b", payload={"data": "b2"})
+        crash(store)
+        assert not os.path.exists(store._index_path)
+
+        reopened = open_store(tmp_path)
+        try:
+            assert reopened.get("a").payload == {"data": "a"}
+            assert reopened.get("b").payload == {"data": "b2"}
+            assert reopened.search("", [vec(0, 1, 0, 0)], limit=1)[0].id == "b"
+        finally:
+            reopened.close()
+
+    def test_replay_with_leftover_rotated_wal(self, tmp_path):
+        store = open_store(tmp_path)
+        store.insert([vec(1, 0, 0, 0)], [{"data": "a"}], ["a"])
+        store.checkpoint()
+        store.insert([vec(0, 1, 0, 0)], [{"data": "b"}], ["b"])
+        # A checkpoint rotated the log and crashed before writing the snapshot
+        with store._lock:
+            store._rotate_wal()
+        store.insert([vec(0, 0, 1, 0)], [{"data": "c"}], ["c"])
+        store.delete("a")
+        crash(store)
+        assert os.path.exists(store._rotated_wal_path)
+
+        reopened = open_store(tmp_path)
+        try:
+            assert reopened.get("a") is None
+            assert {item.id for item in reopened.list()[0]} == {"b", "c"}
+            assert reopened.search("", [vec(0, 0, 1, 0)], limit=1)[0].id == "c"
+            # The snapshot vector of the deleted memory is a tombstone until compaction
+            assert reopened.col_info()["tombstones"] == 1
+        finally:
+            reopened.close()
+        assert not os.path.exists(reopened._rotated_wal_path)
+
+    def test_delete_compact_reload(self, tmp_path):
+        store = open_store(tmp_path)
+        store.insert(
+            [vec(1, 0, 0, 0), vec(0, 1, 0, 0), vec(0, 0, 1, 0)],
+            [{"data": "a"}, {"data": "b"}, {"data": "c"}],
+            ["a", "b", "c"],
+        )
+        store.delete("b")
+
+        assert store.compact() == 1
+        assert store.index.ntotal == 2
+        assert store.compact() == 0
+        store.close()
+
+        reopened = open_store(tmp_path)
+        try:
+            assert reopened.index.ntotal == 2
+            assert reopened.col_info() == {
+                "name": "memories",
+                "count": 2,
+                "tombstones": 0,
+                "dimension": DIMS,
+                "distance": "euclidean",
+            }
+            assert [item.id for item in reopened.search("", [vec(0, 1, 0, 0)], limit=3)] in (["a", "c"], ["c", "a"])
+            # Freed FAISS ids are not reused
+            reopened.insert([vec(0, 0, 0, 1)], [{"data": "d"}], ["d"])
+            assert reopened.id_to_index["d"] == 3
+        finally:
+            reopened.close()
+
+    def test_update_vector_tombstones_old_vector(self, store):
+        store.insert([vec(1, 0, 0, 0)], [{"data": "a", "user_id": "u1"}], ["a"])
+        old_index_id = store.id_to_index["a"]
+
+        store.update("a", vector=vec(0, 0, 0, 1))
+
+        assert store.tombstones == {old_index_id}
+        assert store.index.ntotal == 2
+        assert store.col_info()["count"] == 1
+        results = store.search("", [vec(1, 0, 0, 0)], limit=5)
+        assert [item.id for item in results] == ["a"]
+        assert results[0].score == pytest.approx(2.0)
+        assert store.filter_ids[("user_id", "u1")] == {store.id_to_index["a"]}
+
+    def test_update_payload_keeps_vector(self, store):
+        store.insert([vec(1, 0, 0, 0)], [{"data": "a", "user_id": "u1"}], ["a"])
+
+        store.update("a", payload={"data": "a2", "user_id": "u2"})
+
+        assert store.tombstones == set()
+        assert store.get("a").payload == {"data": "a2", "user_id": "u2"}
+        assert ("user_id", "u1") not in store.filter_ids
+
+    def test_legacy_pickle_converted(self, tmp_path):
+        flat = faiss.IndexFlatL2(DIMS)
+        flat.add(np.array([vec(1, 0, 0, 0), vec(0, 1, 0, 0), vec(0, 0, 1, 0)], dtype=np.float32))
+        faiss.write_index(flat, str(tmp_path / "memories.faiss"))
+        # Old snapshot format: (docstore, position -> id); "b" was deleted from the docstore only
+        with open(tmp_path / "memories.pkl", "wb") as f:
+            pickle.dump(({"a": {"data": "a"}, "c": {"data": "c"}}, {0: "a", 1: "b", 2: "c"}), f)
+
+        store = open_store(tmp_path)
+        try:
+            assert isinstance(store.index, faiss.IndexIDMap2)
+            assert store.index.ntotal == 2
+            assert store.search("", [vec(0, 0, 1, 0)], limit=1)[0].id == "c"
+            assert store.search("", [vec(1, 0, 0, 0)], limit=1)[0].id == "a"
+            store.insert([vec(0, 0, 0, 1)], [{"data": "d"}], ["d"])
+        finally:
+            store.close()
+
+        reopened = open_store(tmp_path)
+        try:
+            assert isinstance(faiss.read_index(str(tmp_path / "memories.faiss")), faiss.IndexIDMap2)
+            assert {item.id for item in reopened.list()[0]} == {"a", "c", "d"}
+        finally:
+            reopened.close()
+
+    def test_closed_store_can_be_collected(self, tmp_path):
+        store = open_store(tmp_path)
+        store.close()
+        ref = weakref.ref(store)
+
+        del store
+        gc.collect()
+
+        assert ref() is None
+
+
+class TestFaissFilteredSearch:
+    @staticmethod
+    def fill(store):
+        rng = np.random.default_rng(0)
+        vectors = rng.random((200, DIMS)).tolist()
+        payloads = [
+            {"data": str(i), "user_id": "u-small" if i % 20 == 0 else "u-large", "category": "x" if i % 2 else "y"}
+            for i in range(200)
+        ]
+        store.insert(vectors, payloads, [str(i) for i in range(200)])
+        return vectors
+
+    @pytest.mark.parametrize(
+        "filters",
+        [
+            {"user_id": "u-small"},
+            {"user_id": "u-small", "category": "y"},
+            {"user_id": "u-large", "category": "x"},
+            {"user_id": ["u-small", "u-large"]},
+        ],
+    )
+    def test_prefilter_matches_postfilter(self, tmp_path, filters):
+        prefilter = open_store(tmp_path / "pre", filter_mode="prefilter")
+        postfilter = open_store(tmp_path / "post", filter_mode="postfilter")
+        try:
+            vectors = self.fill(prefilter)
+            self.fill(postfilter)
+            query = vectors[7]
+
+            pre = prefilter.search("", [query], limit=5, filters=filters)
+            post = postfilter.search("", [query], limit=5, filters=filters)
+
+            assert [item.id for item in pre] == [item.id for item in post]
+            assert len(pre) == 5
+            assert all(prefilter._apply_filters(item.payload, filters) for item in pre)
+        finally:
+            prefilter.close()
+            postfilter.close()
+
+    def test_prefilter_skips_deleted_vectors(self, store):
+        self.fill(store)
+        store.delete("0")
+
+        results = store.search("", [vec(0, 0, 0, 0)], limit=20, filters={"user_id": "u-small"})
+
+        assert len(results) == 9
+        assert "0" not in {item.id for item in results}
+
+    def test_unknown_filter_value(self, store):
+        self.fill(store)
+
+        assert store.search("", [vec(0, 0, 0, 0)], limit=5, filters={"user_id": "nobody"}) == []
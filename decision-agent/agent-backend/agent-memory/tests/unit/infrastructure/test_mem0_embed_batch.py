@@ -0,0 +1,103 @@
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../.."))
+
+import pytest
+
+from mem0.configs.embeddings.base import BaseEmbedderConfig
+from mem0.embeddings import openai as openai_embedding
+from mem0.embeddings.openai import OpenAIEmbedding
+from mem0.memory.main import AsyncMemory, Memory
+
+
+def fake_vector(text):
+    return [float(len(text)), float(sum(map(ord, text)))]
+
+
+class FakeEmbeddings:
+    """Embeddings API stub that returns the items of each request in reverse order"""
+
+    def __init__(self):
+        self.requests = []
+
+    def create(self, input, model, dimensions, extra_headers):
+        self.requests.append(list(input))
+        data = [SimpleNamespace(index=i, embedding=fake_vector(text)) for i, text in enumerate(input)]
+        return SimpleNamespace(data=data[::-1])
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.batches = []
+
+    def embed_batch(self, texts, memory_action=None, context=None):
+        self.batches.append(list(texts))
+        return [fake_vector(text) for text in texts]
+
+
+@pytest.fixture
+def embedder():
+    with patch.object(openai_embedding, "OpenAI"):
+        embedder = OpenAIEmbedding(BaseEmbedderConfig(api_key="test", embedding_dims=2))
+    embedder.client = MagicMock()
+    embedder.client.embeddings = FakeEmbeddings()
+    return embedder
+
+
+class TestOpenAIEmbedBatch:
+    def test_chunks_and_keeps_order(self, embedder):
+        texts = ["a", "bb", "line\nbreak", "a", "ccc", "dddd", "e"]
+
+        with patch.object(openai_embedding, "MAX_BATCH_SIZE", 3):
+            embeddings = embedder.embed_batch(texts, "add")
+
+        assert [len(request) for request in embedder.client.embeddings.requests] == [3, 3, 1]
+        assert embeddings == [fake_vector(text.replace("\n", " ")) for text in texts]
+
+    def test_empty_input(self, embedder):
+        assert embedder.embed_batch([]) == []
+        assert embedder.client.embeddings.requests == []
+
+
+class TestEmbedMissing:
+    @staticmethod
+    def memory(memory_class):
+        memory = memory_class.__new__(memory_class)
+        memory.embedding_model = FakeEmbedder()
+        return memory
+
+    def test_duplicates_embedded_once(self):
+        memory = self.memory(Memory)
+        existing = {"known": [0.0, 0.0]}
+
+        memory._embed_missing(["x", "known", "yy", "x", "zzz", "yy"], existing, "add")
+
+        assert memory.embedding_model.batches == [["x", "yy", "zzz"]]
+        assert existing == {"known": [0.0, 0.0], "x": fake_vector("x"), "yy": fake_vector("yy"),
+                            "zzz": fake_vector("zzz")}
+
+    def test_nothing_missing(self):
+        memory = self.memory(Memory)
+        existing = {"known": [0.0, 0.0]}
+
+        memory._embed_missing([], existing, "add")
+        memory._embed_missing(["known", "known"], existing, "add")
+
+        assert memory.embedding_model.batches == []
+        assert existing == {"known": [0.0, 0.0]}
+
+    @pytest.mark.asyncio
+    async def test_async_maps_embeddings_to_texts(self, embedder):
+        memory = AsyncMemory.__new__(AsyncMemory)
+        memory.embedding_model = embedder
+        texts = ["t%d" % i for i in range(7)] + ["t3", "t0"]
+        existing = {}
+
+        with patch.object(openai_embedding, "MAX_BATCH_SIZE", 2):
+            await memory._embed_missing(texts, existing, "add", {"user_id": "u1"})
+
+        assert [len(request) for request in embedder.client.embeddings.requests] == [2, 2, 2, 1]
+        assert existing == {text: fake_vector(text) for text in texts}
@@ -0,0 +1,34 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../.."))
+
+from unittest.mock import MagicMock, patch
+
+from src.interfaces.cli import vector_store as cli
+
+
+class TestVectorStoreCli:
+    def test_migrate_ids(self):
+        store = MagicMock()
+        store.migrate_document_ids.return_value = 3
+
+        with patch.object(cli, "create_vector_store", return_value=store):
+            assert cli.main(["migrate-ids", "--batch-size", "100"]) == 0
+
+        store.migrate_document_ids.assert_called_once_with(batch_size=100)
+
+    def test_migrate_ids_unsupported_store(self):
+        store = MagicMock(spec=[])
+
+        with patch.object(cli, "create_vector_store", return_value=store):
+            assert cli.main(["migrate-ids"]) == 1
+
+    def test_reindex(self):
+        store = MagicMock()
+        store.reindex_knn_engine.return_value = "memory_lucene_1"
+
+        with patch.object(cli, "create_vector_store", return_value=store):
+            assert cli.main(["reindex"]) == 0
+
+        store.reindex_knn_engine.assert_called_once_with()
@@ -127,3 +127,28 @@ class TestConfig:
 
         assert rerank_config.rerank_url == "http://test.com"
         assert rerank_config.rerank_model == "reranker"
+
+    def test_get_vector_config_knn_settings(self):
+        """Test k-NN engine and filter mode are passed to the vector store"""
+        from src.config.config import Config
+
+        Config._instance = None
+        Config._initialized = False
+
+        with patch.object(Config, "__init__", lambda self: None):
+            config = Config()
+            config.config = {
+                "vector_store": {
+                    "provider": "opensearch",
+                    "host": "localhost",
+                    "port": 9200,
+                    "collection_name": "memory",
+                    "knn_engine": "faiss",
+                    "filter_mode": "efficient",
+                }
+            }
+
+        vector_config = config._get_vector_config()
+
+        assert vector_config.config.knn_engine == "faiss"
+        assert vector_config.config.filter_mode == "efficient"
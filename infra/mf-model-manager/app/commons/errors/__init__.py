@@ -1244,3 +1244,10 @@ ModelQuotaControllerUserModelConfigNoLeftSpaceError = {
     "solution": "请联系管理员增加额度",
     "link": ""
 }
+ModelFactory_ModelController_Model_Busy_Error = {
+    "code": "ModelFactory.ModelController.Model.Busy",
+    "description": "模型繁忙",
+    "detail": "模型并发调用已达上限，排队超时",
+    "solution": "请稍后重试或联系管理员调整模型并发上限",
+    "link": ""
+}
@@ -13,9 +13,12 @@ from app.dao.model_quota_dao import model_quota_dao
 from app.logs.stand_log import StandLogger
 from app.mydb.ConnectUtil import redis_util, get_redis_util
 from app.utils import llm_utils
+from app.utils.admission_controller import admission_controller, AdmissionRejected
 from app.utils.common import validate_required_params
 from app.utils.config_cache import quota_config_cache_tree
 from app.utils.llm_utils import openai_series_stream, OpenAIClientRequest
+from app.utils.model_registry import model_registry, MODEL_KIND_LLM
+from app.utils.quota_ledger import quota_ledger, SOFT_LIMIT_REASON
 from app.utils.param_verify_utils import *
 from app.utils.reshape_utils import *
 from app.utils.str_util import generate_random_string
@@ -63,6 +66,7 @@ async def add_model(schema_para, userId, language):
                                                    userId, json.dumps(config),
                                                    schema_para["max_model_len"],
                                                    schema_para.get("model_parameters", None), quota)
+            await model_registry.invalidate(MODEL_KIND_LLM, [schema_para["model_name"]])
             content = {"status": "ok", "id": model_id}
             if quota is False:
                 # 需要预插入一条模型配额
@@ -100,6 +104,7 @@ async def remove_model(model_ids, userId, language):
         if redis_util is None:
             redis_util = await get_redis_util()
         await redis_util.delete_str(cache_key_list)
+        await model_registry.invalidate(MODEL_KIND_LLM, model_names)
         # 删除缓存
         quota_config_cache_tree.delete_batch(model_ids['model_ids'])
         content = {"status": "ok", "id": model_ids['model_ids']}
@@ -134,6 +139,7 @@ async def remove_model_by_name(model_names, userId, language):
         if redis_util is None:
             redis_util = await get_redis_util()
         await redis_util.delete_str(cache_key_list)
+        await model_registry.invalidate(MODEL_KIND_LLM, model_names["model_names"])
         content = {"status": "ok", "id": model_ids}
         return JSONResponse(status_code=200, content=content)
     except Exception as e:
@@ -246,6 +252,7 @@ async def edit_model(model_para, userId, language):
                     await redis_util.delete_str(quota_cache_key)
                     await redis_util.delete_str(llm_cache_key)
                     await redis_util.delete_str(llm_default_key)
+                    await model_registry.invalidate(MODEL_KIND_LLM, [old_name, re_name])
                     content = {"status": "ok", "id": model_para['model_id']}
                     return JSONResponse(status_code=200, content=content)
                 else:
@@ -598,6 +605,56 @@ async def used_model_stream(request: Request, llm_id, ai_system, ai_user, ai_ass
 
 
 async def used_model_openai(request, user_id, language, func_module):
+    reservations = []
+    tickets = []
+    try:
+        response = await _used_model_openai(request, user_id, language, func_module, reservations, tickets)
+    except BaseException:
+        await _release_call(reservations, tickets)
+        raise
+    if not reservations and not tickets:
+        return response
+    if isinstance(response, EventSourceResponse):
+        # 流式调用在输出结束后释放预留额度和调用名额
+        response.body_iterator = _release_after_stream(response.body_iterator, reservations, tickets)
+    else:
+        await _release_call(reservations, tickets)
+    return response
+
+
+async def _release_call(reservations, tickets):
+    for ticket in tickets:
+        ticket.release()
+    for reservation in reservations:
+        await quota_ledger.release(reservation)
+
+
+async def _release_after_stream(body_iterator, reservations, tickets):
+    try:
+        async for item in body_iterator:
+            yield item
+    finally:
+        await _release_call(reservations, tickets)
+
+
+async def _acquire_admission(model_data, user_id, func_module, soft_limit, tickets):
+    """占用模型调用名额并加入tickets，排队超时或队列已满时返回429响应"""
+    try:
+        tickets.append(await admission_controller.acquire(model_data, user_id, func_module, soft_limit))
+    except AdmissionRejected as e:
+        StandLogger.warn(f"{e}: user_id={user_id}, func_module={func_module}")
+        error_dict = ModelFactory_ModelController_Model_Busy_Error.copy()
+        error_dict["detail"] = str(e)
+        return JSONResponse(status_code=429, content=error_dict)
+    return None
+
+
+async def get_admission_stats():
+    """各模型的并发调用数、排队数和排队耗时"""
+    return JSONResponse(status_code=200, content=admission_controller.stats())
+
+
+async def _used_model_openai(request, user_id, language, func_module, reservations, tickets):
     if "stream" not in request.keys():
         stream = True
     else:
@@ -609,66 +666,38 @@ async def used_model_openai(request, user_id, language, func_module):
             return JSONResponse(status_code=400, content=error_dict)
 
     model_name = request["model"]
-    cache_key = f"dip:model-api:llm:{model_name}:list"
     try:
-        # 确保 redis_util 已初始化
-        global redis_util
-        if redis_util is None:
-            redis_util = await get_redis_util()
-        res = await redis_util.get_str(cache_key)
-        if res is not None and isinstance(res, (str, bytes)):
-            try:
-                model_info = eval(res)
-            except Exception as e:
-                StandLogger.warn(f"解析缓存数据失败: {str(e)}, key={cache_key}, value={res}")
-                # 缓存解析失败，回退到数据库查询
-                model_info = llm_model_dao.get_data_from_model_list_by_name(model_name)
-                if len(model_info) == 0:
-                    return JSONResponse(status_code=400, content=ModelFactory_ExternalSmallModel_Used_NameNotExist)
-                # 重新设置缓存
-                await redis_util.set_str(key=cache_key, value=str(model_info), expire=300)
-        else:
-            # 缓存不存在或非预期类型，从数据库获取
-            model_info = llm_model_dao.get_data_from_model_list_by_name(model_name)
-            if len(model_info) == 0:
-                return JSONResponse(status_code=400, content=ModelFactory_ExternalSmallModel_Used_NameNotExist)
-            # 设置缓存
-            await redis_util.set_str(key=cache_key, value=str(model_info), expire=300)
+        # 模型信息从进程内注册表获取
+        model_data = await model_registry.get_llm(model_name)
+        if model_data is None:
+            return JSONResponse(status_code=400, content=ModelFactory_ExternalSmallModel_Used_NameNotExist)
     except Exception as e:
         StandLogger.error(e.args)
         DataBaseError["detail"] = str(e)
         return JSONResponse(status_code=500, content=DataBaseError)
-    model_data = model_info[0]
     model_series = model_data["f_model_series"]
     context_size = model_data["f_max_model_len"]
     model_id = model_data["f_model_id"]
     quota = model_data["f_quota"]
+    soft_limit = False
     if quota:
-        quota_cache_key = f"dip:model-api:llm-quota:{model_name}:list"
-        res = await redis_util.get_str(quota_cache_key)
-        if res is not None and isinstance(res, (str, bytes)):
-            try:
-                model_quota_info = eval(res)
-            except Exception as e:
-                StandLogger.warn(f"解析缓存数据失败: {str(e)}, key={quota_cache_key}, value={res}")
-                # 缓存解析失败，回退到数据库查询
-                model_quota_info = llm_model_dao.get_quota_by_user_and_model(user_id, model_id)
-                # 重新设置缓存
-                await redis_util.set_str(key=quota_cache_key, value=str(model_quota_info), expire=300)
-        else:
-            # 缓存不存在或非预期类型，从数据库获取
-            model_quota_info = llm_model_dao.get_quota_by_user_and_model(user_id, model_id)
-            # 设置缓存
-            await redis_util.set_str(key=quota_cache_key, value=str(model_quota_info), expire=300)
-        if len(model_quota_info) == 0 or model_quota_info[0]["remaining_input_tokens"] <= 0 or model_quota_info[0][
-            "remaining_output_tokens"] <= 0:
+        # 配额账本准入检查，并按max_tokens预留输出额度
+        allowed, reason, reservation = await quota_ledger.admit(model_id, user_id, request.get("max_tokens") or 0)
+        if not allowed:
             error_dict = ModelQuotaControllerUserModelConfigNoLeftSpaceError.copy()
             return JSONResponse(status_code=400, content=error_dict)
+        if reservation is not None:
+            reservations.append(reservation)
+        soft_limit = reason == SOFT_LIMIT_REASON
 
     if request["max_tokens"] > context_size * 1000:
         error_dict = ModelFactory_Router_ParamError_FormatError_Error.copy()
         error_dict["detail"] = f"max_tokens超过最大值{context_size}k"
         return JSONResponse(status_code=400, content=error_dict)
+    # 按模型限制并发调用数，超出时按用户和func_module公平排队
+    rejected = await _acquire_admission(model_data, user_id, func_module, soft_limit, tickets)
+    if rejected is not None:
+        return rejected
     messages = request["messages"]
     message = messages[len(messages) - 1]["content"]
     history_dia = []
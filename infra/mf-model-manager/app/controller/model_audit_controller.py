@@ -4,6 +4,7 @@ from app.logs.stand_log import StandLogger
 import json
 
 from app.mydb.ConnectUtil import kafka_client
+from app.utils.quota_ledger import quota_ledger
 
 
 async def add_llm_model_call_log(para: logics.AddModelUsedAudit):
@@ -12,6 +13,8 @@ async def add_llm_model_call_log(para: logics.AddModelUsedAudit):
     :param para:
     :return:
     """
+    # 实时累加配额账本，写Kafka失败不影响配额计数
+    await quota_ledger.record_usage(para.model_id, para.user_id, para.input_tokens, para.output_tokens)
     try:
         
         # 准备消息数据，参考kafka_streams_processor.py中消费者的字段
@@ -8,6 +8,7 @@ from app.dao.model_used_audit_dao import model_op_dao
 from app.logs.stand_log import StandLogger
 from app.mydb.ConnectUtil import redis_util, get_redis_util
 from app.utils.config_cache import quota_config_cache_tree, ModelConfigNode
+from app.utils.quota_ledger import quota_ledger
 from app.utils.param_verify_utils import *
 from app.interfaces import logics, dbaccess
 num_type_list = [0, 1000, 10000, 100000000, 1000000, 10000000]
@@ -157,6 +158,7 @@ async def edit_model_quota_config(para: logics.EditModelQuota, conf_id: str, use
                 "f_price_type": para.price_type
             }
             quota_config_cache_tree.update(config_dict)
+            await quota_ledger.invalidate_limits(model_id)
         except Exception as e:
             StandLogger.error(e.args)
             return JSONResponse(status_code=500, content=ModelFactory_MyPymysqlPool_Connection_ConnectError_Error)
@@ -418,6 +420,7 @@ async def add_user_model_quota_config(para: logics.AddUserModelQuotaList, user_i
         for user_id in user_ids:
             quota_cache_key = f"{user_id}:dip:model-api:llm-quota:{model_name}:list"
             await redis_util.delete_str(quota_cache_key)
+        await quota_ledger.invalidate_limits(conf[0]["f_model_id"])
         return JSONResponse(status_code=200, content={"res": "success"})
     except Exception as e:
         StandLogger.error(e.args)
@@ -578,6 +581,7 @@ async def delete_user_model_quota_config(conf_id_list, user_id: str):
                 model_name = line["f_model_name"]
                 quota_cache_key = f"dip:model-api:llm-quota:{model_name}:list"
                 await redis_util.delete_str(quota_cache_key)
+                await quota_ledger.invalidate_limits(line["f_model_id"])
         except Exception as e:
             StandLogger.error(e.args)
             return JSONResponse(status_code=500, content=ModelFactory_MyPymysqlPool_Connection_ConnectError_Error)
@@ -4,7 +4,6 @@ import asyncio
 import ast
 
 import func_timeout
-import tiktoken
 
 from fastapi.responses import JSONResponse
 from app.commons.errors.codes import *
@@ -17,6 +16,7 @@ from app.utils.comment_utils import error_log
 from app.utils.llm_utils import model_config, get_context_size
 from app.utils.param_verify_utils import *
 from app.utils.reshape_utils import *
+from app.utils.tokenizer_service import tokenizer_service
 from app.dao.prompt_dao import prompt_dao
 from app.dao.llm_model_dao import llm_model_dao
 
@@ -908,16 +908,7 @@ async def decode_endpoint(params_json):
                                                     model_info["f_model"], model_info["f_model_url"],
                                                     model_info["f_model_config"])
         if model_info["f_model_series"] == "openai":
-            import os
-
-            cache_key = "9b5ad71b2ce5302211f9c61530b329a4922fc6a4"
-            tiktoken_cache_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + "/utils/tiktoken_cache"
-            os.environ["TIKTOKEN_CACHE_DIR"] = tiktoken_cache_dir
-
-            assert os.path.exists(os.path.join(tiktoken_cache_dir, cache_key))
-
-            encoding = tiktoken.get_encoding("cl100k_base")
-            text = encoding.decode(token_ids)
+            text = await tokenizer_service.decode("openai", token_ids)
             return JSONResponse(status_code=200, content={"res": {"text": text, "count": len(text)}})
         elif model_info["f_model_series"].lower() == "aishu":
             model_config = eval(model_info["f_model_config"])
@@ -14,6 +14,9 @@ from app.utils.reshape_utils import *
 from fastapi import Response, status
 from app.mydb.ConnectUtil import redis_util, get_redis_util
 from app.utils.permission_manager import PermissionManager, permission_manager
+from app.utils.embedding_cache import embedding_cache, config_fingerprint
+from app.utils.model_registry import model_registry, MODEL_KIND_SMALL_MODEL
+from app.utils.adapter_cache import adapter_cache
 
 
 async def add_model(request: logics.AddExternalSmallModel, userId, language, role, private=False):
@@ -68,6 +71,7 @@ async def add_model(request: logics.AddExternalSmallModel, userId, language, rol
         if not status:
             raise Exception("add permission failed")
         small_model_dao.add_model_info(config_info, userId)
+        await model_registry.invalidate(MODEL_KIND_SMALL_MODEL, [request.model_name])
         content = {"status": "ok", "id": model_id}
         return JSONResponse(status_code=200, content=content)
     except Exception as e:
@@ -188,6 +192,9 @@ async def edit_model(request: logics.EditExternalSmallModel, userId, language, r
         if redis_util is None:
             redis_util = await get_redis_util()
         await redis_util.delete_str(cache_key)
+        await model_registry.invalidate(MODEL_KIND_SMALL_MODEL,
+                                        [model_info[0]["f_model_name"], request.model_name])
+        adapter_cache.invalidate([request.model_id])
         content = {"status": "ok", "id": request.model_id}
         return JSONResponse(status_code=200, content=content)
     except Exception as e:
@@ -290,6 +297,24 @@ async def get_info(model_id, user_id, role):
         return JSONResponse(status_code=400, content=error_dict)
 
 
+async def check_permission(request: logics.CheckSmallModelPermission, userId, role):
+    """批量校验当前用户对模型的操作权限"""
+    try:
+        results = await permission_manager.check_permissions(user_id=userId, resource_ids=request.model_ids,
+                                                             operation=request.operation,
+                                                             resource_type="small_model", role=role)
+        return JSONResponse(status_code=200, content={"results": results})
+    except Exception as e:
+        StandLogger.error(e.args)
+        error_dict = ModelFactory_ExternalSmallModel_UnknownError.copy()
+        return JSONResponse(status_code=400, content=error_dict)
+
+
+async def get_adapter_stats():
+    """各模型适配器的调用次数、失败次数和耗时"""
+    return JSONResponse(status_code=200, content=adapter_cache.stats())
+
+
 async def get_info_by_name(model_name):
     if not model_name:
         return JSONResponse(status_code=400, content=ModelFactory_ExternalSmallModel_GetInfo_IdNotExist_Error)
@@ -370,6 +395,9 @@ async def delete_model(model_para, userId, language, role):
             if redis_util is None:
                 redis_util = await get_redis_util()
             await redis_util.delete_str(cache_key_list)
+            await model_registry.invalidate(MODEL_KIND_SMALL_MODEL,
+                                            [model_info["f_model_name"] for model_info in original_res])
+            adapter_cache.invalidate(model_ids)
         except Exception as e:
             StandLogger.error(str(e))
             return JSONResponse(status_code=500, content=ModelFactory_MyPymysqlPool_Connection_ConnectError_Error)
@@ -415,6 +443,9 @@ async def delete_model_by_name(model_para, userId, language):
             if redis_util is None:
                 redis_util = await get_redis_util()
             await redis_util.delete_str(cache_key_list)
+            await model_registry.invalidate(MODEL_KIND_SMALL_MODEL,
+                                            [model_info["f_model_name"] for model_info in original_res])
+            adapter_cache.invalidate(model_ids)
         except Exception as e:
             StandLogger.error(str(e))
             return JSONResponse(status_code=500, content=ModelFactory_MyPymysqlPool_Connection_ConnectError_Error)
@@ -430,31 +461,10 @@ async def embedding_model_used(request, userId, language, role, func_module, pri
     try:
         model_name = request.model
         texts = request.input
-        cache_key = f"dip:model-api:small-model:{model_name}:list"
-        # 确保 redis_util 已初始化
-        global redis_util
-        if redis_util is None:
-            redis_util = await get_redis_util()
-        res = await redis_util.get_str(cache_key)
-        if res is not None and isinstance(res, (str, bytes)):
-            try:
-                model_info = eval(res)
-            except Exception as e:
-                StandLogger.warn(f"解析缓存数据失败: {str(e)}, key={cache_key}, value={res}")
-                # 缓存解析失败，回退到数据库查询
-                model_info = small_model_dao.get_model_info_by_name(model_name)
-                if len(model_info) == 0:
-                    return JSONResponse(status_code=400, content=ModelFactory_ExternalSmallModel_Used_NameNotExist)
-                # 重新设置缓存
-                await redis_util.set_str(key=cache_key, value=str(model_info), expire=300)
-        else:
-            # 缓存不存在或非预期类型，从数据库获取
-            model_info = small_model_dao.get_model_info_by_name(model_name)
-            if len(model_info) == 0:
-                return JSONResponse(status_code=400, content=ModelFactory_ExternalSmallModel_Used_NameNotExist)
-            # 设置缓存
-            await redis_util.set_str(key=cache_key, value=str(model_info), expire=300)
-        model_info = model_info[0]
+        # 模型信息从进程内注册表获取
+        model_info = await model_registry.get_small_model(model_name)
+        if model_info is None:
+            return JSONResponse(status_code=400, content=ModelFactory_ExternalSmallModel_Used_NameNotExist)
         config_info = json.loads(model_info["f_model_config"])
         adapter = model_info["f_adapter"]
         model_id = model_info["f_model_id"]
@@ -467,14 +477,20 @@ async def embedding_model_used(request, userId, language, role, func_module, pri
             if not permission:
                 return JSONResponse(status_code=403, content=NotPermissionError)
         client = InnerClient(url=config_info.get("api_url", ""), model_name=config_info.get("api_model", ""),
-                             api_key=config_info.get("api_key", ""), adapter=adapter, adapter_code=adapter_code)
-        res_dict = await client.embedding(texts)
+                             api_key=config_info.get("api_key", ""), adapter=adapter, adapter_code=adapter_code,
+                             model_id=model_id)
+        # 命中缓存的文本不再调用上游，usage仍按全部文本计算
+        res_dict = await embedding_cache.embed(model_id=model_id,
+                                               fingerprint=config_fingerprint(config_info, adapter, adapter_code),
+                                               model_name=model_name, texts=texts, fetch=client.embedding)
         prompt_tokens = res_dict.get("usage", {}).get("prompt_tokens")
         total_tokens = res_dict.get("usage", {}).get("total_tokens")
+        cached_tokens = res_dict.get("usage", {}).get("cached_tokens", 0)
         if get_logger():
             get_logger().info(
                 f'{{"model_name":{model_name},"resourece_type":"embeddings","user_id":{userId},'
-                f'"prompt_tokens":{prompt_tokens},"total_tokens":{total_tokens},"func_module":{func_module},"status":"success"}}')
+                f'"prompt_tokens":{prompt_tokens},"total_tokens":{total_tokens},"cached_tokens":{cached_tokens},'
+                f'"func_module":{func_module},"status":"success"}}')
         return res_dict
 
     except Exception as e:
@@ -494,32 +510,10 @@ async def reranker_model_used(request, userId, language, role, func_module, priv
         model_name = request.model
         query = request.query
         documents = request.documents
-        cache_key = f"dip:model-api:small-model:{model_name}:list"
-        # 确保 redis_util 已初始化
-        global redis_util
-        if redis_util is None:
-            redis_util = await get_redis_util()
-        res = await redis_util.get_str(cache_key)
-        if res is not None and isinstance(res, (str, bytes)):
-            try:
-                model_info = eval(res)
-            except Exception as e:
-                StandLogger.warn(f"解析缓存数据失败: {str(e)}, key={cache_key}, value={res}")
-                # 缓存解析失败，回退到数据库查询
-                model_info = small_model_dao.get_model_info_by_name(model_name)
-                if len(model_info) == 0:
-                    return JSONResponse(status_code=400, content=ModelFactory_ExternalSmallModel_Used_NameNotExist)
-                # 重新设置缓存
-                await redis_util.set_str(key=cache_key, value=str(model_info), expire=300)
-        else:
-            # 缓存不存在或非预期类型，从数据库获取
-            model_info = small_model_dao.get_model_info_by_name(model_name)
-            if len(model_info) == 0:
-                return JSONResponse(status_code=400, content=ModelFactory_ExternalSmallModel_Used_NameNotExist)
-            # 设置缓存
-            await redis_util.set_str(key=cache_key, value=str(model_info), expire=300)
-
-        model_info = model_info[0]
+        # 模型信息从进程内注册表获取
+        model_info = await model_registry.get_small_model(model_name)
+        if model_info is None:
+            return JSONResponse(status_code=400, content=ModelFactory_ExternalSmallModel_Used_NameNotExist)
         config_info = json.loads(model_info["f_model_config"])
         adapter = model_info["f_adapter"]
         model_id = model_info["f_model_id"]
@@ -532,7 +526,8 @@ async def reranker_model_used(request, userId, language, role, func_module, priv
             if not permission:
                 return JSONResponse(status_code=403, content=NotPermissionError)
         client = InnerClient(url=config_info.get("api_url", ""), model_name=config_info.get("api_model", ""),
-                             api_key=config_info.get("api_key", ""), adapter=adapter, adapter_code=adapter_code)
+                             api_key=config_info.get("api_key", ""), adapter=adapter, adapter_code=adapter_code,
+                             model_id=model_id)
         res_dict = await client.reranker(query=query, documents=documents)
         prompt_tokens = res_dict.get("usage", {}).get("prompt_tokens")
         total_tokens = res_dict.get("usage", {}).get("total_tokens")
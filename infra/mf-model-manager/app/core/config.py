@@ -110,6 +110,54 @@ class BaseConfig(object):
     # 权限关闭时写入审计日志所用的匿名用户ID占位符
     ANONYMOUS_USER_ID = "anonymous-user"
 
+    # embedding结果缓存：进程内LRU条数（0表示关闭），是否启用Redis共享缓存及其过期时间（秒）
+    EMBEDDING_CACHE_SIZE = int(os.getenv('EMBEDDING_CACHE_SIZE', 20000))
+    EMBEDDING_CACHE_REDIS = os.getenv('EMBEDDING_CACHE_REDIS', 'false').lower() == 'true'
+    EMBEDDING_CACHE_REDIS_TTL = int(os.getenv('EMBEDDING_CACHE_REDIS_TTL', 7 * 24 * 3600))
+
+    # 进程内模型注册表：超过刷新间隔（秒）后先返回旧值并在后台重新加载，超过最大过期时间必须重新加载成功才能使用；
+    # 不存在的模型名称缓存时间（秒）
+    MODEL_REGISTRY_REFRESH_INTERVAL = int(os.getenv('MODEL_REGISTRY_REFRESH_INTERVAL', 60))
+    MODEL_REGISTRY_MAX_STALE = int(os.getenv('MODEL_REGISTRY_MAX_STALE', 600))
+    MODEL_REGISTRY_NEGATIVE_TTL = int(os.getenv('MODEL_REGISTRY_NEGATIVE_TTL', 5))
+
+    # 用户模型配额账本：与MySQL对账间隔（秒），软限制比例，未释放预留的清理时间（秒）
+    QUOTA_LEDGER_SYNC_INTERVAL = int(os.getenv('QUOTA_LEDGER_SYNC_INTERVAL', 300))
+    QUOTA_SOFT_LIMIT_RATIO = float(os.getenv('QUOTA_SOFT_LIMIT_RATIO', 0.9))
+    QUOTA_RESERVATION_TTL = int(os.getenv('QUOTA_RESERVATION_TTL', 1800))
+
+    # 用量汇总入库：满足任一条件即入库并提交Kafka位点——距上次入库的时间（秒），累计消息数，汇总键数
+    USAGE_FLUSH_INTERVAL = int(os.getenv('USAGE_FLUSH_INTERVAL', 30))
+    USAGE_FLUSH_MAX_MESSAGES = int(os.getenv('USAGE_FLUSH_MAX_MESSAGES', 20000))
+    USAGE_FLUSH_MAX_KEYS = int(os.getenv('USAGE_FLUSH_MAX_KEYS', 2000))
+
+    # 权限校验结果缓存：有权限/无权限结果的缓存时间（秒），最多缓存条数（0表示关闭）
+    PERMISSION_CACHE_TTL = int(os.getenv('PERMISSION_CACHE_TTL', 10))
+    PERMISSION_CACHE_NEGATIVE_TTL = int(os.getenv('PERMISSION_CACHE_NEGATIVE_TTL', 3))
+    PERMISSION_CACHE_SIZE = int(os.getenv('PERMISSION_CACHE_SIZE', 10000))
+
+    # 大模型上游连接池：每个上游的最大并发请求数，空闲连接保留时间（秒），
+    # 连续失败多少次后熔断，熔断持续时间（秒）
+    LLM_UPSTREAM_MAX_CONCURRENCY = int(os.getenv('LLM_UPSTREAM_MAX_CONCURRENCY', 256))
+    LLM_UPSTREAM_KEEPALIVE = int(os.getenv('LLM_UPSTREAM_KEEPALIVE', 60))
+    LLM_UPSTREAM_BREAKER_FAILURES = int(os.getenv('LLM_UPSTREAM_BREAKER_FAILURES', 5))
+    LLM_UPSTREAM_BREAKER_COOLDOWN = int(os.getenv('LLM_UPSTREAM_BREAKER_COOLDOWN', 30))
+
+    # token计数：编码线程数，按文本缓存的token数条数（0表示关闭）
+    TOKENIZER_WORKERS = int(os.getenv('TOKENIZER_WORKERS', 4))
+    TOKEN_COUNT_CACHE_SIZE = int(os.getenv('TOKEN_COUNT_CACHE_SIZE', 100000))
+    # 缺少tokenizer文件时是否拒绝启动（镜像中为true，本地开发缺少文件时按字符数估算）
+    TOKENIZER_ASSETS_REQUIRED = os.getenv('TOKENIZER_ASSETS_REQUIRED', 'false').lower() == 'true'
+
+    # 大模型调用准入：每个模型的最大并发调用数（模型配置max_inflight优先，0表示不限制），
+    # 排队超时时间（秒），每个模型的最大排队数（0表示不限制），
+    # func_module的排队权重（JSON，如{"agent": 2}，默认1），配额达到软限制的用户的权重系数
+    LLM_ADMISSION_MAX_INFLIGHT = int(os.getenv('LLM_ADMISSION_MAX_INFLIGHT', 64))
+    LLM_ADMISSION_QUEUE_TIMEOUT = float(os.getenv('LLM_ADMISSION_QUEUE_TIMEOUT', 30))
+    LLM_ADMISSION_MAX_QUEUE = int(os.getenv('LLM_ADMISSION_MAX_QUEUE', 1000))
+    LLM_ADMISSION_FUNC_MODULE_WEIGHTS = os.getenv('LLM_ADMISSION_FUNC_MODULE_WEIGHTS', '{}')
+    LLM_ADMISSION_SOFT_LIMIT_WEIGHT = float(os.getenv('LLM_ADMISSION_SOFT_LIMIT_WEIGHT', 0.5))
+
 
 base_config = BaseConfig()
 server_info = ServerInfo(
@@ -3,6 +3,7 @@ import json
 
 from app.commons.snow_id import worker
 from app.dao import user_info
+from app.dao.model_used_audit_dao import month_range, usage_rows_sql
 from app.interfaces import dbaccess
 from app.logs.stand_log import StandLogger
 from app.mydb.my_pymysql_pool import connect_execute_close_db, connect_execute_commit_close_db
@@ -72,6 +73,17 @@ class ModelDao():
         res = cursor.fetchall()
         return res
 
+    # 全部模型，字段与get_data_from_model_list_by_name一致，用于加载模型注册表
+    @connect_execute_close_db
+    def get_all_model_info_list(self, connection, cursor):
+        sql = """select f_create_by,f_model,f_model_config,f_model_id,f_quota,
+                                f_model_name,f_model_series,f_model_type,f_update_by,f_max_model_len, f_model_parameters 
+                                from t_llm_model"""
+
+        cursor.execute(sql)
+        res = cursor.fetchall()
+        return res
+
     @connect_execute_commit_close_db
     def add_data_into_model_list(self, model_id, model_series, model_type, model_name, model, userId, model_config,
                                  max_model_len, model_parameters, quota, connection, cursor):
@@ -311,8 +323,8 @@ class ModelDao():
 
     @connect_execute_close_db
     def get_quota_by_user_and_model(self, user_id, model_id, connection, cursor):
-        # 获取当前日期的月初一号
-        now_month = datetime.datetime.now().replace(day=1).strftime('%Y-%m-%d')
+        # 本月用量从按天汇总表读取
+        usage_sql, value_list = usage_rows_sql(*month_range(), model_id=model_id, user_id=user_id)
         sql = f"""SELECT
                     uqc.f_input_tokens, COALESCE(monthly_usage.used_input_tokens,0) AS used_input_tokens,mqc.f_billing_type,
                     uqc.f_output_tokens,COALESCE(monthly_usage.used_output_tokens,0) AS used_output_tokens,uqc.f_num_type
@@ -325,11 +337,7 @@ class ModelDao():
                         SUM(f_input_tokens) AS used_input_tokens,
                         SUM(f_output_tokens) AS used_output_tokens
                     FROM
-                        t_model_op_detail
-                    WHERE
-                        f_user_id = '{user_id}'
-                        AND f_model_id = '{model_id}'
-                        AND f_create_time >= '{now_month}'
+                        {usage_sql}
                     GROUP BY
                         f_user_id, f_model_id
                 ) AS monthly_usage
@@ -337,10 +345,10 @@ class ModelDao():
                     uqc.f_user_id = monthly_usage.f_user_id
                     AND mqc.f_model_id = monthly_usage.f_model_id
                 WHERE
-                    uqc.f_user_id = '{user_id}'
-                    AND mqc.f_model_id = '{model_id}';"""
+                    uqc.f_user_id = %s
+                    AND mqc.f_model_id = %s"""
 
-        cursor.execute(sql)
+        cursor.execute(sql, value_list + [user_id, model_id])
         res = cursor.fetchall()
 
         # 如果没有配额信息，直接返回空结果
@@ -404,7 +412,13 @@ class ModelDao():
 
     @connect_execute_commit_close_db
     def get_overview_data(self, model_id, start_time, end_time, userId, connection, cursor):
-        # 计算end_time向前8小时的时间
+        # 按天的统计从汇总表读取，start_time、end_time为YYYY-MM-DD，包含end_time当天
+        start = datetime.datetime.strptime(start_time, "%Y-%m-%d")
+        end = datetime.datetime.strptime(end_time, "%Y-%m-%d") + datetime.timedelta(days=1)
+        user_id = userId if userId != "266c6a42-6131-4d62-8f39-853e7093701c" else ""
+        usage_sql, value_list = usage_rows_sql(start, end, model_id=model_id, user_id=user_id)
+        if usage_sql is None:
+            return [], [], []
         sql1 = f"""SELECT
                 SUM(f_total_count) AS total_usage,
                 CASE
@@ -412,53 +426,45 @@ class ModelDao():
                     ELSE (SUM(f_failed_count) / SUM(f_total_count))
                 END AS error_rate,
                 CASE
-                    WHEN SUM(f_total_count) = 0 THEN 0
-                    ELSE SUM(f_average_total_time * f_total_count) / SUM(f_total_count)
+                    WHEN SUM(f_total_count) - SUM(f_failed_count) = 0 THEN 0
+                    ELSE SUM(f_total_time) / (SUM(f_total_count) - SUM(f_failed_count))
                 END AS avg_response_time,
                 SUM(f_input_tokens + f_output_tokens) AS total_tokens,
                 SUM(f_input_tokens) AS input_tokens,
                 SUM(f_output_tokens) AS output_tokens
-            FROM t_model_op_detail
-            WHERE DATE(f_create_time) BETWEEN '{start_time}' AND '{end_time}'
-            """
-        if model_id:
-            sql1 += f" and f_model_id='{model_id}'"
-        if userId != "266c6a42-6131-4d62-8f39-853e7093701c":
-            sql1 += f" and f_user_id='{userId}'"
-        cursor.execute(sql1)
+            FROM {usage_sql}"""
+        cursor.execute(sql1, value_list)
         core_metrics = cursor.fetchall()
         sql2 = f"""
             SELECT
-            DATE(f_create_time) AS date_group,
+            DATE(f_bucket) AS date_group,
             SUM(f_input_tokens) AS input_tokens,
             SUM(f_output_tokens) AS output_tokens,
             CASE
-                WHEN SUM(f_total_count) = 0 THEN 0
-                ELSE SUM(f_average_total_time * f_total_count) / SUM(f_total_count)
+                WHEN SUM(f_total_count) - SUM(f_failed_count) = 0 THEN 0
+                ELSE SUM(f_total_time) / (SUM(f_total_count) - SUM(f_failed_count))
             END AS avg_total_time,
             CASE
-                WHEN SUM(f_total_count) = 0 THEN 0
-                ELSE SUM(f_average_first_time * f_total_count) / SUM(f_total_count)
+                WHEN SUM(f_total_count) - SUM(f_failed_count) = 0 THEN 0
+                ELSE SUM(f_first_time) / (SUM(f_total_count) - SUM(f_failed_count))
             END AS avg_first_time,
             SUM(f_input_tokens + f_output_tokens) / 86400.0 AS avg_rate,
             ROUND(SUM(f_total_count) / 86400.0, 6) AS avg_qps
-        FROM t_model_op_detail
-        WHERE DATE(f_create_time) BETWEEN '{start_time}' AND '{end_time}'"""
-        if model_id:
-            sql2 += f" and f_model_id='{model_id}'"
-        if userId != "266c6a42-6131-4d62-8f39-853e7093701c":
-            sql2 += f" and f_user_id='{userId}'"
-        sql2 += " GROUP BY DATE(f_create_time) ORDER BY date_group"
-        cursor.execute(sql2)
+        FROM {usage_sql} GROUP BY DATE(f_bucket) ORDER BY date_group"""
+        cursor.execute(sql2, value_list)
         trend_analysis = cursor.fetchall()
-        sql3 = f"""SELECT DATE_FORMAT(f_create_time, '%Y-%m-%d %H:%i:00') AS date_group,ROUND(SUM(f_total_count) / 300, 6) AS avg_qps
-                  FROM t_model_op_detail WHERE DATE(f_create_time) BETWEEN '{start_time}' AND '{end_time}'"""
+        # 按分钟的QPS只能从明细表统计
+        sql3 = """SELECT DATE_FORMAT(f_create_time, '%%Y-%%m-%%d %%H:%%i:00') AS date_group,ROUND(SUM(f_total_count) / 300, 6) AS avg_qps
+                  FROM t_model_op_detail WHERE f_create_time >= %s AND f_create_time < %s"""
+        value_list = [start, end]
         if model_id:
-            sql3 += f" and f_model_id='{model_id}'"
-        if userId != "266c6a42-6131-4d62-8f39-853e7093701c":
-            sql3 += f" and f_user_id='{userId}'"
-        sql3 += " GROUP BY DATE_FORMAT(f_create_time, '%Y-%m-%d %H:%i:00') ORDER BY date_group desc limit 96"
-        cursor.execute(sql3)
+            sql3 += " and f_model_id=%s"
+            value_list.append(model_id)
+        if user_id:
+            sql3 += " and f_user_id=%s"
+            value_list.append(user_id)
+        sql3 += " GROUP BY DATE_FORMAT(f_create_time, '%%Y-%%m-%%d %%H:%%i:00') ORDER BY date_group desc limit 96"
+        cursor.execute(sql3, value_list)
         qps_analysis = cursor.fetchall()
         return core_metrics, trend_analysis, qps_analysis
 
@@ -652,6 +652,8 @@ class ModelQuotaDao():
         user_model_sql = """delete from t_model_op_detail where f_create_time < %s"""
         StandLogger.info_log("Deleting model op detail records before: %s" % first_day_of_current_month)
         cursor.execute(user_model_sql, (first_day_of_current_month,))
+        # 按小时汇总只用于查询不足一天的时间段，与明细一起清理；按天汇总保留用于历史统计
+        cursor.execute("""delete from t_model_op_usage_hourly where f_bucket < %s""", (first_day_of_current_month,))
 
     @connect_execute_commit_close_db
     def delete_model_quota_by_model_id(self, model_ids, connection, cursor):
@@ -667,7 +669,7 @@ class ModelQuotaDao():
     @connect_execute_close_db
     def get_model_name_by_quota_config_id(self, conf_id_list, connection, cursor):
         conf_id_list = ",".join(conf_id_list)
-        sql = f"""select f_model_name from t_llm_model where f_model_id in (
+        sql = f"""select f_model_id, f_model_name from t_llm_model where f_model_id in (
                     select model_quota.f_model_id from t_model_quota_config model_quota join t_user_quota_config user_quota 
                               on user_quota.f_model_conf=model_quota.f_id
                               where user_quota.f_id in ({conf_id_list})
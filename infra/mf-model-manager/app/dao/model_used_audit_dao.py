@@ -7,6 +7,163 @@ from app.logs.stand_log import StandLogger
 from app.interfaces import dbaccess, logics
 
 
+ADD_MODEL_USED_LOG_SQL = """INSERT INTO t_model_op_detail (f_id, f_model_id, f_user_id, f_input_tokens, f_output_tokens, f_total_price,
+                f_create_time, f_currency_type, f_referprice_in, f_referprice_out, f_price_type, f_total_count, f_failed_count,
+                f_average_total_time, f_average_first_time) 
+                VALUES(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                f_input_tokens = f_input_tokens + VALUES(f_input_tokens),
+                f_output_tokens = f_output_tokens + VALUES(f_output_tokens),
+                f_total_price = f_total_price + VALUES(f_total_price),
+                f_create_time = VALUES(f_create_time),
+                f_total_count = f_total_count + VALUES(f_total_count),
+                f_failed_count = f_failed_count + VALUES(f_failed_count),
+                f_average_total_time = ((f_average_total_time * (f_total_count - f_failed_count)) + (VALUES(f_average_total_time) * (VALUES(f_total_count) - VALUES(f_failed_count)))) / (f_total_count - f_failed_count + VALUES(f_total_count) - VALUES(f_failed_count)),
+                f_average_first_time = ((f_average_first_time * (f_total_count - f_failed_count)) + (VALUES(f_average_first_time) * (VALUES(f_total_count) - VALUES(f_failed_count)))) / (f_total_count - f_failed_count + VALUES(f_total_count) - VALUES(f_failed_count))"""
+
+
+# 用量汇总表：与明细在同一事务中按 (时间桶, 模型, 用户) 累加，耗时保存成功调用的总和，查询时再求平均
+USAGE_DETAIL_TABLE = "t_model_op_detail"
+USAGE_HOURLY_TABLE = "t_model_op_usage_hourly"
+USAGE_DAILY_TABLE = "t_model_op_usage_daily"
+
+ADD_USAGE_ROLLUP_SQL = """INSERT INTO {} (f_bucket, f_model_id, f_user_id, f_input_tokens, f_output_tokens,
+                f_total_price, f_total_count, f_failed_count, f_total_time, f_first_time)
+                VALUES(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                f_input_tokens = f_input_tokens + VALUES(f_input_tokens),
+                f_output_tokens = f_output_tokens + VALUES(f_output_tokens),
+                f_total_price = f_total_price + VALUES(f_total_price),
+                f_total_count = f_total_count + VALUES(f_total_count),
+                f_failed_count = f_failed_count + VALUES(f_failed_count),
+                f_total_time = f_total_time + VALUES(f_total_time),
+                f_first_time = f_first_time + VALUES(f_first_time)"""
+
+# 各数据源统一输出的列，f_total_time/f_first_time为成功调用的耗时之和
+_USAGE_SOURCE_SQL = {
+    USAGE_DETAIL_TABLE: """select f_model_id, f_user_id, f_create_time as f_bucket, f_input_tokens, f_output_tokens,
+                f_total_price, f_total_count, f_failed_count,
+                f_average_total_time * (f_total_count - f_failed_count) as f_total_time,
+                f_average_first_time * (f_total_count - f_failed_count) as f_first_time
+                from t_model_op_detail where f_create_time >= %s and f_create_time < %s""",
+    USAGE_HOURLY_TABLE: """select f_model_id, f_user_id, f_bucket, f_input_tokens, f_output_tokens, f_total_price,
+                f_total_count, f_failed_count, f_total_time, f_first_time
+                from t_model_op_usage_hourly where f_bucket >= %s and f_bucket < %s""",
+    USAGE_DAILY_TABLE: """select f_model_id, f_user_id, f_bucket, f_input_tokens, f_output_tokens, f_total_price,
+                f_total_count, f_failed_count, f_total_time, f_first_time
+                from t_model_op_usage_daily where f_bucket >= %s and f_bucket < %s""",
+}
+
+
+def hour_bucket(time: datetime.datetime) -> datetime.datetime:
+    return time.replace(minute=0, second=0, microsecond=0)
+
+
+def day_bucket(time: datetime.datetime) -> datetime.datetime:
+    return time.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def month_range(now: datetime.datetime = None):
+    """本月的 [月初, 下月初)，本月至今的用量整段落在按天汇总表中"""
+    month_start = day_bucket(now or datetime.datetime.today()).replace(day=1)
+    return month_start, (month_start + datetime.timedelta(days=32)).replace(day=1)
+
+
+def plan_usage_sources(start: datetime.datetime, end: datetime.datetime) -> list:
+    """把 [start, end) 拆分为 [(数据源, 起始时间, 结束时间)]
+
+    整天的部分查按天汇总表，其余整小时的部分查按小时汇总表，不足一小时的首尾部分查明细表
+    """
+    if start >= end:
+        return []
+    sources = []
+    day_start = day_bucket(start)
+    if day_start < start:
+        day_start += datetime.timedelta(days=1)
+    day_end = day_bucket(end)
+    if day_start < day_end:
+        sources.append((USAGE_DAILY_TABLE, day_start, day_end))
+        edges = [(start, day_start), (day_end, end)]
+    else:
+        edges = [(start, end)]
+    for edge_start, edge_end in edges:
+        if edge_start >= edge_end:
+            continue
+        hour_start = hour_bucket(edge_start)
+        if hour_start < edge_start:
+            hour_start += datetime.timedelta(hours=1)
+        hour_end = hour_bucket(edge_end)
+        if hour_start >= hour_end:
+            sources.append((USAGE_DETAIL_TABLE, edge_start, edge_end))
+            continue
+        if edge_start < hour_start:
+            sources.append((USAGE_DETAIL_TABLE, edge_start, hour_start))
+        sources.append((USAGE_HOURLY_TABLE, hour_start, hour_end))
+        if hour_end < edge_end:
+            sources.append((USAGE_DETAIL_TABLE, hour_end, edge_end))
+    return sources
+
+
+def usage_rows_sql(start: datetime.datetime, end: datetime.datetime, model_id: str = "", user_id: str = ""):
+    """[start, end) 内用量数据的子查询及参数，各部分从能覆盖它的最粗粒度的表中读取；时间范围为空时返回 (None, [])"""
+    parts = []
+    params = []
+    for table, source_start, source_end in plan_usage_sources(start, end):
+        sql = _USAGE_SOURCE_SQL[table]
+        params += [source_start, source_end]
+        if model_id:
+            sql += " and f_model_id = %s"
+            params.append(model_id)
+        if user_id:
+            sql += " and f_user_id = %s"
+            params.append(user_id)
+        parts.append(sql)
+    if not parts:
+        return None, []
+    return "(" + " union all ".join(parts) + ") usage_rows", params
+
+
+def _usage_rollup_values(batch_data: list, create_time: datetime.datetime) -> dict:
+    """按 (模型, 用户) 合并本批数据，返回 {汇总表: 参数列表}"""
+    merged = {}
+    for config in batch_data:
+        key = (config.model_id, config.user_id)
+        success_count = config.total_count - config.failed_count
+        values = [config.input_tokens, config.output_tokens, config.total_price, config.total_count,
+                  config.failed_count, config.average_total_time * success_count,
+                  config.average_first_time * success_count]
+        if key in merged:
+            merged[key] = [a + b for a, b in zip(merged[key], values)]
+        else:
+            merged[key] = values
+    return {
+        table: [[bucket, model_id, user_id, *values] for (model_id, user_id), values in merged.items()]
+        for table, bucket in ((USAGE_HOURLY_TABLE, hour_bucket(create_time)),
+                              (USAGE_DAILY_TABLE, day_bucket(create_time)))
+    }
+
+
+def _add_usage_rollups(cursor, batch_data: list, create_time: datetime.datetime):
+    for table, values in _usage_rollup_values(batch_data, create_time).items():
+        cursor.executemany(ADD_USAGE_ROLLUP_SQL.format(table), values)
+
+
+def _model_used_log_values(config: dbaccess.ModelUsedAuditInfo, create_time: datetime.datetime) -> list:
+    return [config.conf_id, config.model_id, config.user_id, config.input_tokens, config.output_tokens,
+            config.total_price,
+            create_time, config.currency_type, config.referprice_in, config.referprice_out,
+            json.dumps(config.price_type), config.total_count, config.failed_count,
+            config.average_total_time, config.average_first_time]
+
+
+class StaleOffsetError(Exception):
+    """分区消费位点已被其他消费者推进，offsets为 {分区: 库中的offset}"""
+
+    def __init__(self, offsets: dict):
+        super().__init__(f"消费位点已过期: {offsets}")
+        self.offsets = offsets
+
+
 class ModelOpDao():
     # 新建模型配额设置（单条插入）
     # @connect_execute_commit_close_db
@@ -24,52 +181,68 @@ class ModelOpDao():
     @connect_execute_commit_close_db
     def batch_add_model_used_log(self, batch_data: list, connection, cursor):
         # 使用 INSERT ... ON DUPLICATE KEY UPDATE 实现幂等性
-        sql = """INSERT INTO t_model_op_detail (f_id, f_model_id, f_user_id, f_input_tokens, f_output_tokens, f_total_price,
-                f_create_time, f_currency_type, f_referprice_in, f_referprice_out, f_price_type, f_total_count, f_failed_count,
-                f_average_total_time, f_average_first_time) 
-                VALUES(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                f_input_tokens = f_input_tokens + VALUES(f_input_tokens),
-                f_output_tokens = f_output_tokens + VALUES(f_output_tokens),
-                f_total_price = f_total_price + VALUES(f_total_price),
-                f_create_time = VALUES(f_create_time),
-                f_total_count = f_total_count + VALUES(f_total_count),
-                f_failed_count = f_failed_count + VALUES(f_failed_count),
-                f_average_total_time = ((f_average_total_time * (f_total_count - f_failed_count)) + (VALUES(f_average_total_time) * (VALUES(f_total_count) - VALUES(f_failed_count)))) / (f_total_count - f_failed_count + VALUES(f_total_count) - VALUES(f_failed_count)),
-                f_average_first_time = ((f_average_first_time * (f_total_count - f_failed_count)) + (VALUES(f_average_first_time) * (VALUES(f_total_count) - VALUES(f_failed_count)))) / (f_total_count - f_failed_count + VALUES(f_total_count) - VALUES(f_failed_count))"""
-        
-        values = []
-        for config in batch_data:
-            value_list = [config.conf_id, config.model_id, config.user_id, config.input_tokens, config.output_tokens,
-                          config.total_price,
-                          datetime.datetime.today(), config.currency_type, config.referprice_in, config.referprice_out,
-                          json.dumps(config.price_type), config.total_count, config.failed_count,
-                          config.average_total_time, config.average_first_time]
-            values.append(value_list)
+        create_time = datetime.datetime.today()
+        values = [_model_used_log_values(config, create_time) for config in batch_data]
         StandLogger.info_log(f"准备批量入库: rows={len(values)}")
         
         try:
-            cursor.executemany(sql, values)
+            cursor.executemany(ADD_MODEL_USED_LOG_SQL, values)
             inserted = cursor.rowcount
+            _add_usage_rollups(cursor, batch_data, create_time)
             StandLogger.info_log(f"批量入库完成: affected_rows={inserted}")
         except Exception as e:
             StandLogger.error(f"批量入库时出错: {e}")
+            connection.rollback()
             # 如果批量操作失败，尝试逐条插入
             inserted = 0
-            for value_list in values:
+            for config, value_list in zip(batch_data, values):
                 try:
-                    cursor.execute(sql, value_list)
+                    cursor.execute(ADD_MODEL_USED_LOG_SQL, value_list)
+                    _add_usage_rollups(cursor, [config], create_time)
                     inserted += 1
                 except Exception as single_e:
                     StandLogger.error(f"单条插入失败: {single_e}, 数据: {value_list}")
         
         return inserted
 
+    # 汇总数据与Kafka消费位点在同一事务中入库，offsets为[(分区, 起始offset, 下一条待消费offset)]
+    @connect_execute_commit_close_db
+    def save_model_used_log_with_offsets(self, batch_data: list, group_id: str, topic: str, offsets: list,
+                                         connection, cursor):
+        partitions = [partition for partition, _, _ in offsets]
+        sql = """select f_partition, f_offset from t_model_op_consumer_offset
+                where f_group_id = %s and f_topic = %s and f_partition in ({}) for update""".format(
+            ", ".join(["%s"] * len(partitions)))
+        cursor.execute(sql, [group_id, topic, *partitions])
+        stored = {row["f_partition"]: row["f_offset"] for row in cursor.fetchall()}
+        # 库中位点超过本批起始位点，说明这部分消息已由其他消费者入库（分区被重新分配）
+        stale = {partition: stored[partition] for partition, start, _ in offsets
+                 if stored.get(partition) is not None and stored[partition] > start}
+        if stale:
+            raise StaleOffsetError(stale)
+
+        now = datetime.datetime.today()
+        if batch_data:
+            cursor.executemany(ADD_MODEL_USED_LOG_SQL, [_model_used_log_values(config, now) for config in batch_data])
+            _add_usage_rollups(cursor, batch_data, now)
+        sql = """insert into t_model_op_consumer_offset (f_group_id, f_topic, f_partition, f_offset, f_update_time)
+                values(%s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE f_offset = VALUES(f_offset), f_update_time = VALUES(f_update_time)"""
+        cursor.executemany(sql, [[group_id, topic, partition, end, now] for partition, _, end in offsets])
+        return len(batch_data)
+
+    # 获取消费者组已入库的消费位点 {分区: 下一条待消费offset}
+    @connect_execute_close_db
+    def get_consumer_offsets(self, group_id: str, topic: str, connection, cursor):
+        sql = """select f_partition, f_offset from t_model_op_consumer_offset where f_group_id = %s and f_topic = %s"""
+        cursor.execute(sql, [group_id, topic])
+        return {row["f_partition"]: row["f_offset"] for row in cursor.fetchall()}
+
     # 获取模型配额配置列表
     @connect_execute_close_db
     def get_model_config_list(self, config: logics.GetModelOpList, connection, cursor):
-        today = datetime.datetime.today()
-        month_start = datetime.datetime(year=today.year, month=today.month, day=1, minute=0, second=0)
+        # 按明细行分页展示，无法由汇总表回答；本月条件使用f_create_time索引
+        month_start, _ = month_range()
         sql = """select `t_model_op_detail`.`f_id`, `t_model_op_detail`.`f_model_id` , `t_model_op_detail`.`f_user_id`, 
                 `t_model_op_detail`.`f_input_tokens`, `t_model_op_detail`.`f_output_tokens`, 
                 `t_model_op_detail`.`f_total_price`, `t_model_op_detail`.`f_create_time`, 
@@ -79,51 +252,50 @@ class ModelOpDao():
                   from t_model_op_detail inner join account on account.account_id = t_model_op_detail.f_user_id  
                   left join t_model_quota_config on t_model_op_detail.f_model_id = t_model_quota_config.f_model_id 
                   inner join t_model_list on t_model_list.f_model_id=t_model_op_detail.f_model_id
-                  where `t_model_op_detail`.`f_create_time` >= '%s' """ % month_start
+                  where `t_model_op_detail`.`f_create_time` >= %s """
+        value_list = [month_start]
 
-        if config.api_model != "" and config.user_id != "":
-            sql += "and f_user_id = '%s' and BINARY t_model_list.f_model = '%s' " % (config.user_id, config.api_model)
-        elif config.api_model != "":
-            sql += "and BINARY t_model_list.f_model = '%s' " % config.api_model
-        elif config.user_id != "":
-            sql += "and f_user_id = '%s' " % config.user_id
+        if config.api_model != "":
+            sql += "and BINARY t_model_list.f_model = %s "
+            value_list.append(config.api_model)
+        if config.user_id != "":
+            sql += "and f_user_id = %s "
+            value_list.append(config.user_id)
 
-        order_str = "order by {0} {1} ".format(logics.model_quota_list_dict[config.order], config.rule)
+        order_str = "order by {0} {1} ".format(logics.model_quota_list_dict[config.order],
+                                                "asc" if config.rule == "asc" else "desc")
         if config.page != -1:
-            limit_str = "limit {0} offset {1}".format(config.size, (config.page - 1) * config.size)
+            limit_str = "limit {0} offset {1}".format(int(config.size), (int(config.page) - 1) * int(config.size))
             sql = sql + order_str + limit_str
         else:
             sql = sql + order_str
 
         StandLogger.info_log(sql)
-        cursor.execute(sql)
+        cursor.execute(sql, value_list)
         res = cursor.fetchall()
         return res
 
-    # 获取指定时间范围内的所有log
+    # 获取指定时间范围内各模型、用户的用量
     @connect_execute_close_db
     def get_model_used_logs_list_within_specified_timeframe(self, start_time, end_time, connection, cursor):
-        sql = """select f_model_id, f_user_id, sum(f_input_tokens) as f_input_tokens, sum(f_output_tokens) as f_output_tokens
-                from t_model_op_detail where f_create_time >= %s and f_create_time < %s group by f_model_id, f_user_id"""
-        value_list = [start_time, end_time]
-        StandLogger.info_log(sql % tuple(value_list))
+        usage_sql, value_list = usage_rows_sql(start_time, end_time)
+        if usage_sql is None:
+            return []
+        sql = f"""select f_model_id, f_user_id, sum(f_input_tokens) as f_input_tokens, sum(f_output_tokens) as f_output_tokens
+                from {usage_sql} group by f_model_id, f_user_id"""
+        StandLogger.info_log(sql)
         cursor.execute(sql, value_list)
         res = cursor.fetchall()
         return res
 
-    # 生成通过model_id获取当月log列表的函数
+    # 获取用户在模型上的本月用量
     @connect_execute_close_db
     def get_model_used_logs_list_within_specified_timeframe_by_model_id(self, model_id, user_id, connection, cursor):
-        sql = """select f_id, f_model_id, f_user_id, f_input_tokens, f_output_tokens, f_total_price, f_create_time, 
-                f_currency_type, f_price_type  
-               from t_model_op_detail where f_model_id = '%s' and f_user_id = '%s' and f_create_time >= '%s'""" % (
-            model_id, user_id,
-            datetime.datetime(year=datetime.datetime.today().year, month=datetime.datetime.today().month, day=1,
-                              minute=0,
-                              second=0))
-
+        usage_sql, value_list = usage_rows_sql(*month_range(), model_id=model_id, user_id=user_id)
+        sql = f"""select f_model_id, f_user_id, sum(f_input_tokens) as f_input_tokens, sum(f_output_tokens) as f_output_tokens
+                from {usage_sql} group by f_model_id, f_user_id"""
         StandLogger.info_log(sql)
-        cursor.execute(sql)
+        cursor.execute(sql, value_list)
         res = cursor.fetchall()
         return res
 
@@ -181,13 +353,12 @@ class ModelOpDao():
 
     @connect_execute_close_db
     def get_all_token_model(self, connection, cursor):
-        today = datetime.datetime.today()
-        month_start = datetime.datetime(year=today.year, month=today.month, day=1, minute=0, second=0)
-        sql = """select distinct t_model_op_detail.f_model_id, t_model_list.f_model_name, t_model_list.f_icon, t_model_list.f_model from t_model_op_detail 
-                inner join t_model_list on t_model_op_detail.f_model_id = t_model_list.f_model_id 
-                where t_model_op_detail.f_create_time > '%s' and t_model_op_detail.f_user_id!=''""" % month_start
+        usage_sql, value_list = usage_rows_sql(*month_range())
+        sql = f"""select distinct usage_rows.f_model_id, t_model_list.f_model_name, t_model_list.f_icon, t_model_list.f_model from {usage_sql} 
+                inner join t_model_list on usage_rows.f_model_id = t_model_list.f_model_id 
+                where usage_rows.f_user_id!=''"""
         StandLogger.info_log(sql)
-        cursor.execute(sql)
+        cursor.execute(sql, value_list)
         res = cursor.fetchall()
         return res
 
@@ -261,12 +432,10 @@ class ModelOpDao():
 
     @connect_execute_close_db
     def get_all_user_id_in_log(self, connection, cursor):
-        today = datetime.datetime.today()
-        month_start = datetime.datetime(year=today.year, month=today.month, day=1, minute=0, second=0)
-        sql = """select distinct t_model_op_detail.f_user_id, account.username from t_model_op_detail inner join 
-                account on t_model_op_detail.f_user_id = account.account_id 
-                where t_model_op_detail.f_create_time > '%s'""" % month_start
-        cursor.execute(sql)
+        usage_sql, value_list = usage_rows_sql(*month_range())
+        sql = f"""select distinct usage_rows.f_user_id, account.username from {usage_sql} inner join 
+                account on usage_rows.f_user_id = account.account_id"""
+        cursor.execute(sql, value_list)
         tmp_res = cursor.fetchall()
         res = []
         for item in tmp_res:
@@ -56,6 +56,17 @@ class SmallModelDao:
         res = cursor.fetchall()
         return res
 
+    # 全部模型，字段与get_model_info_by_name一致，用于加载模型注册表
+    @connect_execute_close_db
+    def get_all_model_info(self, connection, cursor):
+        sql = """select f_model_id, f_model_name, f_model_type, f_model_config, f_create_time, f_update_time,f_adapter, 
+        f_adapter_code,f_batch_size,f_max_tokens,f_embedding_dim 
+                    from t_small_model"""
+
+        cursor.execute(sql)
+        res = cursor.fetchall()
+        return res
+
     @connect_execute_close_db
     def get_model_info_by_ids(self, model_ids, connection, cursor):
         placeholders = ','.join(['%s'] * len(model_ids))
@@ -530,6 +530,12 @@ class UsedEmbedding(BaseModel):
     input: list = Field(description="向量化的内容列表")
 
 
+class CheckSmallModelPermission(BaseModel):
+    model_ids: List[StrictStr] = Field(description="模型id列表", min_items=1, max_items=1000)
+    operation: StrictStr = Field(default="execute", description="操作",
+                                 regex=r'^(display|modify|delete|execute)$')
+
+
 class AuthInfo(BaseModel):
     userid: Optional[str]
     appid: Optional[str]
@@ -131,6 +131,13 @@ async def check_llm_(model_id, request: Request, ):
     return await check_model(model_id, userId, language)
 
 
+# 大模型调用准入统计
+@private_route.get("/llm/admission/stats")
+async def llm_admission_stats(request: Request):
+    userId, language, role = await get_user_info(request)
+    return await get_admission_stats()
+
+
 # 流式返回接口
 @private_route.post("/prompt-run-stream")
 async def run_prompt_stream(request: Request, params: dict = Body(...)):
@@ -327,4 +334,11 @@ async def get_info_list(request: Request, order: str = Query(regex=r'^(desc|asc)
 @private_route.get("/small-model/get_by_name")
 async def get_info(request: Request, model_name):
     userId, language, role = await get_user_info(request)
-    return await small_model_controller.get_info_by_name(model_name)
\ No newline at end of file
+    return await small_model_controller.get_info_by_name(model_name)
+
+
+# 小模型适配器调用统计
+@private_route.get("/small-model/adapter/stats")
+async def small_model_adapter_stats(request: Request):
+    userId, language, role = await get_user_info(request)
+    return await small_model_controller.get_adapter_stats()
\ No newline at end of file
@@ -30,6 +30,12 @@ async def get_info_list(request: Request, order: str = Query(regex=r'^(desc|asc)
                                                       model_series, userId, role)
 
 
+@small_model_router.post("/small-model/permission-check")
+async def check_permission(request: logics.CheckSmallModelPermission, head_request: Request):
+    userId, language, role = await get_user_info(head_request)
+    return await small_model_controller.check_permission(request, userId, role)
+
+
 @small_model_router.get("/small-model/get")
 async def get_info(request: Request, model_id):
     userId, language, role = await get_user_info(request)
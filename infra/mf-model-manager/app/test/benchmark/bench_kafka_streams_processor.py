@@ -0,0 +1,249 @@
+"""模型用量汇总入库吞吐基准
+
+使用内存中的假消费者和假数据访问对象代替Kafka和MySQL，测量KafkaStreamsProcessor的消费吞吐，
+并校验入库的token总量与生成的消息一致：
+- steady: 持续消费，按消息数和汇总键数触发入库
+- crash: 数据入库后、提交Kafka位点前进程退出，新消费者从数据库中的位点恢复
+- rebalance: 消费过程中分区被回收再分配
+- stale: 旧消费者在分区重新分配后仍尝试入库
+
+运行方式（在 mf-model-manager 目录下，需要服务的运行环境）：
+    python -m app.test.benchmark.bench_kafka_streams_processor
+    python -m app.test.benchmark.bench_kafka_streams_processor --messages 500000 --db-latency 0.01
+"""
+
+import argparse
+import json
+import random
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Dict, List
+
+from confluent_kafka import OFFSET_INVALID
+
+from app.dao.model_used_audit_dao import StaleOffsetError
+from app.utils.kafka_streams_processor import KafkaStreamsProcessor
+
+TOPIC = "bench.quota_data"
+GROUP = "bench_group"
+
+
+class FakeMessage:
+    def __init__(self, partition: int, offset: int, value: bytes):
+        self._partition = partition
+        self._offset = offset
+        self._value = value
+
+    def error(self):
+        return None
+
+    def topic(self):
+        return TOPIC
+
+    def partition(self):
+        return self._partition
+
+    def offset(self):
+        return self._offset
+
+    def value(self):
+        return self._value
+
+
+class FakeConsumer:
+    """按分区保存消息的内存消费者，首次consume时触发分区分配"""
+
+    def __init__(self, log: Dict[int, List[bytes]], committed: Dict[int, int]):
+        self.log = log
+        self.committed = committed
+        self.positions: Dict[int, int] = {}
+        self.callbacks = {}
+        self.assigned = False
+        # 消息消费完后停止该处理器
+        self.processor = None
+        self.consumed = 0
+
+    def subscribe(self, topics, on_assign=None, on_revoke=None, on_lost=None):
+        self.callbacks = {"assign": on_assign, "revoke": on_revoke, "lost": on_lost}
+
+    def _partitions(self):
+        from confluent_kafka import TopicPartition
+        return [TopicPartition(TOPIC, partition, OFFSET_INVALID) for partition in self.log]
+
+    def assign(self, partitions):
+        for tp in partitions:
+            self.positions[tp.partition] = tp.offset if tp.offset >= 0 else self.committed.get(tp.partition, 0)
+        self.assigned = True
+
+    def rebalance(self):
+        self.callbacks["revoke"](self, self._partitions())
+        self.positions.clear()
+        self.callbacks["assign"](self, self._partitions())
+
+    def consume(self, num_messages=500, timeout=0.2):
+        if not self.assigned:
+            self.callbacks["assign"](self, self._partitions())
+        result = []
+        partitions = list(self.positions)
+        random.shuffle(partitions)
+        for partition in partitions:
+            position = self.positions[partition]
+            end = min(position + num_messages // len(partitions) + 1, len(self.log[partition]))
+            for offset in range(position, end):
+                result.append(FakeMessage(partition, offset, self.log[partition][offset]))
+            self.positions[partition] = end
+        self.consumed += len(result)
+        if not result:
+            self.processor.running = False
+        return result
+
+    def seek(self, tp):
+        self.positions[tp.partition] = tp.offset
+
+    def commit(self, offsets=None, asynchronous=True):
+        for tp in offsets:
+            self.committed[tp.partition] = tp.offset
+
+    def close(self):
+        self.positions.clear()
+
+
+class FakeDao:
+    """在内存中模拟汇总数据与位点的事务写入"""
+
+    def __init__(self, latency: float = 0.0, crash_before_commit: bool = False):
+        self.latency = latency
+        self.crash_before_commit = crash_before_commit
+        self.offsets: Dict[int, int] = {}
+        self.tokens = defaultdict(int)
+        self.flushes = 0
+        self.rows = 0
+
+    def get_consumer_offsets(self, group_id, topic):
+        return dict(self.offsets)
+
+    def save_model_used_log_with_offsets(self, batch_data, group_id, topic, offsets):
+        time.sleep(self.latency)
+        stale = {partition: self.offsets[partition] for partition, start, _ in offsets
+                 if self.offsets.get(partition) is not None and self.offsets[partition] > start}
+        if stale:
+            raise StaleOffsetError(stale)
+        for row in batch_data:
+            self.tokens[(row.model_id, row.user_id)] += row.input_tokens + row.output_tokens
+        for partition, _, end in offsets:
+            self.offsets[partition] = end
+        self.flushes += 1
+        self.rows += len(batch_data)
+        if self.crash_before_commit:
+            self.crash_before_commit = False
+            raise SystemExit("入库后、提交位点前进程退出")
+        return len(batch_data)
+
+
+def build_log(messages: int, partitions: int, models: int, users: int, seed: int):
+    """生成消息，返回 (分区消息, 计费配置, 按(模型, 用户)统计的token总量)"""
+    rng = random.Random(seed)
+    log = {partition: [] for partition in range(partitions)}
+    expected = defaultdict(int)
+    for index in range(messages):
+        model_id = f"model-{rng.randrange(models)}"
+        user_id = f"user-{rng.randrange(users)}"
+        input_tokens = rng.randrange(1, 2000)
+        output_tokens = rng.randrange(0, 1000)
+        status = "failed" if rng.random() < 0.02 else "success"
+        expected[(model_id, user_id)] += input_tokens + output_tokens
+        log[index % partitions].append(json.dumps({
+            "conf_id": str(index), "model_id": model_id, "user_id": user_id, "status": status,
+            "input_tokens": input_tokens, "output_tokens": output_tokens,
+            "total_time": rng.random() * 10, "first_time": rng.random(),
+        }).encode())
+    configs = {
+        f"model-{i}": SimpleNamespace(billing_type=i % 2, referprice_in=0.002, referprice_out=0.004,
+                                      price_type=["thousand", "million"], currency_type=0)
+        for i in range(models)
+    }
+    return log, configs, expected
+
+
+def run_processor(log, configs, dao, committed, args, rebalance_after=None):
+    consumer = FakeConsumer(log, committed)
+    processor = KafkaStreamsProcessor(topic_name=TOPIC, group_id=GROUP, consumer=consumer, dao=dao,
+                                      quota_configs=configs, flush_interval=3600,
+                                      flush_max_messages=args.flush_messages, flush_max_keys=args.flush_keys)
+    consumer.processor = processor
+    if rebalance_after is not None:
+        consume = consumer.consume
+
+        def consume_with_rebalance(num_messages=500, timeout=0.2):
+            if consumer.consumed >= rebalance_after and not getattr(consumer, "rebalanced", False):
+                consumer.rebalanced = True
+                consumer.rebalance()
+            return consume(num_messages, timeout)
+
+        consumer.consume = consume_with_rebalance
+    try:
+        processor.start_consumer()
+    except SystemExit:
+        pass
+    return processor
+
+
+def check(name: str, dao: FakeDao, expected, elapsed: float, messages: int):
+    exact = dict(dao.tokens) == dict(expected)
+    print(f"{name:>10} {messages / elapsed:>12.0f} {dao.flushes:>8} {dao.rows:>8} {'yes' if exact else 'NO':>6}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--partitions", type=int, default=6)
+    parser.add_argument("--models", type=int, default=10)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--flush-messages", type=int, default=20000)
+    parser.add_argument("--flush-keys", type=int, default=2000)
+    parser.add_argument("--db-latency", type=float, default=0.005, help="每次入库的模拟耗时（秒）")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    log, configs, expected = build_log(args.messages, args.partitions, args.models, args.users, args.seed)
+    print(f"{'scenario':>10} {'msgs/s':>12} {'flushes':>8} {'rows':>8} {'exact':>6}")
+
+    dao = FakeDao(args.db_latency)
+    start = time.perf_counter()
+    run_processor(log, configs, dao, {}, args)
+    check("steady", dao, expected, time.perf_counter() - start, args.messages)
+
+    # 入库成功后进程退出，Kafka位点没有提交
+    dao = FakeDao(args.db_latency, crash_before_commit=True)
+    committed = {}
+    start = time.perf_counter()
+    run_processor(log, configs, dao, committed, args)
+    run_processor(log, configs, dao, committed, args)
+    check("crash", dao, expected, time.perf_counter() - start, args.messages)
+
+    dao = FakeDao(args.db_latency)
+    start = time.perf_counter()
+    run_processor(log, configs, dao, {}, args, rebalance_after=args.messages // 3)
+    check("rebalance", dao, expected, time.perf_counter() - start, args.messages)
+
+    # 旧消费者汇总了一半数据后失去分区，新消费者已从同一位点消费完并入库
+    dao = FakeDao(args.db_latency)
+    committed = {}
+    zombie_consumer = FakeConsumer(log, committed)
+    zombie = KafkaStreamsProcessor(topic_name=TOPIC, group_id=GROUP, consumer=zombie_consumer, dao=dao,
+                                   quota_configs=configs, flush_interval=3600,
+                                   flush_max_messages=args.messages, flush_max_keys=args.messages)
+    zombie_consumer.processor = zombie
+    zombie_consumer.subscribe([TOPIC], zombie._on_assign, zombie._on_revoke, zombie._on_lost)
+    for msg in zombie_consumer.consume(num_messages=args.messages // 2):
+        zombie._process_message(msg.partition(), msg.offset(), msg.value())
+    start = time.perf_counter()
+    run_processor(log, configs, dao, committed, args)
+    stale_rejected = not zombie._flush()
+    check("stale", dao, expected, time.perf_counter() - start, args.messages)
+    print(f"stale batch rejected: {stale_rejected}")
+
+
+if __name__ == "__main__":
+    main()
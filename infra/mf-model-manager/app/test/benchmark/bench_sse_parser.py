@@ -0,0 +1,193 @@
+"""推理模型流式响应解析基准
+
+生成OpenAI格式的流式响应（<think>推理内容</think>正文，标签被拆在不同token中），
+分别用原先逐token全文匹配的解析方式（legacy）和sse_parser（current）处理，
+比较每个token的CPU耗时，并校验拆分出的推理内容和正文是否与生成的内容一致。
+响应长度依次取--tokens的1/8、1/4、1/2和全部；legacy每个token都对累计的回答做正则匹配，
+耗时随长度增长过快，超过--legacy-max-tokens的长度不再运行。
+
+运行方式（在 mf-model-manager 目录下）：
+    python -m app.test.benchmark.bench_sse_parser
+    python -m app.test.benchmark.bench_sse_parser --tokens 32000 --reasoning-ratio 0.9
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+from typing import List, Tuple
+
+from app.utils.sse_parser import SSE_DONE, THINK_CONTENT, THINK_PENDING, ThinkTagSplitter, sse_data
+
+WORDS = ["the", " model", " thinks", " about", " 问题", "，", " 然后", " answer", "\n", " data:", " x", "<", "/"]
+
+
+def has_common_substring(a, b):
+    len_a = len(a)
+    len_b = len(b)
+    for i in range(1, len_b + 1):
+        if a[len_a - i: len_a] == b[0: i]:
+            return True
+    return False
+
+
+def build_stream(tokens: int, reasoning_ratio: float, seed: int) -> Tuple[List[bytes], Tuple[str, str]]:
+    """返回 (响应行, (推理内容, 正文))"""
+    rng = random.Random(seed)
+    reasoning_tokens = int(tokens * reasoning_ratio)
+    reasoning = [rng.choice(WORDS) for _ in range(reasoning_tokens)]
+    content = [rng.choice(WORDS) for _ in range(tokens - reasoning_tokens)]
+    pieces = ["<th", "ink>"] + reasoning + ["</", "think", ">"] + content
+    lines = [b'data: {"id":"chatcmpl-1","object":"chat.completion.chunk","choices":[{"index":0,'
+             b'"delta":{"role":"assistant","content":""}}],"usage":null}\n']
+    for piece in pieces:
+        lines.append(("data: " + json.dumps({
+            "id": "chatcmpl-1", "object": "chat.completion.chunk",
+            "choices": [{"index": 0, "delta": {"content": piece}}], "usage": None,
+        }, ensure_ascii=False) + "\n").encode())
+    lines.append(b"data: [DONE]\n")
+    return lines, ("".join(reasoning), "".join(content))
+
+
+def legacy(lines: List[bytes]) -> List[str]:
+    """原先OtherClient.chat_completion_stream_openai中推理模型（inner）的处理"""
+    output = []
+    ans = ""
+    think_str = ""
+    rlm_type = ""
+    think_done = False
+    think_start = False
+    for chunk in lines:
+        chunk = chunk.decode(encoding='utf-8')
+        if chunk.endswith('\n'):
+            chunk = chunk[:-1]
+        if chunk == "data: [DONE]" or chunk == "":
+            continue
+        datas = json.loads(chunk[6:])
+        delta = datas["choices"][0]["delta"]
+        if delta.get("content") is not None:
+            ans += delta["content"]
+        if rlm_type == "":
+            if delta.get("content", "") not in ["", None]:
+                rlm_type = "inner"
+            continue
+        if think_done is False:
+            if think_start is False:
+                start_pattern = r"<think>(.*?)"
+                match = re.search(start_pattern, ans, re.DOTALL)
+                if match:
+                    think_start = True
+                    delta["reasoning_content"] = re.sub(start_pattern, "", ans, flags=re.DOTALL)
+                    think_str = ans
+                    delta["content"] = None
+                    output.append(json.dumps(datas, ensure_ascii=False))
+                if not match and len(ans) >= 7:
+                    think_start = True
+                    delta["reasoning_content"] = ans
+                    think_str = ans
+                    delta["content"] = None
+                    output.append(json.dumps(datas, ensure_ascii=False))
+            else:
+                pattern = r"(.*?)</think>"
+                match = re.search(pattern, ans, re.DOTALL)
+                if match:
+                    think_done = True
+                    delta["reasoning_content"] = match.group(1).replace(think_str.replace("<think>", ""), "")
+                    delta["content"] = None
+                    output.append(json.dumps(datas, ensure_ascii=False))
+                    ans = re.sub(pattern, "", ans, flags=re.DOTALL)
+                    delta["reasoning_content"] = None
+                    delta["content"] = ans
+                    output.append(json.dumps(datas, ensure_ascii=False))
+                elif not has_common_substring(ans.replace("<think>", ""), "</think>"):
+                    delta["reasoning_content"] = ans.replace(think_str, "")
+                    delta["content"] = None
+                    think_str = ans
+                    output.append(json.dumps(datas, ensure_ascii=False))
+        else:
+            delta["reasoning_content"] = None
+            output.append(json.dumps(datas, ensure_ascii=False))
+    return output
+
+
+def current(lines: List[bytes]) -> List[str]:
+    """现在OtherClient.chat_completion_stream_openai中推理模型（inner）的处理"""
+    output = []
+    rlm_type = ""
+    think_splitter = ThinkTagSplitter()
+    for line in lines:
+        chunk = sse_data(line)
+        if chunk is None or chunk == SSE_DONE:
+            continue
+        datas = json.loads(chunk)
+        delta = datas["choices"][0]["delta"] if datas["choices"] else None
+        token = delta.get("content") if delta else None
+        if rlm_type == "":
+            if token not in ["", None]:
+                rlm_type = "inner"
+            else:
+                continue
+        if think_splitter.state == THINK_CONTENT:
+            delta["reasoning_content"] = None
+            output.append(json.dumps(datas, ensure_ascii=False))
+            continue
+        reasoning, content = think_splitter.feed(token or "")
+        if think_splitter.state == THINK_CONTENT:
+            delta["reasoning_content"] = reasoning
+            delta["content"] = None
+            output.append(json.dumps(datas, ensure_ascii=False))
+            delta["reasoning_content"] = None
+            delta["content"] = content
+            output.append(json.dumps(datas, ensure_ascii=False))
+        elif think_splitter.state != THINK_PENDING and (reasoning or not think_splitter.holding):
+            delta["reasoning_content"] = reasoning
+            delta["content"] = None
+            output.append(json.dumps(datas, ensure_ascii=False))
+    return output
+
+
+def split_output(output: List[str]):
+    reasoning, content = [], []
+    for item in output:
+        delta = json.loads(item)["choices"][0]["delta"]
+        reasoning.append(delta.get("reasoning_content") or "")
+        content.append(delta.get("content") or "")
+    return "".join(reasoning), "".join(content)
+
+
+def measure(func, lines: List[bytes], repeat: int):
+    best = None
+    output = None
+    for _ in range(repeat):
+        start = time.process_time()
+        output = func(lines)
+        elapsed = time.process_time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, output
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tokens", type=int, default=8000)
+    parser.add_argument("--reasoning-ratio", type=float, default=0.8)
+    parser.add_argument("--legacy-max-tokens", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'tokens':>8} {'parser':>8} {'total_ms':>10} {'us/token':>10} {'exact':>6}")
+    for tokens in (args.tokens // 8, args.tokens // 4, args.tokens // 2, args.tokens):
+        lines, expected = build_stream(tokens, args.reasoning_ratio, args.seed)
+        for name, func in (("legacy", legacy), ("current", current)):
+            if name == "legacy" and tokens > args.legacy_max_tokens:
+                print(f"{tokens:>8} {name:>8} {'skipped':>10}")
+                continue
+            elapsed, output = measure(func, lines, 1 if name == "legacy" else args.repeat)
+            exact = split_output(output) == expected
+            print(f"{tokens:>8} {name:>8} {elapsed * 1000:>10.1f} {elapsed * 1e6 / len(lines):>10.2f} "
+                  f"{'yes' if exact else 'NO':>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+from unittest import IsolatedAsyncioTestCase
+
+from app.utils.adapter_cache import AdapterCache
+
+ADAPTER_CODE = """
+async def main(texts):
+    if not texts:
+        raise ValueError("empty")
+    return [len(text) for text in texts]
+"""
+
+
+class TestAdapterCache(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.cache = AdapterCache(max_size=2)
+
+    async def test_compiled_once(self):
+        first = self.cache.get("m1", ADAPTER_CODE)
+        second = self.cache.get("m1", ADAPTER_CODE)
+
+        self.assertIs(first, second)
+
+    async def test_code_change_replaces_entry(self):
+        old = self.cache.get("m1", ADAPTER_CODE)
+        new = self.cache.get("m1", ADAPTER_CODE + "\n")
+
+        self.assertIsNot(old, new)
+        self.assertEqual(1, len(self.cache._entries))
+
+    async def test_invalidate(self):
+        old = self.cache.get("m1", ADAPTER_CODE)
+        self.cache.invalidate(["m1"])
+
+        self.assertIsNot(old, self.cache.get("m1", ADAPTER_CODE))
+
+    async def test_stats(self):
+        self.assertEqual([2, 3], await self.cache.call("m1", ADAPTER_CODE, ["ab", "cde"]))
+        with self.assertRaises(ValueError):
+            await self.cache.call("m1", ADAPTER_CODE, [])
+        # 未保存的代码不计入统计
+        await self.cache.call(None, ADAPTER_CODE, ["a"])
+
+        stats = self.cache.stats()
+
+        self.assertEqual(["m1"], list(stats))
+        self.assertEqual(2, stats["m1"]["calls"])
+        self.assertEqual(1, stats["m1"]["errors"])
+        self.assertGreaterEqual(stats["m1"]["max_ms"], stats["m1"]["avg_ms"])
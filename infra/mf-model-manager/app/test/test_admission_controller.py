@@ -0,0 +1,149 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+
+from app.utils.admission_controller import REJECT_QUEUE_FULL, REJECT_TIMEOUT, AdmissionController, \
+    AdmissionRejected, ModelGate, model_max_inflight
+
+
+async def admission_order(gate: ModelGate, requests):
+    """名额占满后依次排队，返回放行顺序；requests为 (分组, 权重, 标记)"""
+    holder = await gate.acquire(("holder", ""), 1.0)
+    order = []
+
+    async def run(flow, weight, label):
+        ticket = await gate.acquire(flow, weight)
+        order.append(label)
+        ticket.release()
+
+    tasks = []
+    for flow, weight, label in requests:
+        tasks.append(asyncio.create_task(run(flow, weight, label)))
+        # 保证按列表顺序入队
+        await asyncio.sleep(0)
+    holder.release()
+    await asyncio.gather(*tasks)
+    return order
+
+
+class TestModelMaxInflight(TestCase):
+    def test_model_config_overrides_default(self):
+        self.assertEqual(8, model_max_inflight({"f_model_config": "{'max_inflight': 8}"}))
+        self.assertEqual(0, model_max_inflight({"f_model_config": '{"max_inflight": -1}'}))
+
+
+class TestModelGate(IsolatedAsyncioTestCase):
+    def gate(self, max_inflight=1, queue_timeout=5.0, max_queue=100):
+        return ModelGate("m1", max_inflight, queue_timeout=queue_timeout, max_queue=max_queue)
+
+    async def test_admitted_without_queue(self):
+        gate = self.gate(max_inflight=2)
+        first = await gate.acquire(("u1", ""), 1.0)
+        second = await gate.acquire(("u1", ""), 1.0)
+
+        self.assertEqual(2, gate.in_flight)
+        first.release()
+        first.release()
+        second.release()
+        self.assertEqual(0, gate.in_flight)
+
+    async def test_flows_interleaved(self):
+        a, b = ("u1", "chat"), ("u2", "chat")
+        order = await admission_order(self.gate(), [(a, 1.0, "a1"), (a, 1.0, "a2"), (a, 1.0, "a3"), (b, 1.0, "b1")])
+
+        # u1先排了3个请求，u2的请求仍在u1的第二个请求之前放行
+        self.assertEqual(["a1", "b1", "a2", "a3"], order)
+
+    async def test_weighted_share(self):
+        c, d = ("u1", "agent"), ("u2", "chat")
+        requests = [(c, 2.0, "c1"), (c, 2.0, "c2"), (c, 2.0, "c3"), (c, 2.0, "c4"), (d, 1.0, "d1"), (d, 1.0, "d2")]
+
+        order = await admission_order(self.gate(), requests)
+
+        # 权重2的分组放行次数是权重1的分组的2倍，按最小虚拟完成时间放行
+        self.assertEqual(["c1", "c2", "d1", "c3", "c4", "d2"], order)
+
+    async def test_soft_limit_lowers_priority(self):
+        controller = AdmissionController(func_module_weights={}, soft_limit_weight=0.5)
+        soft, normal = ("u1", ""), ("u2", "")
+
+        def requests(soft_limit):
+            soft_weight = controller.weight("", soft_limit=soft_limit)
+            return [(soft, soft_weight, "s1"), (soft, soft_weight, "s2"), (normal, 1.0, "n1"), (normal, 1.0, "n2")]
+
+        self.assertEqual(["s1", "n1", "s2", "n2"], await admission_order(self.gate(), requests(False)))
+        self.assertEqual(["n1", "s1", "n2", "s2"], await admission_order(self.gate(), requests(True)))
+
+    async def test_queue_full_rejected(self):
+        gate = self.gate(max_queue=1)
+        holder = await gate.acquire(("u1", ""), 1.0)
+        waiting = asyncio.create_task(gate.acquire(("u2", ""), 1.0))
+        await asyncio.sleep(0)
+
+        with self.assertRaises(AdmissionRejected) as ctx:
+            await gate.acquire(("u3", ""), 1.0)
+
+        self.assertEqual(REJECT_QUEUE_FULL, ctx.exception.reason)
+        self.assertEqual(1, gate.stats()["rejected"])
+        holder.release()
+        (await waiting).release()
+        self.assertEqual(0, gate.in_flight)
+
+    async def test_queue_timeout_rejected(self):
+        gate = self.gate(queue_timeout=0.01)
+        holder = await gate.acquire(("u1", ""), 1.0)
+
+        with self.assertRaises(AdmissionRejected) as ctx:
+            await gate.acquire(("u2", ""), 1.0)
+
+        self.assertEqual(REJECT_TIMEOUT, ctx.exception.reason)
+        self.assertEqual(0, gate.queued)
+        self.assertEqual(1, gate.stats()["timeouts"])
+        holder.release()
+        self.assertEqual(0, gate.in_flight)
+
+    async def test_cancelled_waiter_skipped(self):
+        gate = self.gate()
+        holder = await gate.acquire(("u1", ""), 1.0)
+        cancelled = asyncio.create_task(gate.acquire(("u2", ""), 1.0))
+        waiting = asyncio.create_task(gate.acquire(("u3", ""), 1.0))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+
+        holder.release()
+        ticket = await waiting
+
+        self.assertEqual(1, gate.in_flight)
+        ticket.release()
+        self.assertEqual(0, gate.in_flight)
+
+    async def test_raise_max_inflight_dispatches(self):
+        gate = self.gate()
+        holder = await gate.acquire(("u1", ""), 1.0)
+        waiting = asyncio.create_task(gate.acquire(("u2", ""), 1.0))
+        await asyncio.sleep(0)
+
+        gate.set_max_inflight(2)
+        ticket = await asyncio.wait_for(waiting, 1)
+
+        self.assertEqual(2, gate.in_flight)
+        ticket.release()
+        holder.release()
+
+
+class TestAcquireAdmission(IsolatedAsyncioTestCase):
+    async def test_rejected_returns_429(self):
+        from app.controller import llm_controller
+
+        model_data = {"f_model_id": "m1", "f_model_name": "m1", "f_model_config": "{'max_inflight': 1}"}
+        controller = AdmissionController(func_module_weights={}, soft_limit_weight=0.5)
+        # 第二个请求排队超时
+        controller.gate(model_data).queue_timeout = 0.01
+        tickets = []
+        with mock.patch.object(llm_controller, "admission_controller", controller):
+            self.assertIsNone(await llm_controller._acquire_admission(model_data, "u1", "", False, tickets))
+            response = await llm_controller._acquire_admission(model_data, "u2", "", False, tickets)
+
+        self.assertEqual(429, response.status_code)
+        self.assertEqual(1, len(tickets))
+        tickets[0].release()
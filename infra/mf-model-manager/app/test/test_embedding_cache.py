@@ -0,0 +1,178 @@
+import sys
+import types
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+
+from app.utils.embedding_cache import EmbeddingCache, apportion_tokens, config_fingerprint
+
+
+def make_fetch(calls):
+    """模拟上游：向量为[文本长度, 调用序号]，每条文本1个token"""
+
+    async def fetch(texts):
+        calls.append(list(texts))
+        return {
+            "object": "list",
+            "data": [
+                {"object": "embedding", "embedding": [float(len(text)), float(len(calls))], "index": i}
+                for i, text in enumerate(texts)
+            ],
+            "model": "upstream-model",
+            "usage": {"prompt_tokens": len(texts), "total_tokens": len(texts)},
+        }
+
+    return fetch
+
+
+def patch_redis(get_redis_util):
+    """替换ConnectUtil模块，避免导入真实模块时建立连接"""
+    module = types.ModuleType("app.mydb.ConnectUtil")
+    module.get_redis_util = get_redis_util
+    return mock.patch.dict(sys.modules, {"app.mydb.ConnectUtil": module})
+
+
+class TestBuildKey(TestCase):
+    def test_key_contains_model_and_fingerprint(self):
+        key = EmbeddingCache.build_key("m1", "fp", "hello")
+        self.assertTrue(key.startswith("m1:fp:"))
+
+    def test_same_text_different_model(self):
+        self.assertNotEqual(EmbeddingCache.build_key("m1", "fp", "hello"), EmbeddingCache.build_key("m2", "fp", "hello"))
+
+    def test_same_text_different_fingerprint(self):
+        fp1 = config_fingerprint({"api_url": "http://a", "api_model": "x"}, None, None)
+        fp2 = config_fingerprint({"api_url": "http://b", "api_model": "x"}, None, None)
+        self.assertNotEqual(EmbeddingCache.build_key("m1", fp1, "hello"), EmbeddingCache.build_key("m1", fp2, "hello"))
+
+    def test_different_text(self):
+        self.assertNotEqual(EmbeddingCache.build_key("m1", "fp", "hello"), EmbeddingCache.build_key("m1", "fp", "world"))
+
+    def test_unicode_normalized(self):
+        # "é" 的组合形式与预组合形式归一化后相同
+        self.assertEqual(
+            EmbeddingCache.build_key("m1", "fp", "e\u0301"), EmbeddingCache.build_key("m1", "fp", "\u00e9")
+        )
+
+    def test_fingerprint_ignores_api_key(self):
+        fp1 = config_fingerprint({"api_url": "http://a", "api_model": "x", "api_key": "k1"}, None, None)
+        fp2 = config_fingerprint({"api_url": "http://a", "api_model": "x", "api_key": "k2"}, None, None)
+        self.assertEqual(fp1, fp2)
+
+
+class TestApportionTokens(TestCase):
+    def test_sum_preserved(self):
+        tokens = apportion_tokens(10, ["a", "bb", "ccc"])
+        self.assertEqual(10, sum(tokens))
+        self.assertLessEqual(tokens[0], tokens[1])
+        self.assertLessEqual(tokens[1], tokens[2])
+
+    def test_empty(self):
+        self.assertEqual([], apportion_tokens(5, []))
+
+
+class TestEmbeddingCache(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.cache = EmbeddingCache(max_size=10, redis_enabled=False, redis_ttl=60)
+        self.calls = []
+        self.fetch = make_fetch(self.calls)
+
+    async def test_hit_skips_upstream(self):
+        first = await self.cache.embed("m1", "fp", "model", ["hello"], self.fetch)
+        second = await self.cache.embed("m1", "fp", "model", ["hello"], self.fetch)
+
+        self.assertEqual(1, len(self.calls))
+        self.assertEqual(first["data"][0]["embedding"], second["data"][0]["embedding"])
+        self.assertEqual(1, second["usage"]["prompt_tokens"])
+        self.assertEqual(1, second["usage"]["cached_tokens"])
+
+    async def test_model_is_part_of_key(self):
+        await self.cache.embed("m1", "fp", "model", ["hello"], self.fetch)
+        await self.cache.embed("m2", "fp", "model", ["hello"], self.fetch)
+
+        self.assertEqual([["hello"], ["hello"]], self.calls)
+
+    async def test_partial_hits_keep_order(self):
+        await self.cache.embed("m1", "fp", "model", ["bb", "dddd"], self.fetch)
+
+        result = await self.cache.embed("m1", "fp", "model", ["a", "bb", "ccc", "dddd", "a"], self.fetch)
+
+        # 只有未命中的文本去重后发往上游
+        self.assertEqual(["a", "ccc"], self.calls[-1])
+        self.assertEqual([0, 1, 2, 3, 4], [item["index"] for item in result["data"]])
+        self.assertEqual(
+            [[1.0, 2.0], [2.0, 1.0], [3.0, 2.0], [4.0, 1.0], [1.0, 2.0]],
+            [item["embedding"] for item in result["data"]],
+        )
+        self.assertEqual(5, result["usage"]["prompt_tokens"])
+        self.assertEqual(2, result["usage"]["cached_tokens"])
+        self.assertEqual({"l1": 2, "l2": 0, "miss": 5, "hit_ratio": 2 / 7}, self.cache.stats()["m1"])
+
+    async def test_lru_eviction(self):
+        cache = EmbeddingCache(max_size=2, redis_enabled=False, redis_ttl=60)
+        await cache.embed("m1", "fp", "model", ["a"], self.fetch)
+        await cache.embed("m1", "fp", "model", ["b"], self.fetch)
+        # 访问a使其成为最近使用，插入c时淘汰b
+        await cache.embed("m1", "fp", "model", ["a"], self.fetch)
+        await cache.embed("m1", "fp", "model", ["c"], self.fetch)
+        await cache.embed("m1", "fp", "model", ["a", "b"], self.fetch)
+
+        self.assertEqual([["a"], ["b"], ["c"], ["b"]], self.calls)
+
+    async def test_disabled_passes_through(self):
+        cache = EmbeddingCache(max_size=0, redis_enabled=False, redis_ttl=60)
+        await cache.embed("m1", "fp", "model", ["a"], self.fetch)
+        await cache.embed("m1", "fp", "model", ["a"], self.fetch)
+
+        self.assertEqual(2, len(self.calls))
+
+    async def test_redis_write_uses_ttl(self):
+        cache = EmbeddingCache(max_size=10, redis_enabled=True, redis_ttl=123)
+        pipe = mock.MagicMock()
+        pipe.execute = mock.AsyncMock(return_value=[True])
+        pipe_ctx = mock.MagicMock()
+        pipe_ctx.__aenter__ = mock.AsyncMock(return_value=pipe)
+        pipe_ctx.__aexit__ = mock.AsyncMock(return_value=False)
+        redis_util = mock.MagicMock()
+        redis_util.read_conn.mget = mock.AsyncMock(return_value=[None])
+        redis_util.write_conn.pipeline.return_value = pipe_ctx
+
+        with patch_redis(mock.AsyncMock(return_value=redis_util)):
+            await cache.embed("m1", "fp", "model", ["hello"], self.fetch)
+
+        pipe.set.assert_called_once()
+        self.assertEqual(123, pipe.set.call_args.kwargs["ex"])
+
+    async def test_redis_hit_fills_local(self):
+        cache = EmbeddingCache(max_size=10, redis_enabled=True, redis_ttl=60)
+        stored = {}
+
+        async def mget(keys):
+            return [stored.get(key) for key in keys]
+
+        pipe = mock.MagicMock()
+        pipe.set.side_effect = lambda key, value, ex: stored.__setitem__(key, value)
+        pipe.execute = mock.AsyncMock(return_value=[True])
+        pipe_ctx = mock.MagicMock()
+        pipe_ctx.__aenter__ = mock.AsyncMock(return_value=pipe)
+        pipe_ctx.__aexit__ = mock.AsyncMock(return_value=False)
+        redis_util = mock.MagicMock()
+        redis_util.read_conn.mget = mget
+        redis_util.write_conn.pipeline.return_value = pipe_ctx
+
+        with patch_redis(mock.AsyncMock(return_value=redis_util)):
+            first = await cache.embed("m1", "fp", "model", ["hello"], self.fetch)
+            # 另一个副本（本地缓存为空）从Redis命中
+            other = EmbeddingCache(max_size=10, redis_enabled=True, redis_ttl=60)
+            second = await other.embed("m1", "fp", "model", ["hello"], self.fetch)
+
+        self.assertEqual(1, len(self.calls))
+        self.assertEqual(first["data"][0]["embedding"], second["data"][0]["embedding"])
+        self.assertEqual(1, other.stats()["m1"]["l2"])
+
+    async def test_redis_failure_treated_as_miss(self):
+        cache = EmbeddingCache(max_size=10, redis_enabled=True, redis_ttl=60)
+
+        with patch_redis(mock.AsyncMock(side_effect=ConnectionError("down"))):
+            result = await cache.embed("m1", "fp", "model", ["hello"], self.fetch)
+
+        self.assertEqual(1, len(self.calls))
+        self.assertEqual([5.0, 1.0], result["data"][0]["embedding"])
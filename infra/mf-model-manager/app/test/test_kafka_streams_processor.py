@@ -0,0 +1,184 @@
+import random
+import sys
+import types
+from types import SimpleNamespace
+from unittest import TestCase, mock
+
+from confluent_kafka import TopicPartition
+
+# 替换ConnectUtil模块，避免导入真实模块时建立Kafka和Redis连接
+connect_util = types.ModuleType("app.mydb.ConnectUtil")
+connect_util.MyKafkaClient = None
+connect_util.redis_util = None
+connect_util.get_redis_util = None
+with mock.patch.dict(sys.modules, {"app.mydb.ConnectUtil": connect_util}):
+    from app.dao.model_used_audit_dao import ModelOpDao, StaleOffsetError
+    from app.mydb.my_pymysql_pool import PymysqlPool
+    from app.test.benchmark.bench_kafka_streams_processor import (GROUP, TOPIC, FakeConsumer, FakeDao, build_log,
+                                                                  run_processor)
+    from app.utils.kafka_streams_processor import KafkaStreamsProcessor
+
+MESSAGES = 3000
+FLUSH = SimpleNamespace(flush_messages=400, flush_keys=150)
+
+
+class TestKafkaStreamsProcessor(TestCase):
+    def setUp(self) -> None:
+        random.seed(0)
+        self.log, self.configs, self.expected = build_log(MESSAGES, partitions=3, models=4, users=20, seed=1)
+
+    def new_processor(self, dao, committed, flush_max_messages=MESSAGES):
+        consumer = FakeConsumer(self.log, committed)
+        processor = KafkaStreamsProcessor(topic_name=TOPIC, group_id=GROUP, consumer=consumer, dao=dao,
+                                          quota_configs=self.configs, flush_interval=3600,
+                                          flush_max_messages=flush_max_messages, flush_max_keys=MESSAGES)
+        consumer.processor = processor
+        consumer.subscribe([TOPIC], processor._on_assign, processor._on_revoke, processor._on_lost)
+        return processor
+
+    def consume(self, processor, num_messages):
+        for msg in processor.consumer.consume(num_messages=num_messages):
+            processor._process_message(msg.partition(), msg.offset(), msg.value())
+
+    def test_steady(self):
+        dao = FakeDao()
+        committed = {}
+
+        run_processor(self.log, self.configs, dao, committed, FLUSH)
+
+        self.assertEqual(dict(self.expected), dict(dao.tokens))
+        self.assertGreater(dao.flushes, 1)
+        ends = {partition: len(messages) for partition, messages in self.log.items()}
+        self.assertEqual(ends, dao.offsets)
+        self.assertEqual(ends, committed)
+
+    def test_crash_before_kafka_commit(self):
+        dao = FakeDao(crash_before_commit=True)
+        committed = {}
+
+        run_processor(self.log, self.configs, dao, committed, FLUSH)
+        # 数据和位点已入库，Kafka位点没有提交
+        self.assertEqual({}, committed)
+        self.assertEqual(1, dao.flushes)
+
+        # 新消费者从数据库中的位点恢复，不重复计费
+        run_processor(self.log, self.configs, dao, committed, FLUSH)
+        self.assertEqual(dict(self.expected), dict(dao.tokens))
+        self.assertEqual(dao.offsets, committed)
+
+    def test_rebalance(self):
+        dao = FakeDao()
+
+        run_processor(self.log, self.configs, dao, {}, FLUSH, rebalance_after=MESSAGES // 3)
+
+        self.assertEqual(dict(self.expected), dict(dao.tokens))
+
+    def test_revoke_flushes_partitions(self):
+        dao = FakeDao()
+        processor = self.new_processor(dao, {})
+        self.consume(processor, 300)
+
+        processor._on_revoke(processor.consumer, [TopicPartition(TOPIC, 0)])
+
+        self.assertEqual([0], list(dao.offsets))
+        self.assertEqual({1, 2}, set(processor.partitions))
+        self.assertEqual(dao.offsets, processor.consumer.committed)
+
+    def test_revoke_drops_data_when_flush_fails(self):
+        dao = mock.Mock()
+        dao.get_consumer_offsets.return_value = {}
+        dao.save_model_used_log_with_offsets.side_effect = RuntimeError("db down")
+        processor = self.new_processor(dao, {})
+        self.consume(processor, 300)
+
+        processor._on_revoke(processor.consumer, [TopicPartition(TOPIC, 0)])
+
+        self.assertNotIn(0, processor.partitions)
+        self.assertEqual({}, processor.consumer.committed)
+
+    def test_lost_drops_data_without_flush(self):
+        dao = FakeDao()
+        processor = self.new_processor(dao, {})
+        self.consume(processor, 300)
+
+        processor._on_lost(processor.consumer, [TopicPartition(TOPIC, 1)])
+        self.assertNotIn(1, processor.partitions)
+        self.assertEqual(0, dao.flushes)
+
+        self.assertTrue(processor._flush())
+        self.assertEqual({0, 2}, set(dao.offsets))
+
+    def test_flush_failure_keeps_data_and_backs_off(self):
+        dao = FakeDao()
+        processor = self.new_processor(dao, {}, flush_max_messages=1)
+        self.consume(processor, 300)
+        messages = sum(state.messages for state in processor.partitions.values())
+
+        with mock.patch.object(dao, "save_model_used_log_with_offsets", side_effect=RuntimeError("db down")):
+            self.assertFalse(processor._flush())
+        # 退避期间不入库，数据保留
+        self.assertFalse(processor._should_flush())
+        self.assertEqual(messages, sum(state.messages for state in processor.partitions.values()))
+        self.assertEqual({}, processor.consumer.committed)
+
+        processor._retry_at = 0
+        self.assertTrue(processor._should_flush())
+        self.assertTrue(processor._flush())
+        self.assertEqual(dao.offsets, processor.consumer.committed)
+        self.assertEqual(1.0, processor._retry_backoff)
+
+    def test_stale_batch_rejected(self):
+        # 旧消费者汇总了一半数据后失去分区，新消费者已从同一位点消费完并入库
+        dao = FakeDao()
+        committed = {}
+        zombie = self.new_processor(dao, committed)
+        self.consume(zombie, MESSAGES // 2)
+        run_processor(self.log, self.configs, dao, committed, FLUSH)
+        stored = dict(dao.offsets)
+        zombie.consumer.seek = mock.Mock()
+
+        self.assertFalse(zombie._flush())
+
+        self.assertEqual(dict(self.expected), dict(dao.tokens))
+        # 旧消费者丢弃本批数据，从库中的位点重新消费
+        self.assertEqual(stored, {partition: state.committed for partition, state in zombie.partitions.items()})
+        self.assertTrue(all(state.messages == 0 for state in zombie.partitions.values()))
+        self.assertEqual(stored, {call.args[0].partition: call.args[0].offset
+                                  for call in zombie.consumer.seek.call_args_list})
+
+
+class TestSaveModelUsedLogWithOffsets(TestCase):
+    def setUp(self) -> None:
+        self.connection = mock.MagicMock()
+        self.cursor = self.connection.cursor.return_value
+        pool = mock.Mock()
+        pool.connection.return_value = self.connection
+        patcher = mock.patch.object(PymysqlPool, "get_pool", return_value=pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.dao = ModelOpDao()
+
+    def test_stale_offset_rolls_back(self):
+        self.cursor.fetchall.return_value = [{"f_partition": 0, "f_offset": 120}, {"f_partition": 1, "f_offset": 50}]
+
+        with self.assertRaises(StaleOffsetError) as ctx:
+            self.dao.save_model_used_log_with_offsets([], GROUP, TOPIC, [(0, 100, 200), (1, 50, 80)])
+
+        self.assertEqual({0: 120}, ctx.exception.offsets)
+        sql, params = self.cursor.execute.call_args.args
+        self.assertIn("for update", sql)
+        self.assertEqual([GROUP, TOPIC, 0, 1], params)
+        self.cursor.executemany.assert_not_called()
+        self.connection.rollback.assert_called_once()
+        self.connection.commit.assert_not_called()
+
+    def test_offsets_saved_in_same_transaction(self):
+        self.cursor.fetchall.return_value = [{"f_partition": 0, "f_offset": 100}]
+
+        self.assertEqual(0, self.dao.save_model_used_log_with_offsets([], GROUP, TOPIC, [(0, 100, 200), (1, 0, 30)]))
+
+        sql, params = self.cursor.executemany.call_args.args
+        self.assertIn("t_model_op_consumer_offset", sql)
+        self.assertEqual([[GROUP, TOPIC, 0, 200], [GROUP, TOPIC, 1, 30]], [row[:4] for row in params])
+        self.connection.commit.assert_called_once()
+        self.connection.rollback.assert_not_called()
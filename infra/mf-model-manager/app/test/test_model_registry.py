@@ -0,0 +1,114 @@
+import asyncio
+import json
+import sys
+import types
+from unittest import IsolatedAsyncioTestCase, mock
+
+# 替换ConnectUtil模块，避免导入真实模块时建立连接
+connect_util = types.ModuleType("app.mydb.ConnectUtil")
+connect_util.get_redis_util = None
+with mock.patch.dict(sys.modules, {"app.mydb.ConnectUtil": connect_util}):
+    from app.utils import model_registry as model_registry_module
+    from app.utils.model_registry import MODEL_KIND_LLM, ModelRegistry
+
+KEY = (MODEL_KIND_LLM, "m1")
+
+
+class TestModelRegistry(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.now = 1000.0
+        patcher = mock.patch.object(model_registry_module, "monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # 数据库查询在放行前一直挂起
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.calls = []
+        self.rows = {"m1": [{"f_model_name": "m1", "version": 1}]}
+
+        async def to_thread(func, *args):
+            await self.gate.wait()
+            return func(*args)
+
+        def load_by_name(name):
+            self.calls.append(name)
+            return self.rows.get(name, [])
+
+        patcher = mock.patch.object(asyncio, "to_thread", to_thread)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.dict(model_registry_module._NAME_LOADERS, {MODEL_KIND_LLM: load_by_name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.registry = ModelRegistry(refresh_interval=10, max_stale=60, negative_ttl=3)
+
+    async def test_stale_entry_served_while_refreshing(self):
+        self.assertEqual(1, (await self.registry.get_llm("m1"))["version"])
+        self.now += 11
+        self.rows["m1"] = [{"f_model_name": "m1", "version": 2}]
+        self.gate.clear()
+
+        # 超过刷新间隔先返回旧值，并发查询只触发一次后台加载
+        self.assertEqual(1, (await self.registry.get_llm("m1"))["version"])
+        self.assertEqual(1, (await self.registry.get_llm("m1"))["version"])
+        self.assertEqual(1, len(self.registry._loading))
+        refresh = self.registry._loading[KEY]
+
+        self.gate.set()
+        await refresh
+        self.assertEqual({}, self.registry._loading)
+        self.assertEqual(2, (await self.registry.get_llm("m1"))["version"])
+        self.assertEqual(["m1", "m1"], self.calls)
+
+    async def test_expired_entry_waits_for_reload(self):
+        await self.registry.get_llm("m1")
+        self.now += 61
+        self.rows["m1"] = [{"f_model_name": "m1", "version": 2}]
+
+        self.assertEqual(2, (await self.registry.get_llm("m1"))["version"])
+
+    async def test_invalidate_discards_in_flight_load(self):
+        self.gate.clear()
+        load = asyncio.create_task(self.registry.get_llm("m1"))
+        await asyncio.sleep(0)
+        redis_util = mock.Mock()
+        redis_util.write_conn.publish = mock.AsyncMock()
+
+        with mock.patch.object(model_registry_module, "get_redis_util", mock.AsyncMock(return_value=redis_util)):
+            await self.registry.invalidate(MODEL_KIND_LLM, ["m1"])
+        self.gate.set()
+
+        # 失效前开始的加载结果返回给调用方，但不写回注册表
+        self.assertEqual(1, (await load)["version"])
+        self.assertNotIn(KEY, self.registry._entries)
+        self.assertEqual(1, self.registry._versions[KEY])
+        channel, message = redis_util.write_conn.publish.await_args.args
+        self.assertEqual(model_registry_module.REGISTRY_CHANNEL, channel)
+        self.assertEqual({"op": "invalidate", "kind": MODEL_KIND_LLM, "names": ["m1"]},
+                         {key: value for key, value in json.loads(message).items() if key != "source"})
+        # 自己发出的消息被忽略
+        self.assertFalse(self.registry.handle_message(message))
+
+        self.rows["m1"] = [{"f_model_name": "m1", "version": 2}]
+        self.assertEqual(2, (await self.registry.get_llm("m1"))["version"])
+        self.assertEqual(2, self.registry._entries[KEY][0]["version"])
+
+    async def test_missing_model_cached_for_negative_ttl(self):
+        self.assertIsNone(await self.registry.get_llm("missing"))
+        self.now += 2
+        self.assertIsNone(await self.registry.get_llm("missing"))
+        self.assertEqual(["missing"], self.calls)
+
+        self.now += 2
+        self.rows["missing"] = [{"f_model_name": "missing", "version": 1}]
+        self.assertEqual(1, (await self.registry.get_llm("missing"))["version"])
+        self.assertEqual(["missing", "missing"], self.calls)
+
+    async def test_load_failure_not_cached(self):
+        with mock.patch.dict(model_registry_module._NAME_LOADERS,
+                             {MODEL_KIND_LLM: mock.Mock(side_effect=RuntimeError("db down"))}):
+            with self.assertRaises(RuntimeError):
+                await self.registry.get_llm("m1")
+
+        self.assertNotIn(KEY, self.registry._entries)
+        self.assertEqual(1, (await self.registry.get_llm("m1"))["version"])
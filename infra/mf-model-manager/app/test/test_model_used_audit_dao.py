@@ -0,0 +1,131 @@
+from datetime import datetime
+from unittest import TestCase, mock
+
+from app.dao.model_used_audit_dao import (ADD_USAGE_ROLLUP_SQL, USAGE_DAILY_TABLE, USAGE_DETAIL_TABLE,
+                                          USAGE_HOURLY_TABLE, _add_usage_rollups, month_range, plan_usage_sources,
+                                          usage_rows_sql)
+from app.interfaces.dbaccess import ModelUsedAuditInfo
+
+DETAIL, HOURLY, DAILY = USAGE_DETAIL_TABLE, USAGE_HOURLY_TABLE, USAGE_DAILY_TABLE
+
+
+def audit_info(model_id, user_id, input_tokens, output_tokens, total_count, failed_count, average_total_time):
+    return ModelUsedAuditInfo(model_id=model_id, user_id=user_id, input_tokens=input_tokens,
+                              output_tokens=output_tokens, total_price=0.5, currency_type=0,
+                              price_type=["thousand", "thousand"], total_count=total_count,
+                              failed_count=failed_count, average_total_time=average_total_time,
+                              average_first_time=0.1)
+
+
+class TestPlanUsageSources(TestCase):
+    def test_empty_range(self):
+        self.assertEqual([], plan_usage_sources(datetime(2024, 3, 1, 10), datetime(2024, 3, 1, 10)))
+        self.assertEqual([], plan_usage_sources(datetime(2024, 3, 1, 11), datetime(2024, 3, 1, 10)))
+        self.assertEqual((None, []), usage_rows_sql(datetime(2024, 3, 1, 11), datetime(2024, 3, 1, 10)))
+
+    def test_shorter_than_one_hour(self):
+        start, end = datetime(2024, 3, 1, 10, 15), datetime(2024, 3, 1, 10, 45)
+        self.assertEqual([(DETAIL, start, end)], plan_usage_sources(start, end))
+        # 跨过整点但不包含完整的一小时
+        start, end = datetime(2024, 3, 1, 10, 45), datetime(2024, 3, 1, 11, 15)
+        self.assertEqual([(DETAIL, start, end)], plan_usage_sources(start, end))
+
+    def test_mid_hour_edges(self):
+        start, end = datetime(2024, 3, 1, 10, 15), datetime(2024, 3, 1, 13, 40)
+        self.assertEqual([
+            (DETAIL, start, datetime(2024, 3, 1, 11)),
+            (HOURLY, datetime(2024, 3, 1, 11), datetime(2024, 3, 1, 13)),
+            (DETAIL, datetime(2024, 3, 1, 13), end),
+        ], plan_usage_sources(start, end))
+
+    def test_whole_hours(self):
+        start, end = datetime(2024, 3, 1, 10), datetime(2024, 3, 2)
+        self.assertEqual([(HOURLY, start, end)], plan_usage_sources(start, end))
+
+    def test_mid_day_edges(self):
+        start, end = datetime(2024, 3, 1, 10, 15), datetime(2024, 3, 4, 13, 40)
+        self.assertEqual([
+            (DAILY, datetime(2024, 3, 2), datetime(2024, 3, 4)),
+            (DETAIL, start, datetime(2024, 3, 1, 11)),
+            (HOURLY, datetime(2024, 3, 1, 11), datetime(2024, 3, 2)),
+            (HOURLY, datetime(2024, 3, 4), datetime(2024, 3, 4, 13)),
+            (DETAIL, datetime(2024, 3, 4, 13), end),
+        ], plan_usage_sources(start, end))
+
+    def test_mid_day_start_whole_day_end(self):
+        start, end = datetime(2024, 3, 1, 23, 30), datetime(2024, 3, 3)
+        self.assertEqual([
+            (DAILY, datetime(2024, 3, 2), end),
+            (DETAIL, start, datetime(2024, 3, 2)),
+        ], plan_usage_sources(start, end))
+
+    def test_whole_days_use_daily_table_only(self):
+        start, end = datetime(2024, 3, 1), datetime(2024, 3, 8)
+        self.assertEqual([(DAILY, start, end)], plan_usage_sources(start, end))
+
+    def test_crosses_month_boundary(self):
+        start, end = datetime(2024, 1, 31, 22, 30), datetime(2024, 2, 1, 1)
+        self.assertEqual([
+            (DETAIL, start, datetime(2024, 1, 31, 23)),
+            (HOURLY, datetime(2024, 1, 31, 23), end),
+        ], plan_usage_sources(start, end))
+
+    def test_month_range(self):
+        self.assertEqual((datetime(2024, 1, 1), datetime(2024, 2, 1)), month_range(datetime(2024, 1, 31, 23, 59)))
+        self.assertEqual((datetime(2024, 2, 1), datetime(2024, 3, 1)), month_range(datetime(2024, 2, 29, 12)))
+        self.assertEqual((datetime(2024, 12, 1), datetime(2025, 1, 1)), month_range(datetime(2024, 12, 1)))
+        # 本月整段落在按天汇总表中
+        self.assertEqual([(DAILY, datetime(2024, 12, 1), datetime(2025, 1, 1))],
+                         plan_usage_sources(*month_range(datetime(2024, 12, 15, 8))))
+
+
+class TestUsageRowsSql(TestCase):
+    def test_filters_passed_as_parameters(self):
+        start, end = datetime(2024, 3, 1, 10, 15), datetime(2024, 3, 3)
+        model_id, user_id = "m' or '1'='1", "u1"
+
+        sql, params = usage_rows_sql(start, end, model_id=model_id, user_id=user_id)
+
+        self.assertNotIn(model_id, sql)
+        self.assertNotIn(user_id, sql)
+        self.assertEqual(2, sql.count(" union all "))
+        self.assertEqual(3, sql.count("f_model_id = %s"))
+        self.assertEqual(3, sql.count("f_user_id = %s"))
+        self.assertEqual(sql.count("%s"), len(params))
+        self.assertEqual([
+            datetime(2024, 3, 2), end, model_id, user_id,
+            start, datetime(2024, 3, 1, 11), model_id, user_id,
+            datetime(2024, 3, 1, 11), datetime(2024, 3, 2), model_id, user_id,
+        ], params)
+        self.assertTrue(sql.endswith(") usage_rows"))
+
+    def test_without_filters(self):
+        sql, params = usage_rows_sql(datetime(2024, 3, 1), datetime(2024, 3, 2))
+
+        self.assertIn("from t_model_op_usage_daily", sql)
+        self.assertNotIn("f_model_id = %s", sql)
+        self.assertNotIn("f_user_id = %s", sql)
+        self.assertEqual([datetime(2024, 3, 1), datetime(2024, 3, 2)], params)
+
+
+class TestAddUsageRollups(TestCase):
+    def test_rows_merged_by_model_and_user(self):
+        cursor = mock.Mock()
+        batch = [
+            audit_info("m1", "u1", 100, 10, total_count=3, failed_count=1, average_total_time=2.0),
+            audit_info("m2", "u1", 50, 5, total_count=1, failed_count=0, average_total_time=1.5),
+            audit_info("m1", "u1", 20, 2, total_count=2, failed_count=0, average_total_time=0.5),
+        ]
+
+        _add_usage_rollups(cursor, batch, datetime(2024, 3, 1, 10, 35, 12))
+
+        calls = {call.args[0]: call.args[1] for call in cursor.executemany.call_args_list}
+        self.assertEqual({ADD_USAGE_ROLLUP_SQL.format(HOURLY), ADD_USAGE_ROLLUP_SQL.format(DAILY)}, set(calls))
+        # 耗时按成功调用次数累加为总和：2.0 * 2 + 0.5 * 2
+        merged = [[120, 12, 1.0, 5, 1, 5.0, 0.4], [50, 5, 0.5, 1, 0, 1.5, 0.1]]
+        for table, bucket in ((HOURLY, datetime(2024, 3, 1, 10)), (DAILY, datetime(2024, 3, 1))):
+            rows = calls[ADD_USAGE_ROLLUP_SQL.format(table)]
+            self.assertEqual([[bucket, "m1", "u1"], [bucket, "m2", "u1"]], [row[:3] for row in rows])
+            for row, expected in zip(rows, merged):
+                for value, expected_value in zip(row[3:], expected):
+                    self.assertAlmostEqual(expected_value, value)
@@ -0,0 +1,171 @@
+import asyncio
+import sys
+import types
+from unittest import IsolatedAsyncioTestCase, mock
+
+# 替换ConnectUtil模块，避免导入真实模块时建立连接
+connect_util = types.ModuleType("app.mydb.ConnectUtil")
+connect_util.get_redis_util = None
+with mock.patch.dict(sys.modules, {"app.mydb.ConnectUtil": connect_util}):
+    from app.utils import permission_cache as permission_cache_module
+    from app.utils.permission_cache import PermissionDecisionCache
+
+KEY_A = ("u1", "user", "model", "m1", "use")
+KEY_B = ("u1", "user", "model", "m2", "use")
+
+
+class TestPermissionDecisionCache(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.now = 1000.0
+        patcher = mock.patch.object(permission_cache_module, "monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = PermissionDecisionCache(ttl=10, negative_ttl=3, max_size=100)
+
+    async def test_positive_and_negative_ttl(self):
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            return len(calls) == 1
+
+        self.assertTrue(await self.cache.get(KEY_A, loader))
+        self.now += 9
+        self.assertTrue(await self.cache.get(KEY_A, loader))
+        self.assertEqual(1, len(calls))
+
+        # 有权限的结果10秒后过期，重新请求得到无权限
+        self.now += 2
+        self.assertFalse(await self.cache.get(KEY_A, loader))
+        self.now += 2
+        self.assertFalse(await self.cache.get(KEY_A, loader))
+        self.assertEqual(2, len(calls))
+
+        # 无权限的结果3秒后过期
+        self.now += 2
+        await self.cache.get(KEY_A, loader)
+        self.assertEqual(3, len(calls))
+
+    async def test_loader_failure_not_cached(self):
+        async def failing():
+            raise RuntimeError("auth down")
+
+        with self.assertRaises(RuntimeError):
+            await self.cache.get(KEY_A, failing)
+        with self.assertRaises(RuntimeError):
+            await self.cache.get_many([KEY_A], lambda keys: failing())
+
+        self.assertTrue(await self.cache.get(KEY_A, mock.AsyncMock(return_value=True)))
+
+    async def test_get_coalesced_with_get_many(self):
+        release = asyncio.Event()
+        batches = []
+
+        async def load_many(keys):
+            batches.append(keys)
+            await release.wait()
+            return {KEY_A: True}
+
+        single = mock.AsyncMock(return_value=False)
+        batch = asyncio.create_task(self.cache.get_many([KEY_A, KEY_B, KEY_A], load_many))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(self.cache.get(KEY_A, single))
+        await asyncio.sleep(0)
+        release.set()
+
+        self.assertEqual({KEY_A: True, KEY_B: False}, await batch)
+        self.assertTrue(await follower)
+        self.assertEqual([[KEY_A, KEY_B]], batches)
+        single.assert_not_called()
+        # 批量结果已缓存
+        self.assertEqual({KEY_A: True, KEY_B: False}, await self.cache.get_many([KEY_A, KEY_B], load_many))
+        self.assertEqual(1, len(batches))
+
+    async def test_get_many_waits_for_pending_get(self):
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return True
+
+        load_many = mock.AsyncMock(return_value={KEY_B: True})
+        leader = asyncio.create_task(self.cache.get(KEY_A, slow))
+        await asyncio.sleep(0)
+        batch = asyncio.create_task(self.cache.get_many([KEY_A, KEY_B], load_many))
+        await asyncio.sleep(0)
+        release.set()
+
+        self.assertEqual({KEY_A: True, KEY_B: True}, await batch)
+        self.assertTrue(await leader)
+        load_many.assert_awaited_once_with([KEY_B])
+
+    async def test_discard_bumps_generation(self):
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return True
+
+        await self.cache.get(KEY_B, mock.AsyncMock(return_value=True))
+        task = asyncio.create_task(self.cache.get(KEY_A, slow))
+        await asyncio.sleep(0)
+        self.cache.discard(resource_type="model", resource_ids=["m2"])
+        release.set()
+        self.assertTrue(await task)
+
+        # 请求期间发生失效，结果不缓存；失效的条目被删除
+        self.assertEqual({}, self.cache._entries)
+        self.assertEqual(1, self.cache._generation)
+
+    async def test_invalidate_filters_and_publishes(self):
+        for key in (KEY_A, KEY_B, ("u2", "user", "model", "m1", "use")):
+            await self.cache.get(key, mock.AsyncMock(return_value=True))
+        redis_util = mock.Mock()
+        redis_util.write_conn.publish = mock.AsyncMock()
+
+        with mock.patch.object(permission_cache_module, "get_redis_util", mock.AsyncMock(return_value=redis_util)):
+            await self.cache.invalidate(resource_type="model", resource_ids=["m1"], user_id="u1")
+
+        self.assertEqual([KEY_B, ("u2", "user", "model", "m1", "use")], list(self.cache._entries))
+        channel, message = redis_util.write_conn.publish.await_args.args
+        self.assertEqual(permission_cache_module.PERMISSION_CHANNEL, channel)
+        # 自己发出的消息被忽略
+        self.cache.handle_message(message)
+        self.assertEqual(2, len(self.cache._entries))
+
+    async def test_batch_leader_cancelled_while_follower_waits(self):
+        release = asyncio.Event()
+
+        async def load_many(keys):
+            await release.wait()
+            return {key: True for key in keys}
+
+        leader = asyncio.create_task(self.cache.get_many([KEY_A], load_many))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(self.cache.get(KEY_A, mock.AsyncMock(return_value=False)))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        # 发起批量请求的调用方断开不影响等待相同校验的请求
+        self.assertTrue(await follower)
+        self.assertTrue(leader.cancelled())
+        self.assertTrue(await self.cache.get(KEY_A, mock.AsyncMock(return_value=False)))
+
+    async def test_get_leader_cancelled_while_follower_waits(self):
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return True
+
+        leader = asyncio.create_task(self.cache.get(KEY_A, slow))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(self.cache.get_many([KEY_A], mock.AsyncMock()))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        self.assertEqual({KEY_A: True}, await follower)
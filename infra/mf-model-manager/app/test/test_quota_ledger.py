@@ -0,0 +1,180 @@
+from unittest import IsolatedAsyncioTestCase, TestCase, mock, skipUnless
+
+from app.utils import quota_ledger as quota_ledger_module
+from app.utils.quota_ledger import QuotaLedger
+
+try:
+    from fakeredis import FakeAsyncRedis
+    import lupa  # noqa: F401  fakeredis执行Lua脚本需要lupa
+except ImportError:
+    FakeAsyncRedis = None
+
+
+def quota_row(total_in=1000, total_out=500, used_in=0, used_out=0, billing_type=0):
+    """模拟get_quota_by_user_and_model返回的一行"""
+    if billing_type == 1:
+        remaining_in, remaining_out = total_in - used_in, total_out - used_out
+    else:
+        remaining_in = remaining_out = total_in - used_in - used_out
+    return {
+        "f_billing_type": billing_type,
+        "total_input_tokens": total_in,
+        "total_output_tokens": total_out,
+        "used_input_tokens": used_in,
+        "used_output_tokens": used_out,
+        "remaining_input_tokens": remaining_in,
+        "remaining_output_tokens": remaining_out,
+    }
+
+
+class TestSoftWarned(TestCase):
+    def test_bounded(self):
+        ledger = QuotaLedger()
+        with mock.patch.object(quota_ledger_module, "SOFT_WARNED_MAX_SIZE", 2):
+            self.assertTrue(ledger._mark_soft_warned("a"))
+            self.assertFalse(ledger._mark_soft_warned("a"))
+            self.assertTrue(ledger._mark_soft_warned("b"))
+            self.assertTrue(ledger._mark_soft_warned("c"))
+
+        self.assertEqual(["b", "c"], list(ledger._soft_warned))
+
+
+@skipUnless(FakeAsyncRedis is not None, "需要fakeredis和lupa")
+class TestQuotaLedger(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.redis = FakeAsyncRedis()
+        redis_util = mock.MagicMock()
+        redis_util.write_conn = self.redis
+        self.ledger = QuotaLedger()
+        self.row = quota_row()
+        self.dao = mock.MagicMock()
+        self.dao.get_quota_by_user_and_model.side_effect = lambda user_id, model_id: [self.row] if self.row else []
+        patches = [
+            mock.patch.object(quota_ledger_module, "get_redis_util", mock.AsyncMock(return_value=redis_util)),
+            mock.patch.object(quota_ledger_module, "llm_model_dao", self.dao),
+            mock.patch.object(quota_ledger_module.base_config, "QUOTA_LEDGER_SYNC_INTERVAL", 300),
+            mock.patch.object(quota_ledger_module.base_config, "QUOTA_SOFT_LIMIT_RATIO", 0.8),
+            mock.patch.object(quota_ledger_module.base_config, "QUOTA_RESERVATION_TTL", 600),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    async def asyncTearDown(self) -> None:
+        await self.redis.close()
+
+    async def ledger_field(self, field):
+        value = await self.redis.hget(QuotaLedger.ledger_key("m1", "u1"), field)
+        return int(value) if value is not None else None
+
+    async def test_admit_syncs_once_and_reserves(self):
+        allowed, reason, reservation = await self.ledger.admit("m1", "u1", 100)
+
+        self.assertTrue(allowed)
+        self.assertEqual("", reason)
+        self.assertEqual(100, reservation.tokens)
+        self.assertEqual(100, await self.ledger_field("reserved"))
+
+        await self.ledger.admit("m1", "u1", 100)
+        # 对账间隔内不再查库
+        self.assertEqual(1, self.dao.get_quota_by_user_and_model.call_count)
+        self.assertEqual(200, await self.ledger_field("reserved"))
+
+    async def test_reservation_capped_by_remaining(self):
+        self.row = quota_row(total_in=1000, used_in=900)
+
+        allowed, _, reservation = await self.ledger.admit("m1", "u1", 500)
+
+        self.assertTrue(allowed)
+        self.assertEqual(100, reservation.tokens)
+
+    async def test_release_after_stream(self):
+        _, _, reservation = await self.ledger.admit("m1", "u1", 300)
+        await self.ledger.record_usage("m1", "u1", 50, 120)
+        await self.ledger.release(reservation)
+
+        self.assertEqual(0, await self.ledger_field("reserved"))
+        self.assertEqual(50, await self.ledger_field("used_in"))
+        self.assertEqual(120, await self.ledger_field("used_out"))
+        # 重复释放不会把预留扣成负数
+        await self.ledger.release(reservation)
+        self.assertEqual(0, await self.ledger_field("reserved"))
+
+    async def test_denied_when_exhausted(self):
+        self.row = quota_row(total_in=1000, used_in=600, used_out=400)
+
+        allowed, reason, reservation = await self.ledger.admit("m1", "u1", 10)
+
+        self.assertFalse(allowed)
+        self.assertEqual("input", reason)
+        self.assertIsNone(reservation)
+
+    async def test_reservations_count_against_quota(self):
+        self.row = quota_row(total_in=1000)
+
+        self.assertTrue((await self.ledger.admit("m1", "u1", 1000))[0])
+        allowed, reason, _ = await self.ledger.admit("m1", "u1", 1)
+
+        self.assertFalse(allowed)
+        self.assertEqual("input", reason)
+
+    async def test_output_quota_separate_billing(self):
+        self.row = quota_row(total_in=1000, total_out=500, used_out=500, billing_type=1)
+
+        allowed, reason, _ = await self.ledger.admit("m1", "u1", 10)
+
+        self.assertFalse(allowed)
+        self.assertEqual("output", reason)
+
+    async def test_no_quota_config_denied(self):
+        self.row = None
+
+        allowed, reason, _ = await self.ledger.admit("m1", "u1", 10)
+
+        self.assertFalse(allowed)
+        self.assertEqual("input", reason)
+
+    async def test_soft_limit(self):
+        self.row = quota_row(total_in=1000, used_in=850)
+
+        with mock.patch.object(quota_ledger_module.StandLogger, "warn") as warn:
+            allowed, reason, _ = await self.ledger.admit("m1", "u1", 10)
+            await self.ledger.admit("m1", "u1", 10)
+
+        self.assertTrue(allowed)
+        self.assertEqual("soft", reason)
+        warn.assert_called_once()
+
+    async def test_invalidate_limits_triggers_sync(self):
+        await self.ledger.admit("m1", "u1", 0)
+        self.row = quota_row(total_in=1000, used_in=1000)
+        await self.ledger.invalidate_limits("m1")
+
+        allowed, _, _ = await self.ledger.admit("m1", "u1", 0)
+
+        self.assertFalse(allowed)
+        self.assertEqual(2, self.dao.get_quota_by_user_and_model.call_count)
+
+    async def test_sync_keeps_larger_usage(self):
+        await self.ledger.admit("m1", "u1", 0)
+        await self.ledger.record_usage("m1", "u1", 300, 0)
+        # MySQL落后于Redis，对账后保留Redis中较大的已用量
+        self.row = quota_row(total_in=1000, used_in=100)
+        await self.ledger.invalidate_limits("m1")
+        await self.ledger.admit("m1", "u1", 0)
+
+        self.assertEqual(300, await self.ledger_field("used_in"))
+
+    async def test_redis_down_falls_back_to_mysql(self):
+        with mock.patch.object(quota_ledger_module, "get_redis_util", mock.AsyncMock(side_effect=ConnectionError())):
+            allowed, _, reservation = await self.ledger.admit("m1", "u1", 100)
+            self.row = quota_row(total_in=1000, used_in=1000)
+            denied, reason, _ = await self.ledger.admit("m1", "u1", 100)
+            # 释放和记账失败不抛异常
+            await self.ledger.release(reservation)
+            await self.ledger.record_usage("m1", "u1", 1, 1)
+
+        self.assertTrue(allowed)
+        self.assertIsNone(reservation)
+        self.assertFalse(denied)
+        self.assertEqual("input", reason)
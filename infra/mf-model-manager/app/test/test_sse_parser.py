@@ -0,0 +1,74 @@
+import json
+from unittest import TestCase
+
+from app.utils.sse_parser import ThinkTagSplitter, sse_data, think_flush_chunk
+
+
+def split_all(pieces, reasoning_first=False):
+    """依次feed后flush，返回拼接后的 (推理内容, 正文)"""
+    splitter = ThinkTagSplitter(reasoning_first=reasoning_first)
+    reasoning, content = "", ""
+    for piece in pieces:
+        r, c = splitter.feed(piece)
+        reasoning += r
+        content += c
+    r, c = splitter.flush()
+    return reasoning + r, content + c
+
+
+class TestSseData(TestCase):
+    def test_data_line(self):
+        self.assertEqual('{"a": 1}', sse_data(b'data: {"a": 1}\n'))
+        self.assertEqual("[DONE]", sse_data(b"data:[DONE]\r\n"))
+
+    def test_other_lines(self):
+        self.assertIsNone(sse_data(b"\n"))
+        self.assertIsNone(sse_data(b": keep-alive\n"))
+        self.assertIsNone(sse_data(b"event: message\n"))
+
+    def test_bare_json(self):
+        self.assertEqual('{"a": 1}', sse_data(b'{"a": 1}\n'))
+
+
+class TestThinkTagSplitter(TestCase):
+    def test_tags_split_across_pieces(self):
+        self.assertEqual(("plan", "answer"), split_all(["<thi", "nk>pl", "an</th", "ink>ans", "wer"]))
+
+    def test_short_answer_without_tag(self):
+        # 整个回答比<think>还短，流结束时仍在等待标签
+        self.assertEqual(("", "OK"), split_all(["O", "K"]))
+
+    def test_trailing_partial_close_tag(self):
+        # 推理内容末尾恰好是</think>的前缀，流在此结束
+        self.assertEqual(("abc</th", ""), split_all(["<think>abc", "</th"]))
+
+    def test_reasoning_first(self):
+        self.assertEqual(("plan", "answer"), split_all(["plan</think>", "answer"], reasoning_first=True))
+
+    def test_flush_empty(self):
+        splitter = ThinkTagSplitter()
+        splitter.feed("<think>abc</think>done")
+
+        self.assertEqual(("", ""), splitter.flush())
+
+
+class TestThinkFlushChunk(TestCase):
+    def test_short_answer_emitted_as_content(self):
+        splitter = ThinkTagSplitter()
+        datas = {"id": "1", "choices": [{"index": 0, "delta": {"content": "OK"}, "finish_reason": "stop"}]}
+        splitter.feed("OK")
+
+        chunk = json.loads(think_flush_chunk(splitter, datas))
+
+        self.assertEqual("1", chunk["id"])
+        self.assertEqual({"content": "OK", "reasoning_content": None}, chunk["choices"][0]["delta"])
+        self.assertIsNone(chunk["choices"][0]["finish_reason"])
+        # 不修改原chunk
+        self.assertEqual("stop", datas["choices"][0]["finish_reason"])
+
+    def test_nothing_held(self):
+        splitter = ThinkTagSplitter()
+        splitter.feed("<think>abc</think>")
+
+        self.assertIsNone(think_flush_chunk(splitter, {"choices": [{"delta": {}}]}))
+        self.assertIsNone(think_flush_chunk(ThinkTagSplitter(), None))
@@ -0,0 +1,104 @@
+import os
+import threading
+from unittest import TestCase, mock, skipUnless
+
+from app.utils.tokenizer_service import OPENAI_TOKENIZER, TokenizerService, estimate_tokens
+
+
+class FakeTiktoken:
+    """按空格切分的假编码器，接口与tiktoken.Encoding一致"""
+
+    def __init__(self):
+        self.encoded = 0
+
+    def encode_ordinary_batch(self, texts):
+        self.encoded += len(texts)
+        return [[hash(word) for word in text.split()] for text in texts]
+
+    def decode(self, token_ids):
+        return " ".join(str(token_id) for token_id in token_ids)
+
+
+class TestTokenizerService(TestCase):
+    def setUp(self) -> None:
+        self.service = TokenizerService(count_cache_size=100, workers=1)
+
+    def tearDown(self) -> None:
+        self.service.shutdown()
+
+    def test_exact_counts(self):
+        fake = FakeTiktoken()
+        with mock.patch.object(self.service, "_load", return_value=fake):
+            counts = self.service.count_sync("OpenAI", ["a b c", "hello world", "a b c"])
+
+        self.assertEqual([3, 2, 3], counts)
+        # 同一批中重复的文本只编码一次
+        self.assertEqual(2, fake.encoded)
+
+    def test_counts_cached(self):
+        fake = FakeTiktoken()
+        with mock.patch.object(self.service, "_load", return_value=fake):
+            self.service.count_sync("openai", ["a b c"])
+            self.assertEqual([3, 1], self.service.count_sync("openai", ["a b c", "d"]))
+
+        self.assertEqual(2, fake.encoded)
+        self.assertEqual({"texts": 3, "hits": 1}, {k: self.service.stats()[k] for k in ("texts", "hits")})
+
+    def test_fallback_when_assets_missing(self):
+        with mock.patch.object(self.service, "_load", side_effect=FileNotFoundError("missing")) as load:
+            text = "x" * 40
+            self.assertEqual([estimate_tokens(text)], self.service.count_sync("qwen", [text]))
+            self.assertEqual(([], 10), self.service.encode_sync("qwen", text))
+
+        # 加载失败的tokenizer不重复加载
+        load.assert_called_once_with("qwen")
+
+    def test_fallback_for_unknown_series(self):
+        with mock.patch.object(self.service, "_load") as load:
+            self.assertEqual([2], self.service.count_sync("baidu", ["abcdefgh"]))
+
+        load.assert_not_called()
+
+    def test_decode_without_tokenizer(self):
+        with self.assertRaises(ValueError):
+            self.service.decode_sync("baidu", [1, 2])
+
+    def test_slow_load_does_not_block_other_tokenizers(self):
+        loading = threading.Event()
+        release = threading.Event()
+
+        def load(name):
+            if name == "qwen":
+                loading.set()
+                release.wait(5)
+            return FakeTiktoken()
+
+        with mock.patch.object(self.service, "_load", side_effect=load), \
+                mock.patch.object(self.service, "_encode_batch",
+                                  side_effect=lambda name, tokenizer, texts: tokenizer.encode_ordinary_batch(texts)):
+            thread = threading.Thread(target=self.service.get_tokenizer, args=("qwen",))
+            thread.start()
+            self.assertTrue(loading.wait(5))
+            try:
+                # qwen加载期间其他系列可以计数
+                self.assertEqual([2], self.service.count_sync("openai", ["a b"]))
+            finally:
+                release.set()
+                thread.join(5)
+
+        self.assertIsNotNone(self.service.get_tokenizer("qwen"))
+
+    def test_check_assets(self):
+        with mock.patch("app.utils.tokenizer_service.os.path.exists", return_value=False):
+            missing = self.service.check_assets()
+
+        self.assertIn(OPENAI_TOKENIZER, missing)
+        self.assertIn("qwen", missing)
+
+
+@skipUnless(os.path.exists(TokenizerService.asset_path(OPENAI_TOKENIZER)), "需要先执行download_tokenizers.py")
+class TestTiktokenAssets(TestCase):
+    def test_openai_exact_count(self):
+        service = TokenizerService(count_cache_size=0, workers=1)
+
+        self.assertEqual([2], service.count_sync("openai", ["hello world"]))
@@ -0,0 +1,213 @@
+import asyncio
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+import aiohttp
+
+from app.utils.upstream_transport import (BREAKER_CLOSED, BREAKER_HALF_OPEN, BREAKER_OPEN, UpstreamTransport,
+                                          UpstreamTransportPool, UpstreamUnavailableError)
+
+ORIGIN = "https://example.com"
+URL = ORIGIN + "/v1/chat/completions"
+
+
+class FakeSession:
+    """按顺序返回预设结果的会话，结果为状态码或__aenter__时抛出的异常"""
+
+    closed = False
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.requests = 0
+        self.exited = 0
+        # 设置后响应头在放行前一直挂起
+        self.gate = None
+
+    def request(self, method, url, **kwargs):
+        self.requests += 1
+        return FakeRequestContext(self, self.results.pop(0))
+
+
+class FakeRequestContext:
+    def __init__(self, session: FakeSession, result):
+        self.session = session
+        self.result = result
+
+    async def __aenter__(self):
+        if self.session.gate is not None:
+            await self.session.gate.wait()
+        if isinstance(self.result, BaseException):
+            raise self.result
+        return SimpleNamespace(status=self.result)
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.session.exited += 1
+
+
+class TestUpstreamTransportPool(TestCase):
+    def test_transport_per_loop(self):
+        pool = UpstreamTransportPool()
+
+        async def get(url):
+            return pool.get(url)
+
+        first = asyncio.run(get("https://example.com/v1/chat/completions"))
+        second = asyncio.run(get("https://example.com/v1/embeddings"))
+
+        self.assertIsNot(first, second)
+        # 第一个事件循环已关闭，其条目在新建传输层时清理
+        self.assertEqual(1, len(pool._transports))
+
+    def test_same_origin_shared(self):
+        pool = UpstreamTransportPool()
+
+        async def get_twice():
+            return pool.get("https://example.com/a"), pool.get("https://example.com:443/b")
+
+        first, second = asyncio.run(get_twice())
+
+        self.assertIs(first, second)
+
+    def test_connector_verifies_tls(self):
+        pool = UpstreamTransportPool()
+
+        async def connector_ssl():
+            transport = pool.get("https://example.com/a")
+            ssl = transport.session.connector._ssl
+            await pool.close()
+            return ssl
+
+        # 默认校验证书，跳过校验由调用方按请求传入ssl=False
+        self.assertIsNot(False, asyncio.run(connector_ssl()))
+
+
+class TestUpstreamTransport(IsolatedAsyncioTestCase):
+    def new_transport(self, *results, max_concurrency=10):
+        transport = UpstreamTransport(ORIGIN, max_concurrency=max_concurrency, keepalive=1, breaker_failures=3,
+                                      breaker_cooldown=30)
+        transport._session = FakeSession(*results)
+        return transport
+
+    async def call(self, transport):
+        async with transport.request("POST", URL) as response:
+            return response.status
+
+    @staticmethod
+    def cool_down(transport):
+        transport._opened_at -= transport.breaker_cooldown
+
+    async def test_breaker_opens_after_connection_failures(self):
+        transport = self.new_transport(*[aiohttp.ClientConnectionError("refused")] * 2, asyncio.TimeoutError())
+
+        for _ in range(3):
+            self.assertEqual(BREAKER_CLOSED, transport._state)
+            with self.assertRaises((aiohttp.ClientConnectionError, asyncio.TimeoutError)):
+                await self.call(transport)
+        self.assertEqual(BREAKER_OPEN, transport._state)
+
+        # 熔断期间直接失败，不发出请求
+        with self.assertRaises(UpstreamUnavailableError):
+            await self.call(transport)
+        self.assertEqual(3, transport._session.requests)
+        stats = transport.stats()
+        self.assertEqual((3, 1, 1, 0), (stats["failures"], stats["rejected"], stats["breaker_opens"],
+                                        stats["in_flight"]))
+        self.assertFalse(transport._semaphore.locked())
+
+    async def test_breaker_opens_after_gateway_errors(self):
+        transport = self.new_transport(502, 503, 200, 504, 503, 502, 200)
+
+        self.assertEqual([502, 503, 200, 504, 503], [await self.call(transport) for _ in range(5)])
+        # 成功的请求清零连续失败次数
+        self.assertEqual(BREAKER_CLOSED, transport._state)
+        self.assertEqual(502, await self.call(transport))
+        self.assertEqual(BREAKER_OPEN, transport._state)
+        with self.assertRaises(UpstreamUnavailableError):
+            await self.call(transport)
+
+    async def test_single_half_open_trial_recovers(self):
+        transport = self.new_transport(503, 503, 503, 200, 200)
+        for _ in range(3):
+            await self.call(transport)
+        with self.assertRaises(UpstreamUnavailableError):
+            await self.call(transport)
+        self.cool_down(transport)
+        transport._session.gate = asyncio.Event()
+
+        trial = asyncio.create_task(self.call(transport))
+        await asyncio.sleep(0)
+        self.assertEqual(BREAKER_HALF_OPEN, transport._state)
+        # 试探请求未完成时其他请求仍然直接失败
+        with self.assertRaises(UpstreamUnavailableError):
+            await self.call(transport)
+        transport._session.gate.set()
+
+        self.assertEqual(200, await trial)
+        self.assertEqual(BREAKER_CLOSED, transport._state)
+        self.assertEqual(200, await self.call(transport))
+        self.assertEqual(5, transport._session.requests)
+
+    async def test_failed_trial_reopens_breaker(self):
+        transport = self.new_transport(503, 503, 503, aiohttp.ClientConnectionError("refused"), 200)
+        for _ in range(3):
+            await self.call(transport)
+        self.cool_down(transport)
+        opened_at = transport._opened_at
+
+        with self.assertRaises(aiohttp.ClientConnectionError):
+            await self.call(transport)
+
+        self.assertEqual(BREAKER_OPEN, transport._state)
+        self.assertGreater(transport._opened_at, opened_at)
+        self.assertFalse(transport._trial_in_flight)
+        with self.assertRaises(UpstreamUnavailableError):
+            await self.call(transport)
+        self.assertEqual(2, transport.stats()["breaker_opens"])
+
+    async def test_trial_released_on_other_errors(self):
+        transport = self.new_transport(503, 503, 503, ValueError("bad request"), 200)
+        for _ in range(3):
+            await self.call(transport)
+        self.cool_down(transport)
+
+        with self.assertRaises(ValueError):
+            await self.call(transport)
+
+        # 非上游故障不计入熔断，下一个请求可以继续试探
+        self.assertEqual(BREAKER_HALF_OPEN, transport._state)
+        self.assertEqual(200, await self.call(transport))
+        self.assertEqual(BREAKER_CLOSED, transport._state)
+
+    async def test_slot_held_until_stream_read(self):
+        transport = self.new_transport(200, 200, max_concurrency=1)
+        read = asyncio.Event()
+
+        async def stream():
+            async with transport.request("POST", URL) as response:
+                await read.wait()
+                return response.status
+
+        first = asyncio.create_task(stream())
+        await asyncio.sleep(0)
+        second = asyncio.create_task(self.call(transport))
+        await asyncio.sleep(0)
+
+        # 第一个响应读取结束前，第二个请求排队等待
+        self.assertEqual(1, transport._session.requests)
+        self.assertEqual((1, 1), (transport.stats()["in_flight"], transport.stats()["waiting"]))
+        read.set()
+
+        self.assertEqual([200, 200], [await first, await second])
+        self.assertEqual(2, transport._session.exited)
+        self.assertEqual((0, 0), (transport.stats()["in_flight"], transport.stats()["waiting"]))
+        self.assertFalse(transport._semaphore.locked())
+
+    async def test_disconnect_while_streaming_counts_as_failure(self):
+        transport = self.new_transport(200, max_concurrency=1)
+
+        with self.assertRaises(aiohttp.ServerDisconnectedError):
+            async with transport.request("POST", URL):
+                raise aiohttp.ServerDisconnectedError()
+
+        self.assertEqual(1, transport.stats()["failures"])
+        self.assertFalse(transport._semaphore.locked())
@@ -0,0 +1,137 @@
+"""小模型适配器代码缓存
+
+适配器代码需要定义名为main的async函数。代码编译并执行一次后缓存其main函数，
+缓存键为 (model_id, 适配器代码的sha256)：
+- 模型编辑后代码变化，按新代码重新编译，同一模型的旧代码条目随即删除；
+  其他副本不需要额外通知，下次调用时发现代码变化同样会替换
+- 模型编辑、删除时主动删除本副本中该模型的条目
+- 服务启动时按模型注册表中的小模型预编译
+适配器模块级变量在多次调用之间保留，与普通Python模块的行为一致。
+
+每个模型统计调用次数、失败次数和耗时，通过 GET /small-model/adapter/stats 查询，
+另外每隔STATS_LOG_INTERVAL次调用输出一次日志。
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from app.logs.stand_log import StandLogger
+
+# 最多缓存的适配器数量
+MAX_ADAPTERS = 512
+# 每个模型每隔多少次调用输出一次统计
+STATS_LOG_INTERVAL = 1000
+
+
+def code_hash(adapter_code: str) -> str:
+    return hashlib.sha256(adapter_code.encode("utf-8")).hexdigest()
+
+
+def compile_adapter(adapter_code: str, filename: str = "<adapter>") -> Callable:
+    """编译并执行适配器代码，返回其中的main函数"""
+    global_namespace = {'__builtins__': __builtins__}
+    exec(compile(adapter_code, filename, "exec"), global_namespace, global_namespace)
+    adapter_func = global_namespace.get('main')
+    if not adapter_func or not callable(adapter_func):
+        raise ValueError("Adapter code must define an async function named 'main'")
+    return adapter_func
+
+
+class AdapterCache:
+    """按模型缓存编译后的适配器"""
+
+    def __init__(self, max_size: int = MAX_ADAPTERS):
+        self.max_size = max_size
+        # {(model_id, code_hash): main函数}
+        self._entries: "OrderedDict[Tuple[str, str], Callable]" = OrderedDict()
+        self._lock = threading.Lock()
+        # {model_id: {"calls": 调用次数, "errors": 失败次数, "total_ms": 总耗时, "max_ms": 最大耗时}}
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def get(self, model_id: Optional[str], adapter_code: str) -> Callable:
+        """获取适配器的main函数，model_id为空时（如测试未保存的代码）不缓存"""
+        if not model_id:
+            return compile_adapter(adapter_code)
+        key = (model_id, code_hash(adapter_code))
+        with self._lock:
+            adapter_func = self._entries.get(key)
+            if adapter_func is not None:
+                self._entries.move_to_end(key)
+                return adapter_func
+        adapter_func = compile_adapter(adapter_code, f"<adapter:{model_id}>")
+        with self._lock:
+            # 同一模型只保留当前代码
+            for old_key in [old_key for old_key in self._entries if old_key[0] == model_id]:
+                del self._entries[old_key]
+            self._entries[key] = adapter_func
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return adapter_func
+
+    def invalidate(self, model_ids):
+        """模型编辑、删除后调用"""
+        model_ids = set(model_ids)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] in model_ids]:
+                del self._entries[key]
+
+    def warm(self, models):
+        """预编译适配器，models为模型信息行（f_model_id, f_adapter, f_adapter_code）"""
+        count = 0
+        for model in models:
+            if not model.get("f_adapter") or not model.get("f_adapter_code"):
+                continue
+            try:
+                self.get(model["f_model_id"], model["f_adapter_code"])
+                count += 1
+            except Exception as e:
+                StandLogger.warn(f"预编译适配器失败: model_id={model['f_model_id']}, error={e}")
+        StandLogger.info_log(f"预编译适配器{count}个")
+
+    async def call(self, model_id: Optional[str], adapter_code: str, *args):
+        """执行适配器并记录耗时和失败次数"""
+        start = time.perf_counter()
+        ok = False
+        try:
+            result = await self.get(model_id, adapter_code)(*args)
+            ok = True
+            return result
+        finally:
+            if model_id:
+                self._record(model_id, (time.perf_counter() - start) * 1000, ok)
+
+    def _record(self, model_id: str, elapsed_ms: float, ok: bool):
+        with self._lock:
+            stat = self._stats.setdefault(model_id, {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+            stat["calls"] += 1
+            stat["total_ms"] += elapsed_ms
+            stat["max_ms"] = max(stat["max_ms"], elapsed_ms)
+            if not ok:
+                stat["errors"] += 1
+            if stat["calls"] % STATS_LOG_INTERVAL:
+                return
+            message = (
+                f"适配器调用统计: model_id={model_id}, calls={stat['calls']}, errors={stat['errors']}, "
+                f"avg_ms={stat['total_ms'] / stat['calls']:.2f}, max_ms={stat['max_ms']:.2f}"
+            )
+        StandLogger.info_log(message)
+
+    def stats(self) -> Dict[str, dict]:
+        """各模型的累计调用情况"""
+        with self._lock:
+            return {
+                model_id: {
+                    "calls": stat["calls"],
+                    "errors": stat["errors"],
+                    "avg_ms": stat["total_ms"] / stat["calls"] if stat["calls"] else 0.0,
+                    "max_ms": stat["max_ms"],
+                }
+                for model_id, stat in self._stats.items()
+            }
+
+
+# 进程级共享实例
+adapter_cache = AdapterCache()
@@ -0,0 +1,235 @@
+"""大模型调用准入控制
+
+/chat/completions原先直接转发到上游，单个用户的大量请求会占满自建模型的并发，其他用户的首字时间随之变长。
+现在按模型限制同时进行的调用数，超出的请求排队：
+- 每个模型最多LLM_ADMISSION_MAX_INFLIGHT个调用同时进行，模型配置（f_model_config）中的max_inflight优先，
+  0表示不限制；流式调用在输出结束后才释放名额
+- 排队的请求按 (用户, func_module) 分组加权公平排队，按虚拟完成时间排序（WFQ的finish tag）：
+  请求的虚拟开始时间 = max(当前虚拟时间, 同组上一个请求的虚拟完成时间)，虚拟完成时间 = 开始时间 + 1/权重，
+  名额空出时放行虚拟完成时间最小的请求，当前虚拟时间推进到被放行请求的虚拟开始时间；
+  请求多的分组不会挤占其他分组，权重高的分组按权重比例更多地被放行
+- 权重按func_module配置（LLM_ADMISSION_FUNC_MODULE_WEIGHTS），配额达到软限制的用户
+  权重再乘以LLM_ADMISSION_SOFT_LIMIT_WEIGHT
+- 排队超过LLM_ADMISSION_QUEUE_TIMEOUT秒，或排队数已达LLM_ADMISSION_MAX_QUEUE时拒绝
+- 统计排队数、调用数、排队耗时和拒绝数，每隔STATS_LOG_INTERVAL次准入输出一次
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import time
+from typing import Dict, List, Tuple
+
+from app.core.config import base_config
+from app.logs.stand_log import StandLogger
+
+# 每个模型每隔多少次准入输出一次统计
+STATS_LOG_INTERVAL = 1000
+# 模型配置中的最大并发调用数
+MODEL_CONFIG_KEY = "max_inflight"
+
+REJECT_TIMEOUT = "timeout"
+REJECT_QUEUE_FULL = "queue_full"
+
+
+class AdmissionRejected(Exception):
+    """排队超时或队列已满，未发出请求"""
+
+    def __init__(self, model: str, reason: str):
+        super().__init__(f"模型{model}调用" + ("排队超时" if reason == REJECT_TIMEOUT else "排队已满"))
+        self.model = model
+        self.reason = reason
+
+
+def model_max_inflight(model_data: dict) -> int:
+    """模型的最大并发调用数，模型配置中没有配置时使用LLM_ADMISSION_MAX_INFLIGHT"""
+    try:
+        config = json.loads(model_data["f_model_config"].replace("'", '"'))
+        if config.get(MODEL_CONFIG_KEY) is not None:
+            return max(int(config[MODEL_CONFIG_KEY]), 0)
+    except Exception:
+        # 模型配置格式错误时由后续的模型调用返回错误
+        pass
+    return base_config.LLM_ADMISSION_MAX_INFLIGHT
+
+
+class _Waiter:
+    __slots__ = ("future", "start", "enqueued_at")
+
+    def __init__(self, future: asyncio.Future, start: float):
+        self.future = future
+        # 虚拟开始时间
+        self.start = start
+        self.enqueued_at = time.monotonic()
+
+
+class AdmissionTicket:
+    """已占用的调用名额，调用结束后release，重复调用无影响"""
+
+    def __init__(self, gate: "ModelGate", wait_ms: float):
+        self._gate = gate
+        self.wait_ms = wait_ms
+
+    def release(self):
+        gate, self._gate = self._gate, None
+        if gate is not None:
+            gate._release()
+
+
+class ModelGate:
+    """单个模型的并发限制和加权公平排队"""
+
+    def __init__(self, model: str, max_inflight: int, queue_timeout: float = None, max_queue: int = None):
+        self.model = model
+        self.max_inflight = max_inflight
+        self.queue_timeout = base_config.LLM_ADMISSION_QUEUE_TIMEOUT if queue_timeout is None else queue_timeout
+        self.max_queue = base_config.LLM_ADMISSION_MAX_QUEUE if max_queue is None else max_queue
+        self.in_flight = 0
+        # 仍在排队的请求数；超时的请求留在堆中，出堆时跳过
+        self.queued = 0
+        # (虚拟完成时间, 序号, 排队请求)
+        self._queue: List[Tuple[float, int, _Waiter]] = []
+        self._seq = itertools.count()
+        self._virtual_time = 0.0
+        # {(用户, func_module): 该组最后一个排队请求的虚拟完成时间}
+        self._finish: Dict[Tuple[str, str], float] = {}
+        self._stats = {"admitted": 0, "queued": 0, "timeouts": 0, "rejected": 0,
+                       "wait_ms": 0.0, "max_wait_ms": 0.0}
+
+    def _has_slot(self) -> bool:
+        return self.max_inflight <= 0 or self.in_flight < self.max_inflight
+
+    def set_max_inflight(self, max_inflight: int):
+        """模型配置修改后调整名额，调大时立即放行排队的请求"""
+        if max_inflight != self.max_inflight:
+            self.max_inflight = max_inflight
+            self._dispatch()
+
+    async def acquire(self, flow: Tuple[str, str], weight: float) -> AdmissionTicket:
+        if self.queued == 0 and self._has_slot():
+            self.in_flight += 1
+            return self._admitted(0.0)
+        if 0 < self.max_queue <= self.queued:
+            self._stats["rejected"] += 1
+            raise AdmissionRejected(self.model, REJECT_QUEUE_FULL)
+        start = max(self._virtual_time, self._finish.get(flow, 0.0))
+        finish = start + 1.0 / weight
+        self._finish[flow] = finish
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), start)
+        heapq.heappush(self._queue, (finish, next(self._seq), waiter))
+        self.queued += 1
+        self._stats["queued"] += 1
+        try:
+            await asyncio.wait_for(waiter.future, self.queue_timeout if self.queue_timeout > 0 else None)
+        except BaseException as e:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # 已放行但请求同时超时或被取消，归还名额
+                self._release()
+            else:
+                waiter.future.cancel()
+                self.queued -= 1
+                if self.queued == 0:
+                    self._reset()
+            if isinstance(e, asyncio.TimeoutError):
+                self._stats["timeouts"] += 1
+                raise AdmissionRejected(self.model, REJECT_TIMEOUT) from None
+            raise
+        return self._admitted((time.monotonic() - waiter.enqueued_at) * 1000)
+
+    def _release(self):
+        self.in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        while self._queue and self._has_slot():
+            _, _, waiter = heapq.heappop(self._queue)
+            if waiter.future.done():
+                continue
+            self.queued -= 1
+            self.in_flight += 1
+            self._virtual_time = max(self._virtual_time, waiter.start)
+            waiter.future.set_result(None)
+        if self.queued == 0:
+            self._reset()
+
+    def _reset(self):
+        """没有排队的请求时清空虚拟时间，各分组重新开始计算"""
+        self._queue.clear()
+        self._finish.clear()
+        self._virtual_time = 0.0
+
+    def _admitted(self, wait_ms: float) -> AdmissionTicket:
+        stat = self._stats
+        stat["admitted"] += 1
+        stat["wait_ms"] += wait_ms
+        stat["max_wait_ms"] = max(stat["max_wait_ms"], wait_ms)
+        if stat["admitted"] % STATS_LOG_INTERVAL == 0:
+            StandLogger.info_log(
+                f"模型调用准入统计: model={self.model}, admitted={stat['admitted']}, in_flight={self.in_flight}, "
+                f"queue_depth={self.queued}, queued={stat['queued']}, timeouts={stat['timeouts']}, "
+                f"rejected={stat['rejected']}, avg_wait_ms={stat['wait_ms'] / stat['admitted']:.1f}, "
+                f"max_wait_ms={stat['max_wait_ms']:.1f}")
+        return AdmissionTicket(self, wait_ms)
+
+    def stats(self) -> dict:
+        stat = dict(self._stats)
+        wait_ms = stat.pop("wait_ms")
+        stat["avg_wait_ms"] = wait_ms / stat["admitted"] if stat["admitted"] else 0.0
+        stat["in_flight"] = self.in_flight
+        stat["queue_depth"] = self.queued
+        stat["max_inflight"] = self.max_inflight
+        return stat
+
+
+class AdmissionController:
+    def __init__(self, func_module_weights: Dict[str, float] = None, soft_limit_weight: float = None):
+        self.func_module_weights = _load_weights() if func_module_weights is None else func_module_weights
+        self.soft_limit_weight = base_config.LLM_ADMISSION_SOFT_LIMIT_WEIGHT \
+            if soft_limit_weight is None else soft_limit_weight
+        # {模型ID: 准入控制}
+        self._gates: Dict[str, ModelGate] = {}
+
+    def weight(self, func_module: str, soft_limit: bool = False) -> float:
+        weight = self.func_module_weights.get(func_module or "", 1.0)
+        if soft_limit:
+            weight *= self.soft_limit_weight
+        return max(weight, 0.01)
+
+    def gate(self, model_data: dict) -> ModelGate:
+        model_id = str(model_data["f_model_id"])
+        max_inflight = model_max_inflight(model_data)
+        gate = self._gates.get(model_id)
+        if gate is None:
+            gate = self._gates[model_id] = ModelGate(model_data["f_model_name"], max_inflight)
+        else:
+            gate.model = model_data["f_model_name"]
+            gate.set_max_inflight(max_inflight)
+        return gate
+
+    async def acquire(self, model_data: dict, user_id: str, func_module: str,
+                      soft_limit: bool = False) -> AdmissionTicket:
+        """占用模型调用名额，排队超时或队列已满时抛出AdmissionRejected
+
+        Args:
+            model_data: 模型注册表中的模型信息
+            soft_limit: 用户配额是否达到软限制，达到时降低排队权重
+        """
+        return await self.gate(model_data).acquire((user_id, func_module or ""),
+                                                   self.weight(func_module, soft_limit))
+
+    def stats(self) -> Dict[str, dict]:
+        return {gate.model: gate.stats() for gate in list(self._gates.values())}
+
+
+def _load_weights() -> Dict[str, float]:
+    try:
+        weights = json.loads(base_config.LLM_ADMISSION_FUNC_MODULE_WEIGHTS or "{}")
+        return {str(module): float(weight) for module, weight in weights.items()}
+    except Exception as e:
+        StandLogger.error(f"LLM_ADMISSION_FUNC_MODULE_WEIGHTS格式错误，所有func_module按相同权重排队: {e}")
+        return {}
+
+
+# 进程级共享实例
+admission_controller = AdmissionController()
@@ -0,0 +1,278 @@
+"""embedding结果缓存
+
+按内容寻址：缓存键由 (model_id, 模型配置指纹, 归一化文本的sha256) 组成，
+模型的接口地址、上游模型名或适配器代码变化后指纹随之变化，旧结果自然失效。
+
+两级缓存：
+- L1: 进程内LRU，保存向量和该文本的token数
+- L2: 可选的Redis缓存，多副本共享，向量以float64原样存储，读写失败时按未命中处理
+
+批量请求只把未命中的文本（去重后）发往上游，结果按原顺序重组。
+返回的usage仍按全部文本计算（命中文本使用缓存的token数），保证计费口径与不走缓存时一致，
+其中命中部分额外通过usage.cached_tokens给出。
+"""
+
+import asyncio
+import hashlib
+import json
+import struct
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import base_config
+from app.logs.stand_log import StandLogger
+
+REDIS_KEY_PREFIX = "dip:model-api:embedding-cache"
+# token数(uint32) + float64向量
+_TOKENS_FORMAT = "<I"
+_TOKENS_SIZE = struct.calcsize(_TOKENS_FORMAT)
+# 每个模型每隔多少次查询输出一次命中率
+STATS_LOG_INTERVAL = 1000
+
+
+def normalize_text(text: str) -> str:
+    """文本归一化：统一为NFC形式，避免同一文本的不同Unicode编码产生不同的缓存键"""
+    return unicodedata.normalize("NFC", text)
+
+
+def config_fingerprint(config_info: dict, adapter, adapter_code) -> str:
+    """计算影响embedding结果的模型配置指纹（不包含api_key）"""
+    content = json.dumps(
+        [config_info.get("api_url", ""), config_info.get("api_model", ""), bool(adapter), adapter_code or ""],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+
+def apportion_tokens(total: int, texts: List[str]) -> List[int]:
+    """按文本长度把上游返回的token总数分摊到每条文本上，分摊结果之和等于total"""
+    if not texts:
+        return []
+    weights = [max(len(text), 1) for text in texts]
+    weight_sum = sum(weights)
+    shares = [total * weight / weight_sum for weight in weights]
+    result = [int(share) for share in shares]
+    # 最大余数法补齐取整误差
+    remainder = total - sum(result)
+    order = sorted(range(len(texts)), key=lambda i: shares[i] - result[i], reverse=True)
+    for i in order[:remainder]:
+        result[i] += 1
+    return result
+
+
+class EmbeddingCache:
+    """embedding两级缓存"""
+
+    def __init__(self, max_size: int = None, redis_enabled: bool = None, redis_ttl: int = None):
+        self.max_size = base_config.EMBEDDING_CACHE_SIZE if max_size is None else max_size
+        self.redis_enabled = base_config.EMBEDDING_CACHE_REDIS if redis_enabled is None else redis_enabled
+        self.redis_ttl = base_config.EMBEDDING_CACHE_REDIS_TTL if redis_ttl is None else redis_ttl
+        self._entries: "OrderedDict[str, Tuple[array, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # {model_id: {"l1": 命中数, "l2": 命中数, "miss": 未命中数}}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 or self.redis_enabled
+
+    @staticmethod
+    def build_key(model_id: str, fingerprint: str, text: str) -> str:
+        text_hash = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{model_id}:{fingerprint}:{text_hash}"
+
+    def _get_local(self, key: str) -> Optional[Tuple[array, int]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _put_local(self, key: str, entry: Tuple[array, int]):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def _get_redis(self, keys: List[str]) -> List[Optional[Tuple[array, int]]]:
+        if not self.redis_enabled or not keys:
+            return [None] * len(keys)
+        try:
+            from app.mydb.ConnectUtil import get_redis_util
+            redis_util = await get_redis_util()
+            values = await asyncio.wait_for(
+                redis_util.read_conn.mget([f"{REDIS_KEY_PREFIX}:{key}" for key in keys]), timeout=2.0
+            )
+        except Exception as e:
+            StandLogger.warn(f"读取embedding缓存失败: {str(e)}")
+            return [None] * len(keys)
+        result = []
+        for value in values:
+            if not value or len(value) < _TOKENS_SIZE:
+                result.append(None)
+                continue
+            tokens = struct.unpack_from(_TOKENS_FORMAT, value)[0]
+            vector = array("d")
+            vector.frombytes(value[_TOKENS_SIZE:])
+            result.append((vector, tokens))
+        return result
+
+    async def _put_redis(self, items: Dict[str, Tuple[array, int]]):
+        if not self.redis_enabled or not items:
+            return
+        try:
+            from app.mydb.ConnectUtil import get_redis_util
+            redis_util = await get_redis_util()
+            async with redis_util.write_conn.pipeline(transaction=False) as pipe:
+                for key, (vector, tokens) in items.items():
+                    pipe.set(
+                        f"{REDIS_KEY_PREFIX}:{key}",
+                        struct.pack(_TOKENS_FORMAT, tokens) + vector.tobytes(),
+                        ex=self.redis_ttl,
+                    )
+                await asyncio.wait_for(pipe.execute(), timeout=2.0)
+        except Exception as e:
+            StandLogger.warn(f"写入embedding缓存失败: {str(e)}")
+
+    def _record(self, model_id: str, l1: int, l2: int, miss: int):
+        with self._lock:
+            stat = self._stats.setdefault(model_id, {"l1": 0, "l2": 0, "miss": 0, "logged": 0})
+            stat["l1"] += l1
+            stat["l2"] += l2
+            stat["miss"] += miss
+            lookups = stat["l1"] + stat["l2"] + stat["miss"]
+            if lookups - stat["logged"] < STATS_LOG_INTERVAL:
+                return
+            stat["logged"] = lookups
+            hits = stat["l1"] + stat["l2"]
+            message = (
+                f"embedding缓存命中率: model_id={model_id}, hit_ratio={hits / lookups:.4f}, "
+                f"l1={stat['l1']}, l2={stat['l2']}, miss={stat['miss']}"
+            )
+        StandLogger.info_log(message)
+
+    def stats(self) -> Dict[str, dict]:
+        """各模型的累计命中情况"""
+        with self._lock:
+            result = {}
+            for model_id, stat in self._stats.items():
+                lookups = stat["l1"] + stat["l2"] + stat["miss"]
+                result[model_id] = {
+                    "l1": stat["l1"],
+                    "l2": stat["l2"],
+                    "miss": stat["miss"],
+                    "hit_ratio": (stat["l1"] + stat["l2"]) / lookups if lookups else 0.0,
+                }
+            return result
+
+    async def embed(
+        self,
+        model_id: str,
+        fingerprint: str,
+        model_name: str,
+        texts: list,
+        fetch: Callable[[list], Awaitable[dict]],
+    ) -> dict:
+        """获取一批文本的embedding，只把未命中的文本交给fetch
+
+        Args:
+            model_id: 模型ID
+            fingerprint: 模型配置指纹，见config_fingerprint
+            model_name: 模型名称，全部命中时作为返回结果的model字段
+            texts: 文本列表
+            fetch: 调用上游的协程函数，入参为文本列表，返回openai风格的embedding结果
+
+        Returns:
+            openai风格的embedding结果，data与texts一一对应
+        """
+        if not self.enabled or not texts or not all(isinstance(text, str) for text in texts):
+            return await fetch(texts)
+
+        keys = [self.build_key(model_id, fingerprint, text) for text in texts]
+        entries: Dict[str, Tuple[array, int]] = {}
+        for key in keys:
+            if key not in entries:
+                entry = self._get_local(key)
+                if entry is not None:
+                    entries[key] = entry
+        l1_hits = sum(1 for key in keys if key in entries)
+
+        redis_keys = list(dict.fromkeys(key for key in keys if key not in entries))
+        for key, entry in zip(redis_keys, await self._get_redis(redis_keys)):
+            if entry is not None:
+                entries[key] = entry
+                self._put_local(key, entry)
+        l2_hits = sum(1 for key in keys if key in entries) - l1_hits
+
+        # 未命中的文本去重后发往上游
+        miss_texts: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in entries and key not in miss_texts:
+                miss_texts[key] = text
+
+        upstream_model = model_name
+        if miss_texts:
+            miss_keys = list(miss_texts)
+            result = await fetch(list(miss_texts.values()))
+            vectors = self._parse_vectors(result, len(miss_keys))
+            if vectors is None:
+                if len(miss_keys) == len(texts):
+                    # 上游返回格式无法识别且没有使用缓存，原样返回
+                    self._record(model_id, 0, 0, len(texts))
+                    return result
+                raise Exception(f"embedding结果数量与输入不一致: 期望{len(miss_keys)}条")
+            upstream_model = result.get("model", model_name)
+            prompt_tokens = (result.get("usage") or {}).get("prompt_tokens") or 0
+            tokens = apportion_tokens(int(prompt_tokens), list(miss_texts.values()))
+            new_entries = {}
+            for key, vector, token in zip(miss_keys, vectors, tokens):
+                entry = (array("d", vector), token)
+                entries[key] = entry
+                new_entries[key] = entry
+                self._put_local(key, entry)
+            await self._put_redis(new_entries)
+
+        miss_count = len(texts) - l1_hits - l2_hits
+        self._record(model_id, l1_hits, l2_hits, miss_count)
+
+        data = []
+        total_tokens = 0
+        cached_tokens = 0
+        for index, key in enumerate(keys):
+            vector, token = entries[key]
+            data.append({"object": "embedding", "embedding": vector.tolist(), "index": index})
+            total_tokens += token
+            if key not in miss_texts:
+                cached_tokens += token
+        return {
+            "object": "list",
+            "data": data,
+            "model": upstream_model,
+            "usage": {
+                "prompt_tokens": total_tokens,
+                "total_tokens": total_tokens,
+                "cached_tokens": cached_tokens,
+            },
+        }
+
+    @staticmethod
+    def _parse_vectors(result, count: int) -> Optional[List[list]]:
+        """从openai风格的结果中按index顺序取出向量，格式不符时返回None"""
+        if not isinstance(result, dict) or not isinstance(result.get("data"), list):
+            return None
+        data = result["data"]
+        if len(data) != count or not all(isinstance(item, dict) and "embedding" in item for item in data):
+            return None
+        if all("index" in item for item in data):
+            data = sorted(data, key=lambda item: item["index"])
+        return [item["embedding"] for item in data]
+
+
+# 进程级共享实例
+embedding_cache = EmbeddingCache()
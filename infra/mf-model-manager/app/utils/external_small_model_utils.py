@@ -7,6 +7,7 @@ import concurrent.futures
 
 from app.core.config import base_config
 from app.logs.stand_log import StandLogger
+from app.utils.adapter_cache import adapter_cache
 
 
 class BaiduTianchenClient:
@@ -238,7 +239,7 @@ class BaishengClient:
 
 
 class InnerClient:
-    def __init__(self, url, model_name, api_key="", adapter=False, adapter_code=None):
+    def __init__(self, url, model_name, api_key="", adapter=False, adapter_code=None, model_id=None):
         if not url.startswith(('http://', 'https://')):
             url = f"http://{url}"
         self.url = url
@@ -249,18 +250,13 @@ class InnerClient:
         }
         self.adapter = adapter
         self.adapter_code = adapter_code
+        # 为空时不缓存编译后的适配器（测试未保存的代码）
+        self.model_id = model_id
 
     async def embedding(self, texts):
         if self.adapter and self.adapter_code:
             try:
-                global_namespace = {'__builtins__': __builtins__}
-                exec(self.adapter_code, global_namespace, global_namespace)
-                adapter_func = global_namespace.get('main')
-                if not adapter_func or not callable(adapter_func):
-                    raise ValueError("Adapter code must define an async function named 'main'")
-
-                result = await adapter_func(texts)
-                return result
+                return await adapter_cache.call(self.model_id, self.adapter_code, texts)
             except Exception as e:
                 raise Exception(f"Adapter execution failed: {str(e)}")
 
@@ -285,13 +281,7 @@ class InnerClient:
     async def reranker(self, query, documents):
         if self.adapter and self.adapter_code:
             try:
-                global_namespace = {'__builtins__': __builtins__}
-                exec(self.adapter_code, global_namespace, global_namespace)
-                reranker_func = global_namespace.get('main')
-                if not reranker_func or not callable(reranker_func):
-                    raise ValueError("Adapter code must define an async function named 'my_reranker'")
-                result = await reranker_func(query, documents)
-                return result
+                return await adapter_cache.call(self.model_id, self.adapter_code, query, documents)
             except Exception as e:
                 raise Exception(f"Adapter execution failed: {str(e)}")
 
@@ -317,15 +307,7 @@ class InnerClient:
     async def test_embedding(self, texts):
         if self.adapter and self.adapter_code:
             try:
-                global_namespace = {'__builtins__': __builtins__}
-                exec(self.adapter_code, global_namespace, global_namespace)
-                adapter_func = global_namespace.get('main')
-                if not adapter_func or not callable(adapter_func):
-                    raise ValueError("Adapter code must define an async function named 'main'")
-
-                result = await adapter_func(texts)
-
-                return result
+                return await adapter_cache.call(None, self.adapter_code, texts)
             except Exception as e:
                 raise Exception(f"Adapter execution failed: {str(e)}")
 
@@ -357,12 +339,7 @@ class InnerClient:
     async def test_reranker(self, query, documents):
         if self.adapter and self.adapter_code:
             try:
-                global_namespace = {'__builtins__': __builtins__}
-                exec(self.adapter_code, global_namespace, global_namespace)
-                reranker_func = global_namespace.get('main')
-                if not reranker_func or not callable(reranker_func):
-                    raise ValueError("Adapter code must define an async function named 'my_reranker'")
-                result = await reranker_func(query, documents)
+                result = await adapter_cache.call(None, self.adapter_code, query, documents)
             except Exception as e:
                 raise Exception(f"Adapter execution failed: {str(e)}")
 
@@ -1,64 +1,126 @@
-import asyncio
+"""模型用量Kafka消息汇总入库
+
+按分区维护尚未入库的汇总数据，满足时间、消息数或汇总键数任一条件时入库：
+- 汇总数据与各分区的消费位点在同一个数据库事务中写入t_model_op_consumer_offset，
+  入库成功后再同步提交Kafka位点，进程在两者之间退出时以数据库中的位点为准，不会重复计费
+- 分区分配时从数据库读取位点并定位，低于已入库位点的消息直接跳过
+- 分区回收前先把该分区的数据入库，入库失败则丢弃，由新的消费者从已入库位点重新消费
+- 数据库中的位点超过本批起始位点时（旧消费者在分区重新分配后仍在入库），本批作废并重新定位
+入库失败时保留数据，按退避时间重试，期间不提交位点。
+"""
+
+import datetime
 import json
-import threading
 import time
-from collections import defaultdict
+from typing import Dict, List, Optional
 
-from app.commons.snow_id import worker
-from app.mydb.ConnectUtil import MyKafkaClient, get_redis_util, redis_util
-from app.logs.stand_log import StandLogger
-from app.dao.model_used_audit_dao import model_op_dao
-from app.interfaces.dbaccess import ModelUsedAuditInfo
-import datetime
+from confluent_kafka import TopicPartition
 
+from app.core.config import base_config
+from app.dao.model_used_audit_dao import StaleOffsetError, model_op_dao
+from app.interfaces.dbaccess import ModelUsedAuditInfo
+from app.logs.stand_log import StandLogger
+from app.mydb.ConnectUtil import MyKafkaClient
 from app.utils.config_cache import quota_config_cache_tree
 
+PRICE_UNITS = {
+    "thousand": 1000,
+    "million": 1000000
+}
+# 入库失败后的最长重试间隔（秒）
+MAX_RETRY_BACKOFF = 60
+
+
+def _new_record() -> dict:
+    return {
+        'input_tokens': 0,
+        'output_tokens': 0,
+        'conf_id': '',
+        'model_id': '',
+        'user_id': '',
+        'total_price': 0.0,
+        'currency_type': 0,
+        'price_type': [],
+        'referprice_in': 0.0,
+        'referprice_out': 0.0,
+        'total_count': 0,
+        'failed_count': 0,
+        'total_time': 0.0,
+        'first_time': 0.0
+    }
+
+
+class PartitionState:
+    """单个分区尚未入库的汇总数据"""
+
+    def __init__(self, committed: Optional[int] = None):
+        # 已入库的下一条待消费offset，未知时为None
+        self.committed = committed
+        # 本批起始offset和下一条待消费offset
+        self.start = None
+        self.next_offset = None
+        self.messages = 0
+        # {f"{model_id}_{user_id}_{status}": 汇总数据}
+        self.aggregated: Dict[str, dict] = {}
+
+    def accept(self, offset: int) -> bool:
+        """记录消息offset，已入库或已汇总过的消息返回False"""
+        if self.committed is not None and offset < self.committed:
+            return False
+        if self.next_offset is not None and offset < self.next_offset:
+            return False
+        if self.start is None:
+            self.start = offset if self.committed is None else self.committed
+        self.next_offset = offset + 1
+        self.messages += 1
+        return True
+
+    def reset(self, committed: Optional[int]):
+        self.committed = committed
+        self.start = None
+        self.next_offset = None
+        self.messages = 0
+        self.aggregated = {}
+
 
 class KafkaStreamsProcessor:
     def __init__(self, topic_name='tenant_a.dip.model_manager.quota_data', group_id='quota_data_group_new',
-                 consume_from_beginning=False):
-        # 使用新的消费者组ID，确保能够消费到所有消息
-        self.kafka_client = MyKafkaClient(topic_name)
+                 consume_from_beginning=False, consumer=None, dao=None, quota_configs=None,
+                 flush_interval: int = None, flush_max_messages: int = None, flush_max_keys: int = None):
+        """
+        Args:
+            consumer: 已创建的消费者，为空时在start_consumer中按配置创建
+            dao: 用量数据访问对象，默认为model_op_dao
+            quota_configs: 按model_id查询计费配置，默认为quota_config_cache_tree
+        """
+        self.kafka_client = None
+        self.consumer = consumer
         self.topic_name = topic_name
         self.group_id = group_id
         self.consume_from_beginning = consume_from_beginning  # 是否从最早的消息开始消费
-        # 存储按model_id和user_id联合主键汇总的数据
-        self.aggregated_data = defaultdict(lambda: {
-            'input_tokens': 0,
-            'output_tokens': 0,
-            'conf_id': '',
-            'model_id': '',
-            'user_id': '',
-            'total_price': 0.0,
-            'currency_type': 0,
-            'price_type': [],
-            'referprice_in': 0.0,
-            'referprice_out': 0.0,
-            'total_count': 0,
-            'failed_count': 0,
-            'average_total_time': 0.0,
-            'average_first_time': 0.0,
-            'total_time': 0.0,
-            'first_time': 0.0
-        })
-        self.model_op_dao = model_op_dao
-        self.lock = threading.Lock()
+        self.model_op_dao = model_op_dao if dao is None else dao
+        self.quota_configs = quota_config_cache_tree if quota_configs is None else quota_configs
+        self.flush_interval = base_config.USAGE_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self.flush_max_messages = base_config.USAGE_FLUSH_MAX_MESSAGES \
+            if flush_max_messages is None else flush_max_messages
+        self.flush_max_keys = base_config.USAGE_FLUSH_MAX_KEYS if flush_max_keys is None else flush_max_keys
+        self.partitions: Dict[int, PartitionState] = {}
         self.running = True  # 添加运行状态标志
-        self.processed_messages = set()  # 用于记录已处理的消息，防止重复处理
-        self.is_processing = False  # 添加处理状态标志，防止重复执行
+        self._consuming = False
+        self._last_flush = time.monotonic()
+        self._retry_at = 0.0
+        self._retry_backoff = 1.0
 
     def _connect_consumer_with_custom_config(self):
         """使用自定义配置连接消费者"""
         from confluent_kafka import Consumer
-        from app.core.config import base_config
         import socket
+        import os
 
         # 使用固定的消费者组ID，确保多实例之间实现分区协作而不是重复消费
         hostname = socket.gethostname()
-        import os
         pid = os.getpid()
 
-        # 自定义消费者配置，避免重复消费
         offset_reset = 'earliest' if self.consume_from_beginning else 'latest'
         consumer_config = {
             'bootstrap.servers': '{}:{}'.format(base_config.KAFKAHOST, base_config.KAFKAPORT),
@@ -69,8 +131,7 @@ class KafkaStreamsProcessor:
             'sasl.password': base_config.KAFKAPASS,
             'group.id': self.group_id,  # 使用固定消费者组，避免多实例重复消费
             'auto.offset.reset': offset_reset,  # 根据配置决定从何处开始消费
-            'enable.auto.commit': True,
-            'auto.commit.interval.ms': 5000,  # 增加提交间隔
+            'enable.auto.commit': False,  # 汇总数据入库后手动提交位点
             'session.timeout.ms': 30000,  # 增加会话超时时间
             'heartbeat.interval.ms': 10000,  # 心跳间隔
             'max.poll.interval.ms': 300000,  # 最大轮询间隔
@@ -82,253 +143,260 @@ class KafkaStreamsProcessor:
         StandLogger.info_log(f"消费者配置: group.id={self.group_id}, auto.offset.reset={offset_reset}")
         StandLogger.info_log(f"主机名: {hostname}, 进程ID: {pid}")
 
-        # 创建消费者
+        # 检查并创建topic
+        self.kafka_client = MyKafkaClient(self.topic_name)
         self.kafka_client.consumer = Consumer(consumer_config)
-        # 订阅topic
-        self.kafka_client.consumer.subscribe([self.topic_name])
-
-        StandLogger.info_log(f"消费者已订阅 Topic: {self.topic_name}")
+        self.consumer = self.kafka_client.consumer
 
     def start_consumer(self):
-        """启动Kafka消费者"""
+        """启动Kafka消费者，在当前线程中消费并按条件入库，直到stop_consumer被调用"""
         StandLogger.info_log(f"启动Kafka消费者... Topic: {self.topic_name}, Group ID: {self.group_id}")
 
-        try:
-            StandLogger.info_log("正在连接Kafka消费者...")
-            # 使用自定义配置连接消费者
-            self._connect_consumer_with_custom_config()
-            StandLogger.info_log("Kafka消费者连接成功")
-        except Exception as e:
-            StandLogger.error(f"连接Kafka消费者失败: {e}")
-            raise
-
-        # 启动定时任务（仅启动一次）
-        # 使用线程来运行定时任务
-        if not hasattr(self, "_timer_thread") or self._timer_thread is None or not self._timer_thread.is_alive():
-            StandLogger.info_log("启动定时数据处理任务...")
-            import threading
-            self._timer_thread = threading.Thread(target=self._run_periodic_processing, daemon=True)
-            self._timer_thread.start()
-            StandLogger.info_log("定时数据处理任务已启动")
-        else:
-            StandLogger.info_log("定时数据处理任务已在运行，跳过重复启动")
-
-        # 持续消费消息（批量）
-        message_count = 0
-        StandLogger.info_log("开始消费Kafka消息...")
-        while self.running:
+        if self.consumer is None:
             try:
-                batch = self.kafka_client.consume_batch(num_messages=500, timeout=0.2)
-                if batch:
-                    for message in batch:
-                        message_count += 1
-                        # StandLogger.info_log(
-                        #     f"收到第{message_count}条消息: topic={message['topic']}, partition={message['partition']}, offset={message['offset']}")
-                        self._process_message(message)
+                self._connect_consumer_with_custom_config()
             except Exception as e:
-                StandLogger.error(f"消费Kafka消息时出错: {e}")
-                import time
-                time.sleep(1)
+                StandLogger.error(f"连接Kafka消费者失败: {e}")
+                raise
+        self.consumer.subscribe([self.topic_name], on_assign=self._on_assign, on_revoke=self._on_revoke,
+                                on_lost=self._on_lost)
+        StandLogger.info_log(f"消费者已订阅 Topic: {self.topic_name}")
 
+        self._consuming = True
+        try:
+            while self.running:
+                try:
+                    for msg in self.consumer.consume(num_messages=500, timeout=0.2) or []:
+                        if msg.error():
+                            StandLogger.error(f"Consumer error: {msg.error()}")
+                            continue
+                        self._process_message(msg.partition(), msg.offset(), msg.value())
+                    if self._should_flush():
+                        self._flush()
+                except Exception as e:
+                    StandLogger.error(f"消费Kafka消息时出错: {e}")
+                    time.sleep(1)
+            # 退出前把已汇总的数据入库
+            self._flush()
+        finally:
+            self._consuming = False
+            self._close()
         StandLogger.info_log("Kafka消费者已停止")
 
-    def _process_message(self, message):
-        """处理单条Kafka消息"""
+    def _on_assign(self, consumer, partitions: List[TopicPartition]):
+        """分区分配后从数据库中的已入库位点开始消费"""
+        try:
+            stored = self.model_op_dao.get_consumer_offsets(self.group_id, self.topic_name)
+        except Exception as e:
+            StandLogger.error(f"读取已入库的消费位点失败，使用Kafka提交的位点: {e}")
+            stored = {}
+        for tp in partitions:
+            committed = stored.get(tp.partition)
+            if committed is not None:
+                tp.offset = committed
+            self.partitions[tp.partition] = PartitionState(committed)
+        consumer.assign(partitions)
+        StandLogger.info_log(f"分配分区: {[(tp.partition, tp.offset) for tp in partitions]}")
+
+    def _on_revoke(self, consumer, partitions: List[TopicPartition]):
+        """分区回收前入库，失败时丢弃该分区的数据，由新的消费者重新消费"""
+        revoked = [tp.partition for tp in partitions]
+        if not self._flush(revoked):
+            StandLogger.warn(f"分区回收前入库失败，丢弃未入库的数据: partitions={revoked}")
+        for partition in revoked:
+            self.partitions.pop(partition, None)
+        StandLogger.info_log(f"回收分区: {revoked}")
+
+    def _on_lost(self, consumer, partitions: List[TopicPartition]):
+        """分区已被其他消费者接管，未入库的数据直接丢弃"""
+        lost = [tp.partition for tp in partitions]
+        for partition in lost:
+            self.partitions.pop(partition, None)
+        StandLogger.warn(f"分区丢失，丢弃未入库的数据: partitions={lost}")
+
+    def _process_message(self, partition: int, offset: int, value):
+        """汇总单条Kafka消息，无法解析的消息同样推进位点"""
+        state = self.partitions.get(partition)
+        if state is None:
+            state = self.partitions[partition] = PartitionState()
+        if not state.accept(offset):
+            return
         try:
-            # 生成消息唯一标识符（基于topic、partition、offset）
-            message_id = f"{message['topic']}_{message['partition']}_{message['offset']}"
-
-            # 检查是否已经处理过此消息（幂等性检查）
-            with self.lock:
-                if message_id in self.processed_messages:
-                    StandLogger.info_log(f"消息已处理过，跳过: {message_id}")
-                    return
-                self.processed_messages.add(message_id)
-
-                # 限制已处理消息集合的大小，避免内存泄漏
-                if len(self.processed_messages) > 10000:
-                    # 保留最近5000个消息ID
-                    self.processed_messages = set(list(self.processed_messages)[-5000:])
-
-            # 解析消息内容
-            value = message['value']
             if isinstance(value, bytes):
                 value = value.decode('utf-8')
-
             data = json.loads(value)
-            StandLogger.info_log(f"接收到消息: {data}")
-            # 提取关键字段
+
             model_id = data.get('model_id', '')
             user_id = data.get('user_id', '')
             status = data.get('status', '')
-
             if not model_id or not user_id or not status:
                 StandLogger.warn(f"消息缺少model_id或user_id或status: {data}")
                 return
 
-            # 使用model_id和user_id作为联合主键
+            config = self.quota_configs[model_id]
+            input_tokens = data.get('input_tokens', 0)
+            output_tokens = data.get('output_tokens', 0)
+            price_type = config.price_type
+            if config.billing_type == 1:
+                total_price = input_tokens * (config.referprice_in / PRICE_UNITS.get(price_type[0], 1000)) + \
+                              output_tokens * (config.referprice_out / PRICE_UNITS.get(price_type[1], 1000))
+            else:
+                total_price = (input_tokens + output_tokens) * \
+                              config.referprice_in / PRICE_UNITS.get(price_type[0], 1000)
+
             key = f"{model_id}_{user_id}_{status}"
-            # 累加input_tokens和output_tokens
-            with self.lock:
-                self.aggregated_data[key]['input_tokens'] += data.get('input_tokens', 0)
-                self.aggregated_data[key]['output_tokens'] += data.get('output_tokens', 0)
-                self.aggregated_data[key]['total_count'] += 1
-                if status == "failed":
-                    self.aggregated_data[key]['failed_count'] += 1
-                # 累加总时间和首字时间（仅统计成功请求）
-                if status != "failed":
-                    self.aggregated_data[key]['total_time'] += data.get('total_time', 0.0)
-                    self.aggregated_data[key]['first_time'] += data.get('first_time', 0.0)
-                # 保存其他字段（假设同一种model_id和user_id组合的其他字段是相同的）
-                self.aggregated_data[key]['conf_id'] = data.get('conf_id', '')
-                self.aggregated_data[key]['model_id'] = model_id
-                self.aggregated_data[key]['user_id'] = user_id
-                price_dict = {
-                    "thousand": 1000,
-                    "million": 1000000
-                }
-                price_type = quota_config_cache_tree[model_id].price_type
-                if quota_config_cache_tree[model_id].billing_type == 1:
-                    total_price = data.get('input_tokens', 0) * (
-                            quota_config_cache_tree[model_id].referprice_in / price_dict.get(price_type[0],
-                                                                                             1000)) + data.get(
-                        'output_tokens', 0) * (quota_config_cache_tree[model_id].referprice_out / price_dict.get(
-                        price_type[1], 1000))
-                else:
-                    total_price = (data.get('input_tokens', 0) + data.get('output_tokens', 0)) * \
-                                  quota_config_cache_tree[model_id].referprice_in / price_dict.get(price_type[0], 1000)
-                self.aggregated_data[key]['total_price'] += total_price
-                self.aggregated_data[key]['currency_type'] = quota_config_cache_tree[model_id].currency_type
-                self.aggregated_data[key]['price_type'] = price_type
-                self.aggregated_data[key]['referprice_in'] = quota_config_cache_tree[model_id].referprice_in
-                self.aggregated_data[key]['referprice_out'] = quota_config_cache_tree[model_id].referprice_out
-            # StandLogger.info_log(
-            #     f"处理消息: model_id={model_id}, user_id={user_id}, conf_id={conf_id}, input_tokens={data.get('input_tokens', 0)}, output_tokens={data.get('output_tokens', 0)}")
+            record = state.aggregated.get(key)
+            if record is None:
+                record = state.aggregated[key] = _new_record()
+            record['input_tokens'] += input_tokens
+            record['output_tokens'] += output_tokens
+            record['total_count'] += 1
+            if status == "failed":
+                record['failed_count'] += 1
+            else:
+                # 总时间和首字时间仅统计成功请求
+                record['total_time'] += data.get('total_time', 0.0)
+                record['first_time'] += data.get('first_time', 0.0)
+            # 同一种model_id和user_id组合的其他字段相同，保存最后一条消息的值
+            record['conf_id'] = data.get('conf_id', '')
+            record['model_id'] = model_id
+            record['user_id'] = user_id
+            record['total_price'] += total_price
+            record['currency_type'] = config.currency_type
+            record['price_type'] = price_type
+            record['referprice_in'] = config.referprice_in
+            record['referprice_out'] = config.referprice_out
         except json.JSONDecodeError as e:
-            StandLogger.error(f"解析Kafka消息失败: {e}")
+            StandLogger.error(f"解析Kafka消息失败: partition={partition}, offset={offset}, error={e}")
         except Exception as e:
-            StandLogger.error(f"处理Kafka消息时出错: {e}")
-
-    def _run_periodic_processing(self):
-        """运行定时数据处理的线程函数"""
-        StandLogger.info_log("创建定时汇总数据任务成功")
-        import time
-
-        while self.running:
+            StandLogger.error(f"处理Kafka消息时出错: partition={partition}, offset={offset}, error={e}")
+
+    def _should_flush(self) -> bool:
+        now = time.monotonic()
+        if now < self._retry_at:
+            return False
+        messages = sum(state.messages for state in self.partitions.values())
+        if messages == 0:
+            self._last_flush = now
+            return False
+        return messages >= self.flush_max_messages \
+            or sum(len(state.aggregated) for state in self.partitions.values()) >= self.flush_max_keys \
+            or now - self._last_flush >= self.flush_interval
+
+    def _flush(self, partitions: List[int] = None) -> bool:
+        """汇总数据与位点一起入库后提交Kafka位点，partitions为空表示全部分区
+
+        Returns:
+            是否入库成功
+        """
+        states = {partition: state for partition, state in self.partitions.items()
+                  if state.messages and (partitions is None or partition in partitions)}
+        if not states:
+            return True
+
+        rows = self._build_rows(self._merge(states.values()))
+        offsets = [(partition, state.start, state.next_offset) for partition, state in states.items()]
+        try:
+            self.model_op_dao.save_model_used_log_with_offsets(rows, self.group_id, self.topic_name, offsets)
+        except StaleOffsetError as e:
+            StandLogger.warn(f"分区已由其他消费者入库，丢弃本批数据并重新定位: {e.offsets}")
+            for partition, offset in e.offsets.items():
+                self._rewind(partition, offset)
+            return False
+        except Exception as e:
+            StandLogger.error(f"汇总数据入库失败，{self._retry_backoff}秒后重试: {e}")
+            self._retry_at = time.monotonic() + self._retry_backoff
+            self._retry_backoff = min(self._retry_backoff * 2, MAX_RETRY_BACKOFF)
+            return False
+
+        self._retry_backoff = 1.0
+        self._last_flush = time.monotonic()
+        messages = 0
+        for state in states.values():
+            messages += state.messages
+            state.reset(state.next_offset)
+        self._commit(offsets)
+        StandLogger.info_log(f"汇总数据入库: partitions={[offset[0] for offset in offsets]}, "
+                             f"messages={messages}, rows={len(rows)}")
+        return True
+
+    @staticmethod
+    def _merge(states) -> Dict[str, dict]:
+        """合并各分区相同汇总键的数据，减少入库行数"""
+        merged = {}
+        for state in states:
+            for key, data in state.aggregated.items():
+                record = merged.get(key)
+                if record is None:
+                    merged[key] = dict(data)
+                    continue
+                for field in ('input_tokens', 'output_tokens', 'total_price', 'total_count', 'failed_count',
+                              'total_time', 'first_time'):
+                    record[field] += data[field]
+        return merged
+
+    def _build_rows(self, aggregated: Dict[str, dict]) -> List[ModelUsedAuditInfo]:
+        rows = []
+        create_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        for data in aggregated.values():
             try:
-                StandLogger.info_log("300秒后开始执行定时汇总任务")
-
-                # 等待300秒
-                time.sleep(300)
-
-                if not self.running:
-                    break
-
-                # 处理数据
-                self._process_aggregated_data()
+                # 计算平均时间
+                success_count = data['total_count'] - data['failed_count']
+                average_total_time = data['total_time'] / success_count if success_count > 0 else 0.0
+                average_first_time = data['first_time'] / success_count if success_count > 0 else 0.0
+                rows.append(ModelUsedAuditInfo(
+                    conf_id=data['conf_id'],
+                    model_id=data['model_id'],
+                    user_id=data['user_id'],
+                    input_tokens=data['input_tokens'],
+                    output_tokens=data['output_tokens'],
+                    total_price=data['total_price'],
+                    create_time=create_time,
+                    currency_type=data['currency_type'],
+                    price_type=json.loads(data['price_type']) if isinstance(data['price_type'],
+                                                                            str) else data['price_type'],
+                    referprice_in=data['referprice_in'],
+                    referprice_out=data['referprice_out'],
+                    total_count=data['total_count'],
+                    failed_count=data['failed_count'],
+                    average_total_time=average_total_time,
+                    average_first_time=average_first_time
+                ))
             except Exception as e:
-                StandLogger.error(f"定期处理数据时出错: {e}")
-                time.sleep(1)
-
-    def _process_aggregated_data(self):
-        """处理汇总数据并存入数据库"""
-        # 检查是否正在处理中，防止重复执行
-        with self.lock:
-            if self.is_processing:
-                StandLogger.info_log("数据正在处理中，跳过本次执行")
-                return
-            self.is_processing = True
-
+                StandLogger.error(f"创建ModelUsedAuditInfo对象时出错: {e}")
+        return rows
+
+    def _rewind(self, partition: int, offset: int):
+        """丢弃分区未入库的数据，从已入库位点重新消费"""
+        state = self.partitions.get(partition)
+        if state is not None:
+            state.reset(offset)
         try:
-            if not self.aggregated_data:
-                StandLogger.info_log("没有需要处理的汇总数据")
-                return
+            self.consumer.seek(TopicPartition(self.topic_name, partition, offset))
+        except Exception as e:
+            StandLogger.warn(f"重新定位分区失败: partition={partition}, offset={offset}, error={e}")
 
-            StandLogger.info_log(f"开始处理{len(self.aggregated_data)}条汇总数据")
-
-            # 使用锁保护复制和清空操作
-            with self.lock:
-                # 复制当前数据并清空原字典
-                data_to_process = dict(self.aggregated_data)
-                self.aggregated_data.clear()
-
-            # 将数据分批，每批最多500条
-            batch_size = 500
-            data_items = list(data_to_process.items())
-
-            # 分批处理数据
-            for i in range(0, len(data_items), batch_size):
-                batch_items = data_items[i:i + batch_size]
-                batch_data = []
-
-                # 收集一批数据
-                for key, data in batch_items:
-                    try:
-                        # 计算平均时间
-                        success_count = data['total_count'] - data['failed_count']
-                        average_total_time = data['total_time'] / success_count if success_count > 0 else 0.0
-                        average_first_time = data['first_time'] / success_count if success_count > 0 else 0.0
-                        
-                        audit_info = ModelUsedAuditInfo(
-                            conf_id=data['conf_id'],
-                            model_id=data['model_id'],
-                            user_id=data['user_id'],
-                            input_tokens=data['input_tokens'],
-                            output_tokens=data['output_tokens'],
-                            total_price=data['total_price'],
-                            create_time=datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            currency_type=data['currency_type'],
-                            price_type=json.loads(data['price_type']) if isinstance(data['price_type'],
-                                                                                    str) else data['price_type'],
-                            referprice_in=data['referprice_in'],
-                            referprice_out=data['referprice_out'],
-                            total_count=data['total_count'],
-                            failed_count=data['failed_count'],
-                            average_total_time=average_total_time,
-                            average_first_time=average_first_time
-                        )
-                        batch_data.append(audit_info)
-                    except Exception as e:
-                        StandLogger.error(f"创建ModelUsedAuditInfo对象时出错: {e}")
-
-                # 批量保存到数据库（使用INSERT ... ON DUPLICATE KEY UPDATE实现幂等性）
-                if batch_data:
-                    try:
-                        # 使用批量插入或更新，避免重复数据
-                        affected = self.model_op_dao.batch_add_model_used_log(batch_data)
-                        StandLogger.info_log(f"成功批量保存/更新{affected}条数据, 收集到{len(batch_data)}条")
-                    except Exception as e:
-                        StandLogger.error(f"批量保存数据到数据库时出错: {e}")
-
-        # # 将处理失败的数据重新放回聚合字典
-        # if failed_data:
-        #     with self.lock:
-        #         for key, data in failed_data.items():
-        #             # 如果该key已存在，则累加tokens，否则直接赋值
-        #             if key in self.aggregated_data:
-        #                 self.aggregated_data[key]['input_tokens'] += data['input_tokens']
-        #                 self.aggregated_data[key]['output_tokens'] += data['output_tokens']
-        #                 # 其他字段保持不变，因为假设相同key的数据其他字段是相同的
-        #             else:
-        #                 self.aggregated_data[key] = data
-        #     StandLogger.info_log(f"重新放回{len(failed_data)}条处理失败的数据到聚合字典")
+    def _commit(self, offsets: list):
+        try:
+            self.consumer.commit(offsets=[TopicPartition(self.topic_name, partition, end)
+                                          for partition, _, end in offsets], asynchronous=False)
+        except Exception as e:
+            # 重新分配分区时以数据库中的位点为准
+            StandLogger.warn(f"提交Kafka位点失败: {e}")
 
-        finally:
-            # 重置处理状态标志
-            with self.lock:
-                self.is_processing = False
+    def _close(self):
+        if self.kafka_client is not None:
+            self.kafka_client.close_consumer()
+        elif self.consumer is not None:
+            self.consumer.close()
+        self.consumer = None
 
     def stop_consumer(self):
-        """停止Kafka消费者"""
+        """停止Kafka消费者，消费循环退出前会把已汇总的数据入库"""
         StandLogger.info_log("停止Kafka消费者...")
         self.running = False
-        self.kafka_client.close_consumer()
-        # 等待定时线程退出
-        try:
-            if hasattr(self, "_timer_thread") and self._timer_thread is not None:
-                self._timer_thread.join(timeout=2)
-        except Exception:
-            pass
+        if not self._consuming and self.consumer is not None:
+            self._close()
 
 
 # 全局实例
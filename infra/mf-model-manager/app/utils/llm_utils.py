@@ -2,10 +2,8 @@ import asyncio
 import json
 import re
 import time
-import threading
 
 import aiohttp
-import tiktoken
 import requests
 from fastapi.responses import JSONResponse
 from func_timeout import func_set_timeout
@@ -21,12 +19,11 @@ from app.interfaces import logics
 from app.logs.stand_log import StandLogger
 from app.utils.observability.observability_log import get_logger
 
-from app.utils.str_util import generate_random_string, has_common_substring
-
-# 全局tokenizer缓存
-_TOKENIZER_CACHE = {}
-_TOKENIZER_LOCK = threading.RLock()
-_MAX_CACHE_SIZE = 5  # 限制最大缓存数量
+from app.utils.sse_parser import SSE_DONE, THINK_CONTENT, THINK_REASONING, ThinkTagSplitter, sse_data, \
+    think_flush_chunk
+from app.utils.str_util import generate_random_string
+from app.utils.tokenizer_service import tokenizer_service
+from app.utils.upstream_transport import upstream_session
 
 
 class OpenAIClient:
@@ -66,17 +63,7 @@ class OpenAIClient:
             tool_choice=self.tool_choice
         )
         res = llm.predict(message)
-        import os
-
-        cache_key = "9b5ad71b2ce5302211f9c61530b329a4922fc6a4"
-        tiktoken_cache_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + "/utils/tiktoken_cache"
-        os.environ["TIKTOKEN_CACHE_DIR"] = tiktoken_cache_dir
-
-        assert os.path.exists(os.path.join(tiktoken_cache_dir, cache_key))
-
-        encoding = tiktoken.get_encoding("cl100k_base")
-        tokens = encoding.encode(res)
-        token_len = len(tokens)
+        token_len = await tokenizer_service.count("openai", res)
         result = {
             "res":
                 {
@@ -113,16 +100,7 @@ class OpenAIClient:
         # yield res_mess
         end_time = time.time()
 
-        import os
-        cache_key = "9b5ad71b2ce5302211f9c61530b329a4922fc6a4"
-        tiktoken_cache_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + "/utils/tiktoken_cache"
-        os.environ["TIKTOKEN_CACHE_DIR"] = tiktoken_cache_dir
-
-        assert os.path.exists(os.path.join(tiktoken_cache_dir, cache_key))
-
-        encoding = tiktoken.get_encoding("cl100k_base")
-        tokens = encoding.encode(res_mess)
-        token_len = len(tokens)
+        token_len = await tokenizer_service.count("openai", res_mess)
 
         yield "--info--" + str(json.dumps({"time": str(end_time - start_time), "token_len": token_len}))
         log_info = logics.AddModelUsedAudit(
@@ -178,12 +156,11 @@ class OpenAIClientRequest:
         headers = {
             "api-key": self.api_key
         }
-        conn = aiohttp.TCPConnector(verify_ssl=False)
-        async with aiohttp.ClientSession(connector=conn, timeout=base_config.aiohttp_timeout) as session:
+        async with upstream_session() as session:
             async with session.post(
                     self.api_url + "openai/deployments/{}/chat/completions?api-version=2023-05-15&api-type=azure".format(
                         self.api_model),
-                    json=params, headers=headers) as resp:
+                    json=params, headers=headers, ssl=False) as resp:
                 res = await resp.text()
                 result = json.loads(res)
                 if resp.status == 200:
@@ -256,7 +233,7 @@ class OpenAIClientRequest:
                 }
                 prompt_tokens = 0
                 completion_tokens = 0
-                async with aiohttp.ClientSession(timeout=base_config.aiohttp_timeout) as session:
+                async with upstream_session() as session:
                     url = self.api_url + f"openai/deployments/{self.api_model}/chat/completions?api-version=2023-05-15&api-type=azure"
                     async with session.post(url, json=params, headers=headers, ssl=False) as response:
                         response.encoding = 'utf-8'
@@ -266,15 +243,11 @@ class OpenAIClientRequest:
                             yield "--error--" + json.dumps(error_dict, ensure_ascii=False)
                             return
                         ans = ""
-                        async for chunk in response.content:
-                            chunk = chunk.decode(encoding='utf-8')
-                            if chunk.endswith('\n'):
-                                chunk = chunk[:-1]
-                            elif chunk.endswith('\r\n'):
-                                chunk = chunk[:-2]
-                            if chunk != "data: [DONE]" and chunk != "":
-                                if chunk[0:6] == "data: ":
-                                    chunk = chunk[6:]
+                        async for line in response.content:
+                            chunk = sse_data(line)
+                            if chunk is None:
+                                continue
+                            if chunk != SSE_DONE:
                                 datas = json.loads(chunk)
                                 try:
                                     delta = datas["choices"][0]["delta"]
@@ -295,7 +268,7 @@ class OpenAIClientRequest:
                                     except Exception:
                                         pass
                                 yield chunk
-                            elif chunk == "data: [DONE]":
+                            elif chunk == SSE_DONE:
                                 # end_time = time.time()
                                 if return_info:
                                     if completion_tokens == 0:
@@ -341,6 +314,7 @@ class OpenAIClientRequest:
                                 f'{{"model_name":{self.api_model},"resourece_type":"LLM","user_id":{user_id},'
                                 f'"prompt_tokens":{prompt_tokens},"completion_tokens":{completion_tokens},'
                                 f'"total_tokens":{prompt_tokens + completion_tokens},"func_module":{func_module},"status":"success"}}')
+                        return
             except aiohttp.ClientError as e:
                 if retry_time <= 0:
                     error_dict = ModelFactory_ModelController_Model_Error_Error.copy()
@@ -393,17 +367,11 @@ def prompt(ai_system, ai_user, ai_assistant, ai_history):
 
 
 async def openai_token_num(user_max_token, llm_max_token, message):
-    import os
-
-    cache_key = "9b5ad71b2ce5302211f9c61530b329a4922fc6a4"
-    tiktoken_cache_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + "/utils/tiktoken_cache"
-    os.environ["TIKTOKEN_CACHE_DIR"] = tiktoken_cache_dir
-
-    assert os.path.exists(os.path.join(tiktoken_cache_dir, cache_key))
-
-    encoding = tiktoken.get_encoding("cl100k_base")
-    tokens = encoding.encode(message)
-    mess_token = len(tokens)
+    """message为字符串或消息内容列表，列表中每条消息的token数单独缓存"""
+    if isinstance(message, str):
+        mess_token = await tokenizer_service.count("openai", message)
+    else:
+        mess_token = await tokenizer_service.count_messages("openai", message)
     if user_max_token + mess_token >= llm_max_token - 50:
         return -1
     return mess_token
@@ -421,7 +389,7 @@ async def openai_series_stream(types, api_key, api_model, ai_system, ai_history,
         llm_max_token = max_token if max_token is not None else 16000
         # 校验 token 有没有超出
         try:
-            prompt_tokens = await openai_token_num(max_tokens, llm_max_token, mess_str)
+            prompt_tokens = await openai_token_num(max_tokens, llm_max_token, [m.content for m in messages])
             if prompt_tokens == -1:
                 return JSONResponse(status_code=400, content=ModelError)
         except Exception as e:
@@ -489,13 +457,12 @@ class BaiduTianchenClient:
         }
         if system is not None:
             params["system"] = system
-        conn = aiohttp.TCPConnector(verify_ssl=False)
         headers = {
             "ClientId": self.ClientId,
             "OperationCode": self.OperationCode
         }
-        async with aiohttp.ClientSession(connector=conn, timeout=base_config.aiohttp_timeout) as session:
-            async with session.post(self.api_url + f"?api_name={self.api_model}", json=params, headers=headers) as resp:
+        async with upstream_session() as session:
+            async with session.post(self.api_url + f"?api_name={self.api_model}", json=params, headers=headers, ssl=False) as resp:
                 res = await resp.text()
                 result = json.loads(res)
                 if resp.status == 200 and "result" in result.keys():
@@ -575,7 +542,7 @@ class BaiduTianchenClient:
                 }
                 if system is not None:
                     params["system"] = system
-                async with aiohttp.ClientSession(timeout=base_config.aiohttp_timeout) as session:
+                async with upstream_session() as session:
                     url = self.api_url + f"?api_name={self.api_model}"
                     async with session.post(url, json=params, headers=headers, ssl=False) as response:
                         response.encoding = 'utf-8'
@@ -586,15 +553,11 @@ class BaiduTianchenClient:
                             return
                         ans = ""
                         prompt_tokens = completion_tokens = 0
-                        async for chunk in response.content:
-                            chunk = chunk.decode(encoding='utf-8')
-                            if chunk.endswith('\n'):
-                                chunk = chunk[:-1]
-                            elif chunk.endswith('\r\n'):
-                                chunk = chunk[:-2]
-                            if chunk != "data: [DONE]" and chunk != "":
-                                if chunk[0:6] == "data: ":
-                                    chunk = chunk[6:]
+                        async for line in response.content:
+                            chunk = sse_data(line)
+                            if chunk is None:
+                                continue
+                            if chunk != SSE_DONE:
                                 datas = json.loads(chunk)
                                 if "result" not in datas.keys():
                                     yield chunk
@@ -723,7 +686,7 @@ class BaiduTianchenClient:
                 if system is not None:
                     params["system"] = system
                 url = self.api_url + f"?api_name={self.api_model}"
-                async with aiohttp.ClientSession(timeout=base_config.aiohttp_timeout) as session:
+                async with upstream_session() as session:
                     async with session.post(url, json=params, headers=headers, ssl=False) as response:
                         response.encoding = 'utf-8'
                         if response.status != 200:
@@ -733,15 +696,11 @@ class BaiduTianchenClient:
                             return
                         ans = ""
                         prompt_tokens = completion_tokens = 0
-                        async for chunk in response.content:
-                            chunk = chunk.decode(encoding='utf-8')
-                            if chunk.endswith('\n'):
-                                chunk = chunk[:-1]
-                            elif chunk.endswith('\r\n'):
-                                chunk = chunk[:-2]
-                            if chunk != "data: [DONE]" and chunk != "":
-                                if chunk[0:6] == "data: ":
-                                    chunk = chunk[6:]
+                        async for line in response.content:
+                            chunk = sse_data(line)
+                            if chunk is None:
+                                continue
+                            if chunk != SSE_DONE:
                                 datas = json.loads(chunk)
                                 if "result" not in datas.keys():
                                     yield "--error--" + chunk
@@ -803,11 +762,10 @@ class BaiduClient:
             'Accept': 'application/json'
         }
         access_token = ""
-        conn = aiohttp.TCPConnector(verify_ssl=False)
-        async with aiohttp.ClientSession(connector=conn, timeout=base_config.aiohttp_timeout) as session:
+        async with upstream_session() as session:
             async with session.post(
                     f"https://aip.baidubce.com/oauth/2.0/token?grant_type=client_credentials&client_id={self.api_key}&client_secret={self.secret_key}",
-                    headers=headers) as resp:
+                    headers=headers, ssl=False) as resp:
                 res = await resp.text()
                 result = json.loads(res)
                 if resp.status != 200:
@@ -845,9 +803,8 @@ class BaiduClient:
         }
         if system is not None:
             params["system"] = system
-        conn = aiohttp.TCPConnector(verify_ssl=False)
-        async with aiohttp.ClientSession(connector=conn, timeout=base_config.aiohttp_timeout) as session:
-            async with session.post(self.api_url + f"?access_token={access_token}", json=params) as resp:
+        async with upstream_session() as session:
+            async with session.post(self.api_url + f"?access_token={access_token}", json=params, ssl=False) as resp:
                 res = await resp.text()
                 result = json.loads(res)
                 if resp.status == 200 and "result" in result.keys():
@@ -907,7 +864,7 @@ class BaiduClient:
                     'Content-Type': 'application/json',
                     'Accept': 'application/json'
                 }
-                async with aiohttp.ClientSession(timeout=base_config.aiohttp_timeout) as session:
+                async with upstream_session() as session:
                     url = f"https://aip.baidubce.com/oauth/2.0/token?grant_type=client_credentials&client_id={self.api_key}&client_secret={self.secret_key}"
                     async with session.post(url, headers=headers, ssl=False) as access_res:
                         if access_res.status != 200:
@@ -951,7 +908,7 @@ class BaiduClient:
                 }
                 if system is not None:
                     params["system"] = system
-                async with aiohttp.ClientSession(timeout=base_config.aiohttp_timeout) as session:
+                async with upstream_session() as session:
                     url = self.api_url + f"?access_token={access_token}"
                     async with session.post(url, json=params, headers=headers, ssl=False) as response:
                         response.encoding = 'utf-8'
@@ -962,15 +919,11 @@ class BaiduClient:
                             return
                         ans = ""
                         prompt_tokens = completion_tokens = 0
-                        async for chunk in response.content:
-                            chunk = chunk.decode(encoding='utf-8')
-                            if chunk.endswith('\n'):
-                                chunk = chunk[:-1]
-                            elif chunk.endswith('\r\n'):
-                                chunk = chunk[:-2]
-                            if chunk != "data: [DONE]" and chunk != "":
-                                if chunk[0:6] == "data: ":
-                                    chunk = chunk[6:]
+                        async for line in response.content:
+                            chunk = sse_data(line)
+                            if chunk is None:
+                                continue
+                            if chunk != SSE_DONE:
                                 datas = json.loads(chunk)
                                 if "result" not in datas.keys():
                                     yield chunk
@@ -1091,7 +1044,7 @@ class BaiduClient:
                     'Accept': 'application/json'
                 }
                 baidu_url = f"https://aip.baidubce.com/oauth/2.0/token?grant_type=client_credentials&client_id={self.api_key}&client_secret={self.secret_key}"
-                async with aiohttp.ClientSession(timeout=base_config.aiohttp_timeout) as session:
+                async with upstream_session() as session:
                     async with session.post(baidu_url, headers=headers, ssl=False) as access_res:
                         if access_res.status != 200:
                             tmp_map = await access_res.json()
@@ -1131,7 +1084,7 @@ class BaiduClient:
                         }
                         if system is not None:
                             params["system"] = system
-                        async with aiohttp.ClientSession(timeout=base_config.aiohttp_timeout) as session:
+                        async with upstream_session() as session:
                             url = self.api_url + f"?access_token={access_token}"
                             async with session.post(url, json=params, headers=headers, ssl=False) as response:
                                 response.encoding = 'utf-8'
@@ -1143,15 +1096,11 @@ class BaiduClient:
                                     return
                                 ans = ""
                                 prompt_tokens = completion_tokens = 0
-                                async for chunk in response.content:
-                                    chunk = chunk.decode(encoding='utf-8')
-                                    if chunk.endswith('\n'):
-                                        chunk = chunk[:-1]
-                                    elif chunk.endswith('\r\n'):
-                                        chunk = chunk[:-2]
-                                    if chunk != "data: [DONE]" and chunk != "":
-                                        if chunk[0:6] == "data: ":
-                                            chunk = chunk[6:]
+                                async for line in response.content:
+                                    chunk = sse_data(line)
+                                    if chunk is None:
+                                        continue
+                                    if chunk != SSE_DONE:
                                         datas = json.loads(chunk)
                                         if "result" not in datas.keys():
                                             yield "--error--" + chunk
@@ -1246,9 +1195,8 @@ class OtherClient:
                 headers = {
                     "Authorization": f"Bearer {self.api_key}"
                 }
-                conn = aiohttp.TCPConnector(verify_ssl=False)
-                async with aiohttp.ClientSession(connector=conn, timeout=base_config.aiohttp_timeout) as session:
-                    async with session.post(self.api_url, json=params, headers=headers) as resp:
+                async with upstream_session() as session:
+                    async with session.post(self.api_url, json=params, headers=headers, ssl=False) as resp:
                         res = await resp.text()
                         result = json.loads(res)
                         if resp.status == 200:
@@ -1366,7 +1314,7 @@ class OtherClient:
                 }
                 prompt_tokens = 0
                 completion_tokens = 0
-                async with aiohttp.ClientSession(timeout=base_config.aiohttp_timeout) as session:
+                async with upstream_session() as session:
                     async with session.post(self.api_url, json=params, headers=headers, ssl=False) as response:
                         response.encoding = 'utf-8'
                         if response.status != 200:
@@ -1375,179 +1323,93 @@ class OtherClient:
                             StandLogger.error(json.dumps(error_dict, ensure_ascii=False))
                             yield "--error--" + json.dumps(error_dict, ensure_ascii=False)
                             return
-                        ans = ""
-                        think_str = ""
                         rlm_type = ""
-                        think_done = False
-                        think_start = False
-                        async for chunk in response.content:
-                            chunk = chunk.decode(encoding='utf-8')
-                            if chunk.endswith('\n'):
-                                chunk = chunk[:-1]
-                            elif chunk.endswith('\r\n'):
-                                chunk = chunk[:-2]
-                            if len(chunk) >= 6 and chunk[0:6] != "data: ":
+                        think_splitter = ThinkTagSplitter()
+                        think_datas = None
+                        async for line in response.content:
+                            chunk = sse_data(line)
+                            if chunk is None:
                                 continue
-                            if chunk != "data: [DONE]" and chunk != "":
-                                if self.model_type == "rlm":
-                                    if chunk[0:6] == "data: ":
-                                        chunk = chunk[6:]
+                            if chunk != SSE_DONE:
+                                try:
+                                    datas = json.loads(chunk)
+                                except Exception:
+                                    continue
+                                # 只有改写过字段的chunk重新序列化，其余原样转发
+                                rewritten = False
+                                if "usage" in datas.keys() and completion_tokens == 0:
                                     try:
-                                        datas = json.loads(chunk)
+                                        prompt_tokens = datas["usage"]["prompt_tokens"]
+                                        completion_tokens = datas["usage"]["completion_tokens"]
+                                        total_tokens = datas["usage"]["total_tokens"]
+                                        # 处理 usage 信息，添加 uncached_tokens 字段
+                                        if "prompt_tokens_details" not in datas["usage"]:
+                                            datas["usage"]["prompt_tokens_details"] = {
+                                                "cache_type": "implicit",
+                                                "cached_tokens": 0
+                                            }
+                                        prompt_tokens_details = datas["usage"]["prompt_tokens_details"]
+                                        cached_tokens = prompt_tokens_details.get("cached_tokens", 0)
+                                        uncached_tokens = prompt_tokens - cached_tokens
+                                        datas["usage"]["prompt_tokens_details"]["uncached_tokens"] = uncached_tokens
+                                        rewritten = True
                                     except Exception:
-                                        continue
+                                        pass
+                                if self.model_type == "rlm":
                                     try:
                                         if chunk_id == "":
                                             chunk_id = datas.get("id", "")
-                                        if datas["choices"]:
-                                            delta = datas["choices"][0]["delta"]
-                                            if "content" in delta and delta["content"] is not None:
-                                                token = delta["content"]
-                                                if token is not None:
-                                                    token_len += 1
-                                                    ans += token
-                                        else:
-                                            ans += ""
-                                    except Exception as e:
+                                        delta = datas["choices"][0]["delta"] if datas["choices"] else None
+                                    except Exception:
                                         if "error" in datas.keys():
-                                            yield json.dumps(datas, ensure_ascii=False)
+                                            yield chunk
                                             return
-                                    if rlm_type == "":
-                                        if "reasoning_content" in datas["choices"][0]["delta"]:
+                                        continue
+                                    token = delta.get("content") if delta else None
+                                    if token is not None:
+                                        token_len += 1
+                                    if rlm_type == "" and delta:
+                                        if "reasoning_content" in delta:
                                             rlm_type = "saas"
-                                        elif datas["choices"][0]["delta"].get("content", "") not in ["", None]:
+                                        elif token not in ["", None]:
                                             rlm_type = "inner"
                                     if rlm_type == "saas":
-                                        if "usage" in datas.keys() and completion_tokens == 0:
-                                            try:
-                                                prompt_tokens = datas["usage"]["prompt_tokens"]
-                                                completion_tokens = datas["usage"]["completion_tokens"]
-                                                total_tokens = datas["usage"]["total_tokens"]
-                                                # 处理 usage 信息，添加 uncached_tokens 字段
-                                                if "prompt_tokens_details" not in datas["usage"]:
-                                                    datas["usage"]["prompt_tokens_details"] = {
-                                                        "cache_type": "implicit",
-                                                        "cached_tokens": 0
-                                                    }
-                                                prompt_tokens_details = datas["usage"]["prompt_tokens_details"]
-                                                cached_tokens = prompt_tokens_details.get("cached_tokens", 0)
-                                                uncached_tokens = prompt_tokens - cached_tokens
-                                                datas["usage"]["prompt_tokens_details"][
-                                                    "uncached_tokens"] = uncached_tokens
-                                            except Exception:
-                                                pass
-                                        yield json.dumps(datas, ensure_ascii=False)
+                                        yield json.dumps(datas, ensure_ascii=False) if rewritten else chunk
                                     elif rlm_type == "inner":
-                                        if "usage" in datas.keys() and completion_tokens == 0:
-                                            try:
-                                                prompt_tokens = datas["usage"]["prompt_tokens"]
-                                                completion_tokens = datas["usage"]["completion_tokens"]
-                                                total_tokens = datas["usage"]["total_tokens"]
-                                                # 处理 usage 信息，添加 uncached_tokens 字段
-                                                if "prompt_tokens_details" not in datas["usage"]:
-                                                    datas["usage"]["prompt_tokens_details"] = {
-                                                        "cache_type": "implicit",
-                                                        "cached_tokens": 0
-                                                    }
-                                                prompt_tokens_details = datas["usage"]["prompt_tokens_details"]
-                                                cached_tokens = prompt_tokens_details.get("cached_tokens", 0)
-                                                uncached_tokens = prompt_tokens - cached_tokens
-                                                datas["usage"]["prompt_tokens_details"][
-                                                    "uncached_tokens"] = uncached_tokens
-                                            except Exception:
-                                                pass
-                                        if think_done is False:
-                                            if think_start is False:
-                                                start_pattern = r"<think>(.*?)"
-                                                match = re.search(start_pattern, ans, re.DOTALL)
-                                                if match:
-                                                    think_start = True
-                                                    if datas["choices"]:
-                                                        datas["choices"][0]["delta"]["reasoning_content"] = re.sub(
-                                                            start_pattern, "", ans, flags=re.DOTALL)
-                                                        think_str = ans
-                                                        datas["choices"][0]["delta"]["content"] = None
-                                                        yield json.dumps(datas, ensure_ascii=False)
-                                                if not match and len(ans) >= 7:
-                                                    if datas["choices"]:
-                                                        think_start = True
-                                                        datas["choices"][0]["delta"]["reasoning_content"] = ans
-                                                        think_str = ans
-                                                        datas["choices"][0]["delta"]["content"] = None
-                                                        yield json.dumps(datas, ensure_ascii=False)
-                                            else:
-                                                pattern = r"(.*?)</think>"
-                                                match = re.search(pattern, ans, re.DOTALL)
-                                                if match:
-                                                    think_done = True
-                                                    reasoning_datas = datas.copy()
-                                                    if datas["choices"]:
-                                                        reasoning_datas["choices"][0]["delta"][
-                                                            "reasoning_content"] = match.group(1).replace(
-                                                            think_str.replace("<think>", ""), "")
-                                                        reasoning_datas["choices"][0]["delta"]["content"] = None
-                                                        yield json.dumps(reasoning_datas, ensure_ascii=False)
-                                                    if datas["choices"]:
-                                                        ans = re.sub(pattern, "", ans, flags=re.DOTALL)
-                                                        datas["choices"][0]["delta"]["reasoning_content"] = None
-                                                        datas["choices"][0]["delta"]["content"] = ans
-                                                        yield json.dumps(datas, ensure_ascii=False)
-                                                else:
-                                                    if not has_common_substring(ans.replace("<think>", ""), "</think>"):
-                                                        if datas["choices"]:
-                                                            datas["choices"][0]["delta"]["reasoning_content"] = ans.replace(
-                                                                think_str, "")
-                                                            datas["choices"][0]["delta"]["content"] = None
-                                                            think_str = ans
-                                                            yield json.dumps(datas, ensure_ascii=False)
-
-
-
-                                        else:
-                                            if datas["choices"]:
-                                                datas["choices"][0]["delta"]["reasoning_content"] = None
+                                        if think_splitter.state == THINK_CONTENT:
+                                            if delta is not None:
+                                                delta["reasoning_content"] = None
+                                                rewritten = True
+                                            yield json.dumps(datas, ensure_ascii=False) if rewritten else chunk
+                                            continue
+                                        # 推理结束前不转发没有choices的chunk
+                                        if delta is None:
+                                            continue
+                                        think_datas = datas
+                                        reasoning, content = think_splitter.feed(token or "")
+                                        if think_splitter.state == THINK_CONTENT:
+                                            delta["reasoning_content"] = reasoning
+                                            delta["content"] = None
+                                            yield json.dumps(datas, ensure_ascii=False)
+                                            delta["reasoning_content"] = None
+                                            delta["content"] = content
+                                            yield json.dumps(datas, ensure_ascii=False)
+                                        elif think_splitter.state == THINK_REASONING and \
+                                                (reasoning or not think_splitter.holding):
+                                            delta["reasoning_content"] = reasoning
+                                            delta["content"] = None
                                             yield json.dumps(datas, ensure_ascii=False)
                                 else:
-                                    if chunk[0:6] == "data: ":
-                                        chunk = chunk[6:]
-                                    try:
-                                        datas = json.loads(chunk)
-                                    except Exception as e:
-                                        continue
-                                    # try:
-                                    #     delta = datas["choices"][0]["delta"]
-                                    #     if "content" in delta:
-                                    #         token = delta["content"]
-                                    #         if token is not None:
-                                    #             token_len += 1
-                                    #             ans += token
-                                    # except Exception as e:
-                                    #     if "error" in datas.keys():
-                                    #         yield json.dumps(datas, ensure_ascii=False)
-                                    #         return
-                                    if "usage" in datas.keys() and completion_tokens == 0:
-                                        try:
-                                            prompt_tokens = datas["usage"]["prompt_tokens"]
-                                            completion_tokens = datas["usage"]["completion_tokens"]
-                                            total_tokens = datas["usage"]["total_tokens"]
-                                            # 处理 usage 信息，添加 uncached_tokens 字段
-                                            if "prompt_tokens_details" not in datas["usage"]:
-                                                datas["usage"]["prompt_tokens_details"] = {
-                                                    "cache_type": "implicit",
-                                                    "cached_tokens": 0
-                                                }
-                                            prompt_tokens_details = datas["usage"]["prompt_tokens_details"]
-                                            cached_tokens = prompt_tokens_details.get("cached_tokens", 0)
-                                            uncached_tokens = prompt_tokens - cached_tokens
-                                            datas["usage"]["prompt_tokens_details"]["uncached_tokens"] = uncached_tokens
-                                        except Exception:
-                                            pass
-                                    yield json.dumps(datas, ensure_ascii=False)
-
+                                    yield json.dumps(datas, ensure_ascii=False) if rewritten else chunk
                             else:
-
-                                if chunk == "data: [DONE]":
-                                    yield "[DONE]"
+                                flushed = think_flush_chunk(think_splitter, think_datas)
+                                if flushed is not None:
+                                    yield flushed
+                                yield "[DONE]"
+                        # 上游没有发送[DONE]就结束时同样输出暂存的文本
+                        flushed = think_flush_chunk(think_splitter, think_datas)
+                        if flushed is not None:
+                            yield flushed
                         log_info = logics.AddModelUsedAudit(
                             model_id=self.model_id, user_id=user_id, input_tokens=prompt_tokens,
                             output_tokens=completion_tokens)
@@ -1628,7 +1490,7 @@ class OtherClient:
                 prompt_tokens = 0
                 completion_tokens = 0
                 # try:
-                async with aiohttp.ClientSession(timeout=base_config.aiohttp_timeout) as session:
+                async with upstream_session() as session:
                     async with session.post(self.api_url, json=params, headers=headers, ssl=False) as response:
                         response.encoding = 'utf-8'
                         if response.status != 200:
@@ -1642,18 +1504,13 @@ class OtherClient:
                         if self.model_type == "llm":
                             think_end = True
                         rlm_type = ""
-                        async for chunk in response.content:
-                            chunk = chunk.decode('utf-8')
-                            if chunk.endswith('\n'):
-                                chunk = chunk[:-1]
-                            elif chunk.endswith('\r\n'):
-                                chunk = chunk[:-2]
-                            if len(chunk) >= 6 and chunk[0:6] != "data: ":
+                        think_splitter = ThinkTagSplitter(reasoning_first=True)
+                        async for line in response.content:
+                            chunk = sse_data(line)
+                            if chunk is None:
                                 continue
                             # StandLogger.info_log(chunk)
-                            if chunk != "data: [DONE]" and chunk != "":
-                                if chunk[0:6] == "data: ":
-                                    chunk = chunk[6:]
+                            if chunk != SSE_DONE:
                                 try:
                                     datas = json.loads(chunk)
                                 except Exception:
@@ -1677,10 +1534,9 @@ class OtherClient:
                                             if think_end:
                                                 yield token
                                             if not think_end:
-                                                pattern = r"(.*?)</think>"
-                                                match = re.search(pattern, ans, re.DOTALL)
-                                                if match:
-                                                    ans = re.sub(pattern, "", ans, flags=re.DOTALL)
+                                                _, content = think_splitter.feed(token)
+                                                if think_splitter.state == THINK_CONTENT:
+                                                    ans = content
                                                     yield ans
                                                     think_end = True
                                             # print(token)
@@ -1695,7 +1551,9 @@ class OtherClient:
 
                                     except Exception:
                                         pass
-                            elif chunk == "data: [DONE]":
+                            elif chunk == SSE_DONE:
+                                # 暂存的文本已经累加在ans中：没有</think>时整个ans作为回答输出，否则暂存的是推理内容
+                                think_splitter.flush()
                                 if not think_end:
                                     yield ans
                                 if ans == "":
@@ -1844,7 +1702,7 @@ class ClaudeClient:
             "anthropic-beta": "prompt-caching-2024-07-31",
 
         }
-        async with aiohttp.ClientSession(timeout=base_config.aiohttp_timeout) as session:
+        async with upstream_session() as session:
             async with session.post(self.api_url, json=params, headers=headers) as resp:
                 result = await resp.text()
                 res = json.loads(result)
@@ -2005,7 +1863,7 @@ class ClaudeClient:
             "anthropic-beta": "prompt-caching-2024-07-31",
             "content-type": "application/json"
         }
-        async with aiohttp.ClientSession(timeout=base_config.aiohttp_timeout) as session:
+        async with upstream_session() as session:
             async with session.post(self.api_url, json=params, headers=headers, ssl=False) as response:
                 response.encoding = 'utf-8'
                 if response.status != 200:
@@ -2020,15 +1878,11 @@ class ClaudeClient:
                 prompt_cache_hit_tokens = 0
                 prompt_cache_miss_tokens = 0
                 ans = ""
-                async for chunk in response.content:
-                    chunk = chunk.decode(encoding='utf-8')
-                    if chunk.endswith('\n'):
-                        chunk = chunk[:-1]
-                    elif chunk.endswith('\r\n'):
-                        chunk = chunk[:-2]
+                async for line in response.content:
+                    chunk = sse_data(line)
+                    if chunk is None:
+                        continue
                     # StandLogger.info_log(chunk)
-                    if chunk.find("data:") != -1:
-                        chunk = chunk.replace("data:", "")
                     try:
                         chunk_json = json.loads(chunk)
                     except Exception as e:
@@ -2215,7 +2069,7 @@ class ClaudeClient:
             "anthropic-beta": "prompt-caching-2024-07-31",
             "content-type": "application/json"
         }
-        async with aiohttp.ClientSession(timeout=base_config.aiohttp_timeout) as session:
+        async with upstream_session() as session:
             async with session.post(self.api_url, json=params, headers=headers, ssl=False) as response:
                 response.encoding = 'utf-8'
                 if response.status != 200:
@@ -2230,15 +2084,11 @@ class ClaudeClient:
                 prompt_cache_miss_tokens = 0
 
                 ans = ""
-                async for chunk in response.content:
-                    chunk = chunk.decode(encoding='utf-8')
-                    if chunk.endswith('\n'):
-                        chunk = chunk[:-1]
-                    elif chunk.endswith('\r\n'):
-                        chunk = chunk[:-2]
+                async for line in response.content:
+                    chunk = sse_data(line)
+                    if chunk is None:
+                        continue
                     # StandLogger.info_log(chunk)
-                    if chunk.find("data:") != -1:
-                        chunk = chunk.replace("data:", "")
                     try:
                         chunk_json = json.loads(chunk)
                     except Exception as e:
@@ -2284,65 +2134,8 @@ class ClaudeClient:
 
 
 async def encode(model_series, text, api_model="", api_key="", secret_key=""):
-    return [], len(text) // 4  # 5002beta过度，5003删除该函数
-    # import os
-    # if model_series == "openai":
-    #     cache_key = "9b5ad71b2ce5302211f9c61530b329a4922fc6a4"
-    #     tiktoken_cache_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + "/utils/tiktoken_cache"
-    #     os.environ["TIKTOKEN_CACHE_DIR"] = tiktoken_cache_dir
-    #
-    #     assert os.path.exists(os.path.join(tiktoken_cache_dir, cache_key))
-    #
-    #     encoding = tiktoken.get_encoding("cl100k_base")
-    #     tokens = encoding.encode(text)
-    #     return tokens, len(tokens)
-    # elif model_series in ["qwen", "internlm", "deepseek", "chatglm", "llama"]:
-    #     tokenizer_dir = os.path.dirname(
-    #         os.path.dirname(os.path.realpath(__file__))) + f"/utils/tokenizer/{model_series}"
-    #     try:
-    #         # 使用异步方式加载tokenizer
-    #         tokenizer = await get_tokenizer_async(tokenizer_dir)
-    #         tokens = tokenizer.encode(text)
-    #         return tokens, len(tokens)
-    #     except Exception as e:
-    #         StandLogger.error(f"Tokenizer加载失败: {str(e)}")
-    #         # 出错时使用近似估算
-    #         return [], len(text) // 4
-    # elif model_series == "tome":
-    #     tokenizer_dir = os.path.dirname(
-    #         os.path.dirname(os.path.realpath(__file__))) + f"/utils/tokenizer/qwen"
-    #     try:
-    #         # 使用异步方式加载tokenizer
-    #         tokenizer = await get_tokenizer_async(tokenizer_dir)
-    #         tokens = tokenizer.encode(text)
-    #         return tokens, len(tokens)
-    #     except Exception as e:
-    #         StandLogger.error(f"Tokenizer加载失败: {str(e)}")
-    #         # 出错时使用近似估算
-    #         return [], len(text) // 4
-    # elif model_series == "baidu":
-    #     headers = {
-    #         'Content-Type': 'application/json',
-    #         'Accept': 'application/json'
-    #     }
-    #     async with aiohttp.ClientSession(timeout=base_config.aiohttp_timeout) as session:
-    #         baidu_url = f"https://aip.baidubce.com/oauth/2.0/token?grant_type=client_credentials&client_id={api_key}&client_secret={secret_key}"
-    #         async with session.post(baidu_url, headers=headers, ssl=False) as access_res:
-    #             access_info = await access_res.json()
-    #             access_token = access_info["access_token"]
-    #     params = {
-    #         "prompt": text
-    #     }
-    #     if api_model in ["ernie-4.0-8k", "ernie-3.5-8k", "ernie-speed-8k", "ernie-speed-128k", "ernie-lite-8k",
-    #                      "ernie-tiny-8k", "ernie-char-8k"]:
-    #         params["model"] = api_model
-    #     async with aiohttp.ClientSession(timeout=base_config.aiohttp_timeout) as session:
-    #         url = f"https://aip.baidubce.com/rpc/2.0/ai_custom/v1/wenxinworkshop/tokenizer/erniebot?access_token={access_token}"
-    #         async with session.post(url, json=params, headers=headers, ssl=False) as original_res:
-    #             original_info = await original_res.json()
-    #             return [], original_info["usage"]["total_tokens"]
-    # else:
-    #     return [], len(text) // 4  # 使用更合理的近似值
+    """返回 (token ids, token数)，没有本地tokenizer的模型系列按字符数估算"""
+    return await tokenizer_service.encode(model_series, text)
 
 
 async def decode(api_base, api_model, token_ids):
@@ -2351,7 +2144,7 @@ async def decode(api_base, api_model, token_ids):
         "token_ids": token_ids,
         "model": api_model
     }
-    async with aiohttp.ClientSession(timeout=base_config.aiohttp_timeout) as session:
+    async with upstream_session() as session:
         async with session.post(url, data=json.dumps(params), ssl=False) as response:
             return response.json()
 
@@ -2415,6 +2208,8 @@ class ModelConfig:
     def __init__(self):
         self.config_name = {}
         self.config_id = {}
+        # 查询不到的模型 {(key, value): 过期时间}，避免反复查库
+        self._missing = {}
 
     async def init_model_config(self):
         models = llm_model_dao.get_all_model_list()
@@ -2424,25 +2219,29 @@ class ModelConfig:
             self.config_id[model["f_model_id"]] = model
 
     async def get_model_config(self, key, value):
-        # self.init_model_config()
-        try:
-            if key == "name":
-                res = self.config_name.get(value)
-                if res == None:
-                    raise Exception("")
-                return res
-            elif key == "id":
-
-                res = self.config_id.get(value)
-                if res == None:
-                    raise Exception("")
-                return res
-        except Exception:
-            await self.init_model_config()
-            if key == "name":
-                return self.config_name.get(value, {})
-            elif key == "id":
-                return self.config_id.get(value, {})
+        if key == "name":
+            configs = self.config_name
+            loader = llm_model_dao.get_data_from_model_list_by_name
+        elif key == "id":
+            configs = self.config_id
+            loader = llm_model_dao.get_data_from_model_list_by_id
+        else:
+            return None
+        res = configs.get(value)
+        if res is not None:
+            return res
+        # 未命中时只加载该模型，不再全量重新加载
+        if self._missing.get((key, value), 0) > time.monotonic():
+            return {}
+        models = await asyncio.to_thread(loader, value)
+        if not models:
+            self._missing[(key, value)] = time.monotonic() + base_config.MODEL_REGISTRY_NEGATIVE_TTL
+            return {}
+        model = models[0]
+        self._missing.pop(("name", model["f_model_name"]), None)
+        self._missing.pop(("id", model["f_model_id"]), None)
+        self.config_name[model["f_model_name"]] = self.config_id[model["f_model_id"]] = model
+        return model
 
     async def add_model_config(self, model_id, model_series, model_type, model_name, model, config):
         self.config_id[str(model_id)] = self.config_name[model_name] = \
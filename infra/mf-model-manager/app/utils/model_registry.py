@@ -0,0 +1,222 @@
+"""进程内模型注册表
+
+模型调用接口（大模型、embedding、reranker）按模型名称查询模型信息时不再访问Redis和数据库：
+- 服务启动时从数据库全量加载大模型和小模型
+- 模型新增、编辑、删除后通过Redis频道model_registry_change广播失效消息，
+  各副本收到后删除本地条目，下次查询时重新加载（与quota_config_change的同步方式一致）
+- 发布订阅消息可能丢失，条目超过刷新间隔后先返回旧值并在后台重新加载，
+  超过最大过期时间则必须重新加载成功才能使用；订阅重连后全量重新加载
+- 不存在的模型名称短暂缓存，避免错误请求反复查库
+
+数据库查询是同步调用，统一放到线程池中执行，不阻塞事件循环。
+"""
+
+import asyncio
+import json
+import uuid
+from time import monotonic
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import base_config
+from app.dao.llm_model_dao import llm_model_dao
+from app.dao.small_model_dao import small_model_dao
+from app.logs.stand_log import StandLogger
+from app.mydb.ConnectUtil import get_redis_util
+
+MODEL_KIND_LLM = "llm"
+MODEL_KIND_SMALL_MODEL = "small_model"
+REGISTRY_CHANNEL = "model_registry_change"
+# 本副本标识，忽略自己发出的失效消息
+INSTANCE_ID = uuid.uuid4().hex
+
+_NAME_LOADERS = {
+    MODEL_KIND_LLM: llm_model_dao.get_data_from_model_list_by_name,
+    MODEL_KIND_SMALL_MODEL: small_model_dao.get_model_info_by_name,
+}
+_ALL_LOADERS = {
+    MODEL_KIND_LLM: llm_model_dao.get_all_model_info_list,
+    MODEL_KIND_SMALL_MODEL: small_model_dao.get_all_model_info,
+}
+
+
+def build_invalidation_message(kind: str, names: List[str] = None) -> str:
+    """构造失效消息，names为空表示全量重新加载"""
+    payload = {"op": "invalidate", "kind": kind, "names": names or [], "source": INSTANCE_ID}
+    if not names:
+        payload["op"] = "reload"
+    return json.dumps(payload, ensure_ascii=False)
+
+
+class ModelRegistry:
+    """按 (模型类型, 模型名称) 缓存模型信息，值与DAO按名称查询返回的行一致"""
+
+    def __init__(self, refresh_interval: int = None, max_stale: int = None, negative_ttl: int = None):
+        self.refresh_interval = base_config.MODEL_REGISTRY_REFRESH_INTERVAL \
+            if refresh_interval is None else refresh_interval
+        self.max_stale = base_config.MODEL_REGISTRY_MAX_STALE if max_stale is None else max_stale
+        self.negative_ttl = base_config.MODEL_REGISTRY_NEGATIVE_TTL if negative_ttl is None else negative_ttl
+        # {(kind, name): (模型信息或None, 加载时间)}
+        self._entries: Dict[Tuple[str, str], Tuple[Optional[dict], float]] = {}
+        # 失效时递增，加载完成时版本已变化则丢弃结果，避免旧数据覆盖失效
+        self._versions: Dict[Tuple[str, str], int] = {}
+        self._loading: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._listener_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """全量加载并启动失效消息订阅，在FastAPI启动事件中调用"""
+        try:
+            await self.reload_all()
+        except Exception as e:
+            StandLogger.error(f"模型注册表全量加载失败，改为按需加载: {e}")
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self._listen_loop())
+
+    async def stop(self):
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            self._listener_task = None
+
+    async def reload_all(self, kinds: List[str] = None):
+        """从数据库全量加载指定类型的模型，替换本地条目"""
+        for kind in kinds or list(_ALL_LOADERS):
+            versions = dict(self._versions)
+            rows = await asyncio.to_thread(_ALL_LOADERS[kind])
+            now = monotonic()
+            # 加载期间失效的模型不使用本次结果，下次查询时单独加载
+            entries = {}
+            for row in rows:
+                key = (kind, row["f_model_name"])
+                if self._versions.get(key, 0) == versions.get(key, 0):
+                    entries[key] = (row, now)
+            for key in [key for key in self._entries if key[0] == kind and key not in entries]:
+                self._entries.pop(key, None)
+            self._entries.update(entries)
+            StandLogger.info_log(f"模型注册表加载{kind}模型{len(entries)}个")
+
+    async def get(self, kind: str, name: str) -> Optional[dict]:
+        """按名称获取模型信息，模型不存在时返回None"""
+        key = (kind, name)
+        entry = self._entries.get(key)
+        if entry is not None:
+            row, loaded_at = entry
+            age = monotonic() - loaded_at
+            if row is None:
+                if age < self.negative_ttl:
+                    return None
+            elif age < self.refresh_interval:
+                return row
+            elif age < self.max_stale:
+                # 先返回旧值，后台重新加载
+                self._refresh(key)
+                return row
+        return await asyncio.shield(self._refresh(key))
+
+    def rows(self, kind: str) -> List[dict]:
+        """本地已加载的某类型模型信息"""
+        return [row for key, (row, _) in list(self._entries.items()) if key[0] == kind and row is not None]
+
+    async def get_llm(self, name: str) -> Optional[dict]:
+        return await self.get(MODEL_KIND_LLM, name)
+
+    async def get_small_model(self, name: str) -> Optional[dict]:
+        return await self.get(MODEL_KIND_SMALL_MODEL, name)
+
+    def _refresh(self, key: Tuple[str, str]) -> asyncio.Task:
+        """同一名称同时只有一个加载任务"""
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, self._versions.get(key, 0)))
+            self._loading[key] = task
+            task.add_done_callback(lambda t: self._on_loaded(key, t))
+        return task
+
+    def _on_loaded(self, key: Tuple[str, str], task: asyncio.Task):
+        if self._loading.get(key) is task:
+            del self._loading[key]
+        if not task.cancelled() and task.exception() is not None:
+            StandLogger.warn(f"模型注册表加载失败: kind={key[0]}, name={key[1]}, error={task.exception()}")
+
+    async def _load(self, key: Tuple[str, str], version: int) -> Optional[dict]:
+        kind, name = key
+        rows = await asyncio.to_thread(_NAME_LOADERS[kind], name)
+        row = rows[0] if rows else None
+        if self._versions.get(key, 0) == version:
+            self._entries[key] = (row, monotonic())
+        return row
+
+    def _bump_version(self, key: Tuple[str, str]):
+        self._versions[key] = self._versions.get(key, 0) + 1
+        self._loading.pop(key, None)
+
+    def discard(self, kind: str, names: List[str] = None):
+        """删除本地条目，names为空时删除该类型的全部条目"""
+        if names:
+            keys = [(kind, name) for name in names]
+        else:
+            keys = [key for key in self._entries if key[0] == kind]
+        for key in keys:
+            self._bump_version(key)
+            self._entries.pop(key, None)
+
+    async def invalidate(self, kind: str, names: List[str] = None):
+        """模型变更后调用：删除本地条目并通知其他副本"""
+        self.discard(kind, [name for name in names or [] if name] or None)
+        try:
+            redis_util = await get_redis_util()
+            await redis_util.write_conn.publish(REGISTRY_CHANNEL, build_invalidation_message(kind, names))
+        except Exception as e:
+            StandLogger.error(f"发布模型变更事件失败: {e}")
+
+    def handle_message(self, data) -> bool:
+        """处理失效消息，返回是否需要全量重新加载"""
+        if isinstance(data, (bytes, bytearray)):
+            data = data.decode()
+        try:
+            payload = json.loads(data)
+        except Exception:
+            return False
+        if payload.get("source") == INSTANCE_ID or payload.get("kind") not in _ALL_LOADERS:
+            return False
+        if payload.get("op") == "reload":
+            self.discard(payload["kind"])
+            return True
+        if payload.get("op") == "invalidate":
+            self.discard(payload["kind"], payload.get("names") or None)
+        return False
+
+    async def _listen_loop(self):
+        backoff = 0.5
+        reconnect = False
+        while True:
+            pubsub = None
+            try:
+                redis_util = await get_redis_util()
+                pubsub = redis_util.read_conn.pubsub()
+                await pubsub.subscribe(REGISTRY_CHANNEL)
+                if reconnect:
+                    # 断线期间可能错过失效消息
+                    await self.reload_all()
+                reconnect = True
+                backoff = 0.5
+                while True:
+                    msg = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if not msg:
+                        continue
+                    if self.handle_message(msg.get("data")):
+                        await self.reload_all()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                StandLogger.error(f"模型注册表订阅循环异常: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 10)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.close()
+                    except Exception:
+                        pass
+
+
+# 进程级共享实例
+model_registry = ModelRegistry()
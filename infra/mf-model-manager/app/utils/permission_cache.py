@@ -0,0 +1,215 @@
+"""权限校验结果缓存
+
+模型调用接口在同一时间段内会被相同用户对相同模型反复调用，每次都请求授权服务开销较大。
+校验结果按 (用户, 角色, 资源类型, 资源ID, 操作) 短暂缓存：
+- 有权限的结果缓存PERMISSION_CACHE_TTL秒，无权限的结果缓存PERMISSION_CACHE_NEGATIVE_TTL秒
+- 授权服务请求失败不缓存
+- 相同的校验同时只请求一次授权服务，其余请求等待其结果
+- 资源授权或删除后通过Redis频道permission_change广播失效消息，各副本删除对应条目；
+  其他服务修改授权策略时也可以向该频道发布消息，未发布时以缓存时间为上限
+"""
+
+import asyncio
+import json
+import uuid
+from collections import OrderedDict
+from time import monotonic
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.core.config import base_config
+from app.logs.stand_log import StandLogger
+from app.mydb.ConnectUtil import get_redis_util
+
+PERMISSION_CHANNEL = "permission_change"
+# 本副本标识，忽略自己发出的失效消息
+INSTANCE_ID = uuid.uuid4().hex
+
+# (user_id, role, resource_type, resource_id, operation)
+PermissionKey = Tuple[str, str, str, str, str]
+
+
+def build_invalidation_message(resource_type: str = None, resource_ids: List[str] = None,
+                               user_id: str = None) -> str:
+    """构造失效消息，字段为空表示不按该字段过滤"""
+    return json.dumps({"resource_type": resource_type, "resource_ids": resource_ids or [], "user_id": user_id,
+                       "source": INSTANCE_ID}, ensure_ascii=False)
+
+
+class PermissionDecisionCache:
+    def __init__(self, ttl: int = None, negative_ttl: int = None, max_size: int = None):
+        self.ttl = base_config.PERMISSION_CACHE_TTL if ttl is None else ttl
+        self.negative_ttl = base_config.PERMISSION_CACHE_NEGATIVE_TTL if negative_ttl is None else negative_ttl
+        self.max_size = base_config.PERMISSION_CACHE_SIZE if max_size is None else max_size
+        # {key: (是否有权限, 过期时间)}
+        self._entries: "OrderedDict[PermissionKey, Tuple[bool, float]]" = OrderedDict()
+        # 正在请求授权服务的校验
+        self._pending: Dict[PermissionKey, asyncio.Future] = {}
+        # 失效时递增，请求期间发生失效则不缓存请求结果
+        self._generation = 0
+        self._listener_task: Optional[asyncio.Task] = None
+        # 批量请求授权服务的任务，保留引用避免执行中被回收
+        self._batch_tasks: Set[asyncio.Task] = set()
+
+    def _lookup(self, key: PermissionKey) -> Optional[bool]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= monotonic():
+            self._entries.pop(key, None)
+            return None
+        return entry[0]
+
+    def _store(self, key: PermissionKey, allowed: bool, generation: int):
+        if generation != self._generation or self.max_size <= 0:
+            return
+        self._entries[key] = (allowed, monotonic() + (self.ttl if allowed else self.negative_ttl))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _release(self, key: PermissionKey, future: asyncio.Future):
+        if self._pending.get(key) is future:
+            del self._pending[key]
+
+    async def get(self, key: PermissionKey, loader: Callable[[], Awaitable[bool]]) -> bool:
+        """获取单个校验结果，未命中时调用loader请求授权服务，loader异常时向调用方抛出"""
+        allowed = self._lookup(key)
+        if allowed is not None:
+            return allowed
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._load(key, loader, self._generation))
+            self._pending[key] = future
+            future.add_done_callback(lambda f: self._release(key, f))
+        return await asyncio.shield(future)
+
+    async def _load(self, key: PermissionKey, loader: Callable[[], Awaitable[bool]], generation: int) -> bool:
+        allowed = bool(await loader())
+        self._store(key, allowed, generation)
+        return allowed
+
+    async def get_many(self, keys: List[PermissionKey],
+                       loader: Callable[[List[PermissionKey]], Awaitable[Dict[PermissionKey, bool]]]
+                       ) -> Dict[PermissionKey, bool]:
+        """批量获取校验结果，未命中且没有在请求中的校验合并为一次loader调用"""
+        result = {}
+        waiting = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            allowed = self._lookup(key)
+            if allowed is not None:
+                result[key] = allowed
+            elif key in self._pending:
+                waiting[key] = self._pending[key]
+            else:
+                missing.append(key)
+
+        if missing:
+            loop = asyncio.get_running_loop()
+            futures = {key: loop.create_future() for key in missing}
+            self._pending.update(futures)
+            # 在独立任务中请求授权服务，调用方被取消时其他等待相同校验的请求仍能拿到结果
+            task = asyncio.ensure_future(self._load_many(loader, futures, self._generation))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+            waiting.update(futures)
+
+        for key, future in waiting.items():
+            result[key] = await asyncio.shield(future)
+        return result
+
+    async def _load_many(self, loader: Callable[[List[PermissionKey]], Awaitable[Dict[PermissionKey, bool]]],
+                         futures: Dict[PermissionKey, asyncio.Future], generation: int):
+        try:
+            decisions = await loader(list(futures))
+        except BaseException as e:
+            for future in futures.values():
+                future.set_exception(e)
+                # 没有其他等待方时避免未读取异常的告警
+                future.exception()
+            if not isinstance(e, Exception):
+                raise
+            return
+        finally:
+            for key, future in futures.items():
+                self._release(key, future)
+        for key, future in futures.items():
+            allowed = bool(decisions.get(key, False))
+            self._store(key, allowed, generation)
+            future.set_result(allowed)
+
+    def discard(self, resource_type: str = None, resource_ids: List[str] = None, user_id: str = None):
+        """删除本地条目，参数为空表示不按该字段过滤"""
+        self._generation += 1
+        resource_ids = set(resource_ids or [])
+        for key in list(self._entries):
+            if user_id and key[0] != user_id:
+                continue
+            if resource_type and key[2] != resource_type:
+                continue
+            if resource_ids and key[3] not in resource_ids:
+                continue
+            self._entries.pop(key, None)
+
+    async def invalidate(self, resource_type: str = None, resource_ids: List[str] = None, user_id: str = None):
+        """授权变更后调用：删除本地条目并通知其他副本"""
+        self.discard(resource_type, resource_ids, user_id)
+        try:
+            redis_util = await get_redis_util()
+            await redis_util.write_conn.publish(PERMISSION_CHANNEL,
+                                                build_invalidation_message(resource_type, resource_ids, user_id))
+        except Exception as e:
+            StandLogger.error(f"发布权限变更事件失败: {e}")
+
+    def handle_message(self, data):
+        if isinstance(data, (bytes, bytearray)):
+            data = data.decode()
+        try:
+            payload = json.loads(data)
+        except Exception:
+            return
+        if not isinstance(payload, dict) or payload.get("source") == INSTANCE_ID:
+            return
+        self.discard(payload.get("resource_type"), payload.get("resource_ids"), payload.get("user_id"))
+
+    async def start(self):
+        """启动失效消息订阅，在FastAPI启动事件中调用"""
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self._listen_loop())
+
+    async def stop(self):
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            self._listener_task = None
+
+    async def _listen_loop(self):
+        backoff = 0.5
+        while True:
+            pubsub = None
+            try:
+                redis_util = await get_redis_util()
+                pubsub = redis_util.read_conn.pubsub()
+                await pubsub.subscribe(PERMISSION_CHANNEL)
+                # 断线期间可能错过失效消息
+                self.discard()
+                backoff = 0.5
+                while True:
+                    msg = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if msg:
+                        self.handle_message(msg.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                StandLogger.error(f"权限变更订阅循环异常: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 10)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.close()
+                    except Exception:
+                        pass
+
+
+# 进程级共享实例
+permission_cache = PermissionDecisionCache()
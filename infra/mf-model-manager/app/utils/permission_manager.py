@@ -4,6 +4,7 @@ from typing import List, Dict, Optional
 from app.core.config import base_config
 from app.dao.small_model_dao import small_model_dao
 from app.logs.stand_log import StandLogger
+from app.utils.permission_cache import permission_cache
 
 
 class PermissionManager:
@@ -87,6 +88,7 @@ class PermissionManager:
                     headers={'Content-Type': 'application/json'}
             ) as response:
                 if response.status == 204:
+                    await permission_cache.invalidate(resource_type=resource_type, resource_ids=[resource_id])
                     return True
         except Exception as e:
             StandLogger.error(e.args)
@@ -100,7 +102,17 @@ class PermissionManager:
                                       resource_type: str, role: str) -> bool:
         if not base_config.AUTH_ENABLED:
             return True
-        """校验用户对资源的权限"""
+        """校验用户对资源的权限，结果短暂缓存"""
+        key = (user_id, role, resource_type, resource_id, operations)
+        try:
+            return await permission_cache.get(
+                key, lambda: self._operation_check(user_id, resource_id, operations, resource_type, role))
+        except Exception as e:
+            StandLogger.error(e.args)
+            return False
+
+    async def _operation_check(self, user_id: str, resource_id: str, operations: str,
+                               resource_type: str, role: str) -> bool:
         payload = {
             "method": "GET",
             "accessor": {
@@ -113,21 +125,52 @@ class PermissionManager:
             },
             "operation": [operations]
         }
+        session = await self.get_session()
+        async with session.post(
+                self.check_single_auth_url,
+                json=payload,
+                headers={'Content-Type': 'application/json'}
+        ) as response:
+            if response.status == 200:
+                result = await response.json()
+                return result.get('result', False)
+            raise Exception(f"operation-check failed: status={response.status}, detail={await response.text()}")
 
-        try:
+    async def check_permissions(self, user_id: str, resource_ids: List[str], operation: str,
+                                resource_type: str, role: str) -> Dict[str, bool]:
+        """批量校验用户对多个资源的同一操作权限，未命中缓存的资源合并为一次resource-filter请求"""
+        if not base_config.AUTH_ENABLED:
+            return {resource_id: True for resource_id in resource_ids}
+
+        async def load(keys):
+            payload = {
+                "method": "GET",
+                "accessor": {
+                    "id": user_id,
+                    "type": role
+                },
+                "resources": [{"id": key[3], "type": resource_type} for key in keys],
+                "operation": [operation]
+            }
             session = await self.get_session()
             async with session.post(
-                    self.check_single_auth_url,
+                    self.resource_filter_url,
                     json=payload,
                     headers={'Content-Type': 'application/json'}
             ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    return result.get('result', False)
-                return False
+                if response.status != 200:
+                    raise Exception(
+                        f"resource-filter failed: status={response.status}, detail={await response.text()}")
+                allowed = {item['id'] for item in await response.json()}
+            return {key: key[3] in allowed for key in keys}
+
+        keys = [(user_id, role, resource_type, resource_id, operation) for resource_id in resource_ids]
+        try:
+            decisions = await permission_cache.get_many(keys, load)
         except Exception as e:
             StandLogger.error(e.args)
-            return False
+            decisions = {}
+        return {key[3]: decisions.get(key, False) for key in keys}
 
     async def get_permission_ids(self, user_id: str, operation: str,
                                  resource_type: str, resource_name: str, role: str) -> list:
@@ -201,6 +244,7 @@ class PermissionManager:
                     headers={"Content-Type": "application/json"}
             ) as response:
                 if response.status == 204:
+                    await permission_cache.invalidate(resource_type=resource_type, resource_ids=resource_ids)
                     return True
         except Exception as e:
             StandLogger.error(e.args)
@@ -0,0 +1,283 @@
+"""用户模型配额账本
+
+按 (月份, 模型, 用户) 在Redis Hash中维护配额和已用量，准入检查只需一次Redis脚本调用：
+- limit_in/limit_out/billing_type: 配额，来自t_user_quota_config
+- used_in/used_out: 本月已用量，add_llm_model_call_log上报用量时实时累加
+- reserved: 尚未结束的调用预留的输出token
+
+准入时按max_tokens预留输出额度（不超过剩余额度），调用结束后释放，用量以上报为准；
+进程异常退出未释放的预留超过QUOTA_RESERVATION_TTL后自动清理。
+已用量达到配额的QUOTA_SOFT_LIMIT_RATIO时为软限制，仍然放行但记录告警；达到配额时拒绝。
+
+账本每隔QUOTA_LEDGER_SYNC_INTERVAL秒与MySQL对账一次：重新读取配额，
+已用量取Redis与MySQL的较大值（Kafka聚合入库有延迟，MySQL通常落后于Redis；Redis数据丢失时由MySQL补齐）。
+配额配置修改后递增模型的配额版本号，账本在下次准入时立即重新对账。
+"""
+
+import asyncio
+import datetime
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from redis.exceptions import NoScriptError
+
+from app.core.config import base_config
+from app.dao.llm_model_dao import llm_model_dao
+from app.logs.stand_log import StandLogger
+from app.mydb.ConnectUtil import get_redis_util
+
+LEDGER_KEY_PREFIX = "dip:model-api:quota-ledger"
+# 账本保留时间，覆盖整个自然月
+LEDGER_KEY_TTL = 40 * 24 * 3600
+# 放行时已用量达到软限制
+SOFT_LIMIT_REASON = "soft"
+# 最多记住多少个已告警过软限制的账本，超出后淘汰最早的（被淘汰的账本再次达到软限制时会重复告警一次）
+SOFT_WARNED_MAX_SIZE = 10000
+
+_ADMIT_SCRIPT = """
+local f = redis.call('HMGET', KEYS[1], 'synced_at', 'version', 'configured', 'billing_type',
+                     'limit_in', 'limit_out', 'used_in', 'used_out', 'reserved')
+local version = redis.call('GET', KEYS[3]) or '0'
+if not f[1] or tonumber(ARGV[1]) - tonumber(f[1]) >= tonumber(ARGV[2]) or f[2] ~= version then
+    return {'sync'}
+end
+if f[3] ~= '1' then
+    return {'denied', 'input'}
+end
+local limit_in = tonumber(f[5])
+local limit_out = tonumber(f[6])
+local used_in = tonumber(f[7]) or 0
+local used_out = tonumber(f[8]) or 0
+local reserved = tonumber(f[9]) or 0
+local limit, used, remaining
+if f[4] == '1' then
+    if limit_in - used_in <= 0 then
+        return {'denied', 'input'}
+    end
+    limit = limit_out
+    used = used_out
+    remaining = limit_out - used_out - reserved
+    if remaining <= 0 then
+        return {'denied', 'output'}
+    end
+else
+    limit = limit_in
+    used = used_in + used_out
+    remaining = limit_in - used - reserved
+    if remaining <= 0 then
+        return {'denied', 'input'}
+    end
+end
+local reserve = math.min(tonumber(ARGV[3]), remaining)
+if reserve > 0 then
+    redis.call('HINCRBY', KEYS[1], 'reserved', reserve)
+    redis.call('HSET', KEYS[2], ARGV[4], reserve .. ':' .. ARGV[1])
+    redis.call('EXPIRE', KEYS[2], ARGV[6])
+end
+local soft = '0'
+if limit > 0 and used + reserved + reserve >= limit * tonumber(ARGV[5]) then
+    soft = '1'
+end
+return {'ok', tostring(reserve), soft}
+"""
+
+_SYNC_SCRIPT = """
+redis.call('HSET', KEYS[1], 'synced_at', ARGV[1], 'version', ARGV[2], 'configured', ARGV[3],
+           'billing_type', ARGV[4], 'limit_in', ARGV[5], 'limit_out', ARGV[6])
+local used_in = tonumber(redis.call('HGET', KEYS[1], 'used_in') or '0')
+if tonumber(ARGV[7]) > used_in then
+    redis.call('HSET', KEYS[1], 'used_in', ARGV[7])
+end
+local used_out = tonumber(redis.call('HGET', KEYS[1], 'used_out') or '0')
+if tonumber(ARGV[8]) > used_out then
+    redis.call('HSET', KEYS[1], 'used_out', ARGV[8])
+end
+local reserved = 0
+local items = redis.call('HGETALL', KEYS[2])
+for i = 1, #items, 2 do
+    local amount, at = string.match(items[i + 1], '^(%d+):(%d+)$')
+    if not amount or tonumber(ARGV[1]) - tonumber(at) > tonumber(ARGV[9]) then
+        redis.call('HDEL', KEYS[2], items[i])
+    else
+        reserved = reserved + tonumber(amount)
+    end
+end
+redis.call('HSET', KEYS[1], 'reserved', reserved)
+redis.call('EXPIRE', KEYS[1], ARGV[10])
+return 1
+"""
+
+_USAGE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('HINCRBY', KEYS[1], 'used_in', ARGV[1])
+redis.call('HINCRBY', KEYS[1], 'used_out', ARGV[2])
+return 1
+"""
+
+_RELEASE_SCRIPT = """
+local v = redis.call('HGET', KEYS[2], ARGV[1])
+if not v then
+    return 0
+end
+redis.call('HDEL', KEYS[2], ARGV[1])
+local amount = tonumber(string.match(v, '^(%d+)'))
+if redis.call('HINCRBY', KEYS[1], 'reserved', -amount) < 0 then
+    redis.call('HSET', KEYS[1], 'reserved', 0)
+end
+return amount
+"""
+
+
+class _Script:
+    def __init__(self, source: str):
+        self.source = source
+        self.sha = None
+
+    async def __call__(self, conn, keys, args):
+        if self.sha is None:
+            self.sha = await conn.script_load(self.source)
+        try:
+            return await conn.evalsha(self.sha, len(keys), *keys, *args)
+        except NoScriptError:
+            # Redis重启或切主后脚本缓存丢失
+            self.sha = await conn.script_load(self.source)
+            return await conn.evalsha(self.sha, len(keys), *keys, *args)
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, (bytes, bytearray)) else str(value)
+
+
+class QuotaReservation:
+    """一次调用预留的输出额度"""
+
+    def __init__(self, ledger_key: str, reservation_id: str, tokens: int):
+        self.ledger_key = ledger_key
+        self.reservation_id = reservation_id
+        self.tokens = tokens
+
+
+class QuotaLedger:
+    def __init__(self):
+        self._admit = _Script(_ADMIT_SCRIPT)
+        self._sync_script = _Script(_SYNC_SCRIPT)
+        self._usage = _Script(_USAGE_SCRIPT)
+        self._release = _Script(_RELEASE_SCRIPT)
+        # 已经告警过软限制的账本，避免重复告警；账本键包含月份，跨月后旧键随新键写入逐渐淘汰
+        self._soft_warned: "OrderedDict[str, None]" = OrderedDict()
+
+    @staticmethod
+    def ledger_key(model_id, user_id) -> str:
+        month = datetime.datetime.now().strftime("%Y%m")
+        return f"{LEDGER_KEY_PREFIX}:{month}:{model_id}:{user_id}"
+
+    @staticmethod
+    def version_key(model_id) -> str:
+        return f"{LEDGER_KEY_PREFIX}:version:{model_id}"
+
+    async def admit(self, model_id, user_id, reserve_tokens: int = 0) -> Tuple[bool, str, Optional[QuotaReservation]]:
+        """准入检查并预留输出额度
+
+        Returns:
+            (是否放行, 拒绝原因input/output（放行时达到软限制为soft）, 预留信息)
+        """
+        key = self.ledger_key(model_id, user_id)
+        reservation_id = uuid.uuid4().hex
+        try:
+            conn = (await get_redis_util()).write_conn
+            row = None
+            for _ in range(3):
+                res = await self._admit(conn, [key, f"{key}:reservations", self.version_key(model_id)],
+                                        [int(time.time()), base_config.QUOTA_LEDGER_SYNC_INTERVAL,
+                                         max(int(reserve_tokens or 0), 0), reservation_id,
+                                         base_config.QUOTA_SOFT_LIMIT_RATIO, base_config.QUOTA_RESERVATION_TTL])
+                status = _decode(res[0])
+                if status != "sync":
+                    break
+                row = await self._sync(conn, key, model_id, user_id)
+            else:
+                # 对账期间配额被反复修改，按本次从MySQL读到的数据判断
+                return self._check_row(row), "input", None
+        except Exception as e:
+            StandLogger.error(f"配额账本准入检查失败，改为查询数据库: {e}")
+            row = await self._load_quota(model_id, user_id)
+            return self._check_row(row), "input", None
+
+        if status == "denied":
+            return False, _decode(res[1]), None
+        reserved = int(_decode(res[1]))
+        soft = _decode(res[2]) == "1"
+        if soft and self._mark_soft_warned(key):
+            StandLogger.warn(f"用户模型配额达到软限制: model_id={model_id}, user_id={user_id}, "
+                             f"ratio={base_config.QUOTA_SOFT_LIMIT_RATIO}")
+        reservation = QuotaReservation(key, reservation_id, reserved) if reserved > 0 else None
+        return True, SOFT_LIMIT_REASON if soft else "", reservation
+
+    def _mark_soft_warned(self, key: str) -> bool:
+        """记录账本已告警软限制，首次记录时返回True"""
+        if key in self._soft_warned:
+            return False
+        self._soft_warned[key] = None
+        while len(self._soft_warned) > SOFT_WARNED_MAX_SIZE:
+            self._soft_warned.popitem(last=False)
+        return True
+
+    async def release(self, reservation: Optional[QuotaReservation]):
+        """调用结束后释放预留额度，实际用量由record_usage记账"""
+        if reservation is None:
+            return
+        try:
+            conn = (await get_redis_util()).write_conn
+            await self._release(conn, [reservation.ledger_key, f"{reservation.ledger_key}:reservations"],
+                                [reservation.reservation_id])
+        except Exception as e:
+            StandLogger.warn(f"释放配额预留失败，将在超时后自动清理: {e}")
+
+    async def record_usage(self, model_id, user_id, input_tokens, output_tokens):
+        """累加本月已用量，账本不存在时跳过（首次准入时从MySQL对账）"""
+        try:
+            conn = (await get_redis_util()).write_conn
+            await self._usage(conn, [self.ledger_key(model_id, user_id)],
+                              [int(input_tokens or 0), int(output_tokens or 0)])
+        except Exception as e:
+            StandLogger.warn(f"配额账本记账失败，将在下次对账时补齐: {e}")
+
+    async def invalidate_limits(self, model_id):
+        """模型配额配置修改后调用，该模型的账本在下次准入时重新对账"""
+        try:
+            conn = (await get_redis_util()).write_conn
+            await conn.incr(self.version_key(model_id))
+        except Exception as e:
+            StandLogger.error(f"更新配额版本号失败: {e}")
+
+    @staticmethod
+    async def _load_quota(model_id, user_id) -> Optional[dict]:
+        res = await asyncio.to_thread(llm_model_dao.get_quota_by_user_and_model, user_id, model_id)
+        return res[0] if res else None
+
+    @staticmethod
+    def _check_row(row: Optional[dict]) -> bool:
+        return row is not None and row["remaining_input_tokens"] > 0 and row["remaining_output_tokens"] > 0
+
+    async def _sync(self, conn, key, model_id, user_id) -> Optional[dict]:
+        """从MySQL读取配额和本月已用量写入账本"""
+        # 先读版本号再查库，查库期间的配额修改会在下次准入时再次触发对账
+        version = await conn.get(self.version_key(model_id))
+        row = await self._load_quota(model_id, user_id)
+        if row is None:
+            args = [0, 0, 0, 0, 0, 0]
+        else:
+            args = [1, int(row["f_billing_type"] or 0), int(row["total_input_tokens"]),
+                    int(row["total_output_tokens"]), int(row["used_input_tokens"]), int(row["used_output_tokens"])]
+        await self._sync_script(conn, [key, f"{key}:reservations"],
+                                [int(time.time()), _decode(version) if version is not None else "0", *args,
+                                 base_config.QUOTA_RESERVATION_TTL, LEDGER_KEY_TTL])
+        return row
+
+
+# 进程级共享实例
+quota_ledger = QuotaLedger()
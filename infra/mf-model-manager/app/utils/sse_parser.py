@@ -0,0 +1,115 @@
+"""大模型流式响应解析
+
+各大模型客户端的流式接口共用：
+- sse_data: 从响应的一行中取出SSE的data字段
+- ThinkTagSplitter: 按<think>...</think>标签把推理模型的输出拆分为推理内容和正文。
+  每次只扫描新增的文本（以及上次留下的不完整标签），不对累计的回答做全文匹配
+- think_flush_chunk: 流结束时把ThinkTagSplitter暂存的文本生成为一个OpenAI格式的chunk
+"""
+
+import json
+from typing import Optional, Tuple
+
+# 流结束标记
+SSE_DONE = "[DONE]"
+
+THINK_OPEN = "<think>"
+THINK_CLOSE = "</think>"
+
+# 等待<think>标签：开头的文本不足len(THINK_OPEN)个字符时无法确定是否有标签
+THINK_PENDING = "pending"
+# 推理内容
+THINK_REASONING = "reasoning"
+# </think>之后的正文
+THINK_CONTENT = "content"
+
+
+def sse_data(line: bytes) -> Optional[str]:
+    """取出一行中data字段的内容
+
+    空行、注释以及event、id等其他字段返回None；不带data前缀的JSON行按数据处理
+    """
+    if line[:5] == b"data:":
+        line = line[6:] if line[5:6] == b" " else line[5:]
+    elif line[:1] != b"{":
+        return None
+    data = line.rstrip(b"\r\n")
+    if not data:
+        return None
+    return data.decode("utf-8")
+
+
+def _partial_tag_length(text: str, tag: str) -> int:
+    """text末尾与tag开头重合的最大长度，即可能被拆到下一段中的不完整标签"""
+    for length in range(min(len(tag) - 1, len(text)), 0, -1):
+        if text.endswith(tag[:length]):
+            return length
+    return 0
+
+
+class ThinkTagSplitter:
+    """推理模型输出的增量拆分
+
+    feed每次传入新增的正文片段，返回 (推理内容, 正文) 中可以确定的部分；
+    可能属于</think>的末尾字符暂存到下一次feed，流结束时调用flush取出。
+    模型没有输出<think>标签时（开头len(THINK_OPEN)个字符中没有标签），全部按推理内容处理，直到</think>。
+    """
+
+    def __init__(self, reasoning_first: bool = False):
+        """reasoning_first为True时不等待<think>标签，从推理内容开始"""
+        self.state = THINK_REASONING if reasoning_first else THINK_PENDING
+        self._held = ""
+
+    @property
+    def holding(self) -> bool:
+        """是否有暂存未返回的文本"""
+        return bool(self._held)
+
+    def feed(self, text: str) -> Tuple[str, str]:
+        if self.state == THINK_CONTENT:
+            return "", text
+        text = self._held + text
+        self._held = ""
+        if self.state == THINK_PENDING:
+            index = text.find(THINK_OPEN)
+            if index != -1:
+                text = text[:index] + text[index + len(THINK_OPEN):]
+            elif len(text) < len(THINK_OPEN):
+                self._held = text
+                return "", ""
+            self.state = THINK_REASONING
+        index = text.find(THINK_CLOSE)
+        if index != -1:
+            self.state = THINK_CONTENT
+            return text[:index], text[index + len(THINK_CLOSE):]
+        length = _partial_tag_length(text, THINK_CLOSE)
+        if length:
+            self._held = text[-length:]
+            text = text[:-length]
+        return text, ""
+
+    def flush(self) -> Tuple[str, str]:
+        """流结束时返回并清空暂存的文本，格式与feed相同
+
+        仍在等待<think>标签时，整个回答比标签还短且没有标签，按正文返回；
+        推理内容中暂存的不完整</think>按推理内容返回
+        """
+        held, self._held = self._held, ""
+        if self.state == THINK_PENDING:
+            return "", held
+        return held, ""
+
+
+def think_flush_chunk(splitter: ThinkTagSplitter, datas: Optional[dict]) -> Optional[str]:
+    """流结束时取出splitter暂存的文本，按datas（最后一个送入splitter的chunk）的格式生成chunk
+
+    没有暂存文本时返回None
+    """
+    if datas is None:
+        return None
+    reasoning, content = splitter.flush()
+    if not reasoning and not content:
+        return None
+    choice = dict(datas["choices"][0], finish_reason=None)
+    choice["delta"] = dict(choice["delta"], reasoning_content=reasoning or None, content=content or None)
+    return json.dumps(dict(datas, choices=[choice]), ensure_ascii=False)
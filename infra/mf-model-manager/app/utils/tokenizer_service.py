@@ -0,0 +1,250 @@
+"""大模型token计数
+
+按模型系列懒加载tokenizer：
+- openai: tiktoken的cl100k_base，编码文件在 app/utils/tiktoken_cache
+- qwen、internlm、deepseek、chatglm、llama: app/utils/tokenizer/<系列> 下的HuggingFace tokenizer，tome使用qwen
+- 其他系列或tokenizer加载失败时按 len(text) // 4 估算
+tokenizer文件不在代码仓库中，构建镜像时由 download_tokenizers.py 下载；服务启动时用check_assets检查，
+TOKENIZER_ASSETS_REQUIRED为true（镜像中的默认值）时缺少文件拒绝启动，否则记录错误日志后按估算处理。
+已加载的tokenizer按LRU最多保留_MAX_CACHE_SIZE个，加载失败的系列不再重复加载。
+每个tokenizer单独加锁加载，加载较慢的tokenizer不阻塞其他系列。
+
+编码在线程池中批量执行，不阻塞事件循环。
+每条文本的token数按 (tokenizer, 文本的哈希) 缓存，多轮对话只需要计算新增的消息。
+"""
+
+import asyncio
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import tiktoken
+
+from app.core.config import base_config
+from app.logs.stand_log import StandLogger
+
+_UTILS_DIR = os.path.dirname(os.path.realpath(__file__))
+TIKTOKEN_CACHE_DIR = os.path.join(_UTILS_DIR, "tiktoken_cache")
+# cl100k_base编码文件
+TIKTOKEN_CACHE_KEY = "9b5ad71b2ce5302211f9c61530b329a4922fc6a4"
+TOKENIZER_DIR = os.path.join(_UTILS_DIR, "tokenizer")
+
+OPENAI_TOKENIZER = "openai"
+# {模型系列: tokenizer目录名}
+HF_TOKENIZERS = {
+    "qwen": "qwen",
+    "internlm": "internlm",
+    "deepseek": "deepseek",
+    "chatglm": "chatglm",
+    "llama": "llama",
+    "tome": "qwen",
+}
+
+_MAX_CACHE_SIZE = 5  # 限制最大缓存数量
+# 每隔多少次计数输出一次命中率
+STATS_LOG_INTERVAL = 1000
+
+
+def tokenizer_name(model_series: str) -> Optional[str]:
+    """模型系列对应的tokenizer，没有可用tokenizer时返回None"""
+    model_series = (model_series or "").lower()
+    if model_series == "openai":
+        return OPENAI_TOKENIZER
+    return HF_TOKENIZERS.get(model_series)
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4
+
+
+def _text_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+class TokenizerService:
+    def __init__(self, max_tokenizers: int = _MAX_CACHE_SIZE, count_cache_size: int = None, workers: int = None):
+        self.max_tokenizers = max_tokenizers
+        self.count_cache_size = base_config.TOKEN_COUNT_CACHE_SIZE if count_cache_size is None else count_cache_size
+        self.workers = base_config.TOKENIZER_WORKERS if workers is None else workers
+        self._tokenizers: "OrderedDict[str, object]" = OrderedDict()
+        # 加载失败的tokenizer
+        self._failed = set()
+        # {(tokenizer, 文本哈希): token数}
+        self._counts: "OrderedDict[Tuple[str, bytes], int]" = OrderedDict()
+        self._lock = threading.RLock()
+        # {tokenizer: 加载锁}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats = {"texts": 0, "hits": 0}
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tokenizer")
+        return self._executor
+
+    def _load(self, name: str):
+        if name == OPENAI_TOKENIZER:
+            os.environ.setdefault("TIKTOKEN_CACHE_DIR", TIKTOKEN_CACHE_DIR)
+            if not os.path.exists(self.asset_path(name)):
+                raise FileNotFoundError(f"tiktoken编码文件不存在: {os.environ['TIKTOKEN_CACHE_DIR']}")
+            return tiktoken.get_encoding("cl100k_base")
+        # transformers导入较慢，只在需要本地tokenizer时导入
+        from transformers import AutoTokenizer
+        if not os.path.exists(self.asset_path(name)):
+            raise FileNotFoundError(f"tokenizer目录不存在: {self.asset_path(name)}")
+        return AutoTokenizer.from_pretrained(self.asset_path(name), trust_remote_code=True)
+
+    @staticmethod
+    def asset_path(name: str) -> str:
+        """tokenizer文件所在路径"""
+        if name == OPENAI_TOKENIZER:
+            return os.path.join(os.environ.get("TIKTOKEN_CACHE_DIR", TIKTOKEN_CACHE_DIR), TIKTOKEN_CACHE_KEY)
+        return os.path.join(TOKENIZER_DIR, name)
+
+    def check_assets(self) -> List[str]:
+        """返回缺少文件的tokenizer"""
+        names = [OPENAI_TOKENIZER] + sorted(set(HF_TOKENIZERS.values()))
+        return [name for name in names if not os.path.exists(self.asset_path(name))]
+
+    def _cached(self, name: str):
+        with self._lock:
+            tokenizer = self._tokenizers.get(name)
+            if tokenizer is not None:
+                self._tokenizers.move_to_end(name)
+            return tokenizer
+
+    def get_tokenizer(self, name: str):
+        """获取已加载的tokenizer，未加载时加载；加载失败返回None"""
+        tokenizer = self._cached(name)
+        if tokenizer is not None:
+            return tokenizer
+        with self._lock:
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+        # 只锁当前tokenizer，其他系列的计数不等待加载
+        with load_lock:
+            tokenizer = self._cached(name)
+            if tokenizer is not None:
+                return tokenizer
+            if name in self._failed:
+                return None
+            try:
+                tokenizer = self._load(name)
+            except Exception as e:
+                self._failed.add(name)
+                StandLogger.error(f"Tokenizer加载失败，按字符数估算token数: tokenizer={name}, error={e}")
+                return None
+            with self._lock:
+                self._tokenizers[name] = tokenizer
+                while len(self._tokenizers) > self.max_tokenizers:
+                    self._tokenizers.popitem(last=False)
+            StandLogger.info_log(f"Tokenizer加载完成: {name}")
+            return tokenizer
+
+    @staticmethod
+    def _encode_batch(name: str, tokenizer, texts: List[str]) -> List[List[int]]:
+        if name == OPENAI_TOKENIZER:
+            # 文本中的<|endoftext|>等特殊token按普通文本计数
+            return tokenizer.encode_ordinary_batch(texts)
+        return tokenizer(texts, add_special_tokens=False)["input_ids"]
+
+    def encode_sync(self, model_series: str, text: str) -> Tuple[List[int], int]:
+        name = tokenizer_name(model_series)
+        tokenizer = self.get_tokenizer(name) if name else None
+        if tokenizer is None:
+            return [], estimate_tokens(text)
+        tokens = self._encode_batch(name, tokenizer, [text])[0]
+        return tokens, len(tokens)
+
+    def count_sync(self, model_series: str, texts: Sequence[str]) -> List[int]:
+        """按顺序返回每条文本的token数"""
+        name = tokenizer_name(model_series)
+        tokenizer = self.get_tokenizer(name) if name else None
+        if tokenizer is None:
+            return [estimate_tokens(text) for text in texts]
+        counts: List[Optional[int]] = [None] * len(texts)
+        # {文本哈希: [位置]}，同一请求中重复的文本只编码一次
+        missing: Dict[bytes, List[int]] = {}
+        with self._lock:
+            for index, text in enumerate(texts):
+                key = _text_key(text)
+                count = self._counts.get((name, key))
+                if count is not None:
+                    self._counts.move_to_end((name, key))
+                    counts[index] = count
+                else:
+                    missing.setdefault(key, []).append(index)
+        if missing:
+            keys = list(missing)
+            encoded = self._encode_batch(name, tokenizer, [texts[missing[key][0]] for key in keys])
+            with self._lock:
+                for key, tokens in zip(keys, encoded):
+                    for index in missing[key]:
+                        counts[index] = len(tokens)
+                    if self.count_cache_size > 0:
+                        self._counts[(name, key)] = len(tokens)
+                while len(self._counts) > self.count_cache_size:
+                    self._counts.popitem(last=False)
+        self._record(len(texts), len(texts) - sum(len(indexes) for indexes in missing.values()))
+        return counts
+
+    def _record(self, texts: int, hits: int):
+        with self._lock:
+            before = self._stats["texts"]
+            self._stats["texts"] += texts
+            self._stats["hits"] += hits
+            if before // STATS_LOG_INTERVAL == self._stats["texts"] // STATS_LOG_INTERVAL:
+                return
+            stat = dict(self._stats)
+        StandLogger.info_log(f"token计数缓存统计: texts={stat['texts']}, hits={stat['hits']}, "
+                             f"hit_rate={stat['hits'] / stat['texts']:.2%}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            stat = dict(self._stats)
+            stat["cached_counts"] = len(self._counts)
+            stat["tokenizers"] = list(self._tokenizers)
+        return stat
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def encode(self, model_series: str, text: str) -> Tuple[List[int], int]:
+        """返回 (token ids, token数)，没有可用tokenizer时返回 ([], 估算的token数)"""
+        return await self._run(self.encode_sync, model_series, text)
+
+    async def count(self, model_series: str, text: str) -> int:
+        return (await self._run(self.count_sync, model_series, [text]))[0]
+
+    async def count_many(self, model_series: str, texts: Sequence[str]) -> List[int]:
+        if not texts:
+            return []
+        return await self._run(self.count_sync, model_series, list(texts))
+
+    async def count_messages(self, model_series: str, contents: Sequence[str]) -> int:
+        """多条消息的token总数，每条消息单独缓存"""
+        return sum(await self.count_many(model_series, contents))
+
+    def decode_sync(self, model_series: str, token_ids: List[int]) -> str:
+        name = tokenizer_name(model_series)
+        tokenizer = self.get_tokenizer(name) if name else None
+        if tokenizer is None:
+            raise ValueError(f"模型系列{model_series}没有可用的tokenizer")
+        return tokenizer.decode(token_ids)
+
+    async def decode(self, model_series: str, token_ids: List[int]) -> str:
+        return await self._run(self.decode_sync, model_series, token_ids)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+# 进程级共享实例
+tokenizer_service = TokenizerService()
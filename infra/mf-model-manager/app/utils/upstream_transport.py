@@ -0,0 +1,256 @@
+"""大模型上游连接池
+
+各大模型客户端原先每次请求新建aiohttp.ClientSession，请求结束即关闭连接，
+流式请求的首字时间包含TCP（和TLS）建连时间。现在按上游地址（scheme://host:port）共享传输层：
+- 每个上游一个长连接池，空闲连接保留LLM_UPSTREAM_KEEPALIVE秒
+- 每个上游最多LLM_UPSTREAM_MAX_CONCURRENCY个并发请求，超出的请求排队等待；
+  流式请求在响应读取结束后才释放名额
+- 熔断：连续LLM_UPSTREAM_BREAKER_FAILURES次连接失败、超时或502/503/504后熔断，
+  LLM_UPSTREAM_BREAKER_COOLDOWN秒内直接失败；冷却结束后放行一个试探请求，成功则恢复
+- 统计请求数、排队数、失败数、熔断次数和响应头耗时，每隔STATS_LOG_INTERVAL次请求输出一次
+
+aiohttp不支持HTTP/2，连接复用依赖HTTP/1.1 keep-alive。
+连接池保留默认的TLS证书校验，需要跳过校验的调用方按请求传入ssl=False。
+
+用法与aiohttp.ClientSession一致，退出上下文时不关闭连接池：
+    async with upstream_session() as session:
+        async with session.post(url, json=params, headers=headers) as response:
+            ...
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional
+
+import aiohttp
+from yarl import URL
+
+from app.core.config import base_config
+from app.logs.stand_log import StandLogger
+
+# 每个上游每隔多少次请求输出一次统计
+STATS_LOG_INTERVAL = 1000
+# 计入熔断的上游状态码
+BREAKER_STATUSES = (502, 503, 504)
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+class UpstreamUnavailableError(aiohttp.ClientConnectionError):
+    """上游已熔断，未发出请求"""
+
+
+class UpstreamTransport:
+    """单个上游的连接池、并发限制和熔断状态"""
+
+    def __init__(self, origin: str, max_concurrency: int = None, keepalive: int = None,
+                 breaker_failures: int = None, breaker_cooldown: int = None):
+        self.origin = origin
+        self.max_concurrency = base_config.LLM_UPSTREAM_MAX_CONCURRENCY \
+            if max_concurrency is None else max_concurrency
+        self.keepalive = base_config.LLM_UPSTREAM_KEEPALIVE if keepalive is None else keepalive
+        self.breaker_failures = base_config.LLM_UPSTREAM_BREAKER_FAILURES \
+            if breaker_failures is None else breaker_failures
+        self.breaker_cooldown = base_config.LLM_UPSTREAM_BREAKER_COOLDOWN \
+            if breaker_cooldown is None else breaker_cooldown
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._state = BREAKER_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._stats = {"requests": 0, "in_flight": 0, "waiting": 0, "failures": 0, "rejected": 0,
+                       "breaker_opens": 0, "headers_ms": 0.0}
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=0,
+                                             keepalive_timeout=self.keepalive, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=base_config.aiohttp_timeout)
+        return self._session
+
+    def _admit(self) -> bool:
+        """熔断检查，返回本次请求是否为半开状态下的试探请求"""
+        if self._state == BREAKER_CLOSED:
+            return False
+        if self._state == BREAKER_OPEN and time.monotonic() - self._opened_at >= self.breaker_cooldown:
+            self._state = BREAKER_HALF_OPEN
+        if self._state == BREAKER_HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        self._stats["rejected"] += 1
+        raise UpstreamUnavailableError(f"上游{self.origin}已熔断，{self.breaker_cooldown}秒后重试")
+
+    def record_success(self, trial: bool):
+        if trial:
+            self._trial_in_flight = False
+        if self._state != BREAKER_CLOSED:
+            StandLogger.info_log(f"上游{self.origin}恢复")
+        self._state = BREAKER_CLOSED
+        self._failures = 0
+
+    def record_failure(self, trial: bool, reason):
+        self._stats["failures"] += 1
+        if trial:
+            self._trial_in_flight = False
+        self._failures += 1
+        if self._state == BREAKER_HALF_OPEN or \
+                (self._state == BREAKER_CLOSED and self._failures >= self.breaker_failures):
+            self._state = BREAKER_OPEN
+            self._opened_at = time.monotonic()
+            self._stats["breaker_opens"] += 1
+            StandLogger.warn(f"上游{self.origin}熔断: failures={self._failures}, reason={reason}")
+
+    def _record_request(self, headers_ms: float):
+        stat = self._stats
+        stat["requests"] += 1
+        stat["headers_ms"] += headers_ms
+        if stat["requests"] % STATS_LOG_INTERVAL == 0:
+            StandLogger.info_log(
+                f"上游连接统计: upstream={self.origin}, requests={stat['requests']}, "
+                f"in_flight={stat['in_flight']}, waiting={stat['waiting']}, failures={stat['failures']}, "
+                f"rejected={stat['rejected']}, breaker_opens={stat['breaker_opens']}, "
+                f"avg_headers_ms={stat['headers_ms'] / stat['requests']:.1f}")
+
+    def stats(self) -> dict:
+        stat = dict(self._stats)
+        headers_ms = stat.pop("headers_ms")
+        stat["avg_headers_ms"] = headers_ms / stat["requests"] if stat["requests"] else 0.0
+        stat["breaker"] = self._state
+        stat["max_concurrency"] = self.max_concurrency
+        return stat
+
+    def request(self, method: str, url, **kwargs) -> "_UpstreamRequest":
+        return _UpstreamRequest(self, method, url, kwargs)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
+def _is_upstream_failure(exc) -> bool:
+    return isinstance(exc, (aiohttp.ClientConnectionError, asyncio.TimeoutError)) and \
+        not isinstance(exc, UpstreamUnavailableError)
+
+
+class _UpstreamRequest:
+    """占用并发名额发出请求，响应读取结束后释放"""
+
+    def __init__(self, transport: UpstreamTransport, method: str, url, kwargs: dict):
+        self.transport = transport
+        self.method = method
+        self.url = url
+        self.kwargs = kwargs
+        self._context = None
+        self._trial = False
+        self._acquired = False
+
+    async def __aenter__(self) -> aiohttp.ClientResponse:
+        transport = self.transport
+        self._trial = transport._admit()
+        transport._stats["waiting"] += 1
+        try:
+            await transport._semaphore.acquire()
+        except BaseException:
+            if self._trial:
+                transport._trial_in_flight = False
+            raise
+        finally:
+            transport._stats["waiting"] -= 1
+        self._acquired = True
+        transport._stats["in_flight"] += 1
+        start = time.perf_counter()
+        try:
+            self._context = transport.session.request(self.method, self.url, **self.kwargs)
+            response = await self._context.__aenter__()
+        except BaseException as e:
+            self._release()
+            if _is_upstream_failure(e):
+                transport.record_failure(self._trial, repr(e))
+            elif self._trial:
+                transport._trial_in_flight = False
+            raise
+        transport._record_request((time.perf_counter() - start) * 1000)
+        if response.status in BREAKER_STATUSES:
+            transport.record_failure(self._trial, f"status={response.status}")
+        else:
+            transport.record_success(self._trial)
+        self._trial = False
+        return response
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            return await self._context.__aexit__(exc_type, exc, tb)
+        finally:
+            self._release()
+            # 流式读取过程中断开
+            if exc is not None and _is_upstream_failure(exc):
+                self.transport.record_failure(False, repr(exc))
+
+    def _release(self):
+        if self._acquired:
+            self._acquired = False
+            self.transport._stats["in_flight"] -= 1
+            self.transport._semaphore.release()
+
+
+class PooledSession:
+    """按请求地址选择上游传输层，接口与aiohttp.ClientSession的post/get一致"""
+
+    def __init__(self, pool: "UpstreamTransportPool"):
+        self._pool = pool
+
+    def post(self, url, **kwargs) -> _UpstreamRequest:
+        return self._pool.get(url).request("POST", url, **kwargs)
+
+    def get(self, url, **kwargs) -> _UpstreamRequest:
+        return self._pool.get(url).request("GET", url, **kwargs)
+
+    async def __aenter__(self) -> "PooledSession":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        # 连接池在进程内共享，不随请求关闭
+        return None
+
+
+class UpstreamTransportPool:
+    def __init__(self):
+        # {事件循环: {上游地址: 传输层}}，连接池不能跨事件循环使用。
+        # 以事件循环对象本身为键（而不是id，循环关闭回收后id可能被新循环复用），
+        # 已关闭的事件循环的条目在下次新建传输层时清理
+        self._transports: Dict[asyncio.AbstractEventLoop, Dict[str, UpstreamTransport]] = {}
+
+    def get(self, url) -> UpstreamTransport:
+        origin = str(URL(str(url)).origin())
+        loop = asyncio.get_running_loop()
+        transports = self._transports.get(loop)
+        transport = transports.get(origin) if transports is not None else None
+        if transport is None:
+            self._drop_closed_loops()
+            transport = self._transports.setdefault(loop, {})[origin] = UpstreamTransport(origin)
+        return transport
+
+    def _drop_closed_loops(self):
+        for loop in [loop for loop in self._transports if loop.is_closed()]:
+            del self._transports[loop]
+
+    def stats(self) -> Dict[str, dict]:
+        return {transport.origin: transport.stats()
+                for transports in list(self._transports.values()) for transport in list(transports.values())}
+
+    async def close(self):
+        """关闭当前事件循环中的连接池，在FastAPI停止事件中调用"""
+        for transport in self._transports.pop(asyncio.get_running_loop(), {}).values():
+            await transport.close()
+
+
+# 进程级共享实例
+upstream_pool = UpstreamTransportPool()
+
+
+def upstream_session() -> PooledSession:
+    return PooledSession(upstream_pool)
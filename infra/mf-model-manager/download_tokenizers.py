@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+构建镜像时下载token计数用的tokenizer文件
+
+- openai: tiktoken的cl100k_base编码文件，下载到 app/utils/tiktoken_cache
+- 其他系列: HuggingFace上对应模型的tokenizer文件，下载到 app/utils/tokenizer/<系列>
+
+任一tokenizer下载或加载失败时以非0状态退出，使镜像构建失败。
+环境变量：
+- TOKENIZERS: 需要下载的tokenizer，逗号分隔，默认全部
+- TOKENIZER_REPO_<名称>: 覆盖默认的HuggingFace仓库，如 TOKENIZER_REPO_QWEN=Qwen/Qwen2.5-72B-Instruct
+- HF_ENDPOINT / HF_TOKEN: HuggingFace镜像地址和访问令牌（llama仓库需要令牌）
+"""
+import os
+import sys
+
+from app.utils.tokenizer_service import HF_TOKENIZERS, OPENAI_TOKENIZER, TIKTOKEN_CACHE_DIR, TOKENIZER_DIR, \
+    tokenizer_service
+
+# {tokenizer目录名: HuggingFace仓库}
+TOKENIZER_REPOS = {
+    "qwen": "Qwen/Qwen2.5-7B-Instruct",
+    "internlm": "internlm/internlm2_5-7b-chat",
+    "deepseek": "deepseek-ai/DeepSeek-V3",
+    "chatglm": "THUDM/glm-4-9b-chat",
+    "llama": "meta-llama/Llama-3.1-8B-Instruct",
+}
+# tokenizer相关文件，不下载模型权重
+TOKENIZER_FILES = ["tokenizer*", "*.tiktoken", "*.model", "vocab*", "merges.txt", "special_tokens_map.json",
+                   "added_tokens.json", "config.json", "*.py"]
+
+
+def download(name: str):
+    if name == OPENAI_TOKENIZER:
+        import tiktoken
+        os.makedirs(TIKTOKEN_CACHE_DIR, exist_ok=True)
+        os.environ["TIKTOKEN_CACHE_DIR"] = TIKTOKEN_CACHE_DIR
+        tiktoken.get_encoding("cl100k_base")
+        return
+    from huggingface_hub import snapshot_download
+    repo = os.getenv(f"TOKENIZER_REPO_{name.upper()}", TOKENIZER_REPOS[name])
+    snapshot_download(repo, local_dir=os.path.join(TOKENIZER_DIR, name), allow_patterns=TOKENIZER_FILES)
+
+
+def main() -> int:
+    names = [OPENAI_TOKENIZER] + sorted(set(HF_TOKENIZERS.values()))
+    if os.getenv("TOKENIZERS"):
+        names = [name.strip() for name in os.getenv("TOKENIZERS").split(",") if name.strip()]
+    failed = []
+    for name in names:
+        try:
+            download(name)
+            # 确认服务能加载下载的文件
+            tokenizer_service._load(name)
+            print(f"tokenizer {name} ok")
+        except Exception as e:
+            print(f"tokenizer {name} failed: {e!r}", file=sys.stderr)
+            failed.append(name)
+    if failed:
+        print(f"tokenizer下载失败: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,6 +11,11 @@ from app.utils.app_utils import create_app
 from app.core.config import base_config
 from app.logs.stand_log import StandLogger
 from app.utils.config_cache import quota_config_cache_tree  # 初始化大模型配置缓存
+from app.utils.model_registry import model_registry, MODEL_KIND_SMALL_MODEL
+from app.utils.adapter_cache import adapter_cache
+from app.utils.permission_cache import permission_cache
+from app.utils.upstream_transport import upstream_pool
+from app.utils.tokenizer_service import tokenizer_service
 
 app = create_app()
 
@@ -36,6 +41,37 @@ async def _startup_kafka_consumer():
         StandLogger.error(f"FastAPI 启动事件：启动 Kafka 消费者进程异常: {e}")
 
 
+@app.on_event("startup")
+async def _startup_check_tokenizers():
+    missing = tokenizer_service.check_assets()
+    if not missing:
+        return
+    message = f"缺少tokenizer文件，这些tokenizer将按字符数估算token数: {', '.join(missing)}，" \
+              f"请在构建镜像时执行 download_tokenizers.py"
+    if base_config.TOKENIZER_ASSETS_REQUIRED:
+        raise RuntimeError(message)
+    StandLogger.error(message)
+
+
+@app.on_event("startup")
+async def _startup_model_registry():
+    # 加载模型注册表并订阅模型变更
+    await model_registry.start()
+    # 预编译小模型适配器
+    adapter_cache.warm(model_registry.rows(MODEL_KIND_SMALL_MODEL))
+    # 订阅权限变更
+    await permission_cache.start()
+
+
+@app.on_event("shutdown")
+async def _shutdown_model_registry():
+    await model_registry.stop()
+    await permission_cache.stop()
+    # 关闭大模型上游连接池
+    await upstream_pool.close()
+    tokenizer_service.shutdown()
+
+
 @app.on_event("shutdown")
 async def _shutdown_kafka_consumer():
     try:
@@ -0,0 +1,16 @@
+-- Copyright The kweaver.ai Authors.
+--
+-- Licensed under the Apache License, Version 2.0.
+-- See the LICENSE file in the project root for details.
+
+SET SCHEMA kweaver;
+
+CREATE TABLE if not exists t_model_op_consumer_offset
+(
+    f_group_id VARCHAR(100 CHAR) not null,
+    f_topic VARCHAR(200 CHAR) not null,
+    f_partition INT not null,
+    f_offset BIGINT not null,
+    f_update_time datetime(6) not null,
+    CLUSTER PRIMARY KEY (f_group_id, f_topic, f_partition)
+);
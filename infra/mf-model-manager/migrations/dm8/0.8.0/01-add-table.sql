@@ -0,0 +1,63 @@
+-- Copyright The kweaver.ai Authors.
+--
+-- Licensed under the Apache License, Version 2.0.
+-- See the LICENSE file in the project root for details.
+
+SET SCHEMA kweaver;
+
+CREATE TABLE if not exists t_model_op_usage_hourly
+(
+    f_bucket datetime not null,
+    f_model_id VARCHAR(50 CHAR) not null,
+    f_user_id VARCHAR(50 CHAR) not null,
+    f_input_tokens BIGINT default 0 not null,
+    f_output_tokens BIGINT default 0 not null,
+    f_total_price DECIMAL(38,10) default 0 not null,
+    f_total_count int default 0 not null,
+    f_failed_count int default 0 not null,
+    f_total_time DOUBLE default 0 not null,
+    f_first_time DOUBLE default 0 not null,
+    CLUSTER PRIMARY KEY (f_bucket, f_model_id, f_user_id)
+);
+
+CREATE INDEX IF NOT EXISTS t_model_op_usage_hourly_idx_model_user ON t_model_op_usage_hourly(f_model_id, f_user_id, f_bucket);
+
+CREATE TABLE if not exists t_model_op_usage_daily
+(
+    f_bucket datetime not null,
+    f_model_id VARCHAR(50 CHAR) not null,
+    f_user_id VARCHAR(50 CHAR) not null,
+    f_input_tokens BIGINT default 0 not null,
+    f_output_tokens BIGINT default 0 not null,
+    f_total_price DECIMAL(38,10) default 0 not null,
+    f_total_count int default 0 not null,
+    f_failed_count int default 0 not null,
+    f_total_time DOUBLE default 0 not null,
+    f_first_time DOUBLE default 0 not null,
+    CLUSTER PRIMARY KEY (f_bucket, f_model_id, f_user_id)
+);
+
+CREATE INDEX IF NOT EXISTS t_model_op_usage_daily_idx_model_user ON t_model_op_usage_daily(f_model_id, f_user_id, f_bucket);
+
+CREATE INDEX IF NOT EXISTS t_model_op_detail_idx_create_time ON t_model_op_detail(f_create_time);
+
+-- 按已有明细数据回填汇总表
+insert into t_model_op_usage_hourly (f_bucket, f_model_id, f_user_id, f_input_tokens, f_output_tokens, f_total_price,
+                    f_total_count, f_failed_count, f_total_time, f_first_time)
+                select TRUNC(f_create_time, 'HH'), f_model_id, f_user_id, sum(f_input_tokens), sum(f_output_tokens),
+                    sum(f_total_price), sum(f_total_count), sum(f_failed_count),
+                    sum(f_average_total_time * (f_total_count - f_failed_count)),
+                    sum(f_average_first_time * (f_total_count - f_failed_count))
+                from t_model_op_detail
+                where not exists(select f_bucket from t_model_op_usage_hourly)
+                group by TRUNC(f_create_time, 'HH'), f_model_id, f_user_id;
+
+insert into t_model_op_usage_daily (f_bucket, f_model_id, f_user_id, f_input_tokens, f_output_tokens, f_total_price,
+                    f_total_count, f_failed_count, f_total_time, f_first_time)
+                select TRUNC(f_create_time, 'DD'), f_model_id, f_user_id, sum(f_input_tokens), sum(f_output_tokens),
+                    sum(f_total_price), sum(f_total_count), sum(f_failed_count),
+                    sum(f_average_total_time * (f_total_count - f_failed_count)),
+                    sum(f_average_first_time * (f_total_count - f_failed_count))
+                from t_model_op_detail
+                where not exists(select f_bucket from t_model_op_usage_daily)
+                group by TRUNC(f_create_time, 'DD'), f_model_id, f_user_id;
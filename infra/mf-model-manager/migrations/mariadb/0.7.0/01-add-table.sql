@@ -0,0 +1,16 @@
+-- Copyright The kweaver.ai Authors.
+--
+-- Licensed under the Apache License, Version 2.0.
+-- See the LICENSE file in the project root for details.
+
+USE kweaver;
+
+create table if not exists t_model_op_consumer_offset
+(
+    f_group_id varchar(100) not null comment 'Kafka消费者组',
+    f_topic varchar(200) not null comment 'Kafka主题',
+    f_partition int not null comment '分区',
+    f_offset bigint not null comment '已入库的下一条待消费消息offset',
+    f_update_time datetime(6) not null comment '更新时间',
+    primary key (f_group_id, f_topic, f_partition)
+);
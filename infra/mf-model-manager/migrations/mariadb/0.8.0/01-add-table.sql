@@ -0,0 +1,61 @@
+-- Copyright The kweaver.ai Authors.
+--
+-- Licensed under the Apache License, Version 2.0.
+-- See the LICENSE file in the project root for details.
+
+USE kweaver;
+
+create table if not exists t_model_op_usage_hourly
+(
+    f_bucket datetime not null comment '小时起始时间',
+    f_model_id varchar(50) not null comment '模型id',
+    f_user_id varchar(50) not null comment '用户id',
+    f_input_tokens bigint default 0 not null comment 'input tokens消费',
+    f_output_tokens bigint default 0 not null comment 'output tokens消费',
+    f_total_price DECIMAL(38,10) default 0 not null comment '消费总金额',
+    f_total_count int default 0 not null comment '总调用次数',
+    f_failed_count int default 0 not null comment '调用失败次数',
+    f_total_time double default 0 not null comment '成功调用的总响应时间之和',
+    f_first_time double default 0 not null comment '成功调用的首字时间之和',
+    primary key (f_bucket, f_model_id, f_user_id),
+    key idx_model_op_usage_hourly_model_user (f_model_id, f_user_id, f_bucket)
+);
+
+create table if not exists t_model_op_usage_daily
+(
+    f_bucket datetime not null comment '日期（0点）',
+    f_model_id varchar(50) not null comment '模型id',
+    f_user_id varchar(50) not null comment '用户id',
+    f_input_tokens bigint default 0 not null comment 'input tokens消费',
+    f_output_tokens bigint default 0 not null comment 'output tokens消费',
+    f_total_price DECIMAL(38,10) default 0 not null comment '消费总金额',
+    f_total_count int default 0 not null comment '总调用次数',
+    f_failed_count int default 0 not null comment '调用失败次数',
+    f_total_time double default 0 not null comment '成功调用的总响应时间之和',
+    f_first_time double default 0 not null comment '成功调用的首字时间之和',
+    primary key (f_bucket, f_model_id, f_user_id),
+    key idx_model_op_usage_daily_model_user (f_model_id, f_user_id, f_bucket)
+);
+
+create index if not exists idx_model_op_detail_create_time on t_model_op_detail (f_create_time);
+
+-- 按已有明细数据回填汇总表
+insert into t_model_op_usage_hourly (f_bucket, f_model_id, f_user_id, f_input_tokens, f_output_tokens, f_total_price,
+                    f_total_count, f_failed_count, f_total_time, f_first_time)
+                select DATE_FORMAT(f_create_time, '%Y-%m-%d %H:00:00'), f_model_id, f_user_id, sum(f_input_tokens), sum(f_output_tokens),
+                    sum(f_total_price), sum(f_total_count), sum(f_failed_count),
+                    sum(f_average_total_time * (f_total_count - f_failed_count)),
+                    sum(f_average_first_time * (f_total_count - f_failed_count))
+                from t_model_op_detail
+                where not exists(select f_bucket from t_model_op_usage_hourly)
+                group by DATE_FORMAT(f_create_time, '%Y-%m-%d %H:00:00'), f_model_id, f_user_id;
+
+insert into t_model_op_usage_daily (f_bucket, f_model_id, f_user_id, f_input_tokens, f_output_tokens, f_total_price,
+                    f_total_count, f_failed_count, f_total_time, f_first_time)
+                select DATE(f_create_time), f_model_id, f_user_id, sum(f_input_tokens), sum(f_output_tokens),
+                    sum(f_total_price), sum(f_total_count), sum(f_failed_count),
+                    sum(f_average_total_time * (f_total_count - f_failed_count)),
+                    sum(f_average_first_time * (f_total_count - f_failed_count))
+                from t_model_op_detail
+                where not exists(select f_bucket from t_model_op_usage_daily)
+                group by DATE(f_create_time), f_model_id, f_user_id;
@@ -3,6 +3,9 @@ Session config sync service.
 
 Synchronizes session-level Python dependency configuration into the executor
 runtime by performing a full install into the target dependency directory.
+
+When a dependency layer cache is configured, the resolved requirement set is
+looked up in the cache first and a cached layer replaces the pip install.
 """
 
 from __future__ import annotations
@@ -10,18 +13,34 @@ from __future__ import annotations
 import asyncio
 import importlib.util
 import importlib.metadata
+import json
 import os
+import re
 import shutil
 import sys
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import structlog
 
+if TYPE_CHECKING:
+    from executor.infrastructure.persistence.dependency_layer_cache import DependencyLayerCache
+
 
 logger = structlog.get_logger(__name__)
 
+# name==version (with optional extras); such a spec needs no resolution to be cache keyed
+_PINNED_REQUIREMENT = re.compile(
+    r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)(\[[A-Za-z0-9._,\s-]*\])?\s*==\s*([A-Za-z0-9.+!_-]+)\s*$"
+)
+
+
+def _normalize_name(name: str) -> str:
+    """PEP 503 normalized project name."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
 
 @dataclass(frozen=True)
 class SessionConfigSyncRequest:
@@ -54,6 +73,9 @@ class SessionConfigSyncResult:
     error: str
     started_at: datetime
     completed_at: datetime
+    layer_key: str = ""
+    # "local" / "remote" when restored from the layer cache, "built" after a pip install
+    layer_source: str = ""
 
 
 class SessionConfigSyncError(Exception):
@@ -71,9 +93,16 @@ class SessionDependencyInstallError(SessionConfigSyncError):
 class SessionConfigSyncService:
     """Application service for session dependency synchronization."""
 
-    def __init__(self, install_path: Path, pip_cache_path: Path):
+    def __init__(
+        self,
+        install_path: Path,
+        pip_cache_path: Path,
+        layer_cache: DependencyLayerCache | None = None,
+    ):
         self._install_path = install_path
         self._pip_cache_path = pip_cache_path
+        self._layer_cache = layer_cache
+        self._upload_tasks: set[asyncio.Task] = set()
 
     async def sync(self, request: SessionConfigSyncRequest) -> SessionConfigSyncResult:
         """Synchronize final dependency state for a session."""
@@ -91,8 +120,23 @@ class SessionConfigSyncService:
 
         await asyncio.to_thread(self._reset_install_directory)
 
+        layer_key = ""
+        layer_source = ""
         if request.dependencies:
-            await self._install_dependencies(request)
+            if self._layer_cache is not None:
+                layer_key = await self._resolve_layer_key(request)
+            if layer_key:
+                layer_source = (
+                    await asyncio.to_thread(self._layer_cache.restore, layer_key, self._install_path)
+                    or ""
+                )
+            if not layer_source:
+                # Drop whatever a failed restore may have copied before installing
+                await asyncio.to_thread(self._clear_directory, self._install_path)
+                await self._install_dependencies(request)
+                if layer_key:
+                    await self._publish_layer(layer_key)
+                    layer_source = "built"
 
         installed_dependencies = await asyncio.to_thread(self._scan_installed_dependencies)
         completed_at = datetime.now(timezone.utc)
@@ -101,7 +145,9 @@ class SessionConfigSyncService:
             "Session dependency sync completed",
             session_id=request.session_id,
             dependency_count=len(installed_dependencies),
-            completed_at=completed_at.isoformat(),
+            layer_key=layer_key or None,
+            layer_source=layer_source or None,
+            duration_ms=round((completed_at - started_at).total_seconds() * 1000, 2),
         )
 
         return SessionConfigSyncResult(
@@ -110,7 +156,95 @@ class SessionConfigSyncService:
             error="",
             started_at=started_at,
             completed_at=completed_at,
+            layer_key=layer_key,
+            layer_source=layer_source,
+        )
+
+    async def _resolve_layer_key(self, request: SessionConfigSyncRequest) -> str:
+        """
+        Compute the layer key of the request's resolved requirement set.
+
+        Exact `name==version` pins are used as they are (their transitive
+        dependencies are the ones resolved when the layer was first built, like
+        a lock file). Any other spec is resolved with `pip install --dry-run`.
+        Returns an empty string when the set cannot be resolved; the sync then
+        falls back to a plain install.
+        """
+        requirements = self._pinned_requirements(request.dependencies)
+        if requirements is None:
+            requirements = await self._resolve_requirements(request)
+        if requirements is None:
+            return ""
+        return self._layer_cache.layer_key(
+            request.language_runtime,
+            request.python_package_index_url,
+            requirements,
+        )
+
+    @staticmethod
+    def _pinned_requirements(dependencies: list[str]) -> list[str] | None:
+        requirements = []
+        for dependency in dependencies:
+            match = _PINNED_REQUIREMENT.match(dependency)
+            if match is None:
+                return None
+            name, extras, version = match.groups()
+            extras = re.sub(r"\s+", "", extras or "").lower()
+            requirements.append(f"{_normalize_name(name)}{extras}=={version}")
+        return requirements
+
+    async def _resolve_requirements(self, request: SessionConfigSyncRequest) -> list[str] | None:
+        command = [
+            self._get_pip_python_executable(),
+            "-m",
+            "pip",
+            "install",
+            "--dry-run",
+            "--ignore-installed",
+            "--quiet",
+            "--report",
+            "-",
+            "--cache-dir",
+            str(self._pip_cache_path),
+            "--disable-pip-version-check",
+            "--index-url",
+            request.python_package_index_url,
+            *request.dependencies,
+        ]
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await process.communicate()
+        try:
+            if process.returncode != 0:
+                raise ValueError(stderr.decode("utf-8", errors="replace").strip())
+            report = json.loads(stdout)
+            return [
+                f"{_normalize_name(item['metadata']['name'])}=={item['metadata']['version']}"
+                for item in report["install"]
+            ]
+        except (ValueError, KeyError, TypeError) as exc:
+            logger.warning(
+                "Failed to resolve dependencies for layer cache",
+                session_id=request.session_id,
+                error=str(exc)[:500],
+            )
+            return None
+
+    async def _publish_layer(self, layer_key: str) -> None:
+        """Keep the installed tree as a node-local layer and upload it in the background."""
+        try:
+            await asyncio.to_thread(self._layer_cache.publish, layer_key, self._install_path)
+        except OSError as exc:
+            logger.warning("Failed to cache dependency layer", layer_key=layer_key, error=str(exc))
+            return
+        task = asyncio.get_running_loop().create_task(
+            asyncio.to_thread(self._layer_cache.upload, layer_key)
         )
+        self._upload_tasks.add(task)
+        task.add_done_callback(self._upload_tasks.discard)
 
     def _validate_request(self, request: SessionConfigSyncRequest) -> None:
         if not request.session_id:
@@ -39,10 +39,35 @@ class Settings(BaseModel):
         default="/tmp/pip-cache",
         description="Cache directory for pip install operations",
     )
+    dependency_layer_cache_enabled: bool = Field(
+        default=False,
+        description="Reuse installed dependency trees (layers) keyed by the resolved requirement set",
+    )
+    dependency_layer_cache_path: str = Field(
+        default="/opt/sandbox-layer-cache",
+        description="Node-local directory for extracted dependency layers",
+    )
+    dependency_layer_cache_max_mb: int = Field(
+        default=4096, ge=1, description="Size limit of the node-local layer cache (LRU eviction)"
+    )
+    dependency_layer_store_path: str = Field(
+        default="/mnt/s3-root/dependency-layers",
+        description="Shared layer store directory, the object storage bucket through the s3fs mount "
+        "(empty disables sharing layers across nodes)",
+    )
 
     # Execution Configuration
     default_timeout: int = Field(default=30, ge=1, le=3600, description="Default timeout in seconds")
     max_timeout: int = Field(default=3600, ge=1, le=3600, description="Maximum timeout in seconds")
+    warm_interpreter_enabled: bool = Field(
+        default=False,
+        description="Run Python executions in a per-session pre-forked interpreter",
+    )
+    warm_interpreter_preload: str = Field(
+        default="",
+        description="Comma-separated modules imported by the warm interpreter, "
+        "in addition to the packages installed in dependency_install_path",
+    )
 
     # Heartbeat Configuration
     heartbeat_interval: int = Field(default=5, ge=1, le=60, description="Heartbeat interval in seconds")
@@ -20,6 +20,12 @@ from executor.domain.value_objects import ExecutionResult, ExecutionStatus, Exec
 from executor.infrastructure.isolation.code_wrapper import normalize_shell_code
 from executor.infrastructure.config import settings
 from executor.infrastructure.isolation.result_parser import remove_markers_from_output
+from executor.infrastructure.isolation.zygote import (
+    PythonZygote,
+    ZygoteResult,
+    build_zygote_command,
+    supports_warm_execution,
+)
 
 
 logger = structlog.get_logger(__name__)
@@ -79,15 +85,24 @@ class BubblewrapRunner:
     using Linux namespaces and seccomp filters.
     """
 
-    def __init__(self, workspace_path: Path):
+    def __init__(
+        self,
+        workspace_path: Path,
+        warm_interpreter: bool = False,
+        preload_modules: Optional[List[str]] = None,
+    ):
         """
         Initialize the Bubblewrap runner.
 
         Args:
             workspace_path: Path to the workspace directory
+            warm_interpreter: Run Python executions in a pre-forked interpreter
+            preload_modules: Modules imported by the warm interpreter in addition to
+                the packages installed in the dependency directory
         """
         self.workspace_path = workspace_path
         self._base_args = self._build_base_args()
+        self._zygote = self._create_zygote(preload_modules or []) if warm_interpreter else None
 
     def _build_base_args(self, container_working_directory: str = "/workspace") -> List[str]:
         """
@@ -149,30 +164,36 @@ class BubblewrapRunner:
         )
 
         try:
-            # Build language-specific command and environment
-            cmd, env_args = self._build_command(execution)
-            if env_args:
-                cmd = self._inject_env_args(cmd, env_args)
-
-            # Prepare environment with event data
-            env = os.environ.copy()
-            env["PYTHONPATH"] = self._build_pythonpath(env.get("PYTHONPATH"))
-
-            # Execute with asyncio subprocess (non-blocking)
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=str(self.workspace_path),
-                env=env,
-            )
-
-            # Wait for process to complete and capture output
-            stdout_bytes, stderr_bytes = await process.communicate()
-
-            # Convert bytes to string
-            stdout = stdout_bytes.decode('utf-8')
-            stderr = stderr_bytes.decode('utf-8')
+            warm_result = await self._execute_warm(execution)
+            if warm_result is not None:
+                stdout, stderr = warm_result.stdout, warm_result.stderr
+                returncode = warm_result.exit_code
+            else:
+                # Build language-specific command and environment
+                cmd, env_args = self._build_command(execution)
+                if env_args:
+                    cmd = self._inject_env_args(cmd, env_args)
+
+                # Prepare environment with event data
+                env = os.environ.copy()
+                env["PYTHONPATH"] = self._build_pythonpath(env.get("PYTHONPATH"))
+
+                # Execute with asyncio subprocess (non-blocking)
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    cwd=str(self.workspace_path),
+                    env=env,
+                )
+
+                # Wait for process to complete and capture output
+                stdout_bytes, stderr_bytes = await process.communicate()
+
+                # Convert bytes to string
+                stdout = stdout_bytes.decode('utf-8')
+                stderr = stderr_bytes.decode('utf-8')
+                returncode = process.returncode
 
             duration_ms = (time.perf_counter() - start_time) * 1000
             cpu_time_ms = (time.process_time() - start_cpu) * 1000
@@ -196,10 +217,10 @@ class BubblewrapRunner:
             # For now, we don't have direct access to the child process's memory usage
 
             execution_result = ExecutionResult(
-                status=ExecutionStatus.COMPLETED if process.returncode == 0 else ExecutionStatus.FAILED,
+                status=ExecutionStatus.COMPLETED if returncode == 0 else ExecutionStatus.FAILED,
                 stdout=clean_stdout,
                 stderr=stderr,
-                exit_code=process.returncode,
+                exit_code=returncode,
                 execution_time_ms=duration_ms,
                 return_value=return_value,
                 metrics=metrics,
@@ -208,8 +229,9 @@ class BubblewrapRunner:
             logger.info(
                 "Execution completed",
                 execution_id=execution.execution_id,
-                exit_code=process.returncode,
+                exit_code=returncode,
                 duration_ms=duration_ms,
+                warm=warm_result is not None,
             )
 
             return execution_result
@@ -252,6 +274,58 @@ class BubblewrapRunner:
                 metrics=ExecutionMetrics(duration_ms=round(duration_ms, 2), cpu_time_ms=0),
             )
 
+    def _create_zygote(self, preload_modules: List[str]) -> PythonZygote:
+        """Create the warm interpreter, sandboxed with the same arguments as cold executions."""
+        dependency_path = settings.dependency_install_path
+        cmd = self._build_base_args() + [
+            "--setenv", "PYTHONPATH", self._build_pythonpath(os.environ.get("PYTHONPATH")),
+            "--",
+        ] + build_zygote_command(
+            preload_modules=preload_modules,
+            scan_paths=[dependency_path],
+            # /tmp is a private tmpfs of the zygote sandbox shared by all its executions
+            clean_dirs=["/tmp"],
+        )
+        env = os.environ.copy()
+        env["PYTHONPATH"] = self._build_pythonpath(env.get("PYTHONPATH"))
+        return PythonZygote(command=cmd, env=env, cwd=str(self.workspace_path))
+
+    async def _execute_warm(self, execution: Execution) -> Optional[ZygoteResult]:
+        """
+        Run a Python execution in the warm interpreter.
+
+        Returns:
+            ZygoteResult, or None if the execution has to run in a cold interpreter
+        """
+        if (
+            self._zygote is None
+            or execution.language.lower() != "python"
+            or not supports_warm_execution(execution.context.env_vars)
+        ):
+            return None
+        execution.context.resolve_working_directory_path()
+        env = {
+            "PATH": EXECUTION_PATH,
+            "HOME": "/workspace",
+            "TMPDIR": "/tmp",
+            **self._build_execution_env(execution),
+        }
+        return await self._zygote.execute(
+            code=self._generate_wrapper_code(execution.code),
+            env=env,
+            cwd=execution.context.container_working_directory(),
+        )
+
+    async def restart_warm_interpreter(self) -> None:
+        """Restart the warm interpreter so that it preloads the current session packages."""
+        if self._zygote is not None:
+            await self._zygote.restart()
+
+    async def close(self) -> None:
+        """Stop the warm interpreter."""
+        if self._zygote is not None:
+            await self._zygote.stop()
+
     def _generate_wrapper_code(self, user_code: str) -> str:
         """
         Generate wrapper code for Lambda-style handler execution.
@@ -12,16 +12,24 @@ import time
 import json
 import logging
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from executor.domain.entities import Execution
 from executor.domain.value_objects import ExecutionResult, ExecutionStatus, ExecutionMetrics
 from executor.infrastructure.config import settings
 from executor.infrastructure.isolation.code_wrapper import normalize_shell_code
+from executor.infrastructure.isolation.zygote import (
+    PythonZygote,
+    ZygoteResult,
+    build_zygote_command,
+    supports_warm_execution,
+)
 
 logger = logging.getLogger(__name__)
 
 EXECUTION_PATH = "/usr/local/go/bin:/usr/local/bin:/usr/local/sbin:/usr/bin:/usr/sbin:/bin:/sbin"
+# Outer layer handles the actual execution timeout
+DEFAULT_TIMEOUT_SECONDS = 30
 
 
 class SubprocessRunner:
@@ -32,12 +40,20 @@ class SubprocessRunner:
     security isolation. Never use this in production.
     """
 
-    def __init__(self, workspace_path: Path):
+    def __init__(
+        self,
+        workspace_path: Path,
+        warm_interpreter: bool = False,
+        preload_modules: Optional[List[str]] = None,
+    ):
         """
         Initialize the subprocess runner.
 
         Args:
             workspace_path: Path to the workspace directory (can be S3 path)
+            warm_interpreter: Run Python executions in a pre-forked interpreter
+            preload_modules: Modules imported by the warm interpreter in addition to
+                the packages installed in the dependency directory
         """
         # Store original workspace path for reference
         self.original_workspace_path = workspace_path
@@ -51,6 +67,8 @@ class SubprocessRunner:
         else:
             self.workspace_path = workspace_path
 
+        self._zygote = self._create_zygote(preload_modules or []) if warm_interpreter else None
+
         logger.warning(f"SubprocessRunner initialized - NO SECURITY ISOLATION, workspace_path={self.workspace_path}")
 
     async def execute(self, execution: Execution) -> ExecutionResult:
@@ -72,30 +90,38 @@ class SubprocessRunner:
             cmd, env_args = self._build_command(execution)
             cwd_path = execution.context.resolve_working_directory_path()
 
-            # Execute using asyncio subprocess
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                cwd=str(cwd_path),
-                env=env_args,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=30  # Default timeout, outer layer handles actual timeout
-            )
+            warm_result = await self._execute_warm(execution, cmd, env_args, cwd_path)
+            if warm_result is not None:
+                if warm_result.timed_out:
+                    raise asyncio.TimeoutError()
+                stdout_str, stderr_str = warm_result.stdout, warm_result.stderr
+                returncode = warm_result.exit_code
+            else:
+                # Execute using asyncio subprocess
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    cwd=str(cwd_path),
+                    env=env_args,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(),
+                    timeout=DEFAULT_TIMEOUT_SECONDS,
+                )
+
+                stdout_str = stdout.decode("utf-8", errors="replace")
+                stderr_str = stderr.decode("utf-8", errors="replace")
+                returncode = process.returncode
 
             duration = time.perf_counter() - start_time
             cpu_time = time.process_time() - start_cpu
 
-            stdout_str = stdout.decode("utf-8", errors="replace")
-            stderr_str = stderr.decode("utf-8", errors="replace")
-
             # Parse return value from stdout (for Lambda handlers)
             return_value = None
             language = execution.language.lower()
-            if language in ("python", "python3") and process.returncode == 0:
+            if language in ("python", "python3") and returncode == 0:
                 try:
                     # Lambda handler writes return value as JSON to stdout
                     # But there might be print() statements before the return value
@@ -126,13 +152,13 @@ class SubprocessRunner:
                     logger.debug(f"Failed to parse return value from stdout: {e}")
                     pass
 
-            logger.info(f"Execution completed, execution_id={execution.execution_id}, exit_code={process.returncode}, duration_ms={duration * 1000}")
+            logger.info(f"Execution completed, execution_id={execution.execution_id}, exit_code={returncode}, duration_ms={duration * 1000}, warm={warm_result is not None}")
 
             return ExecutionResult(
-                status=ExecutionStatus.COMPLETED if process.returncode == 0 else ExecutionStatus.FAILED,
+                status=ExecutionStatus.COMPLETED if returncode == 0 else ExecutionStatus.FAILED,
                 stdout=stdout_str,
                 stderr=stderr_str,
-                exit_code=process.returncode,
+                exit_code=returncode,
                 execution_time_ms=duration * 1000,
                 return_value=return_value,
                 metrics=ExecutionMetrics(
@@ -151,7 +177,7 @@ class SubprocessRunner:
                 stdout="",
                 stderr="Execution timed out",
                 exit_code=124,
-                execution_time_ms=30000,
+                execution_time_ms=DEFAULT_TIMEOUT_SECONDS * 1000,
                 return_value=None,
                 metrics=None,
             )
@@ -167,6 +193,62 @@ class SubprocessRunner:
                 metrics=None,
             )
 
+    def _build_base_env(self) -> dict:
+        """Environment shared by all executions."""
+        import os
+
+        # Build environment variables - inherit from current process
+        env_args = os.environ.copy()
+        # Override specific variables
+        env_args.update({
+            "PATH": EXECUTION_PATH,
+            "HOME": str(self.workspace_path),
+            "USER": "sandbox",
+            "WORKSPACE_PATH": str(self.workspace_path),
+            "PYTHONPATH": self._build_pythonpath(env_args.get("PYTHONPATH")),
+        })
+        return env_args
+
+    def _create_zygote(self, preload_modules: List[str]) -> PythonZygote:
+        """Create the warm interpreter with the same interpreter and environment as cold executions."""
+        cmd = build_zygote_command(
+            preload_modules=preload_modules,
+            scan_paths=[settings.dependency_install_path],
+        )
+        return PythonZygote(command=cmd, env=self._build_base_env(), cwd=str(self.workspace_path))
+
+    async def _execute_warm(
+        self, execution: Execution, cmd: List[str], env_args: dict, cwd_path: Path
+    ) -> Optional[ZygoteResult]:
+        """
+        Run a Python execution in the warm interpreter.
+
+        Returns:
+            ZygoteResult, or None if the execution has to run in a cold interpreter
+        """
+        if (
+            self._zygote is None
+            or cmd[:2] != ["python3", "-c"]
+            or not supports_warm_execution(execution.context.env_vars)
+        ):
+            return None
+        return await self._zygote.execute(
+            code=cmd[2],
+            env=env_args,
+            cwd=str(cwd_path),
+            timeout=DEFAULT_TIMEOUT_SECONDS,
+        )
+
+    async def restart_warm_interpreter(self) -> None:
+        """Restart the warm interpreter so that it preloads the current session packages."""
+        if self._zygote is not None:
+            await self._zygote.restart()
+
+    async def close(self) -> None:
+        """Stop the warm interpreter."""
+        if self._zygote is not None:
+            await self._zygote.stop()
+
     def _build_command(self, execution: Execution) -> Tuple[List[str], dict]:
         """
         Build language-specific command and environment.
@@ -177,20 +259,10 @@ class SubprocessRunner:
         Returns:
             Tuple of (command_list, environment_dict)
         """
-        import os
         language = execution.language.lower()
         code = execution.code
 
-        # Build environment variables - inherit from current process
-        env_args = os.environ.copy()
-        # Override specific variables
-        env_args.update({
-            "PATH": EXECUTION_PATH,
-            "HOME": str(self.workspace_path),
-            "USER": "sandbox",
-            "WORKSPACE_PATH": str(self.workspace_path),
-            "PYTHONPATH": self._build_pythonpath(env_args.get("PYTHONPATH")),
-        })
+        env_args = self._build_base_env()
 
         # Add user-provided environment variables
         if execution.context.env_vars:
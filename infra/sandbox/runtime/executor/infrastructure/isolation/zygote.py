@@ -0,0 +1,263 @@
+"""
+Warm Python Interpreter Adapter
+
+Keeps a long-lived Python interpreter (zygote) per session that has the session's
+third-party packages already imported, and forks a fresh child from it for every
+Python execution. This removes interpreter startup and package import time from
+each execution.
+
+The zygote is started by the isolation runner with the same sandbox arguments as a
+cold execution, so forked children run under the same isolation and resource limits.
+Only one execution runs in the zygote at a time; executions that arrive while it is
+busy or not yet started fall back to a cold interpreter.
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from executor.infrastructure.logging import get_logger
+
+
+logger = get_logger()
+
+ZYGOTE_SOURCE = Path(__file__).with_name("zygote_server.py").read_text(encoding="utf-8")
+
+# Result lines carry the full stdout/stderr of an execution
+PROTOCOL_LINE_LIMIT = 256 * 1024 * 1024
+
+# Environment variables read only at interpreter startup; executions setting them run cold
+STARTUP_ENV_PREFIXES = ("PYTHON", "LD_")
+
+
+def build_zygote_command(
+    preload_modules: List[str],
+    scan_paths: List[str],
+    clean_dirs: Optional[List[str]] = None,
+    python: str = "python3",
+) -> List[str]:
+    """
+    Build the interpreter command that runs the zygote server.
+
+    Args:
+        preload_modules: Modules to import at startup
+        scan_paths: Directories whose top-level packages are imported at startup
+        clean_dirs: Directories emptied after each execution (only private tmpfs mounts)
+        python: Interpreter executable
+
+    Returns:
+        Command list to append after the isolation arguments
+    """
+    config = {
+        "preload": preload_modules,
+        "scan_paths": scan_paths,
+        "clean_dirs": clean_dirs or [],
+    }
+    return [python, "-c", ZYGOTE_SOURCE, json.dumps(config)]
+
+
+def supports_warm_execution(env_vars: Optional[Dict[str, str]]) -> bool:
+    """Whether an execution's environment can be applied to an already running interpreter."""
+    return not any(key.upper().startswith(STARTUP_ENV_PREFIXES) for key in (env_vars or {}))
+
+
+class ZygoteError(Exception):
+    """The warm interpreter exited or returned an invalid response."""
+
+
+@dataclass
+class ZygoteResult:
+    """Output of one execution in the warm interpreter."""
+
+    stdout: str
+    stderr: str
+    exit_code: int
+    timed_out: bool = False
+
+
+class PythonZygote:
+    """
+    Client for the zygote server process.
+
+    The process is started lazily in the background; `execute` returns None until it
+    is ready, and while another execution is running in it.
+    """
+
+    def __init__(
+        self,
+        command: List[str],
+        env: Dict[str, str],
+        cwd: str,
+        start_timeout: float = 60.0,
+        cancel_timeout: float = 5.0,
+    ):
+        """
+        Initialize the zygote client.
+
+        Args:
+            command: Complete command that starts the zygote server (including isolation)
+            env: Environment of the zygote process
+            cwd: Working directory of the zygote process
+            start_timeout: Maximum time to wait for preloading to finish
+            cancel_timeout: Maximum time to wait for a cancelled execution to be killed
+        """
+        self._command = command
+        self._env = env
+        self._cwd = cwd
+        self._start_timeout = start_timeout
+        self._cancel_timeout = cancel_timeout
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._start_task: Optional[asyncio.Task] = None
+        self._cancel_tasks: set[asyncio.Task] = set()
+        self._busy = False
+
+    @property
+    def is_ready(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    def ensure_started(self) -> None:
+        """Start the zygote in the background if it is not running or starting."""
+        if self.is_ready or (self._start_task is not None and not self._start_task.done()):
+            return
+        self._process = None
+        self._start_task = asyncio.get_running_loop().create_task(self._start())
+
+    async def _start(self) -> None:
+        process = await asyncio.create_subprocess_exec(
+            *self._command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            cwd=self._cwd,
+            env=self._env,
+            limit=PROTOCOL_LINE_LIMIT,
+        )
+        try:
+            line = await asyncio.wait_for(process.stdout.readline(), timeout=self._start_timeout)
+            message = json.loads(line) if line else {}
+            if not message.get("ready"):
+                raise ZygoteError("Warm interpreter exited during startup")
+        except (asyncio.TimeoutError, ValueError, ZygoteError) as e:
+            await self._kill(process)
+            logger.warning("Failed to start warm interpreter", error=str(e) or type(e).__name__)
+            return
+        except asyncio.CancelledError:
+            await self._kill(process)
+            raise
+
+        self._process = process
+        logger.info(
+            "Warm interpreter ready",
+            preloaded_modules=len(message.get("preloaded", [])),
+            startup_ms=message.get("startup_ms"),
+        )
+
+    async def execute(
+        self,
+        code: str,
+        env: Dict[str, str],
+        cwd: str,
+        timeout: Optional[float] = None,
+    ) -> Optional[ZygoteResult]:
+        """
+        Run code in a child forked from the warm interpreter.
+
+        Args:
+            code: Complete Python source to execute as __main__
+            env: Environment of the execution (replaces the zygote environment)
+            cwd: Working directory of the execution
+            timeout: Kill the execution after this many seconds
+
+        Returns:
+            ZygoteResult, or None when the zygote cannot take the execution now
+
+        Raises:
+            ZygoteError: If the zygote died while running the execution
+        """
+        if not self.is_ready:
+            self.ensure_started()
+            return None
+        if self._busy:
+            return None
+
+        process = self._process
+        request = {"code": code, "env": env, "cwd": cwd, "timeout": timeout}
+        self._busy = True
+        try:
+            process.stdin.write(json.dumps(request).encode("utf-8") + b"\n")
+            await process.stdin.drain()
+            line = await process.stdout.readline()
+        except asyncio.CancelledError:
+            # Timeout enforced by the caller: kill the child, keep the zygote
+            self._cancel_in_background(process)
+            raise
+        except (ConnectionError, OSError) as e:
+            self._busy = False
+            await self._discard(process)
+            raise ZygoteError(f"Warm interpreter is not reachable: {e}") from e
+
+        self._busy = False
+        if not line:
+            await self._discard(process)
+            raise ZygoteError("Warm interpreter exited unexpectedly")
+        message = json.loads(line)
+        return ZygoteResult(
+            stdout=message["stdout"],
+            stderr=message["stderr"],
+            exit_code=message["exit_code"],
+            timed_out=message.get("timed_out", False),
+        )
+
+    def _cancel_in_background(self, process: asyncio.subprocess.Process) -> None:
+        async def cancel() -> None:
+            try:
+                process.stdin.write(b"cancel\n")
+                await process.stdin.drain()
+                line = await asyncio.wait_for(process.stdout.readline(), timeout=self._cancel_timeout)
+                if not line:
+                    raise ZygoteError("Warm interpreter exited while cancelling")
+            except Exception as e:
+                logger.warning("Failed to cancel warm execution, restarting interpreter", error=str(e))
+                await self._discard(process)
+            finally:
+                self._busy = False
+
+        task = asyncio.get_running_loop().create_task(cancel())
+        self._cancel_tasks.add(task)
+        task.add_done_callback(self._cancel_tasks.discard)
+
+    async def _discard(self, process: asyncio.subprocess.Process) -> None:
+        if self._process is process:
+            self._process = None
+        await self._kill(process)
+
+    @staticmethod
+    async def _kill(process: asyncio.subprocess.Process) -> None:
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+        await process.wait()
+
+    async def stop(self) -> None:
+        """Stop the zygote; the next execution starts a new one."""
+        if self._start_task is not None and not self._start_task.done():
+            self._start_task.cancel()
+            try:
+                await self._start_task
+            except asyncio.CancelledError:
+                pass
+        self._start_task = None
+        for task in list(self._cancel_tasks):
+            task.cancel()
+        if self._process is not None:
+            await self._discard(self._process)
+        self._busy = False
+
+    async def restart(self) -> None:
+        """Replace the zygote, e.g. after session dependencies were reinstalled."""
+        await self.stop()
+        self.ensure_started()
@@ -0,0 +1,297 @@
+"""
+Warm interpreter (zygote) server.
+
+Runs inside the sandbox as a long-lived ``python3 -c`` process. It imports the
+session's third-party packages once, then forks a fresh child for every
+execution request so that each execution starts from the same preloaded state
+and cannot leak interpreter state into the next one.
+
+This file is passed to the interpreter as source text and must only use the
+standard library.
+
+Protocol (one JSON document per line):
+    argv[1]  {"preload": [...], "scan_paths": [...], "clean_dirs": [...]}
+    stdout   {"ready": true, "preloaded": [...], "startup_ms": float}
+    stdin    {"code": str, "env": {...}, "cwd": str, "timeout": float | null}
+    stdout   {"stdout": str, "stderr": str, "exit_code": int, "timed_out": bool}
+    stdin    "cancel" while an execution is running kills it
+"""
+
+import importlib
+import json
+import os
+import selectors
+import shutil
+import signal
+import sys
+import time
+import traceback
+import types
+
+STDIN_FD = 0
+# Replaced in main() by a duplicate of the original stdout; fd 1 then points to stderr
+PROTOCOL_FD = 1
+# Grace period for reading output still buffered in the pipes after the child exits
+DRAIN_GRACE_SECONDS = 1.0
+
+
+def _discover_modules(path):
+    """Top-level importable names installed in a site-packages style directory."""
+    names = []
+    try:
+        entries = sorted(os.listdir(path))
+    except OSError:
+        return names
+    for entry in entries:
+        full_path = os.path.join(path, entry)
+        if entry.startswith(("_", ".")) or entry in ("bin", "share", "include"):
+            continue
+        if os.path.isdir(full_path):
+            if os.path.exists(os.path.join(full_path, "__init__.py")):
+                names.append(entry)
+        elif entry.endswith(".py"):
+            names.append(entry[:-3])
+        elif entry.endswith(".so") and "." in entry:
+            names.append(entry.split(".", 1)[0])
+    return [name for name in names if name.isidentifier()]
+
+
+def _preload(config):
+    preloaded = []
+    modules = list(config.get("preload") or [])
+    for path in config.get("scan_paths") or []:
+        modules.extend(_discover_modules(path))
+    seen = set()
+    for name in modules:
+        if name in seen:
+            continue
+        seen.add(name)
+        try:
+            importlib.import_module(name)
+            preloaded.append(name)
+        except BaseException:
+            # Packages that fail to import are imported (and fail) in the execution itself
+            pass
+    return preloaded
+
+
+def _write_message(message):
+    data = (json.dumps(message) + "\n").encode("utf-8")
+    while data:
+        written = os.write(PROTOCOL_FD, data)
+        data = data[written:]
+
+
+class _StdinReader:
+    """Line reader on the raw stdin fd, so it can be combined with select."""
+
+    def __init__(self):
+        self._buffer = b""
+        self.closed = False
+
+    def feed(self):
+        chunk = os.read(STDIN_FD, 65536)
+        if not chunk:
+            self.closed = True
+        self._buffer += chunk
+
+    def pop_line(self):
+        if b"\n" not in self._buffer:
+            return None
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return line
+
+    def pop_cancel(self):
+        """Consume buffered lines; True if a cancel request was among them."""
+        cancelled = False
+        while True:
+            line = self.pop_line()
+            if line is None:
+                return cancelled
+            cancelled = cancelled or line.strip() == b"cancel"
+
+    def readline(self):
+        while True:
+            line = self.pop_line()
+            if line is not None or self.closed:
+                return line
+            self.feed()
+
+
+def _exit_code_of(status):
+    code = getattr(status, "code", status)
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def _run_child(request, out_fd, err_fd):
+    """Executed in the forked child: never returns."""
+    exit_code = 1
+    try:
+        os.setsid()
+        os.close(PROTOCOL_FD)
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, STDIN_FD)
+        os.dup2(out_fd, 1)
+        os.dup2(err_fd, 2)
+        for fd in (devnull, out_fd, err_fd):
+            os.close(fd)
+        sys.stdin = open(os.devnull)
+        os.environ.clear()
+        os.environ.update(request.get("env") or {})
+        os.chdir(request.get("cwd") or os.getcwd())
+        code = compile(request["code"], "<string>", "exec")
+        # Match a cold `python3 -c`: user code runs in the real __main__ module, so
+        # pickle and multiprocessing can look up the classes and functions it defines
+        main = types.ModuleType("__main__")
+        main.__builtins__ = __builtins__
+        sys.modules["__main__"] = main
+        sys.argv = ["-c"]
+        exit_code = 0
+        exec(code, main.__dict__)
+    except SystemExit as e:
+        exit_code = _exit_code_of(e)
+    except BaseException as e:
+        # Hide this frame so the traceback matches a cold `python3 -c` run
+        traceback.print_exception(type(e), e, e.__traceback__.tb_next)
+        exit_code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        except BaseException:
+            pass
+        os._exit(exit_code)
+
+
+def _kill_group(pid, reaped=False):
+    # Until it is reaped, the child may not have called setsid() yet, so kill it directly as well
+    kills = (os.killpg,) if reaped else (os.killpg, os.kill)
+    for kill in kills:
+        try:
+            kill(pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+def _clean_dirs(paths):
+    """Remove files left behind by the previous execution (private tmpfs only)."""
+    for path in paths:
+        try:
+            entries = os.listdir(path)
+        except OSError:
+            continue
+        for entry in entries:
+            full_path = os.path.join(path, entry)
+            try:
+                if os.path.isdir(full_path) and not os.path.islink(full_path):
+                    shutil.rmtree(full_path, ignore_errors=True)
+                else:
+                    os.unlink(full_path)
+            except OSError:
+                pass
+
+
+def _execute(request, stdin_reader, clean_dirs):
+    out_read, out_write = os.pipe()
+    err_read, err_write = os.pipe()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        os.close(out_read)
+        os.close(err_read)
+        _run_child(request, out_write, err_write)
+    os.close(out_write)
+    os.close(err_write)
+
+    timeout = request.get("timeout")
+    deadline = time.monotonic() + timeout if timeout else None
+    output = {out_read: [], err_read: []}
+    open_fds = {out_read, err_read}
+    selector = selectors.DefaultSelector()
+    selector.register(out_read, selectors.EVENT_READ)
+    selector.register(err_read, selectors.EVENT_READ)
+    selector.register(STDIN_FD, selectors.EVENT_READ)
+    status = None
+    timed_out = False
+    drain_deadline = None
+    # A cancel request may already have been read together with the execution request
+    if stdin_reader.pop_cancel():
+        _kill_group(pid)
+
+    while open_fds or status is None:
+        now = time.monotonic()
+        if status is None and deadline is not None and now >= deadline:
+            timed_out = True
+            _kill_group(pid)
+        if drain_deadline is not None and now >= drain_deadline:
+            break
+        # Once the output pipes are closed the child is about to exit: poll it more often
+        for key, _ in selector.select(timeout=0.05 if open_fds else 0.001):
+            fd = key.fd
+            if fd == STDIN_FD:
+                stdin_reader.feed()
+                if stdin_reader.pop_cancel() or stdin_reader.closed:
+                    _kill_group(pid)
+                if stdin_reader.closed:
+                    selector.unregister(STDIN_FD)
+                continue
+            chunk = os.read(fd, 65536)
+            if chunk:
+                output[fd].append(chunk)
+            else:
+                selector.unregister(fd)
+                open_fds.discard(fd)
+        if status is None:
+            waited_pid, wait_status = os.waitpid(pid, os.WNOHANG)
+            if waited_pid == pid:
+                status = wait_status
+                # Background processes started by the execution die with it
+                _kill_group(pid, reaped=True)
+                drain_deadline = time.monotonic() + DRAIN_GRACE_SECONDS
+
+    selector.close()
+    for fd in (out_read, err_read):
+        os.close(fd)
+    _clean_dirs(clean_dirs)
+    return {
+        "stdout": b"".join(output[out_read]).decode("utf-8", errors="replace"),
+        "stderr": b"".join(output[err_read]).decode("utf-8", errors="replace"),
+        "exit_code": os.waitstatus_to_exitcode(status),
+        "timed_out": timed_out,
+    }
+
+
+def main():
+    global PROTOCOL_FD
+
+    started = time.perf_counter()
+    # Anything printed by the zygote itself (e.g. while importing packages) goes to stderr
+    PROTOCOL_FD = os.dup(1)
+    os.dup2(2, 1)
+    config = json.loads(sys.argv[1]) if len(sys.argv) > 1 else {}
+    preloaded = _preload(config)
+    clean_dirs = config.get("clean_dirs") or []
+    _write_message({
+        "ready": True,
+        "preloaded": preloaded,
+        "startup_ms": round((time.perf_counter() - started) * 1000, 2),
+    })
+
+    stdin_reader = _StdinReader()
+    while True:
+        line = stdin_reader.readline()
+        if line is None:
+            return
+        if not line.strip() or line.strip() == b"cancel":
+            continue
+        _write_message(_execute(json.loads(line), stdin_reader, clean_dirs))
+
+
+if __name__ == "__main__":
+    main()
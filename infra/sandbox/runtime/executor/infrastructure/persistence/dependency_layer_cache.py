@@ -0,0 +1,321 @@
+"""
+Dependency layer cache.
+
+Content-addressed cache of installed session dependency trees ("layers"). A layer
+is the content of the dependency install directory after `pip install --target`
+for one resolved requirement set, keyed by a hash of the runtime, interpreter,
+package index URL and the pinned requirements.
+
+Layers are kept in two places:
+    <store_path>/<key>.tar.gz    shared store, visible to every executor
+                                 (the object storage bucket through the s3fs mount)
+    <cache_path>/<key>/tree/     node-local extracted copy, evicted in LRU order
+
+Restoring a layer copies the node-local tree into the install directory, using
+hard links when both are on the same filesystem. Files in the install directory
+must therefore never be modified in place; the directory is mounted read-only
+into the sandbox and is only ever cleared and refilled by the sync service.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import sys
+import sysconfig
+import tarfile
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from executor.infrastructure.logging.logging_config import get_logger
+
+logger = get_logger()
+
+# Bump when the layer content layout changes, so old layers are never reused
+LAYER_FORMAT_VERSION = 1
+
+LAYER_ARCHIVE_SUFFIX = ".tar.gz"
+_TREE_DIR = "tree"
+_SIZE_FILE = ".size"
+_LAST_USED_FILE = ".last_used"
+
+
+def compute_layer_key(language_runtime: str, index_url: str, requirements: list[str]) -> str:
+    """
+    Compute the content address of a dependency layer.
+
+    Args:
+        language_runtime: Session language runtime, e.g. python3.11
+        index_url: Package index the requirements are resolved against
+        requirements: Fully pinned requirement set (name==version)
+
+    Returns:
+        Hex sha256 digest
+    """
+    payload = {
+        "format": LAYER_FORMAT_VERSION,
+        "runtime": language_runtime,
+        # Compiled wheels depend on the interpreter ABI and platform, not only on the runtime name
+        "interpreter": sys.implementation.cache_tag,
+        "platform": sysconfig.get_platform(),
+        "index_url": index_url.rstrip("/"),
+        "requirements": sorted({requirement.strip().lower() for requirement in requirements}),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _is_layer_key(key: str) -> bool:
+    return len(key) == 64 and all(char in "0123456789abcdef" for char in key)
+
+
+def _check_layer_key(key: str) -> None:
+    # Keys are joined into paths under the cache and store directories
+    if not _is_layer_key(key):
+        raise ValueError(f"Invalid dependency layer key: {key!r}")
+
+
+def _tree_size(path: Path) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+class DependencyLayerCache:
+    """
+    Node-local LRU cache of dependency layers backed by a shared layer store.
+
+    All methods are blocking and are expected to run in a worker thread.
+    Concurrent executors on the same node may share `cache_path`; building and
+    evicting layers is serialized with file locks.
+    """
+
+    def __init__(self, cache_path: Path, max_bytes: int, store_path: Optional[Path] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_path: Node-local directory for extracted layers
+            max_bytes: Size limit of the node-local cache
+            store_path: Shared layer store directory (None disables sharing across nodes)
+        """
+        self._cache_path = cache_path
+        self._max_bytes = max_bytes
+        self._store_path = store_path
+
+    @staticmethod
+    def layer_key(language_runtime: str, index_url: str, requirements: list[str]) -> str:
+        """Content address of a resolved requirement set (see compute_layer_key)."""
+        return compute_layer_key(language_runtime, index_url, requirements)
+
+    def restore(self, key: str, target: Path) -> Optional[str]:
+        """
+        Fill an empty install directory with a cached layer.
+
+        Args:
+            key: Layer key
+            target: Empty dependency install directory
+
+        Returns:
+            "local" or "remote" depending on where the layer was found, None on a miss
+        """
+        _check_layer_key(key)
+        source = "local"
+        layer = self._layer_path(key)
+        if not self._is_complete(layer):
+            if not self._fetch(key):
+                return None
+            source = "remote"
+
+        try:
+            shutil.copytree(
+                layer / _TREE_DIR,
+                target,
+                symlinks=True,
+                copy_function=_link_or_copy,
+                dirs_exist_ok=True,
+            )
+        except (OSError, shutil.Error) as e:
+            # The layer may have been evicted by another executor while it was being copied
+            logger.warning("Failed to restore dependency layer", layer_key=key, error=str(e))
+            return None
+        self._touch(layer)
+        return source
+
+    def prefetch(self, key: str) -> bool:
+        """Pull a layer from the shared store into the node-local cache."""
+        _check_layer_key(key)
+        return self._is_complete(self._layer_path(key)) or self._fetch(key)
+
+    def publish(self, key: str, source: Path) -> None:
+        """
+        Store a freshly installed dependency tree as a node-local layer.
+
+        Args:
+            key: Layer key
+            source: Dependency install directory after a successful install
+        """
+        _check_layer_key(key)
+        self._build_layer(
+            key,
+            lambda tree: shutil.copytree(source, tree, symlinks=True, copy_function=_link_or_copy),
+        )
+
+    def upload(self, key: str) -> bool:
+        """
+        Copy a node-local layer to the shared store, unless it is already there.
+
+        Returns:
+            True if the layer was uploaded
+        """
+        _check_layer_key(key)
+        layer = self._layer_path(key)
+        if self._store_path is None or not self._is_complete(layer):
+            return False
+        archive = self._archive_path(key)
+        if archive.exists():
+            return False
+
+        started = time.perf_counter()
+        archive.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{key}.", dir=archive.parent)
+        os.close(fd)
+        try:
+            with tarfile.open(tmp_name, "w:gz", compresslevel=1) as tar:
+                tar.add(layer / _TREE_DIR, arcname=_TREE_DIR)
+            os.replace(tmp_name, archive)
+        except OSError as e:
+            logger.warning("Failed to upload dependency layer", layer_key=key, error=str(e))
+            return False
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+        logger.info(
+            "Dependency layer uploaded",
+            layer_key=key,
+            size_bytes=archive.stat().st_size,
+            duration_ms=round((time.perf_counter() - started) * 1000, 2),
+        )
+        return True
+
+    def evict(self) -> int:
+        """
+        Remove least recently used layers until the cache fits in its size limit.
+
+        Returns:
+            Number of layers removed
+        """
+        if not self._cache_path.exists():
+            return 0
+        with self._lock("evict"):
+            layers = []
+            for layer in self._cache_path.iterdir():
+                if _is_layer_key(layer.name) and self._is_complete(layer):
+                    layers.append((self._last_used(layer), self._size(layer), layer))
+            total = sum(size for _, size, _ in layers)
+            removed = 0
+            for _, size, layer in sorted(layers):
+                if total <= self._max_bytes:
+                    break
+                shutil.rmtree(layer, ignore_errors=True)
+                total -= size
+                removed += 1
+                logger.info("Evicted dependency layer", layer_key=layer.name, size_bytes=size)
+            return removed
+
+    def _fetch(self, key: str) -> bool:
+        if self._store_path is None:
+            return False
+        archive = self._archive_path(key)
+        if not archive.exists():
+            return False
+
+        def extract(tree: Path) -> None:
+            with tarfile.open(archive, "r:gz") as tar:
+                # The "data" filter rejects absolute paths and links leaving the layer
+                tar.extractall(tree.parent, filter="data")
+
+        started = time.perf_counter()
+        try:
+            self._build_layer(key, extract)
+        except (OSError, tarfile.TarError) as e:
+            logger.warning("Failed to download dependency layer", layer_key=key, error=str(e))
+            return False
+        logger.info(
+            "Dependency layer downloaded",
+            layer_key=key,
+            duration_ms=round((time.perf_counter() - started) * 1000, 2),
+        )
+        return self._is_complete(self._layer_path(key))
+
+    def _build_layer(self, key: str, fill) -> None:
+        """Create a node-local layer atomically: fill a temporary directory, then rename it."""
+        self._cache_path.mkdir(parents=True, exist_ok=True)
+        with self._lock(key):
+            layer = self._layer_path(key)
+            if self._is_complete(layer):
+                return
+            staging = Path(tempfile.mkdtemp(prefix=f".{key}.", dir=self._cache_path))
+            try:
+                fill(staging / _TREE_DIR)
+                (staging / _SIZE_FILE).write_text(str(_tree_size(staging / _TREE_DIR)))
+                (staging / _LAST_USED_FILE).touch()
+                os.rename(staging, layer)
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+        self.evict()
+
+    @contextmanager
+    def _lock(self, name: str) -> Iterator[None]:
+        with open(self._cache_path / f".{name}.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _layer_path(self, key: str) -> Path:
+        return self._cache_path / key
+
+    def _archive_path(self, key: str) -> Path:
+        return self._store_path / f"{key}{LAYER_ARCHIVE_SUFFIX}"
+
+    @staticmethod
+    def _is_complete(layer: Path) -> bool:
+        return (layer / _SIZE_FILE).exists()
+
+    @staticmethod
+    def _size(layer: Path) -> int:
+        try:
+            return int((layer / _SIZE_FILE).read_text())
+        except (OSError, ValueError):
+            return 0
+
+    @staticmethod
+    def _last_used(layer: Path) -> float:
+        try:
+            return (layer / _LAST_USED_FILE).stat().st_mtime
+        except OSError:
+            return 0.0
+
+    @staticmethod
+    def _touch(layer: Path) -> None:
+        try:
+            (layer / _LAST_USED_FILE).touch()
+        except OSError:
+            pass
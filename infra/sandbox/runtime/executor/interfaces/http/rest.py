@@ -42,6 +42,10 @@ from executor.infrastructure.isolation.bwrap import BubblewrapRunner
 from executor.infrastructure.logging import configure_logging, get_logger
 from executor.infrastructure.monitoring.metrics import MetricsCollector
 from executor.infrastructure.persistence.artifact_scanner import ArtifactScanner
+from executor.infrastructure.persistence.dependency_layer_cache import (
+    DependencyLayerCache,
+    _is_layer_key,
+)
 
 
 # Configure structured logging
@@ -156,6 +160,25 @@ class SessionConfigSyncResponseModel(BaseModel):
     error: str = ""
     started_at: str
     completed_at: str
+    layer_key: str = ""
+    layer_source: str = ""
+
+
+class DependencyLayerPrefetchRequestModel(BaseModel):
+    """Internal request model for pulling dependency layers into the node-local cache."""
+
+    layer_keys: list[str] = Field(
+        default_factory=list, max_length=32, description="Dependency layer keys to prefetch"
+    )
+
+    @field_validator("layer_keys")
+    @classmethod
+    def validate_layer_keys(cls, value: list[str]) -> list[str]:
+        # Keys become file names under the layer cache and store directories
+        invalid = [key for key in value if not _is_layer_key(key)]
+        if invalid:
+            raise ValueError(f"invalid dependency layer keys: {invalid}")
+        return value
 
 
 # Global service instances
@@ -165,6 +188,10 @@ _lifecycle_service: Optional[LifecycleService] = None
 _callback_client: Optional[CallbackClient] = None
 _metrics_collector: Optional[MetricsCollector] = None
 _session_config_sync_service: Optional[SessionConfigSyncService] = None
+_dependency_layer_cache: Optional[DependencyLayerCache] = None
+_prefetch_tasks: set[asyncio.Task] = set()
+# Isolation runner with a warm Python interpreter (None when the warm interpreter is disabled)
+_warm_interpreter_runner = None
 
 
 def get_execute_command() -> ExecuteCodeCommand:
@@ -208,6 +235,7 @@ async def lifespan(app: FastAPI):
     Note: Uvicorn handles SIGINT/SIGTERM and triggers this shutdown automatically.
     """
     global _execute_command, _heartbeat_service, _lifecycle_service, _callback_client, _metrics_collector, _session_config_sync_service
+    global _warm_interpreter_runner, _dependency_layer_cache
 
     # Environment variables
     workspace_path = Path(os.environ.get("WORKSPACE_PATH", str(settings.workspace_path)))
@@ -272,11 +300,24 @@ async def lifespan(app: FastAPI):
     # Linux uses Bubblewrap, macOS uses Seatbelt sandbox
     # Check if bwrap is disabled via environment variable
     disable_bwrap = os.environ.get("DISABLE_BWRAP", "false").lower() == "true"
+    # Opt-in: run Python executions in a pre-forked interpreter with the session packages imported
+    warm_interpreter = os.environ.get(
+        "WARM_INTERPRETER_ENABLED", str(settings.warm_interpreter_enabled)
+    ).lower() == "true"
+    preload_modules = [
+        module.strip()
+        for module in os.environ.get("WARM_INTERPRETER_PRELOAD", settings.warm_interpreter_preload).split(",")
+        if module.strip()
+    ]
 
     if is_linux and not disable_bwrap:
         try:
-            bwrap_runner = BubblewrapRunner(workspace_path=workspace_path)
-            logger.info("Using BubblewrapRunner for Linux isolation")
+            bwrap_runner = BubblewrapRunner(
+                workspace_path=workspace_path,
+                warm_interpreter=warm_interpreter,
+                preload_modules=preload_modules,
+            )
+            logger.info("Using BubblewrapRunner for Linux isolation", warm_interpreter=warm_interpreter)
         except Exception as e:
             logger.warning("Failed to initialize BubblewrapRunner", error=str(e))
             bwrap_runner = None
@@ -300,9 +341,18 @@ async def lifespan(app: FastAPI):
     # Fallback to SubprocessRunner if no isolation is available
     if bwrap_runner is None:
         from executor.infrastructure.isolation.subprocess import SubprocessRunner
-        bwrap_runner = SubprocessRunner(workspace_path=workspace_path)
+        bwrap_runner = SubprocessRunner(
+            workspace_path=workspace_path,
+            warm_interpreter=warm_interpreter,
+            preload_modules=preload_modules,
+        )
         logger.warning("Using SubprocessRunner - NO SECURITY ISOLATION (development mode only)")
 
+    from executor.infrastructure.isolation.subprocess import SubprocessRunner
+    # The macOS Seatbelt runner has no warm interpreter
+    if warm_interpreter and isinstance(bwrap_runner, (BubblewrapRunner, SubprocessRunner)):
+        _warm_interpreter_runner = bwrap_runner
+
     # ArtifactScanner doesn't need workspace_path in constructor
     artifact_scanner = ArtifactScanner()
 
@@ -345,9 +395,11 @@ async def lifespan(app: FastAPI):
         control_plane_url=control_plane_url,
     )
     _execute_command = execute_command
+    _dependency_layer_cache = _create_dependency_layer_cache()
     _session_config_sync_service = SessionConfigSyncService(
         install_path=Path(settings.dependency_install_path),
         pip_cache_path=Path(settings.pip_cache_path),
+        layer_cache=_dependency_layer_cache,
     )
 
     logger.info("Executor startup complete")
@@ -429,6 +481,10 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error("Failed to send container_exited", error=str(e))
 
+    # Stop the warm interpreter
+    if _warm_interpreter_runner is not None:
+        await _warm_interpreter_runner.close()
+
     # Close callback client
     await callback_client.close()
 
@@ -751,8 +807,42 @@ def create_app() -> FastAPI:
                 },
             ) from exc
 
+        # Installed packages changed: the warm interpreter must preload the new set
+        if _warm_interpreter_runner is not None:
+            await _warm_interpreter_runner.restart_warm_interpreter()
+
         return _map_session_config_sync_result(result)
 
+    @app.post(
+        "/internal/dependency-layers/prefetch",
+        status_code=status.HTTP_202_ACCEPTED,
+        summary="Prefetch dependency layers",
+        description="Internal endpoint used by control plane to pull popular dependency layers "
+        "into the node-local cache before a session needs them",
+        tags=["internal"],
+    )
+    async def prefetch_dependency_layers_endpoint(
+        request: DependencyLayerPrefetchRequestModel,
+    ) -> dict:
+        """Pull dependency layers from the shared store in the background."""
+        if _dependency_layer_cache is None:
+            return {"accepted": 0}
+
+        layer_cache = _dependency_layer_cache
+
+        async def prefetch() -> None:
+            for layer_key in request.layer_keys:
+                try:
+                    await asyncio.to_thread(layer_cache.prefetch, layer_key)
+                except OSError as e:
+                    logger.warning("Failed to prefetch dependency layer", layer_key=layer_key, error=str(e))
+
+        # Keep a reference so the task is not garbage-collected before it finishes
+        task = asyncio.create_task(prefetch())
+        _prefetch_tasks.add(task)
+        task.add_done_callback(_prefetch_tasks.discard)
+        return {"accepted": len(request.layer_keys)}
+
     return app
 
 
@@ -781,6 +871,31 @@ if __name__ == "__main__":
     main()
 
 
+def _create_dependency_layer_cache() -> Optional[DependencyLayerCache]:
+    """Create the dependency layer cache when it is enabled."""
+    enabled = os.environ.get(
+        "DEPENDENCY_LAYER_CACHE_ENABLED", str(settings.dependency_layer_cache_enabled)
+    ).lower() == "true"
+    if not enabled:
+        return None
+
+    cache_path = Path(os.environ.get("DEPENDENCY_LAYER_CACHE_PATH", settings.dependency_layer_cache_path))
+    max_mb = int(os.environ.get("DEPENDENCY_LAYER_CACHE_MAX_MB", str(settings.dependency_layer_cache_max_mb)))
+    store_path_env = os.environ.get("DEPENDENCY_LAYER_STORE_PATH", settings.dependency_layer_store_path)
+    store_path = Path(store_path_env) if store_path_env else None
+    # Without the object storage mount (local/dev mode) layers are only reused on this node
+    if store_path is not None and not store_path.parent.is_dir():
+        store_path = None
+
+    logger.info(
+        "Dependency layer cache enabled",
+        cache_path=str(cache_path),
+        max_mb=max_mb,
+        store_path=str(store_path) if store_path else None,
+    )
+    return DependencyLayerCache(cache_path=cache_path, max_bytes=max_mb * 1024 * 1024, store_path=store_path)
+
+
 def _map_session_config_sync_result(
     result: SessionConfigSyncResult,
 ) -> SessionConfigSyncResponseModel:
@@ -799,4 +914,6 @@ def _map_session_config_sync_result(
         error=result.error,
         started_at=result.started_at.isoformat(),
         completed_at=result.completed_at.isoformat(),
+        layer_key=result.layer_key,
+        layer_source=result.layer_source,
     )
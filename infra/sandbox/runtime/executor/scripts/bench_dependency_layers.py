@@ -0,0 +1,91 @@
+"""
+Session dependency sync latency benchmark: pip install vs dependency layer cache.
+
+Syncs the same requirement set through SessionConfigSyncService several times:
+- pip:    no layer cache, every sync runs `pip install --target`
+- built:  first sync with the layer cache (pip install + node-local layer; upload in background)
+- local:  layer found in the node-local cache
+- remote: layer found only in the shared store (a new node with an empty cache)
+
+Usage (from infra/sandbox/runtime):
+    python -m executor.scripts.bench_dependency_layers --deps pandas==2.1.3 --iterations 5
+    python -m executor.scripts.bench_dependency_layers --index-url file:///opt/wheels/simple
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from executor.application.services.session_config_sync_service import (
+    SessionConfigSyncRequest,
+    SessionConfigSyncService,
+)
+from executor.infrastructure.persistence.dependency_layer_cache import DependencyLayerCache
+
+
+async def _sync(service: SessionConfigSyncService, args) -> tuple[float, str]:
+    started = time.perf_counter()
+    result = await service.sync(
+        SessionConfigSyncRequest(
+            session_id="bench",
+            language_runtime="python3.11",
+            python_package_index_url=args.index_url,
+            dependencies=args.deps.split(","),
+            sync_mode="replace",
+        )
+    )
+    latency = (time.perf_counter() - started) * 1000
+    # The upload runs after the sync has returned; finish it before the next sync
+    await asyncio.gather(*service._upload_tasks)
+    return latency, result.layer_source
+
+
+async def run(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        store = root / "store"
+
+        def layer_cache(name: str) -> DependencyLayerCache:
+            return DependencyLayerCache(root / name, max_bytes=8 * 1024**3, store_path=store)
+
+        print(f"deps={args.deps} iterations={args.iterations}")
+        print(f"{'mode':<8}{'p50_ms':>10}{'min_ms':>10}{'max_ms':>10}")
+        rows = {"pip": [], "built": [], "local": [], "remote": []}
+
+        plain = SessionConfigSyncService(root / "deps", root / "pip-cache")
+        for _ in range(args.iterations):
+            rows["pip"].append((await _sync(plain, args))[0])
+
+        cached = SessionConfigSyncService(root / "deps", root / "pip-cache", layer_cache("node-0"))
+        for _ in range(args.iterations + 1):
+            latency, source = await _sync(cached, args)
+            rows[source].append(latency)
+
+        for index in range(args.iterations):
+            fresh_node = SessionConfigSyncService(
+                root / "deps", root / "pip-cache", layer_cache(f"node-{index + 1}")
+            )
+            latency, source = await _sync(fresh_node, args)
+            rows[source].append(latency)
+
+        for mode, latencies in rows.items():
+            if latencies:
+                print(
+                    f"{mode:<8}{statistics.median(latencies):>10.0f}"
+                    f"{min(latencies):>10.0f}{max(latencies):>10.0f}"
+                )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--deps", default="pandas==2.1.3", help="Comma-separated pip specs")
+    parser.add_argument("--index-url", default="https://pypi.org/simple/")
+    parser.add_argument("--iterations", type=int, default=5)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Cold vs warm interpreter latency benchmark.
+
+Runs the same handler repeatedly through an isolation runner with the warm
+interpreter disabled (cold: a new interpreter per execution) and enabled (warm:
+a child forked from the pre-forked interpreter), and prints p50/p95 latency per
+language. Only Python has a warm path; JavaScript and shell are listed to show
+that they are unaffected.
+
+Usage (from infra/sandbox/runtime):
+    python -m executor.scripts.bench_warm_interpreter --runner subprocess --iterations 30
+    python -m executor.scripts.bench_warm_interpreter --runner bwrap --preload numpy,pandas
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from executor.domain.entities import Execution
+from executor.domain.value_objects import ExecutionContext
+
+WORKLOADS = {
+    "python": (
+        "import {module}\n"
+        "def handler(event):\n"
+        "    return {'module': {module}.__name__}\n"
+    ),
+    "javascript": "function handler(event) { return {ok: true}; }\n",
+    "shell": "echo ok\n",
+}
+
+
+def _create_runner(kind: str, workspace: Path, warm: bool, preload: list[str]):
+    if kind == "bwrap":
+        from executor.infrastructure.isolation.bwrap import BubblewrapRunner
+
+        return BubblewrapRunner(workspace, warm_interpreter=warm, preload_modules=preload)
+    from executor.infrastructure.isolation.subprocess import SubprocessRunner
+
+    return SubprocessRunner(workspace, warm_interpreter=warm, preload_modules=preload)
+
+
+def _execution(language: str, code: str, workspace: Path, index: int) -> Execution:
+    return Execution(
+        execution_id=f"bench-{language}-{index}",
+        session_id="bench",
+        code=code,
+        language=language,
+        context=ExecutionContext(
+            workspace_path=workspace,
+            session_id="bench",
+            execution_id=f"bench-{language}-{index}",
+            control_plane_url="http://localhost:8000",
+        ),
+    )
+
+
+async def _measure(runner, language: str, code: str, workspace: Path, iterations: int) -> list[float]:
+    latencies = []
+    for index in range(iterations):
+        started = time.perf_counter()
+        result = await runner.execute(_execution(language, code, workspace, index))
+        latencies.append((time.perf_counter() - started) * 1000)
+        if result.exit_code != 0:
+            raise RuntimeError(f"{language} execution failed: {result.stderr}")
+    return latencies
+
+
+async def _wait_until_warm(runner, timeout: float = 120.0) -> None:
+    """Executions run cold until the warm interpreter has finished preloading."""
+    deadline = time.monotonic() + timeout
+    runner._zygote.ensure_started()
+    while not runner._zygote.is_ready:
+        if time.monotonic() > deadline:
+            raise RuntimeError("Warm interpreter did not start")
+        await asyncio.sleep(0.05)
+
+
+async def run(args) -> None:
+    preload = [module for module in args.preload.split(",") if module]
+    module = preload[0] if preload else "json"
+    with tempfile.TemporaryDirectory() as tmp:
+        workspace = Path(tmp)
+        print(f"runner={args.runner} iterations={args.iterations} preload={preload or '-'}")
+        print(f"{'language':<12}{'mode':<6}{'p50_ms':>10}{'p95_ms':>10}{'mean_ms':>10}")
+        for mode in ("cold", "warm"):
+            runner = _create_runner(args.runner, workspace, mode == "warm", preload)
+            try:
+                for language, template in WORKLOADS.items():
+                    if args.language and language != args.language:
+                        continue
+                    code = template.replace("{module}", module)
+                    if mode == "warm":
+                        await _wait_until_warm(runner)
+                    # Warm-up run, excluded from the statistics
+                    await _measure(runner, language, code, workspace, 1)
+                    latencies = sorted(await _measure(runner, language, code, workspace, args.iterations))
+                    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+                    print(
+                        f"{language:<12}{mode:<6}{statistics.median(latencies):>10.1f}"
+                        f"{p95:>10.1f}{statistics.fmean(latencies):>10.1f}"
+                    )
+            finally:
+                await runner.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runner", choices=["subprocess", "bwrap"], default="subprocess")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--preload", default="numpy", help="Comma-separated modules to preload")
+    parser.add_argument("--language", choices=list(WORKLOADS), default=None)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -421,6 +421,19 @@ class TestHTTPInterfaceIntegration:
         assert data["status"] == "completed"
         assert data["installed_dependencies"][0]["name"] == "requests"
 
+    def test_prefetch_dependency_layers_rejects_invalid_keys(self, test_app):
+        """Test /internal/dependency-layers/prefetch rejects keys that are not layer digests."""
+        from fastapi.testclient import TestClient
+
+        client = TestClient(test_app)
+
+        response = client.post(
+            "/internal/dependency-layers/prefetch",
+            json={"layer_keys": ["a" * 64, "../../etc/passwd"]},
+        )
+
+        assert response.status_code == 422
+
 
 @pytest.mark.integration
 class TestEndToEndExecution:
@@ -123,3 +123,65 @@ class TestSessionConfigSyncService:
 
         with pytest.raises(SessionConfigValidationError):
             await service.sync(request)
+
+
+class TestSessionConfigSyncServiceLayerCache:
+    """Tests for syncing through the dependency layer cache."""
+
+    @pytest.fixture
+    def service(self, tmp_path):
+        from executor.infrastructure.persistence.dependency_layer_cache import DependencyLayerCache
+
+        layer_cache = DependencyLayerCache(
+            cache_path=tmp_path / "layers",
+            max_bytes=1024 * 1024,
+            store_path=tmp_path / "store",
+        )
+        return SessionConfigSyncService(
+            install_path=tmp_path / "deps",
+            pip_cache_path=tmp_path / "pip-cache",
+            layer_cache=layer_cache,
+        )
+
+    @staticmethod
+    def _request(dependencies):
+        return SessionConfigSyncRequest(
+            session_id="sess_1",
+            language_runtime="python3.11",
+            python_package_index_url="https://pypi.org/simple/",
+            dependencies=dependencies,
+            sync_mode="replace",
+        )
+
+    def test_pinned_requirements_are_normalized(self):
+        assert SessionConfigSyncService._pinned_requirements(
+            ["Requests==2.31.0", "uvicorn[Standard] == 0.30.0"]
+        ) == ["requests==2.31.0", "uvicorn[standard]==0.30.0"]
+        assert SessionConfigSyncService._pinned_requirements(["requests>=2"]) is None
+
+    @pytest.mark.asyncio
+    async def test_second_sync_restores_layer_without_pip(self, service):
+        async def fake_install(request):
+            (service._install_path / "requests").mkdir()
+            (service._install_path / "requests" / "__init__.py").write_text("")
+
+        with patch.object(service, "_install_dependencies", side_effect=fake_install) as install_mock:
+            first = await service.sync(self._request(["requests==2.31.0"]))
+            second = await service.sync(self._request(["requests==2.31.0"]))
+
+        assert install_mock.await_count == 1
+        assert first.layer_source == "built"
+        assert second.layer_source == "local"
+        assert second.layer_key == first.layer_key
+        assert (service._install_path / "requests" / "__init__.py").exists()
+
+    @pytest.mark.asyncio
+    async def test_unresolvable_requirements_skip_cache(self, service):
+        with patch.object(service, "_resolve_requirements", return_value=None), patch.object(
+            service, "_install_dependencies"
+        ) as install_mock:
+            result = await service.sync(self._request(["requests>=2"]))
+
+        assert install_mock.await_count == 1
+        assert result.layer_key == ""
+        assert result.layer_source == ""
@@ -0,0 +1,124 @@
+"""
+Unit tests for the dependency layer cache.
+"""
+
+import os
+import time
+
+import pytest
+
+from executor.infrastructure.persistence.dependency_layer_cache import (
+    DependencyLayerCache,
+    compute_layer_key,
+)
+
+
+def _make_tree(path, size=100):
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "pkg").mkdir(exist_ok=True)
+    (path / "pkg" / "__init__.py").write_bytes(b"x" * size)
+    return path
+
+
+def _key(name):
+    return compute_layer_key("python3.11", "https://pypi.org/simple/", [f"{name}==1.0"])
+
+
+class TestComputeLayerKey:
+    """Tests for compute_layer_key."""
+
+    def test_order_and_case_insensitive(self):
+        assert compute_layer_key("python3.11", "https://pypi.org/simple/", ["a==1", "B==2"]) == compute_layer_key(
+            "python3.11", "https://pypi.org/simple", ["b==2", "a==1"]
+        )
+
+    def test_index_url_and_runtime_change_key(self):
+        base = compute_layer_key("python3.11", "https://pypi.org/simple/", ["a==1"])
+        assert base != compute_layer_key("python3.12", "https://pypi.org/simple/", ["a==1"])
+        assert base != compute_layer_key("python3.11", "https://mirror.example/simple/", ["a==1"])
+
+
+class TestDependencyLayerCache:
+    """Tests for DependencyLayerCache."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return DependencyLayerCache(
+            cache_path=tmp_path / "layers",
+            max_bytes=1024 * 1024,
+            store_path=tmp_path / "store",
+        )
+
+    def test_restore_miss(self, cache, tmp_path):
+        assert cache.restore(_key("a"), tmp_path / "target") is None
+
+    def test_publish_then_restore_local(self, cache, tmp_path):
+        key = _key("a")
+        cache.publish(key, _make_tree(tmp_path / "installed"))
+        target = tmp_path / "target"
+        target.mkdir()
+
+        assert cache.restore(key, target) == "local"
+        assert (target / "pkg" / "__init__.py").read_bytes() == b"x" * 100
+
+    def test_restore_from_shared_store_on_another_node(self, cache, tmp_path):
+        key = _key("a")
+        cache.publish(key, _make_tree(tmp_path / "installed"))
+        assert cache.upload(key) is True
+        assert cache.upload(key) is False
+
+        other_node = DependencyLayerCache(
+            cache_path=tmp_path / "other-layers",
+            max_bytes=1024 * 1024,
+            store_path=tmp_path / "store",
+        )
+        target = tmp_path / "target"
+        target.mkdir()
+
+        assert other_node.restore(key, target) == "remote"
+        assert (target / "pkg" / "__init__.py").exists()
+        second_target = tmp_path / "second-target"
+        second_target.mkdir()
+        assert other_node.restore(key, second_target) == "local"
+
+    def test_prefetch_pulls_layer_into_node_cache(self, cache, tmp_path):
+        key = _key("a")
+        cache.publish(key, _make_tree(tmp_path / "installed"))
+        cache.upload(key)
+        other_node = DependencyLayerCache(
+            cache_path=tmp_path / "other-layers",
+            max_bytes=1024 * 1024,
+            store_path=tmp_path / "store",
+        )
+
+        assert other_node.prefetch(key) is True
+        assert other_node.prefetch(_key("missing")) is False
+        assert (tmp_path / "other-layers" / key / "tree" / "pkg" / "__init__.py").exists()
+
+    @pytest.mark.parametrize("key", ["../escape", "A" * 64, ""])
+    def test_invalid_keys_rejected(self, cache, tmp_path, key):
+        target = tmp_path / "target"
+        target.mkdir()
+
+        with pytest.raises(ValueError):
+            cache.restore(key, target)
+        with pytest.raises(ValueError):
+            cache.prefetch(key)
+        assert not (tmp_path / "escape").exists()
+
+    def test_evicts_least_recently_used_layer(self, tmp_path):
+        cache = DependencyLayerCache(cache_path=tmp_path / "layers", max_bytes=250)
+        keys = [_key(name) for name in ("a", "b", "c")]
+        for key in keys[:2]:
+            cache.publish(key, _make_tree(tmp_path / key, size=100))
+        # Use "a" so that "b" becomes the least recently used layer
+        old = time.time() - 60
+        os.utime(tmp_path / "layers" / keys[1] / ".last_used", (old, old))
+        target = tmp_path / "target"
+        target.mkdir()
+        cache.restore(keys[0], target)
+
+        cache.publish(keys[2], _make_tree(tmp_path / keys[2], size=100))
+
+        remaining = {path.name for path in (tmp_path / "layers").iterdir() if not path.name.startswith(".")}
+        assert remaining == {keys[0], keys[2]}
@@ -0,0 +1,201 @@
+"""
+Unit tests for the warm interpreter (zygote).
+
+Runs the zygote server with the current interpreter, without isolation.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from executor.domain.entities import Execution
+from executor.domain.value_objects import ExecutionContext
+from executor.infrastructure.isolation.subprocess import SubprocessRunner
+from executor.infrastructure.isolation.zygote import (
+    PythonZygote,
+    build_zygote_command,
+    supports_warm_execution,
+)
+
+
+async def _ready_zygote(tmp_path: Path, preload=None) -> PythonZygote:
+    zygote = PythonZygote(
+        command=build_zygote_command(preload or [], [], python=sys.executable),
+        env=dict(os.environ),
+        cwd=str(tmp_path),
+    )
+    zygote.ensure_started()
+    for _ in range(200):
+        if zygote.is_ready:
+            return zygote
+        await asyncio.sleep(0.05)
+    raise AssertionError("zygote did not start")
+
+
+class TestSupportsWarmExecution:
+    """Tests for supports_warm_execution."""
+
+    def test_plain_env_vars(self):
+        assert supports_warm_execution({"API_KEY": "x"}) is True
+        assert supports_warm_execution(None) is True
+
+    def test_interpreter_startup_env_vars(self):
+        assert supports_warm_execution({"PYTHONHASHSEED": "0"}) is False
+        assert supports_warm_execution({"LD_PRELOAD": "/lib/x.so"}) is False
+
+
+class TestPythonZygote:
+    """Tests for PythonZygote."""
+
+    @pytest.mark.asyncio
+    async def test_execute_returns_none_until_ready(self, tmp_path):
+        zygote = PythonZygote(
+            command=build_zygote_command([], [], python=sys.executable),
+            env=dict(os.environ),
+            cwd=str(tmp_path),
+        )
+        try:
+            assert await zygote.execute("print(1)", {}, str(tmp_path)) is None
+        finally:
+            await zygote.stop()
+
+    @pytest.mark.asyncio
+    async def test_execute_in_forked_child(self, tmp_path):
+        zygote = await _ready_zygote(tmp_path, preload=["json"])
+        try:
+            code = (
+                "import os, sys\n"
+                "print(os.environ['NAME'], os.getcwd())\n"
+                "print('warn', file=sys.stderr)\n"
+                "sys.exit(3)\n"
+            )
+            result = await zygote.execute(code, {"NAME": "sandbox"}, str(tmp_path))
+
+            assert result.stdout == f"sandbox {tmp_path}\n"
+            assert result.stderr == "warn\n"
+            assert result.exit_code == 3
+        finally:
+            await zygote.stop()
+
+    @pytest.mark.asyncio
+    async def test_state_does_not_leak_between_executions(self, tmp_path):
+        zygote = await _ready_zygote(tmp_path, preload=["json"])
+        try:
+            await zygote.execute("import json\njson.leaked = True", {}, str(tmp_path))
+            result = await zygote.execute(
+                "import json\nprint(hasattr(json, 'leaked'))", {}, str(tmp_path)
+            )
+
+            assert result.stdout == "False\n"
+        finally:
+            await zygote.stop()
+
+    @pytest.mark.asyncio
+    async def test_main_module_matches_cold_run(self, tmp_path):
+        code = (
+            "import pickle, sys\n"
+            "class Foo:\n"
+            "    pass\n"
+            "print(type(pickle.loads(pickle.dumps(Foo()))).__name__, sys.argv)\n"
+        )
+        cold = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, cwd=tmp_path
+        )
+        zygote = await _ready_zygote(tmp_path)
+        try:
+            warm = await zygote.execute(code, dict(os.environ), str(tmp_path))
+
+            assert cold.stdout == "Foo ['-c']\n"
+            assert (warm.stdout, warm.stderr, warm.exit_code) == (
+                cold.stdout,
+                cold.stderr,
+                cold.returncode,
+            )
+        finally:
+            await zygote.stop()
+
+    @pytest.mark.asyncio
+    async def test_uncaught_exception_traceback(self, tmp_path):
+        zygote = await _ready_zygote(tmp_path)
+        try:
+            result = await zygote.execute("raise ValueError('boom')", {}, str(tmp_path))
+
+            assert result.exit_code == 1
+            assert result.stderr.splitlines()[1] == '  File "<string>", line 1, in <module>'
+            assert result.stderr.endswith("ValueError: boom\n")
+        finally:
+            await zygote.stop()
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_child(self, tmp_path):
+        zygote = await _ready_zygote(tmp_path)
+        try:
+            result = await zygote.execute(
+                "import time\nprint('started', flush=True)\ntime.sleep(30)",
+                {},
+                str(tmp_path),
+                timeout=0.2,
+            )
+
+            assert result.timed_out is True
+            assert result.stdout == "started\n"
+            assert result.exit_code == -9
+        finally:
+            await zygote.stop()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_execution_keeps_zygote(self, tmp_path):
+        zygote = await _ready_zygote(tmp_path)
+        try:
+            task = asyncio.create_task(
+                zygote.execute("import time\ntime.sleep(30)", {}, str(tmp_path))
+            )
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            for _ in range(100):
+                result = await zygote.execute("print('next')", {}, str(tmp_path))
+                if result is not None:
+                    break
+                await asyncio.sleep(0.05)
+
+            assert result.stdout == "next\n"
+        finally:
+            await zygote.stop()
+
+
+class TestSubprocessRunnerWarmInterpreter:
+    """Tests for the warm interpreter path of SubprocessRunner."""
+
+    @pytest.mark.asyncio
+    async def test_python_handler_result(self, tmp_path):
+        runner = SubprocessRunner(workspace_path=tmp_path, warm_interpreter=True)
+        try:
+            runner._zygote = await _ready_zygote(tmp_path)
+            execution = Execution(
+                execution_id="exec-1",
+                session_id="session-1",
+                code="def handler(event):\n    print('hello')\n    return {'name': event['name']}\n",
+                language="python",
+                context=ExecutionContext(
+                    workspace_path=tmp_path,
+                    session_id="session-1",
+                    execution_id="exec-1",
+                    control_plane_url="http://localhost:8000",
+                    event={"name": "warm"},
+                ),
+            )
+
+            result = await runner.execute(execution)
+
+            assert result.exit_code == 0
+            assert result.stdout == "hello\n"
+            assert result.return_value == {"name": "warm"}
+        finally:
+            await runner.close()
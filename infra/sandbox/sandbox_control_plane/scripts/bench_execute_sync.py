@@ -0,0 +1,143 @@
+"""
+execute-sync 等待方式压测
+
+对比两种等待执行结果的方式：
+- poll: 原实现，每个请求每隔 poll_interval 秒查询一次数据库
+- notify: ExecutionCompletionNotifier，回调在本进程内唤醒等待者，
+  落在其他副本上的回调由每进程一条批量查询发现
+
+数据库和 executor 均为模拟：执行耗时服从对数正态分布，每次数据库查询计数一次并模拟查询延迟。
+输出数据库 QPS 以及响应延迟（执行完成到请求返回）的 p50/p99。
+
+用法:
+    python scripts/bench_execute_sync.py --concurrency 200 --duration 20 --remote-ratio 0.5
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.infrastructure.messaging.execution_notifier import ExecutionCompletionNotifier  # noqa: E402
+
+
+class FakeDatabase:
+    """模拟执行表：记录每个执行的完成时间，统计查询次数"""
+
+    def __init__(self, query_latency: float):
+        self.query_latency = query_latency
+        self.completed_at = {}
+        self.queries = 0
+
+    async def is_terminal(self, execution_id: str) -> bool:
+        self.queries += 1
+        await asyncio.sleep(self.query_latency)
+        return execution_id in self.completed_at
+
+    async def find_terminal(self, execution_ids) -> set:
+        self.queries += 1
+        await asyncio.sleep(self.query_latency)
+        return {execution_id for execution_id in execution_ids if execution_id in self.completed_at}
+
+
+async def _run_execution(db, notifier, execution_id, remote_ratio, rng):
+    """模拟 executor 执行并回调：remote 的回调落在其他副本，不会唤醒本进程"""
+    await asyncio.sleep(rng.lognormvariate(-0.5, 0.8))
+    db.completed_at[execution_id] = time.monotonic()
+    if notifier is not None and rng.random() >= remote_ratio:
+        notifier.notify(execution_id)
+
+
+async def _wait_poll(db, execution_id, poll_interval):
+    while not await db.is_terminal(execution_id):
+        await asyncio.sleep(poll_interval)
+
+
+async def _wait_notify(db, notifier, execution_id):
+    while True:
+        waiter = notifier.register(execution_id)
+        if await db.is_terminal(execution_id):
+            notifier.unregister(execution_id, waiter)
+            return
+        await notifier.wait(execution_id, waiter, timeout=300)
+
+
+async def _client(mode, db, notifier, args, rng, latencies, stop_at, counter):
+    while time.monotonic() < stop_at:
+        execution_id = f"exec-{next(counter)}"
+        executor = asyncio.create_task(
+            _run_execution(db, notifier if mode == "notify" else None, execution_id, args.remote_ratio, rng)
+        )
+        if mode == "poll":
+            await _wait_poll(db, execution_id, args.poll_interval)
+        else:
+            await _wait_notify(db, notifier, execution_id)
+        latencies.append(time.monotonic() - db.completed_at[execution_id])
+        await executor
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+async def run(mode: str, args) -> dict:
+    rng = random.Random(args.seed)
+    db = FakeDatabase(args.query_latency)
+    notifier = None
+    if mode == "notify":
+        notifier = ExecutionCompletionNotifier(
+            fallback_interval=args.fallback_interval, terminal_checker=db.find_terminal
+        )
+    latencies = []
+    started = time.monotonic()
+    counter = itertools.count()
+    await asyncio.gather(
+        *(
+            _client(mode, db, notifier, args, rng, latencies, started + args.duration, counter)
+            for _ in range(args.concurrency)
+        )
+    )
+    elapsed = time.monotonic() - started
+    if notifier is not None:
+        await notifier.close()
+    return {
+        "mode": mode,
+        "executions": len(latencies),
+        "db_qps": db.queries / elapsed,
+        "queries_per_execution": db.queries / max(len(latencies), 1),
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=200, help="并发 execute-sync 请求数")
+    parser.add_argument("--duration", type=float, default=20.0, help="每种方式的压测时长（秒）")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="poll 方式的查询间隔（秒）")
+    parser.add_argument("--fallback-interval", type=float, default=2.0, help="notify 方式的批量查询间隔（秒）")
+    parser.add_argument("--remote-ratio", type=float, default=0.0, help="回调落在其他副本上的比例")
+    parser.add_argument("--query-latency", type=float, default=0.002, help="模拟的单次查询延迟（秒）")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'mode':<8}{'executions':>12}{'db_qps':>10}{'q/exec':>9}{'p50_ms':>10}{'p99_ms':>10}{'mean_ms':>10}")
+    for mode in ("poll", "notify"):
+        result = asyncio.run(run(mode, args))
+        print(
+            f"{result['mode']:<8}{result['executions']:>12}{result['db_qps']:>10.1f}"
+            f"{result['queries_per_execution']:>9.2f}{result['p50_ms']:>10.1f}"
+            f"{result['p99_ms']:>10.1f}{result['mean_ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
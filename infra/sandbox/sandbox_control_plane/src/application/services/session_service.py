@@ -6,6 +6,7 @@
 
 from typing import Callable, List, Optional
 from datetime import datetime, timedelta
+import time
 import uuid
 
 from src.domain.entities.session import InstalledDependency, Session
@@ -27,6 +28,11 @@ from src.infrastructure.config.settings import get_settings
 from src.application.commands.execute_code import ExecuteCodeCommand
 from src.application.queries.get_session import GetSessionQuery
 from src.application.queries.get_execution import GetExecutionQuery
+from src.application.services.warm_pool_service import (
+    SOURCE_COLD,
+    SOURCE_WARM,
+    WarmPoolService,
+)
 from src.application.dtos.session_dto import SessionDTO
 from src.application.dtos.execution_dto import ExecutionDTO
 from src.shared.errors.domain import NotFoundError, ValidationError, ConflictError
@@ -63,6 +69,7 @@ class SessionService:
         storage_service: Optional[IStorageService] = None,
         executor_client: Optional[ExecutorClient] = None,
         initial_dependency_sync_scheduler: Optional[Callable[[str, int], None]] = None,
+        warm_pool: Optional[WarmPoolService] = None,
     ):
         self._session_repo = session_repo
         self._execution_repo = execution_repo
@@ -71,6 +78,7 @@ class SessionService:
         self._storage_service = storage_service
         self._executor_client = executor_client or ExecutorClient()
         self._initial_dependency_sync_scheduler = initial_dependency_sync_scheduler
+        self._warm_pool = warm_pool
 
     async def create_session(self, command: CreateSessionCommand) -> SessionDTO:
         """
@@ -82,9 +90,10 @@ class SessionService:
         3. 调用调度器选择运行时节点
         4. 创建会话实体
         5. 保存到仓储
-        6. 创建 Docker 容器
+        6. 领取预热容器，未命中时创建 Docker 容器
         7. 更新会话状态为 running
         """
+        started_at = time.monotonic()
         if not command.template_id:
             settings = get_settings()
             command.template_id = settings.default_template_id
@@ -131,13 +140,19 @@ class SessionService:
         await self._session_repo.save(session)
         logger.debug("Session saved to repository", session_id=session_id)
 
-        # 6. 创建容器
-        container_id = await self._create_container_for_session(
-            session=session,
-            template=template,
-            command=command,
-            runtime_node=runtime_node,
-        )
+        # 6. 领取预热容器，未命中时创建容器
+        container_id = await self._claim_warm_container(session, runtime_node)
+        source = SOURCE_WARM
+        if container_id is None:
+            source = SOURCE_COLD
+            container_id = await self._create_container_for_session(
+                session=session,
+                template=template,
+                command=command,
+                runtime_node=runtime_node,
+            )
+        if self._warm_pool is not None and container_id:
+            self._warm_pool.record_create_latency(source, time.monotonic() - started_at)
 
         logger.info(
             "Session created successfully",
@@ -221,6 +236,67 @@ class SessionService:
             dependency_install_status="pending" if dependencies else "completed",
         )
 
+    async def _claim_warm_container(
+        self,
+        session: Session,
+        runtime_node: RuntimeNode,
+    ) -> Optional[str]:
+        """
+        从预热池领取容器并绑定到会话工作空间
+
+        预热容器创建时没有会话环境变量，带有自定义环境变量的会话直接冷启动。
+        绑定失败时销毁该容器并返回 None，由调用方冷启动。
+        """
+        if (
+            self._warm_pool is None
+            or not self._warm_pool.enabled
+            or not hasattr(self._scheduler, "bind_warm_container")
+        ):
+            return None
+        if session.env_vars:
+            self._warm_pool.record_bypass()
+            return None
+
+        warm = await self._warm_pool.claim(session.template_id, session.resource_limit)
+        if warm is None:
+            return None
+
+        try:
+            await self._scheduler.bind_warm_container(
+                container_id=warm.container_id,
+                session_id=session.id,
+                workspace_path=session.workspace_path,
+            )
+        except Exception as e:
+            self._warm_pool.record_bind_failure()
+            logger.warning(
+                "Failed to bind warm container, falling back to cold start",
+                session_id=session.id,
+                container_id=warm.container_id,
+                error=str(e),
+            )
+            try:
+                await self._scheduler.destroy_container(warm.container_id)
+            except Exception as cleanup_error:
+                logger.warning(
+                    "Failed to cleanup warm container",
+                    container_id=warm.container_id,
+                    cleanup_error=str(cleanup_error),
+                )
+            return None
+
+        # 预热容器的 executor 已就绪，直接进入 running
+        session.mark_as_running(runtime_node.id, warm.container_id)
+        await self._session_repo.save(session)
+
+        logger.info(
+            "Warm container claimed for session",
+            session_id=session.id,
+            container_id=warm.container_id,
+            template_id=session.template_id,
+        )
+        return warm.container_id
+
     async def _create_container_for_session(
         self,
         session: Session,
@@ -791,6 +867,8 @@ class SessionService:
                 result.started_at.replace("Z", "+00:00")
             )
         await self._session_repo.save(session)
+        if self._warm_pool is not None and result.layer_key:
+            self._warm_pool.record_dependency_layer(session.template_id, result.layer_key)
         return SessionDTO.from_entity(session)
 
     def _schedule_initial_dependency_sync(
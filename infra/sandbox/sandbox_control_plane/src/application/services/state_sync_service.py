@@ -4,8 +4,9 @@
 负责同步 Session 状态与实际容器状态，支持启动时同步和定时健康检查。
 """
 
+import asyncio
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 
 from src.domain.entities.session import Session, SessionStatus
 from src.domain.repositories.execution_repository import IExecutionRepository
@@ -17,6 +18,8 @@ from src.infrastructure.logging import get_logger
 
 logger = get_logger(__name__)
 
+ACTIVE_STATUSES = (SessionStatus.RUNNING.value, SessionStatus.CREATING.value)
+
 
 class StateSyncService:
     """
@@ -29,6 +32,9 @@ class StateSyncService:
     4. 恢复不健康的容器（创建新容器）
 
     核心原则：Docker/K8s 是容器状态的唯一真实来源，Session 表只保存关联关系。
+
+    每轮检查只查询一次数据库、列出一次运行中的容器，在内存中对比；
+    只有不在运行列表中的会话才逐个确认并恢复，并发数受 recovery_concurrency 限制。
     """
 
     def __init__(
@@ -39,6 +45,7 @@ class StateSyncService:
         template_repo: Optional[ITemplateRepository] = None,
         scheduler=None,
         control_plane_url: str = "http://control-plane:8000",
+        recovery_concurrency: int = 8,
     ):
         self._session_repo = session_repo
         self._container_scheduler = container_scheduler
@@ -46,6 +53,7 @@ class StateSyncService:
         self._template_repo = template_repo
         self._scheduler = scheduler
         self._control_plane_url = control_plane_url
+        self._recovery_concurrency = max(1, recovery_concurrency)
 
     async def sync_on_startup(self) -> Dict[str, int]:
         """
@@ -69,22 +77,29 @@ class StateSyncService:
         }
 
         try:
-            active_sessions = await self._load_active_sessions()
+            if self._is_kubernetes_takeover_enabled():
+                # 接管需要逐个读取 Pod 的 owner 信息，仍按会话处理
+                active_sessions = await self._load_active_sessions()
 
-            stats["total"] = len(active_sessions)
-            logger.info("Found active sessions to sync", count=len(active_sessions))
+                stats["total"] = len(active_sessions)
+                logger.info("Found active sessions to sync", count=len(active_sessions))
 
-            for session in active_sessions:
-                if self._is_kubernetes_takeover_enabled():
+                for session in active_sessions:
                     await self._take_over_session_on_startup(session, stats)
-                else:
-                    if not session.container_id:
+            else:
+                container_ids, sessions = await self._load_session_containers(ACTIVE_STATUSES)
+
+                stats["total"] = len(container_ids)
+                logger.info("Found active sessions to sync", count=len(container_ids))
+
+                for session_id, container_id in list(container_ids.items()):
+                    if not container_id:
                         logger.warning(
-                            "Session has no container_id, skipping", session_id=session.id
+                            "Session has no container_id, skipping", session_id=session_id
                         )
-                        continue
+                        del container_ids[session_id]
 
-                    await self._check_and_recover_session(session, stats)
+                await self._reconcile(container_ids, sessions, ACTIVE_STATUSES, stats)
 
             logger.info(
                 "State sync completed",
@@ -121,16 +136,21 @@ class StateSyncService:
 
     async def _load_active_sessions(self) -> list[Session]:
         """全量加载 creating/running 会话，避免仓储默认 limit 截断。"""
+        return await self._load_sessions(ACTIVE_STATUSES)
+
+    async def _load_sessions(self, statuses: Iterable[str]) -> list[Session]:
+        """全量加载指定状态的会话，仓储支持分页时分页查询。"""
         session_repo_cls = type(self._session_repo)
         has_paginated_query = callable(getattr(session_repo_cls, "find_sessions", None))
         if not has_paginated_query:
-            running_sessions = await self._session_repo.find_by_status("running")
-            creating_sessions = await self._session_repo.find_by_status("creating")
-            return running_sessions + creating_sessions
+            sessions: list[Session] = []
+            for status in statuses:
+                sessions.extend(await self._session_repo.find_by_status(status))
+            return sessions
 
         active_sessions: list[Session] = []
         page_size = 200
-        for status in (SessionStatus.RUNNING.value, SessionStatus.CREATING.value):
+        for status in statuses:
             offset = 0
             while True:
                 sessions = await self._session_repo.find_sessions(
@@ -147,6 +167,105 @@ class StateSyncService:
 
         return active_sessions
 
+    async def _load_session_containers(
+        self, statuses: Iterable[str]
+    ) -> tuple[Dict[str, str], Dict[str, Session]]:
+        """
+        加载指定状态会话的容器 ID
+
+        仓储支持时只查询会话 ID 和容器 ID 两列（一次查询），需要恢复的会话再按 ID 加载；
+        否则全量加载会话实体。
+
+        Returns:
+            ({会话 ID: 容器 ID}, {会话 ID: 已加载的会话实体})
+        """
+        statuses = list(statuses)
+        session_repo_cls = type(self._session_repo)
+        if callable(getattr(session_repo_cls, "find_container_ids_by_status", None)):
+            container_ids = await self._session_repo.find_container_ids_by_status(statuses)
+            return dict(container_ids), {}
+
+        sessions = await self._load_sessions(statuses)
+        return (
+            {session.id: session.container_id or "" for session in sessions},
+            {session.id: session for session in sessions},
+        )
+
+    async def _list_running_containers(self) -> Optional[set[str]]:
+        """一次调用列出运行中的容器，调度器不支持或调用失败时返回 None（逐个检查）。"""
+        scheduler_cls = type(self._container_scheduler)
+        if not callable(getattr(scheduler_cls, "list_running_containers", None)):
+            return None
+        try:
+            return await self._container_scheduler.list_running_containers()
+        except Exception as e:
+            logger.warning(
+                "Failed to list running containers, falling back to per-session checks",
+                error=str(e),
+            )
+            return None
+
+    async def _reconcile(
+        self,
+        container_ids: Dict[str, str],
+        sessions: Dict[str, Session],
+        statuses: Iterable[str],
+        stats: Dict[str, int],
+    ) -> None:
+        """
+        将会话的容器 ID 与运行中的容器列表对比，并发确认和恢复不在列表中的会话
+
+        Args:
+            container_ids: {会话 ID: 容器 ID}
+            sessions: 已加载的会话实体，缺失的按 ID 加载
+            statuses: 本轮检查的会话状态，按 ID 加载时状态已变化的会话跳过
+            stats: 统计信息
+        """
+        running = await self._list_running_containers()
+        if running is None:
+            suspects = list(container_ids)
+        else:
+            suspects = [
+                session_id
+                for session_id, container_id in container_ids.items()
+                if container_id not in running
+            ]
+            stats["healthy"] += len(container_ids) - len(suspects)
+
+        if suspects:
+            logger.info(
+                "Sessions to check individually",
+                count=len(suspects),
+                listed=running is not None,
+            )
+
+        statuses = set(statuses)
+        semaphore = asyncio.Semaphore(self._recovery_concurrency)
+
+        async def check(session_id: str) -> None:
+            async with semaphore:
+                session = sessions.get(session_id)
+                if session is None:
+                    try:
+                        session = await self._session_repo.find_by_id(session_id)
+                    except Exception as e:
+                        error_msg = f"Error checking session {session_id}: {e}"
+                        logger.error(error_msg, exc_info=True)
+                        stats["errors"].append(error_msg)
+                        return
+                    status = getattr(session.status, "value", session.status) if session else None
+                    if (
+                        session is None
+                        or status not in statuses
+                        or (session.container_id or "") != container_ids[session_id]
+                    ):
+                        # 查询之后会话已被终止或重建
+                        logger.debug("Session changed during health check", session_id=session_id)
+                        return
+                await self._check_and_recover_session(session, stats)
+
+        await asyncio.gather(*(check(session_id) for session_id in suspects))
+
     async def _take_over_session_on_startup(self, session: Session, stats: Dict[str, int]) -> None:
         """K8s 启动时对 active session 做 executor 接管。"""
         try:
@@ -298,7 +417,7 @@ class StateSyncService:
         定时健康检查（每 30 秒）
 
         只检查 RUNNING 状态的 Session，减少查询范围。
-        对不健康的容器尝试恢复。
+        一次列出运行中的容器后批量对比，对不健康的容器并发尝试恢复。
         """
         logger.info("Starting periodic health check")
 
@@ -312,15 +431,17 @@ class StateSyncService:
         }
 
         try:
-            running_sessions = await self._session_repo.find_by_status("running")
-            logger.info("Checking running sessions", count=len(running_sessions))
-
-            for session in running_sessions:
-                if not session.container_id:
-                    continue
+            statuses = (SessionStatus.RUNNING.value,)
+            container_ids, sessions = await self._load_session_containers(statuses)
+            container_ids = {
+                session_id: container_id
+                for session_id, container_id in container_ids.items()
+                if container_id
+            }
+            logger.info("Checking running sessions", count=len(container_ids))
 
-                stats["checked"] += 1
-                await self._check_and_recover_session(session, stats)
+            stats["checked"] = len(container_ids)
+            await self._reconcile(container_ids, sessions, statuses, stats)
 
             if stats["checked"] > 0:
                 logger.info(
@@ -0,0 +1,474 @@
+"""
+预热池应用服务
+
+按 (模板, 资源规格) 维护一组已启动、未绑定会话的 executor 容器：
+- create_session 先从池中原子领取容器，再将 /workspace 绑定到会话工作空间，未命中时冷启动
+- 后台任务定期补充：目标数量按最近 warm_pool_max_idle_time 秒内的领取次数计算，
+  限制在 [warm_pool_min_size, warm_pool_default_size]，没有近期需求的规格不再补充
+- 空闲超过 warm_pool_max_idle_time 且超出目标数量的容器被回收
+- 统计领取命中率和会话创建耗时（Prometheus 指标 + stats()）
+- 按模板统计会话最常用的依赖层，预热容器就绪后通知 executor 预取到节点本地缓存
+"""
+
+import asyncio
+import collections
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from src.domain.repositories.template_repository import ITemplateRepository
+from src.domain.value_objects.resource_limit import ResourceLimit
+from src.infrastructure.executors import ExecutorClient
+from src.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 预热池的键：(模板 ID, 资源规格)
+PoolKey = Tuple[str, ResourceLimit]
+
+WARM_POOL_CLAIMS = Counter(
+    "sandbox_warm_pool_claims_total",
+    "Warm pool claim attempts by result",
+    ["template_id", "result"],
+)
+WARM_POOL_IDLE = Gauge(
+    "sandbox_warm_pool_idle_containers",
+    "Ready warm containers waiting to be claimed",
+    ["template_id"],
+)
+SESSION_CREATE_SECONDS = Histogram(
+    "sandbox_session_create_seconds",
+    "Time from create_session request to container assigned",
+    ["source"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120),
+)
+
+SOURCE_WARM = "warm"
+SOURCE_COLD = "cold"
+
+# 每个模板保留计数的依赖层数量上限
+MAX_TRACKED_LAYERS_PER_TEMPLATE = 64
+
+
+@dataclass
+class WarmContainer:
+    """预热容器"""
+
+    container_id: str
+    template_id: str
+    resource_limit: ResourceLimit
+    created_at: float
+    ready_at: Optional[float] = None
+
+    @property
+    def key(self) -> PoolKey:
+        return (self.template_id, self.resource_limit)
+
+
+@dataclass
+class _LatencyStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": self.total * 1000 / self.count if self.count else 0.0,
+            "max_ms": self.max * 1000,
+        }
+
+
+@dataclass
+class _PoolStats:
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    bind_failures: int = 0
+    created: int = 0
+    create_failures: int = 0
+    evicted: int = 0
+    layer_prefetches: int = 0
+    latency: Dict[str, _LatencyStats] = field(
+        default_factory=lambda: {SOURCE_WARM: _LatencyStats(), SOURCE_COLD: _LatencyStats()}
+    )
+
+
+class WarmPoolService:
+    """
+    预热池应用服务
+
+    进程级单例；调度器、模板仓储等请求级依赖由调用方传入。
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        default_size: int,
+        min_size: int,
+        max_idle_time: int,
+        placeholder_workspace: str,
+        default_template_id: Optional[str] = None,
+        startup_timeout: int = 120,
+        prefetch_layers: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        初始化预热池
+
+        Args:
+            enabled: 是否启用
+            default_size: 每个规格的最大预热数量
+            min_size: 有近期需求的规格至少保留的预热数量
+            max_idle_time: 空闲回收时间（秒），同时作为需求统计窗口
+            placeholder_workspace: 预热容器在领取前绑定的占位工作空间
+            default_template_id: 默认模板，即使没有需求也保留 min_size 个预热容器
+            startup_timeout: 预热容器启动超时（秒），超时未就绪则销毁
+            prefetch_layers: 预热容器就绪后预取的依赖层数量，0 表示不预取
+        """
+        self._enabled = enabled
+        self._default_size = max(default_size, 0)
+        self._min_size = min(max(min_size, 0), self._default_size)
+        self._max_idle_time = max_idle_time
+        self._placeholder_workspace = placeholder_workspace
+        self._default_template_id = default_template_id
+        self._startup_timeout = startup_timeout
+        self._prefetch_layers = max(prefetch_layers, 0)
+        self._clock = clock
+
+        self._idle: Dict[PoolKey, Deque[WarmContainer]] = {}
+        self._starting: Dict[PoolKey, List[WarmContainer]] = {}
+        # {规格: 最近的领取时间}
+        self._demand: Dict[PoolKey, Deque[float]] = {}
+        # {模板 ID: {依赖层 key: 使用次数}}
+        self._layers: Dict[str, collections.Counter] = {}
+        self._lock = asyncio.Lock()
+        self._stats = _PoolStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled and self._default_size > 0
+
+    # ============== 领取 ==============
+
+    async def claim(
+        self, template_id: str, resource_limit: ResourceLimit
+    ) -> Optional[WarmContainer]:
+        """
+        原子领取一个已就绪的预热容器，并记录该规格的需求
+
+        Returns:
+            预热容器，池中没有可用容器时返回 None
+        """
+        key = (template_id, resource_limit)
+        async with self._lock:
+            self._demand.setdefault(key, deque()).append(self._clock())
+            idle = self._idle.get(key)
+            warm = idle.popleft() if idle else None
+            if warm is not None:
+                self._stats.hits += 1
+                WARM_POOL_IDLE.labels(template_id=template_id).dec()
+            else:
+                self._stats.misses += 1
+
+        WARM_POOL_CLAIMS.labels(
+            template_id=template_id, result="hit" if warm else "miss"
+        ).inc()
+        return warm
+
+    def record_bypass(self) -> None:
+        """会话无法使用预热容器（如带有自定义环境变量）"""
+        self._stats.bypassed += 1
+
+    def record_bind_failure(self) -> None:
+        self._stats.bind_failures += 1
+
+    def record_create_latency(self, source: str, seconds: float) -> None:
+        """记录会话创建耗时，source 为 warm 或 cold"""
+        self._stats.latency[source].add(seconds)
+        SESSION_CREATE_SECONDS.labels(source=source).observe(seconds)
+
+    def record_dependency_layer(self, template_id: str, layer_key: str) -> None:
+        """记录会话依赖同步使用的依赖层"""
+        layers = self._layers.setdefault(template_id, collections.Counter())
+        layers[layer_key] += 1
+        if len(layers) > MAX_TRACKED_LAYERS_PER_TEMPLATE:
+            # 丢弃最不常用的一半，并将计数减半，使最近常用的层能够进入前列
+            kept = layers.most_common(MAX_TRACKED_LAYERS_PER_TEMPLATE // 2)
+            self._layers[template_id] = collections.Counter(
+                {key: max(count // 2, 1) for key, count in kept}
+            )
+
+    def popular_layers(self, template_id: str) -> List[str]:
+        """模板最常用的依赖层，按使用次数降序"""
+        layers = self._layers.get(template_id)
+        if not layers or self._prefetch_layers == 0:
+            return []
+        return [key for key, _ in layers.most_common(self._prefetch_layers)]
+
+    # ============== 补充与回收 ==============
+
+    def target_size(self, key: PoolKey, now: Optional[float] = None) -> int:
+        """规格的目标预热数量：近期领取次数，限制在 [min_size, default_size]"""
+        now = self._clock() if now is None else now
+        demand = self._demand.get(key)
+        while demand and now - demand[0] > self._max_idle_time:
+            demand.popleft()
+        recent = len(demand) if demand else 0
+
+        if recent == 0:
+            if key[0] == self._default_template_id and key[1] == ResourceLimit.default():
+                return self._min_size
+            return 0
+        return min(max(recent, self._min_size), self._default_size)
+
+    async def replenish(
+        self,
+        scheduler,
+        template_repo: ITemplateRepository,
+        executor_client: ExecutorClient,
+    ) -> dict:
+        """
+        补充和回收预热容器（后台任务周期调用）
+
+        1. 检查启动中的容器，executor 健康后加入空闲队列
+        2. 回收空闲超时且超出目标数量的容器
+        3. 按目标数量创建新的预热容器
+        """
+        result = {"ready": 0, "created": 0, "evicted": 0, "failed": 0}
+        if not self.enabled or not hasattr(scheduler, "create_warm_container"):
+            return result
+
+        await self._promote_ready(scheduler, executor_client, result)
+
+        now = self._clock()
+        to_destroy: List[WarmContainer] = []
+        to_create: List[Tuple[PoolKey, int]] = []
+        async with self._lock:
+            keys = set(self._idle) | set(self._starting) | set(self._demand)
+            if self._default_template_id:
+                keys.add((self._default_template_id, ResourceLimit.default()))
+
+            for key in keys:
+                target = self.target_size(key, now)
+                idle = self._idle.get(key, deque())
+                starting = self._starting.get(key, [])
+
+                # 空闲队列按就绪时间排序，从最早的开始回收超出目标的部分
+                surplus = len(idle) + len(starting) - target
+                while surplus > 0 and idle and now - idle[0].ready_at > self._max_idle_time:
+                    to_destroy.append(idle.popleft())
+                    WARM_POOL_IDLE.labels(template_id=key[0]).dec()
+                    surplus -= 1
+
+                if surplus < 0:
+                    to_create.append((key, -surplus))
+
+                if not self._demand.get(key):
+                    self._demand.pop(key, None)
+
+        for warm in to_destroy:
+            await self._destroy(scheduler, warm)
+        self._stats.evicted += len(to_destroy)
+        result["evicted"] = len(to_destroy)
+
+        for key, count in to_create:
+            template = await template_repo.find_by_id(key[0])
+            if template is None:
+                logger.warning("Warm pool template not found", template_id=key[0])
+                continue
+            created = await asyncio.gather(
+                *(self._create(scheduler, key, template.image) for _ in range(count))
+            )
+            result["created"] += sum(1 for ok in created if ok)
+            result["failed"] += sum(1 for ok in created if not ok)
+
+        if any(result.values()):
+            logger.info("Warm pool replenished", **result, **self._sizes())
+        return result
+
+    async def _promote_ready(self, scheduler, executor_client: ExecutorClient, result: dict) -> None:
+        now = self._clock()
+        for key, starting in list(self._starting.items()):
+            for warm in list(starting):
+                ready = False
+                try:
+                    executor_url = await scheduler.get_executor_url(warm.container_id)
+                    await executor_client.health_check(executor_url)
+                    ready = True
+                    await self._prefetch(executor_client, executor_url, warm)
+                except Exception as e:
+                    if now - warm.created_at <= self._startup_timeout:
+                        continue
+                    logger.warning(
+                        "Warm container did not become ready, destroying",
+                        container_id=warm.container_id,
+                        error=str(e),
+                    )
+
+                async with self._lock:
+                    if self._starting.get(key) is not starting or warm not in starting:
+                        # 检查期间已被 drain 清空
+                        continue
+                    starting.remove(warm)
+                    if ready:
+                        warm.ready_at = self._clock()
+                        self._idle.setdefault(key, deque()).append(warm)
+                        WARM_POOL_IDLE.labels(template_id=warm.template_id).inc()
+                if ready:
+                    result["ready"] += 1
+                else:
+                    self._stats.create_failures += 1
+                    result["failed"] += 1
+                    await self._destroy(scheduler, warm)
+
+    async def _prefetch(self, executor_client: ExecutorClient, executor_url: str, warm: WarmContainer) -> None:
+        """通知 executor 预取模板常用的依赖层（尽力而为，失败不影响容器就绪）"""
+        layer_keys = self.popular_layers(warm.template_id)
+        if not layer_keys:
+            return
+        try:
+            await executor_client.prefetch_dependency_layers(executor_url, layer_keys)
+            self._stats.layer_prefetches += len(layer_keys)
+        except Exception as e:
+            logger.warning(
+                "Failed to prefetch dependency layers",
+                container_id=warm.container_id,
+                layer_count=len(layer_keys),
+                error=str(e),
+            )
+
+    async def _create(self, scheduler, key: PoolKey, image: str) -> bool:
+        template_id, resource_limit = key
+        warm_id = uuid.uuid4().hex[:12]
+        try:
+            container_id = await scheduler.create_warm_container(
+                warm_id=warm_id,
+                template_id=template_id,
+                image=image,
+                resource_limit=resource_limit,
+                workspace_path=self._placeholder_workspace,
+            )
+        except Exception as e:
+            self._stats.create_failures += 1
+            logger.warning(
+                "Failed to create warm container",
+                template_id=template_id,
+                error=str(e),
+            )
+            return False
+
+        warm = WarmContainer(
+            container_id=container_id,
+            template_id=template_id,
+            resource_limit=resource_limit,
+            created_at=self._clock(),
+        )
+        async with self._lock:
+            self._starting.setdefault(key, []).append(warm)
+        self._stats.created += 1
+        return True
+
+    async def _destroy(self, scheduler, warm: WarmContainer) -> None:
+        try:
+            await scheduler.destroy_container(warm.container_id)
+        except Exception as e:
+            logger.warning(
+                "Failed to destroy warm container",
+                container_id=warm.container_id,
+                error=str(e),
+            )
+
+    async def drain(self, scheduler) -> int:
+        """销毁池中所有未领取的容器（应用关闭时调用）"""
+        async with self._lock:
+            containers = [warm for idle in self._idle.values() for warm in idle]
+            containers += [warm for starting in self._starting.values() for warm in starting]
+            self._idle.clear()
+            self._starting.clear()
+        for warm in containers:
+            await self._destroy(scheduler, warm)
+        WARM_POOL_IDLE.clear()
+        return len(containers)
+
+    async def reclaim_orphans(self, scheduler, in_use: Set[str]) -> int:
+        """
+        销毁上次运行遗留的预热容器（应用启动时调用）
+
+        进程崩溃时 drain 不会执行，内存中的预热池随之丢失。按标签列出本实例创建的预热容器，
+        跳过已被会话领取（in_use）和池中持有的容器，其余全部销毁。
+
+        Args:
+            scheduler: 调度服务
+            in_use: 活跃会话使用的容器 ID
+        """
+        if not callable(getattr(type(scheduler), "list_warm_containers", None)):
+            return 0
+
+        async with self._lock:
+            held = {warm.container_id for idle in self._idle.values() for warm in idle}
+            held.update(
+                warm.container_id for starting in self._starting.values() for warm in starting
+            )
+        orphans = [
+            container_id
+            for container_id in await scheduler.list_warm_containers()
+            if container_id not in in_use and container_id not in held
+        ]
+        for container_id in orphans:
+            try:
+                await scheduler.destroy_container(container_id)
+            except Exception as e:
+                logger.warning(
+                    "Failed to destroy orphaned warm container",
+                    container_id=container_id,
+                    error=str(e),
+                )
+        if orphans:
+            logger.info("Reclaimed orphaned warm containers", count=len(orphans))
+        return len(orphans)
+
+    # ============== 统计 ==============
+
+    def _sizes(self) -> dict:
+        return {
+            "idle": sum(len(idle) for idle in self._idle.values()),
+            "starting": sum(len(starting) for starting in self._starting.values()),
+        }
+
+    def stats(self) -> dict:
+        stats = self._stats
+        claims = stats.hits + stats.misses
+        return {
+            "enabled": self.enabled,
+            **self._sizes(),
+            "hits": stats.hits,
+            "misses": stats.misses,
+            "hit_rate": stats.hits / claims if claims else 0.0,
+            "bypassed": stats.bypassed,
+            "bind_failures": stats.bind_failures,
+            "created": stats.created,
+            "create_failures": stats.create_failures,
+            "evicted": stats.evicted,
+            "layer_prefetches": stats.layer_prefetches,
+            "create_latency": {
+                source: latency.as_dict() for source, latency in stats.latency.items()
+            },
+            "templates": {
+                f"{template_id}:{limit.cpu}/{limit.memory}/{limit.disk}": {
+                    "idle": len(self._idle.get((template_id, limit), ())),
+                    "starting": len(self._starting.get((template_id, limit), ())),
+                    "target": self.target_size((template_id, limit)),
+                }
+                for template_id, limit in set(self._idle) | set(self._starting) | set(self._demand)
+            },
+        }
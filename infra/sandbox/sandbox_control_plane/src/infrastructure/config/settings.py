@@ -125,6 +125,8 @@ class Settings(BaseSettings):
     max_extracted_file_count: int = Field(default=10000, ge=1)
     max_extracted_total_size_mb: int = Field(default=512, ge=1)
     disable_bwrap: bool = Field(default=False)  # 禁用 Bubblewrap（本地开发环境）
+    # execute-sync 等待结果时批量检查数据库的间隔（秒），回调落在其他副本上时由此发现完成
+    execution_sync_fallback_interval_seconds: float = Field(default=2.0, gt=0)
     control_plane_url: str | None = Field(
         default=None
     )  # Control Plane URL for executor callback (None = auto-generate from namespace)
@@ -154,11 +156,22 @@ class Settings(BaseSettings):
     warm_pool_default_size: int = Field(default=10)
     warm_pool_min_size: int = Field(default=5)
     warm_pool_max_idle_time: int = Field(default=300)
+    warm_pool_replenish_interval_seconds: int = Field(default=10, ge=1)
+    # 预热容器就绪后预取的依赖层数量（按模板统计最常用的层）
+    warm_pool_prefetch_layers: int = Field(default=3, ge=0)
+
+    # ============== 依赖层缓存配置 ==============
+    # executor 按解析后的依赖集合缓存已安装的依赖目录，共享层存放在 S3 bucket 的 dependency-layers/ 下
+    dependency_layer_cache_enabled: bool = Field(default=False)
+    # 节点本地层缓存目录（宿主机路径，需对 uid 1000 可写），为空时每个容器使用自己的缓存目录
+    dependency_layer_cache_host_path: str = Field(default="")
 
     # ============== 健康检查配置 ==============
     health_check_interval_seconds: int = Field(default=10)
     heartbeat_interval_seconds: int = Field(default=5)
     heartbeat_timeout_seconds: int = Field(default=15)
+    # 状态同步时并发确认/恢复不健康会话的数量上限
+    health_check_recovery_concurrency: int = Field(default=8, ge=1)
 
     # ============== 日志配置 ==============
     log_level: str = Field(default="INFO")
@@ -7,6 +7,37 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Optional, Dict, Any
+from urllib.parse import urlparse
+
+# 容器内 S3 bucket 的挂载点，与启动脚本保持一致
+S3_MOUNT_ROOT = "/mnt/s3-root"
+# executor 节点本地依赖层缓存目录，与 executor 的 DEPENDENCY_LAYER_CACHE_PATH 默认值一致
+DEPENDENCY_LAYER_CACHE_MOUNT_PATH = "/opt/sandbox-layer-cache"
+# 预热容器标签，Docker 和 K8s 调度器共用
+WARM_POOL_LABEL = "warm-pool"
+# 创建预热容器的 control plane 实例，启动时只回收本实例遗留的预热容器
+WARM_POOL_OWNER_LABEL = "warm-pool-owner"
+
+
+def build_workspace_bind_command(workspace_path: str) -> list[str] | None:
+    """
+    构建将 /workspace 重新绑定到指定 S3 路径的命令
+
+    预热容器启动时 /workspace 绑定在占位目录上，被会话领取后以 root 执行该命令，
+    卸载占位目录并将会话目录 bind mount 到 /workspace。非 S3 路径返回 None。
+    """
+    if not workspace_path or not workspace_path.startswith("s3://"):
+        return None
+
+    prefix = urlparse(workspace_path).path.strip("/")
+    session_path = f"{S3_MOUNT_ROOT}/{prefix}"
+    script = (
+        "set -e\n"
+        f'mkdir -p "{session_path}"\n'
+        "umount /workspace 2>/dev/null || true\n"
+        f'mount --bind "{session_path}" /workspace\n'
+    )
+    return ["sh", "-c", script]
 
 
 @dataclass(frozen=True)
@@ -120,6 +151,25 @@ class IContainerScheduler(ABC):
         """
         pass
 
+    async def list_running_containers(self) -> Optional[set[str]]:
+        """
+        一次调用列出所有运行中的 executor 容器（供批量健康检查使用）
+
+        Returns:
+            运行中容器的 ID 集合（包含可用于匹配 session.container_id 的 ID 和名称），
+            调度器不支持批量查询时返回 None，调用方逐个调用 is_container_running
+        """
+        return None
+
+    async def list_containers_by_labels(self, labels: Dict[str, str]) -> Optional[list[str]]:
+        """
+        列出带有全部指定标签的容器（包括已停止的容器）
+
+        Returns:
+            容器名称列表，调度器不支持按标签查询时返回 None
+        """
+        return None
+
     @abstractmethod
     async def get_container_logs(
         self, container_id: str, tail: int = 100, since: Optional[str] = None
@@ -139,6 +189,11 @@ class IContainerScheduler(ABC):
         """检查调度器连接状态"""
         pass
 
+    @abstractmethod
+    async def bind_workspace(self, container_id: str, workspace_path: str) -> None:
+        """将运行中容器的 /workspace 重新绑定到会话工作空间（供预热池使用）"""
+        pass
+
     async def get_container_ownership(
         self,
         container_id: str,
@@ -18,10 +18,12 @@ from aiodocker.exceptions import DockerError
 
 from src.infrastructure.config.settings import get_settings
 from src.infrastructure.container_scheduler.base import (
+    DEPENDENCY_LAYER_CACHE_MOUNT_PATH,
     ContainerConfig,
     ContainerInfo,
     ContainerResult,
     IContainerScheduler,
+    build_workspace_bind_command,
 )
 from src.infrastructure.logging import get_logger
 from src.shared.utils.dependencies import (
@@ -474,6 +476,15 @@ exec python -m executor.interfaces.http.rest
                 f"dependencies={len(dependencies) if dependencies else 0}"
             )
 
+        # 依赖层缓存：启用 executor 的层缓存，并共享节点本地缓存目录
+        settings = get_settings()
+        if settings.dependency_layer_cache_enabled:
+            container_config["Env"].append("DEPENDENCY_LAYER_CACHE_ENABLED=true")
+            if settings.dependency_layer_cache_host_path:
+                container_config["HostConfig"].setdefault("Binds", []).append(
+                    f"{settings.dependency_layer_cache_host_path}:{DEPENDENCY_LAYER_CACHE_MOUNT_PATH}"
+                )
+
         logger.debug(
             "Container config finalized",
             container_name=config.name,
@@ -655,6 +666,35 @@ exec python -m executor.interfaces.http.rest
             logger.warning(f"Failed to check container {container_id} status: {e}")
             return False
 
+    async def list_running_containers(self) -> set[str]:
+        """
+        一次 Docker API 调用列出所有运行中的容器
+
+        会话记录的 container_id 可能是容器名称（会话容器、预热容器）或容器 ID（恢复的容器），
+        因此同时返回完整 ID、短 ID 和名称。
+        """
+        docker = await self._ensure_docker()
+        containers = await docker.containers.list(filters=json.dumps({"status": ["running"]}))
+        running: set[str] = set()
+        for container in containers:
+            running.add(container.id)
+            running.add(container.id[:12])
+            running.update(name.lstrip("/") for name in container["Names"] or [])
+        return running
+
+    async def list_containers_by_labels(self, labels: dict[str, str]) -> list[str]:
+        """按标签列出容器名称（包括已停止的容器）"""
+        docker = await self._ensure_docker()
+        label_filters = [f"{key}={value}" for key, value in labels.items()]
+        containers = await docker.containers.list(
+            all=True, filters=json.dumps({"label": label_filters})
+        )
+        names: list[str] = []
+        for container in containers:
+            container_names = container["Names"] or []
+            names.append(container_names[0].lstrip("/") if container_names else container.id)
+        return names
+
     async def get_container_logs(
         self, container_id: str, tail: int = 100, since: str | None = None
     ) -> str:
@@ -721,6 +761,43 @@ exec python -m executor.interfaces.http.rest
             logger.error(f"Docker ping failed: {e}")
             return False
 
+    async def bind_workspace(self, container_id: str, workspace_path: str) -> None:
+        """
+        将预热容器的 /workspace 重新绑定到会话工作空间
+
+        S3 模式的容器以 root 启动并带有 SYS_ADMIN，通过 docker exec 以 root 执行 bind mount。
+        """
+        command = build_workspace_bind_command(workspace_path)
+        if command is None:
+            return
+
+        docker = await self._ensure_docker()
+        container = docker.containers.container(container_id)
+        try:
+            exec_instance = await container.exec(command, user="root", stdout=True, stderr=True)
+            output = []
+            async with exec_instance.start(detach=False) as stream:
+                while True:
+                    message = await stream.read_out()
+                    if message is None:
+                        break
+                    output.append(message.data.decode("utf-8", errors="replace"))
+            exit_code = (await exec_instance.inspect()).get("ExitCode")
+        except DockerError as e:
+            logger.error(f"Failed to bind workspace for container {container_id}: {e}")
+            raise
+
+        if exit_code != 0:
+            raise RuntimeError(
+                f"Workspace bind failed in container {container_id} "
+                f"(exit code {exit_code}): {''.join(output).strip()}"
+            )
+        logger.info(
+            "Workspace bound to container",
+            container_id=container_id,
+            workspace_path=workspace_path,
+        )
+
     def _parse_memory_to_bytes(self, value: str) -> int:
         """
         解析内存限制为字节数
@@ -22,6 +22,7 @@ from kubernetes.client import (
     V1ContainerPort,
     V1EmptyDirVolumeSource,
     V1EnvVar,
+    V1HostPathVolumeSource,
     V1LocalObjectReference,
     V1ObjectMeta,
     V1OwnerReference,
@@ -34,14 +35,17 @@ from kubernetes.client import (
     V1VolumeMount,
 )
 from kubernetes.client.rest import ApiException
+from kubernetes.stream import stream
 
 from src.infrastructure.config.settings import get_settings
 from src.infrastructure.container_scheduler.base import (
+    DEPENDENCY_LAYER_CACHE_MOUNT_PATH,
     ContainerConfig,
     ContainerInfo,
     ContainerOwnershipInfo,
     ContainerResult,
     IContainerScheduler,
+    build_workspace_bind_command,
 )
 from src.infrastructure.logging import get_logger
 from src.shared.utils.dependencies import (
@@ -51,6 +55,11 @@ from src.shared.utils.dependencies import (
 
 logger = get_logger(__name__)
 
+# executor Pod 的标签选择器，与 create_container 中设置的 app 标签一致
+EXECUTOR_LABEL_SELECTOR = "app=sandbox-executor"
+# 批量列出 Pod 时每页数量
+LIST_PAGE_SIZE = 500
+
 
 def s3_prefix_from_path(prefix: str) -> str:
     """
@@ -117,6 +126,9 @@ class K8sScheduler(IContainerScheduler):
 
         # 创建 API 客户端
         self._core_v1 = client.CoreV1Api()
+        # exec 使用独立的 ApiClient：kubernetes.stream 调用期间会替换 api_client.request，
+        # 与其他线程中的普通请求共用同一个客户端会互相干扰
+        self._exec_core_v1: client.CoreV1Api | None = None
         self._initialized = False
 
     def _load_incluster_config(self):
@@ -271,6 +283,10 @@ class K8sScheduler(IContainerScheduler):
             env_vars.append(V1EnvVar(name="PYTHONPATH", value="/opt/sandbox-venv:/app:/workspace"))
             env_vars.append(V1EnvVar(name="SANDBOX_VENV_PATH", value="/opt/sandbox-venv"))
 
+        settings = get_settings()
+        if settings.dependency_layer_cache_enabled:
+            env_vars.append(V1EnvVar(name="DEPENDENCY_LAYER_CACHE_ENABLED", value="true"))
+
         # 资源限制
         resources = V1ResourceRequirements(
             limits={
@@ -310,6 +326,13 @@ class K8sScheduler(IContainerScheduler):
                     read_only=True,
                 )
             )
+        if settings.dependency_layer_cache_enabled and settings.dependency_layer_cache_host_path:
+            volume_mounts.append(
+                V1VolumeMount(
+                    name="dependency-layer-cache",
+                    mount_path=DEPENDENCY_LAYER_CACHE_MOUNT_PATH,
+                )
+            )
 
         # 安全上下文 - s3fs 需要 privileged 和 root 用户
         # 注意：privileged=True 时容器必须以 root 运行，以便进行 FUSE 挂载
@@ -330,8 +353,6 @@ class K8sScheduler(IContainerScheduler):
         # 构建启动命令
         command = None
         if use_s3_mount:
-            # 获取设置
-            settings = get_settings()
             minio_url = (
                 settings.s3_endpoint_url or "http://minio.sandbox-system.svc.cluster.local:9000"
             )
@@ -430,8 +451,6 @@ exec gosu sandbox python -m executor.interfaces.http.rest
 """
             command = ["sh", "-c", install_script]
 
-        settings = get_settings()
-
         return V1Container(
             name="executor",
             image=config.image,
@@ -509,6 +528,18 @@ exec gosu sandbox python -m executor.interfaces.http.rest
                     empty_dir=V1EmptyDirVolumeSource(),
                 )
             )
+        settings = get_settings()
+        if settings.dependency_layer_cache_enabled and settings.dependency_layer_cache_host_path:
+            # 同一节点上的 executor 共享依赖层缓存
+            volumes.append(
+                V1Volume(
+                    name="dependency-layer-cache",
+                    host_path=V1HostPathVolumeSource(
+                        path=settings.dependency_layer_cache_host_path,
+                        type="DirectoryOrCreate",
+                    ),
+                )
+            )
 
         # 构建标签（排除 dependencies，因为 K8s labels 有严格格式限制）
         # dependencies 不能作为 label，因为包含方括号、引号等非法字符
@@ -684,15 +715,7 @@ exec gosu sandbox python -m executor.interfaces.http.rest
             )
 
             # 转换 K8s Pod 状态到 ContainerInfo
-            phase = pod.status.phase
-            if phase == "Running" and pod.status.container_statuses:
-                for container_status in pod.status.container_statuses:
-                    if container_status.name == "executor":
-                        if container_status.state.terminated:
-                            phase = "exited"
-                        elif container_status.state.waiting:
-                            phase = "waiting"
-                        break
+            phase = self._pod_phase(pod)
 
             ip_address = pod.status.pod_ip
             created_at = (
@@ -722,7 +745,7 @@ exec gosu sandbox python -m executor.interfaces.http.rest
                 id=container_id,
                 name=container_id,
                 image=image,
-                status=phase.lower(),
+                status=phase,
                 ip_address=ip_address,
                 created_at=created_at,
                 started_at=started_at,
@@ -738,6 +761,61 @@ exec gosu sandbox python -m executor.interfaces.http.rest
                 logger.error(f"Failed to get pod status {container_id}: {e}")
                 raise
 
+    @staticmethod
+    def _pod_phase(pod: V1Pod) -> str:
+        """Pod 的状态：Pod phase，executor 容器已退出或等待中时分别为 exited / waiting"""
+        phase = pod.status.phase or "Unknown"
+        if phase == "Running" and pod.status.container_statuses:
+            for container_status in pod.status.container_statuses:
+                if container_status.name == "executor":
+                    if container_status.state.terminated:
+                        phase = "exited"
+                    elif container_status.state.waiting:
+                        phase = "waiting"
+                    break
+        return phase.lower()
+
+    async def list_running_containers(self) -> set[str]:
+        """
+        按 executor 标签分页列出命名空间内的 Pod，返回运行中的 Pod 名称
+
+        每页 LIST_PAGE_SIZE 个 Pod，数千个会话也只需要几次 API 调用。
+        """
+        await self._ensure_connected()
+        running: set[str] = set()
+        continue_token = None
+        while True:
+            kwargs = {"label_selector": EXECUTOR_LABEL_SELECTOR, "limit": LIST_PAGE_SIZE}
+            if continue_token:
+                kwargs["_continue"] = continue_token
+            pods = await asyncio.to_thread(
+                self._core_v1.list_namespaced_pod, self._namespace, **kwargs
+            )
+            for pod in pods.items:
+                if self._pod_phase(pod) == "running":
+                    running.add(pod.metadata.name)
+            continue_token = pods.metadata._continue if pods.metadata else None
+            if not continue_token:
+                return running
+
+    async def list_containers_by_labels(self, labels: dict[str, str]) -> list[str]:
+        """按标签分页列出命名空间内的 Pod 名称（不区分 Pod 状态）"""
+        await self._ensure_connected()
+        label_selector = ",".join(f"{key}={value}" for key, value in labels.items())
+        names: list[str] = []
+        continue_token = None
+        while True:
+            kwargs = {"label_selector": label_selector, "limit": LIST_PAGE_SIZE}
+            if continue_token:
+                kwargs["_continue"] = continue_token
+            pods = await asyncio.to_thread(
+                self._core_v1.list_namespaced_pod, self._namespace, **kwargs
+            )
+            names.extend(pod.metadata.name for pod in pods.items)
+            continue_token = pods.metadata._continue if pods.metadata else None
+            if not continue_token:
+                return names
+
     async def is_container_running(self, container_id: str) -> bool:
         """
         检查 Pod 是否正在运行
@@ -933,6 +1011,62 @@ exec gosu sandbox python -m executor.interfaces.http.rest
             logger.error(f"Kubernetes ping failed: {e}")
             return False
 
+    def _exec_in_pod(self, pod_name: str, command: list[str], timeout: int) -> tuple[int, str]:
+        """在 executor 容器中同步执行命令，返回 (退出码, 输出)"""
+        if self._exec_core_v1 is None:
+            self._exec_core_v1 = client.CoreV1Api(api_client=client.ApiClient())
+
+        resp = stream(
+            self._exec_core_v1.connect_get_namespaced_pod_exec,
+            name=pod_name,
+            namespace=self._namespace,
+            container="executor",
+            command=command,
+            stderr=True,
+            stdin=False,
+            stdout=True,
+            tty=False,
+            _preload_content=False,
+        )
+        output = []
+        try:
+            resp.run_forever(timeout=timeout)
+            output.append(resp.read_stdout() or "")
+            output.append(resp.read_stderr() or "")
+            return resp.returncode, "".join(output)
+        finally:
+            resp.close()
+
+    async def bind_workspace(self, container_id: str, workspace_path: str) -> None:
+        """
+        将预热 Pod 的 /workspace 重新绑定到会话工作空间
+
+        S3 模式的 executor 容器以 root 运行且为 privileged，通过 pods/exec 执行 bind mount。
+        """
+        command = build_workspace_bind_command(workspace_path)
+        if command is None:
+            return
+
+        await self._ensure_connected()
+        try:
+            exit_code, output = await asyncio.to_thread(
+                self._exec_in_pod, container_id, command, 30
+            )
+        except ApiException as e:
+            logger.error(f"Failed to bind workspace for pod {container_id}: {e}")
+            raise
+
+        if exit_code != 0:
+            raise RuntimeError(
+                f"Workspace bind failed in pod {container_id} "
+                f"(exit code {exit_code}): {output.strip()}"
+            )
+        logger.info(
+            "Workspace bound to pod",
+            pod_name=container_id,
+            workspace_path=workspace_path,
+        )
+
     def _parse_memory_to_bytes(self, value: str) -> int:
         """
         解析内存限制为字节数
@@ -15,6 +15,7 @@ from src.infrastructure.logging import get_logger
 from src.application.services.session_service import SessionService
 from src.application.services.template_service import TemplateService
 from src.application.services.file_service import FileService
+from src.application.services.warm_pool_service import WarmPoolService
 
 from src.domain.repositories.session_repository import ISessionRepository
 from src.domain.repositories.execution_repository import IExecutionRepository
@@ -22,10 +23,11 @@ from src.domain.repositories.template_repository import ITemplateRepository
 from src.domain.services.scheduler import IScheduler, RuntimeNode
 from src.domain.services.storage import IStorageService
 from src.domain.value_objects.execution_request import ExecutionRequest
-from src.domain.value_objects.execution_status import SessionStatus
+from src.domain.value_objects.execution_status import ExecutionStatus, SessionStatus
 
 from src.infrastructure.persistence.database import db_manager
 from src.infrastructure.executors import ExecutorClient
+from src.infrastructure.messaging.execution_notifier import ExecutionCompletionNotifier
 from src.infrastructure.config.settings import get_settings
 
 # Configuration flag to switch between Mock and SQL repositories
@@ -487,6 +489,8 @@ def initialize_dependencies(app: FastAPI):
 
 async def cleanup_dependencies(app: FastAPI):
     """清理依赖项"""
+    if _execution_notifier_singleton is not None:
+        await _execution_notifier_singleton.close()
     await db_manager.close()
 
 
@@ -705,9 +709,124 @@ def get_session_service_db(
         storage_service=storage_service,
         executor_client=executor_client,
         initial_dependency_sync_scheduler=get_initial_dependency_sync_scheduler(),
+        warm_pool=get_warm_pool_service(),
     )
 
 
+# Warm pool singleton (shared by all requests and the replenish task)
+_warm_pool_singleton = None
+
+
+def get_warm_pool_service() -> WarmPoolService:
+    """获取预热池（进程级单例）"""
+    global _warm_pool_singleton
+
+    if _warm_pool_singleton is None:
+        settings = get_settings()
+        _warm_pool_singleton = WarmPoolService(
+            enabled=settings.warm_pool_enabled and not USE_MOCK_SCHEDULER,
+            default_size=settings.warm_pool_default_size,
+            min_size=settings.warm_pool_min_size,
+            max_idle_time=settings.warm_pool_max_idle_time,
+            placeholder_workspace=f"s3://{settings.s3_bucket}/warm-pool/idle",
+            default_template_id=settings.default_template_id,
+            prefetch_layers=settings.warm_pool_prefetch_layers,
+        )
+    return _warm_pool_singleton
+
+
+async def run_warm_pool_replenish() -> dict:
+    """预热池补充任务（每次执行时创建新的 repository 和调度服务）"""
+    warm_pool = get_warm_pool_service()
+    if not warm_pool.enabled:
+        return {}
+
+    async with db_manager.get_session() as session:
+        from src.infrastructure.persistence.repositories.sql_runtime_node_repository import (
+            SqlRuntimeNodeRepository,
+        )
+        from src.infrastructure.persistence.repositories.sql_template_repository import (
+            SqlTemplateRepository,
+        )
+
+        template_repo = SqlTemplateRepository(session)
+        scheduler = _create_scheduler_service(
+            runtime_node_repo=SqlRuntimeNodeRepository(session),
+            template_repo=template_repo,
+        )
+        executor_client = ExecutorClient(timeout=2.0, max_retries=0)
+        try:
+            return await warm_pool.replenish(scheduler, template_repo, executor_client)
+        finally:
+            await executor_client.close()
+
+
+async def drain_warm_pool() -> int:
+    """销毁预热池中未领取的容器（应用关闭时调用）"""
+    warm_pool = get_warm_pool_service()
+    if not warm_pool.enabled:
+        return 0
+
+    scheduler = _create_scheduler_service(runtime_node_repo=None, template_repo=None)
+    return await warm_pool.drain(scheduler)
+
+
+async def reclaim_orphaned_warm_containers() -> int:
+    """
+    销毁上次运行遗留的预热容器（应用启动时调用）
+
+    预热池关闭时同样执行，回收关闭前遗留的容器。
+    """
+    from src.application.services.state_sync_service import ACTIVE_STATUSES
+    from src.infrastructure.persistence.repositories.sql_session_repository import (
+        SqlSessionRepository,
+    )
+
+    async with db_manager.get_session() as session:
+        container_ids = await SqlSessionRepository(session).find_container_ids_by_status(
+            list(ACTIVE_STATUSES)
+        )
+
+    scheduler = _create_scheduler_service(runtime_node_repo=None, template_repo=None)
+    return await get_warm_pool_service().reclaim_orphans(scheduler, set(container_ids.values()))
+
+
+# Execution completion notifier singleton (shared by execute-sync requests and the result callback)
+_execution_notifier_singleton = None
+
+# execute-sync 视为完成的执行状态
+SYNC_TERMINAL_STATUSES = [
+    ExecutionStatus.COMPLETED.value,
+    ExecutionStatus.FAILED.value,
+    ExecutionStatus.TIMEOUT.value,
+    ExecutionStatus.CRASHED.value,
+]
+
+
+async def _find_terminal_executions(execution_ids) -> set:
+    """批量检查等待中的执行是否已到终态（一条查询）"""
+    from src.infrastructure.persistence.repositories.sql_execution_repository import (
+        SqlExecutionRepository,
+    )
+
+    async with db_manager.get_session() as session:
+        repo = SqlExecutionRepository(session)
+        return set(await repo.find_ids_by_status(execution_ids, SYNC_TERMINAL_STATUSES))
+
+
+def get_execution_notifier() -> ExecutionCompletionNotifier:
+    """获取执行完成通知（进程级单例）"""
+    global _execution_notifier_singleton
+
+    if _execution_notifier_singleton is None:
+        settings = get_settings()
+        _execution_notifier_singleton = ExecutionCompletionNotifier(
+            fallback_interval=settings.execution_sync_fallback_interval_seconds,
+            terminal_checker=_find_terminal_executions if USE_SQL_REPOSITORIES else None,
+        )
+    return _execution_notifier_singleton
+
+
 def get_initial_dependency_sync_scheduler():
     """获取首次依赖同步后台调度器。"""
 
@@ -799,6 +918,7 @@ async def _run_initial_dependency_sync(session_id: str, install_timeout: int) ->
                         scheduler=scheduler,
                         storage_service=get_storage_service(),
                         executor_client=ExecutorClient(timeout=float(install_timeout)),
+                        warm_pool=get_warm_pool_service(),
                     )
                     await service.sync_session_dependencies_for_session(
                         session_id=session_id,
@@ -936,6 +1056,15 @@ def _create_direct_session_repository(db_mgr):
                     result.append(session_entity)
             return result
 
+        async def find_container_ids_by_status(self, statuses: list[str]) -> dict[str, str]:
+            """批量健康检查：只查询会话 ID 和容器 ID 两列"""
+            async with self._db_mgr.get_session() as session:
+                stmt = select(SessionModel.f_id, SessionModel.f_container_id).where(
+                    SessionModel.f_status.in_(statuses)
+                )
+                rows = await session.execute(stmt)
+                return {session_id: container_id or "" for session_id, container_id in rows.all()}
+
         async def find_by_id(self, session_id: str):
             """通过 ID 查找"""
             async with self._db_mgr.get_session() as session:
@@ -1166,4 +1295,5 @@ def get_state_sync_service():
         template_repo=template_repo,
         scheduler=scheduler,
         control_plane_url=control_plane_url,
+        recovery_concurrency=settings.health_check_recovery_concurrency,
     )
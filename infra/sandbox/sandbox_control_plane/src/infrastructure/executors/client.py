@@ -258,6 +258,27 @@ class ExecutorClient:
 
         raise ExecutorResponseError(executor_url, response.status_code, response.text)
 
+    async def prefetch_dependency_layers(self, executor_url: str, layer_keys: list[str]) -> None:
+        """
+        通知 executor 在后台将依赖层拉取到节点本地缓存
+
+        Raises:
+            ExecutorConnectionError: 无法连接到执行器
+            ExecutorResponseError: 执行器返回错误
+        """
+        client = self._get_client()
+        url = f"{executor_url}/internal/dependency-layers/prefetch"
+
+        try:
+            response = await client.post(url, json={"layer_keys": layer_keys})
+        except httpx.ConnectError as e:
+            raise ExecutorConnectionError(executor_url, str(e))
+        except httpx.TimeoutException:
+            raise ExecutorTimeoutError(executor_url, self._timeout)
+
+        if response.status_code != 202:
+            raise ExecutorResponseError(executor_url, response.status_code, response.text)
+
     async def close(self) -> None:
         """关闭客户端"""
         if self._client:
@@ -98,6 +98,9 @@ class ExecutorSyncSessionConfigResponse(BaseModel):
     error: str = ""
     started_at: Optional[str] = None
     completed_at: Optional[str] = None
+    # 依赖层缓存：层的内容地址，以及来源 local / remote / built（未启用缓存时为空）
+    layer_key: str = ""
+    layer_source: str = ""
 
 
 @dataclass
@@ -0,0 +1,131 @@
+"""
+执行完成通知
+
+execute-sync 请求等待执行结果时不再逐个轮询数据库：
+- 请求注册等待者后挂起，executor 回调 /internal/executions/{id}/result 提交结果后
+  直接在本进程内唤醒等待者
+- 多副本部署时回调可能落在其他副本上，本进程由一个后台任务每隔 fallback_interval 秒
+  用一条查询批量检查所有等待中的执行是否已到终态（其他路径如状态同步标记的终态也由此发现）
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from src.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 传入等待中的执行 ID，返回其中已到终态的执行 ID
+TerminalChecker = Callable[[List[str]], Awaitable[Set[str]]]
+
+
+class ExecutionCompletionNotifier:
+    """
+    进程内的执行完成通知
+
+    同一执行可以有多个等待者；notify 在没有等待者时直接忽略。
+    """
+
+    def __init__(
+        self,
+        fallback_interval: float = 2.0,
+        terminal_checker: Optional[TerminalChecker] = None,
+    ):
+        """
+        Args:
+            fallback_interval: 批量检查数据库的间隔（秒）
+            terminal_checker: 批量检查终态的函数，为 None 时只依赖本进程内的通知
+        """
+        self._fallback_interval = fallback_interval
+        self._terminal_checker = terminal_checker
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._fallback_task: Optional[asyncio.Task] = None
+        self._stats = {"waits": 0, "notified": 0, "fallback_hits": 0, "fallback_checks": 0, "timeouts": 0}
+
+    def register(self, execution_id: str) -> asyncio.Future:
+        """
+        注册等待者
+
+        必须在读取执行状态之前注册，避免状态读取与回调之间的通知丢失。
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(execution_id, []).append(future)
+        self._ensure_fallback_task()
+        return future
+
+    def unregister(self, execution_id: str, future: asyncio.Future) -> None:
+        waiters = self._waiters.get(execution_id)
+        if waiters is None:
+            return
+        if future in waiters:
+            waiters.remove(future)
+        if not waiters:
+            del self._waiters[execution_id]
+
+    async def wait(self, execution_id: str, future: asyncio.Future, timeout: float) -> bool:
+        """
+        等待执行完成
+
+        Returns:
+            True 表示已收到完成通知，False 表示超时
+        """
+        self._stats["waits"] += 1
+        try:
+            await asyncio.wait_for(future, timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            return False
+        finally:
+            self.unregister(execution_id, future)
+
+    def notify(self, execution_id: str) -> int:
+        """唤醒执行的所有等待者，返回唤醒数量"""
+        return self._resolve([execution_id], "notified")
+
+    def _resolve(self, execution_ids: Iterable[str], stat: str) -> int:
+        woken = 0
+        for execution_id in execution_ids:
+            for future in self._waiters.pop(execution_id, []):
+                if not future.done():
+                    future.set_result(None)
+                    woken += 1
+        self._stats[stat] += woken
+        return woken
+
+    def _ensure_fallback_task(self) -> None:
+        if self._terminal_checker is None:
+            return
+        if self._fallback_task is None or self._fallback_task.done():
+            self._fallback_task = asyncio.get_running_loop().create_task(self._fallback_loop())
+
+    async def _fallback_loop(self) -> None:
+        """有等待者时定期批量检查终态，没有等待者时退出"""
+        while self._waiters:
+            await asyncio.sleep(self._fallback_interval)
+            execution_ids = list(self._waiters)
+            if not execution_ids:
+                break
+            self._stats["fallback_checks"] += 1
+            try:
+                completed = await self._terminal_checker(execution_ids)
+            except Exception as e:
+                logger.warning("Execution completion fallback check failed", error=str(e))
+                continue
+            self._resolve(completed, "fallback_hits")
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def stats(self) -> dict:
+        return {**self._stats, "waiting": self.waiting}
+
+    async def close(self) -> None:
+        if self._fallback_task is not None:
+            self._fallback_task.cancel()
+            try:
+                await self._fallback_task
+            except asyncio.CancelledError:
+                pass
+            self._fallback_task = None
@@ -92,6 +92,17 @@ class SqlExecutionRepository(IExecutionRepository):
         result = await self._session.execute(stmt)
         return [model.to_entity() for model in result.scalars().all()]
 
+    async def find_ids_by_status(self, execution_ids: List[str], statuses: List[str]) -> List[str]:
+        """在给定执行中查找处于指定状态的执行 ID（一次查询）"""
+        if not execution_ids:
+            return []
+        stmt = select(ExecutionModel.f_id).where(
+            ExecutionModel.f_id.in_(execution_ids),
+            ExecutionModel.f_status.in_(statuses),
+        )
+        result = await self._session.execute(stmt)
+        return list(result.scalars().all())
+
     async def find_crashed_executions(self, max_retry_count: int) -> List[Execution]:
         """查找可重试的崩溃执行"""
         # 注意：retry_count 字段不在数据库模型中，这里返回空列表
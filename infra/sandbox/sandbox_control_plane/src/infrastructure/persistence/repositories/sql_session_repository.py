@@ -6,7 +6,7 @@
 """
 
 import time
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from sqlalchemy import select, update, delete, func
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -118,6 +118,21 @@ class SqlSessionRepository(ISessionRepository):
         result = await self._session.execute(stmt)
         return [model.to_entity() for model in result.scalars().all()]
 
+    async def find_container_ids_by_status(self, statuses: List[str]) -> Dict[str, str]:
+        """
+        查询指定状态会话的容器 ID（批量健康检查使用）
+
+        只读取会话 ID 和容器 ID 两列，不受 find_by_status 的 limit 限制。
+
+        Returns:
+            {会话 ID: 容器 ID}，没有容器的会话容器 ID 为空字符串
+        """
+        stmt = select(SessionModel.f_id, SessionModel.f_container_id).where(
+            SessionModel.f_status.in_(statuses)
+        )
+        result = await self._session.execute(stmt)
+        return {session_id: container_id or "" for session_id, container_id in result.all()}
+
     async def find_by_template(self, template_id: str) -> List[Session]:
         """根据模板 ID 查找会话"""
         stmt = select(SessionModel).where(SessionModel.f_template_id == template_id)
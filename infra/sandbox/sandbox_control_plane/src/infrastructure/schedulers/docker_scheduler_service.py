@@ -4,6 +4,7 @@ Docker 调度服务
 实现调度策略，选择最优节点并创建容器。
 """
 
+import socket
 from typing import List, Optional
 
 from src.domain.services.scheduler import (
@@ -17,6 +18,8 @@ from src.domain.value_objects.execution_request import ExecutionRequest
 from src.infrastructure.container_scheduler.base import (
     IContainerScheduler,
     ContainerConfig,
+    WARM_POOL_LABEL,
+    WARM_POOL_OWNER_LABEL,
 )
 from src.infrastructure.executors import ExecutorClient
 from src.infrastructure.logging import get_logger
@@ -52,6 +55,8 @@ class DockerSchedulerService(IScheduler):
         self._executor_port = executor_port
         self._control_plane_url = control_plane_url
         self._disable_bwrap = disable_bwrap
+        # control plane 容器的主机名在容器重启后保持不变，用于识别本实例创建的预热容器
+        self._warm_pool_owner = socket.gethostname()
 
     async def schedule(self, request: ScheduleRequest) -> RuntimeNode:
         """
@@ -298,6 +303,79 @@ class DockerSchedulerService(IScheduler):
             )
             raise
 
+    async def create_warm_container(
+        self,
+        warm_id: str,
+        template_id: str,
+        image: str,
+        resource_limit,
+        workspace_path: str,
+    ) -> str:
+        """
+        创建预热容器
+
+        预热容器不属于任何会话，/workspace 绑定在占位目录 workspace_path 上，
+        被会话领取时再通过 bind_warm_container 绑定到会话工作空间。
+
+        Returns:
+            容器名称（作为容器 ID 用于执行器通信）
+        """
+        container_name = f"sandbox-warm-{warm_id}"
+        config = ContainerConfig(
+            image=image,
+            name=container_name,
+            env_vars={
+                "WORKSPACE_PATH": workspace_path,
+                "CONTROL_PLANE_URL": self._control_plane_url,
+                "DISABLE_BWRAP": "true" if self._disable_bwrap else "false",
+            },
+            cpu_limit=resource_limit.cpu,
+            memory_limit=resource_limit.memory,
+            disk_limit=resource_limit.disk,
+            workspace_path=workspace_path,
+            labels={
+                "template_id": template_id,
+                "managed_by": "sandbox-control-plane",
+                WARM_POOL_LABEL: "true",
+                WARM_POOL_OWNER_LABEL: self._warm_pool_owner,
+            },
+        )
+
+        container_id = await self._container_scheduler.create_container(config)
+        try:
+            await self._container_scheduler.start_container(container_id)
+        except Exception:
+            await self._container_scheduler.remove_container(container_id)
+            raise
+
+        logger.info(
+            "Warm container started",
+            container_name=container_name,
+            template_id=template_id,
+        )
+        return container_name
+
+    async def bind_warm_container(
+        self,
+        container_id: str,
+        session_id: str,
+        workspace_path: str,
+    ) -> None:
+        """将预热容器的 /workspace 绑定到会话工作空间"""
+        await self._container_scheduler.bind_workspace(container_id, workspace_path)
+        logger.info(
+            "Warm container bound to session",
+            container_id=container_id,
+            session_id=session_id,
+        )
+
+    async def list_warm_containers(self) -> List[str]:
+        """列出本实例创建的预热容器（包括已被会话领取的容器）"""
+        names = await self._container_scheduler.list_containers_by_labels(
+            {WARM_POOL_LABEL: "true", WARM_POOL_OWNER_LABEL: self._warm_pool_owner}
+        )
+        return names or []
+
     async def destroy_container(self, container_id: str, timeout: int = 10) -> None:
         """
         销毁容器
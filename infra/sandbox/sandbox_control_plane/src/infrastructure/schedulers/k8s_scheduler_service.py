@@ -19,6 +19,8 @@ from src.infrastructure.container_scheduler.base import (
     IContainerScheduler,
     ContainerConfig,
     ControlPlaneOwnerContext,
+    WARM_POOL_LABEL,
+    WARM_POOL_OWNER_LABEL,
 )
 from src.infrastructure.executors import ExecutorClient
 
@@ -177,6 +179,70 @@ class K8sSchedulerService(IScheduler):
             logger.error(f"Failed to create Pod for session {session_id}: {e}")
             raise
 
+    async def create_warm_container(
+        self,
+        warm_id: str,
+        template_id: str,
+        image: str,
+        resource_limit,
+        workspace_path: str,
+    ) -> str:
+        """
+        创建预热 Pod
+
+        预热 Pod 不属于任何会话，/workspace 绑定在占位目录 workspace_path 上，
+        被会话领取时再通过 bind_warm_container 绑定到会话工作空间。
+
+        Returns:
+            Pod 名称
+        """
+        config = ContainerConfig(
+            image=image,
+            name=f"sandbox-warm-{warm_id}",
+            env_vars={
+                "WORKSPACE_PATH": workspace_path,
+                "CONTROL_PLANE_URL": self._control_plane_url,
+                "DISABLE_BWRAP": "true" if self._disable_bwrap else "false",
+            },
+            cpu_limit=resource_limit.cpu,
+            memory_limit=resource_limit.memory,
+            disk_limit=resource_limit.disk,
+            workspace_path=workspace_path,
+            labels={
+                "template_id": template_id,
+                "managed_by": "sandbox-control-plane",
+                WARM_POOL_LABEL: "true",
+                WARM_POOL_OWNER_LABEL: self._owner_context.pod_uid,
+            },
+            owner_context=self._owner_context,
+        )
+
+        pod_name = await self._container_scheduler.create_container(config)
+        logger.info(f"Created warm Pod {pod_name} for template {template_id}")
+        return pod_name
+
+    async def bind_warm_container(
+        self,
+        container_id: str,
+        session_id: str,
+        workspace_path: str,
+    ) -> None:
+        """将预热 Pod 的 /workspace 绑定到会话工作空间"""
+        await self._container_scheduler.bind_workspace(container_id, workspace_path)
+        logger.info(f"Warm Pod {container_id} bound to session {session_id}")
+
+    async def list_warm_containers(self) -> List[str]:
+        """
+        列出当前 control plane Pod 创建的预热 Pod（包括已被会话领取的 Pod）
+
+        control plane Pod 被删除时预热 Pod 随 ownerReferences 级联删除，
+        进程在同一 Pod 内重启时遗留的预热 Pod 由启动回收处理。
+        """
+        names = await self._container_scheduler.list_containers_by_labels(
+            {WARM_POOL_LABEL: "true", WARM_POOL_OWNER_LABEL: self._owner_context.pod_uid}
+        )
+        return names or []
+
     async def destroy_container(self, container_id: str, timeout: int = 10) -> None:
         """
         销毁 Pod
@@ -13,7 +13,6 @@ from src.application.services.session_service import SessionService
 from src.application.commands.execute_code import ExecuteCodeCommand
 from src.application.queries.get_execution import GetExecutionQuery
 from src.application.dtos.execution_dto import ExecutionDTO
-from src.domain.value_objects.execution_status import ExecutionStatus
 from src.interfaces.rest.schemas.request import ExecuteCodeRequest
 from src.interfaces.rest.schemas.response import (
     ExecutionResponse,
@@ -21,7 +20,9 @@ from src.interfaces.rest.schemas.response import (
     ErrorResponse,
 )
 from src.infrastructure.dependencies import (
+    SYNC_TERMINAL_STATUSES,
     USE_SQL_REPOSITORIES,
+    get_execution_notifier,
     get_session_service_db,
     get_session_service as get_mock_session_service,
 )
@@ -79,7 +80,10 @@ async def execute_code_sync(
     session_id: str,
     request: ExecuteCodeRequest,
     poll_interval: float = Query(
-        default=0.5, ge=0.1, le=10.0, description="Polling interval in seconds"
+        default=0.5,
+        ge=0.1,
+        le=10.0,
+        description="Deprecated: completion is now pushed by the executor callback; kept for compatibility",
     ),
     sync_timeout: int = Query(
         default=300, ge=10, le=3600, description="Maximum wait time in seconds"
@@ -89,11 +93,16 @@ async def execute_code_sync(
     """
     Synchronous code execution endpoint
 
-    Internally calls async execution and polls for result until:
+    Internally calls async execution and waits for its completion until:
     - Execution reaches terminal state (COMPLETED, FAILED, TIMEOUT, CRASHED)
     - sync_timeout is reached
 
-    - **poll_interval**: Polling interval in seconds (default: 0.5, range: 0.1-10.0)
+    The request does not poll the database. It is woken up by the executor
+    result callback on this replica; completions reported to other replicas
+    are picked up by one batched status query per process every
+    EXECUTION_SYNC_FALLBACK_INTERVAL_SECONDS.
+
+    - **poll_interval**: Deprecated, ignored
     - **sync_timeout**: Maximum wait time in seconds (default: 300, range: 10-3600)
     - **code**: Code to execute
     - **language**: Programming language (python, javascript, shell)
@@ -113,56 +122,46 @@ async def execute_code_sync(
     execution_dto = await service.execute_code(command)
     execution_id = execution_dto.id
 
-    # 2. Poll for result with timeout
-    loop = asyncio.get_event_loop()
-    start_time = loop.time()
-    # Terminal states for early exit
-    terminal_states = {
-        ExecutionStatus.COMPLETED.value,
-        ExecutionStatus.FAILED.value,
-        ExecutionStatus.TIMEOUT.value,
-        ExecutionStatus.CRASHED.value,
-    }
-
-    import logging
-
-    logger = logging.getLogger(__name__)
-    logger.info(
-        f"Starting sync polling loop: execution_id={execution_id}, USE_SQL_REPOSITORIES={USE_SQL_REPOSITORIES}"
-    )
+    # 2. Wait for completion with timeout
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + sync_timeout
+    notifier = get_execution_notifier()
 
     while True:
-        # Check timeout
-        elapsed = loop.time() - start_time
-        if elapsed >= sync_timeout:
+        # Register before reading so a callback between the read and the wait is not lost
+        waiter = notifier.register(execution_id)
+        try:
+            execution_dto = await _get_execution(execution_id, service)
+        except BaseException:
+            notifier.unregister(execution_id, waiter)
+            raise
+
+        if execution_dto.status in SYNC_TERMINAL_STATUSES:
+            notifier.unregister(execution_id, waiter)
+            return _map_dto_to_response(execution_dto)
+
+        remaining = deadline - loop.time()
+        if remaining <= 0 or not await notifier.wait(execution_id, waiter, remaining):
             raise HTTPException(
                 status_code=status.HTTP_408_REQUEST_TIMEOUT,
                 detail=f"Synchronous execution timeout after {sync_timeout}s",
             )
 
-        # Get current status - use a fresh database session for each poll
-        # to avoid REPEATABLE-READ transaction isolation issues
-        if USE_SQL_REPOSITORIES:
-            execution_dto = await _get_execution_with_fresh_session(execution_id)
-        else:
-            # Mock mode - use the service directly
-            query = GetExecutionQuery(execution_id=execution_id)
-            execution_dto = await service.get_execution(query)
-
-        # Check if terminal state
-        if execution_dto.status in terminal_states:
-            return _map_dto_to_response(execution_dto)
 
-        # Wait before next poll
-        await asyncio.sleep(poll_interval)
+async def _get_execution(execution_id: str, service: SessionService) -> ExecutionDTO:
+    if USE_SQL_REPOSITORIES:
+        # Use a fresh database session to avoid REPEATABLE-READ transaction isolation issues
+        return await _get_execution_with_fresh_session(execution_id)
+    # Mock mode - use the service directly
+    return await service.get_execution(GetExecutionQuery(execution_id=execution_id))
 
 
 async def _get_execution_with_fresh_session(execution_id: str) -> ExecutionDTO:
     """
     Get execution using a fresh database session.
 
-    This is required for the sync execution polling loop to work around
-    MySQL's REPEATABLE-READ transaction isolation. Each poll needs to
+    This is required for the sync execution endpoint to work around
+    MySQL's REPEATABLE-READ transaction isolation. Each read needs to
     see the latest committed data from the executor callback.
     """
     from src.infrastructure.persistence.repositories.sql_execution_repository import (
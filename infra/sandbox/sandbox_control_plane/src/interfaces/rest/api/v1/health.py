@@ -54,6 +54,18 @@ async def detailed_health_check() -> dict:
     }
 
 
+@router.get("/warm-pool")
+async def warm_pool_stats() -> dict:
+    """
+    预热池状态
+
+    返回各模板的空闲/启动中容器数、领取命中率和会话创建耗时。
+    """
+    from src.infrastructure.dependencies import get_warm_pool_service
+
+    return get_warm_pool_service().stats()
+
+
 @router.post("/sync")
 async def trigger_state_sync() -> dict:
     """
@@ -22,6 +22,7 @@ from src.interfaces.rest.schemas.internal import (
 )
 from src.infrastructure.dependencies import (
     USE_SQL_REPOSITORIES,
+    get_execution_notifier,
     get_execution_repository as get_sql_execution_repository,
     get_session_repository as get_sql_session_repository,
 )
@@ -138,6 +139,7 @@ async def report_execution_result(
     # 2. 检查是否已经是终态（幂等性）
     if execution.is_terminal():
         logger.info(f"Execution {execution_id} already in terminal state: {execution.state.status}")
+        get_execution_notifier().notify(execution_id)
         return InternalAPIResponse(message="Result already recorded")
 
     # 3. 映射 API 状态到域状态
@@ -216,6 +218,9 @@ async def report_execution_result(
         # 6.5. 提交事务，确保其他请求可以立即看到更新后的执行状态
         await execution_repo.commit()
 
+        # 6.6. 唤醒本进程内等待该执行的 execute-sync 请求
+        get_execution_notifier().notify(execution_id)
+
         logger.info(
             f"Execution result recorded: {execution_id}, status={domain_status}, "
             f"exit_code={report.exit_code}"
@@ -115,6 +115,15 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.error("Failed to perform startup state sync", error=str(e), exc_info=True)
 
+    # 回收上次运行遗留的预热容器
+    from src.infrastructure.dependencies import reclaim_orphaned_warm_containers
+
+    try:
+        reclaimed = await reclaim_orphaned_warm_containers()
+        logger.info(f"Orphaned warm containers reclaimed: {reclaimed}")
+    except Exception as e:
+        logger.warning(f"Failed to reclaim orphaned warm containers: {e}")
+
     # ============= 启动后台任务管理器 =============
     from src.infrastructure.background_tasks import BackgroundTaskManager
     from src.infrastructure.dependencies import get_state_sync_service
@@ -183,6 +192,17 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         initial_delay_seconds=60,  # 首次执行延迟 1 分钟
     )
 
+    # 注册预热池补充任务
+    if settings.warm_pool_enabled:
+        from src.infrastructure.dependencies import run_warm_pool_replenish
+
+        background_task_manager.register_task(
+            name="warm_pool_replenish",
+            func=run_warm_pool_replenish,
+            interval_seconds=settings.warm_pool_replenish_interval_seconds,
+            initial_delay_seconds=5,
+        )
+
     # 启动所有后台任务
     await background_task_manager.start_all()
     logger.info(f"Background tasks started: {background_task_manager.task_count} tasks")
@@ -200,6 +220,15 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         await app.state.background_task_manager.stop_all()
         logger.info("Background tasks stopped")
 
+    # 销毁预热池中未领取的容器
+    from src.infrastructure.dependencies import drain_warm_pool
+
+    try:
+        drained = await drain_warm_pool()
+        logger.info(f"Warm pool drained: {drained} containers")
+    except Exception as e:
+        logger.warning(f"Failed to drain warm pool: {e}")
+
     # 清理依赖项（包括关闭数据库连接）
     from src.infrastructure.dependencies import cleanup_dependencies
 
@@ -318,6 +347,12 @@ def _register_routes(app: FastAPI) -> None:
     app.include_router(files.router, prefix="/api/v1")
     app.include_router(internal.router, prefix="/api/v1")  # 内部 API
 
+    # Prometheus 指标（预热池命中率、会话创建耗时等）
+    if _settings.metrics_enabled:
+        from prometheus_client import make_asgi_app
+
+        app.mount("/metrics", make_asgi_app())
+
     # 根端点
     @app.get("/", tags=["root"])
     async def root() -> dict:
@@ -16,6 +16,7 @@ from src.application.commands.install_session_dependencies import (
 )
 from src.application.queries.get_execution import GetExecutionQuery
 from src.application.services.session_service import SessionService
+from src.application.services.warm_pool_service import WarmContainer
 from src.domain.entities.session import Session
 from src.domain.entities.template import Template
 from src.domain.services.scheduler import RuntimeNode
@@ -1019,6 +1020,31 @@ class TestSessionService:
         assert result.dependency_install_status == "completed"
         assert result.installed_dependencies[0]["name"] == "requests"
 
+    @pytest.mark.asyncio
+    async def test_sync_session_dependencies_records_dependency_layer(
+        self, service, executor_client
+    ):
+        session = Session(
+            id="sess_1",
+            template_id="python-test",
+            status=SessionStatus.RUNNING,
+            resource_limit=ResourceLimit.default(),
+            workspace_path="s3://bucket/sessions/sess_1",
+            runtime_type="python3.11",
+            container_id="container-1",
+            requested_dependencies=["requests==2.31.0"],
+        )
+        executor_client.sync_session_config.return_value = ExecutorSyncSessionConfigResponse(
+            status="completed",
+            layer_key="abc123",
+            layer_source="remote",
+        )
+        service._warm_pool = Mock()
+
+        await service._sync_session_dependencies(session, sync_mode="replace")
+
+        service._warm_pool.record_dependency_layer.assert_called_once_with("python-test", "abc123")
+
     def test_schedule_initial_dependency_sync_without_scheduler(
         self, session_repo, template_repo, scheduler
     ):
@@ -1036,3 +1062,104 @@ class TestSessionService:
         assert service._infer_runtime_type("java:17") == "java17"
         assert service._infer_runtime_type("golang:1.21") == "go1.21"
         assert service._infer_runtime_type("ubuntu:22.04") == "python3.11"
+
+    def _warm_pool(self, warm=None):
+        warm_pool = Mock()
+        warm_pool.enabled = True
+        warm_pool.claim = AsyncMock(return_value=warm)
+        return warm_pool
+
+    def _warm_service(self, session_repo, template_repo, scheduler, warm_pool):
+        template_repo.find_by_id.return_value = Template(
+            id="python-basic",
+            name="Python Basic",
+            image="python:3.11",
+            base_image="python:3.11-slim",
+        )
+        scheduler.schedule.return_value = RuntimeNode(
+            id="node-1",
+            type="docker",
+            url="http://node-1:2375",
+            status="healthy",
+            cpu_usage=0.1,
+            mem_usage=0.1,
+            session_count=0,
+            max_sessions=100,
+            cached_templates=[],
+        )
+        scheduler.bind_warm_container = AsyncMock()
+        return SessionService(
+            session_repo=session_repo,
+            execution_repo=Mock(),
+            template_repo=template_repo,
+            scheduler=scheduler,
+            warm_pool=warm_pool,
+        )
+
+    @pytest.mark.asyncio
+    async def test_create_session_claims_warm_container(
+        self, session_repo, template_repo, scheduler
+    ):
+        warm = WarmContainer(
+            container_id="sandbox-warm-abc",
+            template_id="python-basic",
+            resource_limit=ResourceLimit.default(),
+            created_at=0.0,
+            ready_at=1.0,
+        )
+        warm_pool = self._warm_pool(warm)
+        service = self._warm_service(session_repo, template_repo, scheduler, warm_pool)
+
+        result = await service.create_session(CreateSessionCommand(template_id="python-basic"))
+
+        assert result.container_id == "sandbox-warm-abc"
+        assert result.status == SessionStatus.RUNNING.value
+        warm_pool.claim.assert_awaited_once_with("python-basic", ResourceLimit.default())
+        scheduler.bind_warm_container.assert_awaited_once_with(
+            container_id="sandbox-warm-abc",
+            session_id=result.id,
+            workspace_path=f"s3://sandbox-workspace/sessions/{result.id}",
+        )
+        scheduler.create_container_for_session.assert_not_called()
+        assert warm_pool.record_create_latency.call_args.args[0] == "warm"
+
+    @pytest.mark.asyncio
+    async def test_create_session_falls_back_to_cold_start_on_miss_and_bind_failure(
+        self, session_repo, template_repo, scheduler
+    ):
+        warm_pool = self._warm_pool(None)
+        service = self._warm_service(session_repo, template_repo, scheduler, warm_pool)
+
+        result = await service.create_session(CreateSessionCommand(template_id="python-basic"))
+
+        assert result.container_id == "container-123"
+        assert warm_pool.record_create_latency.call_args.args[0] == "cold"
+
+        warm_pool.claim.return_value = WarmContainer(
+            container_id="sandbox-warm-bad",
+            template_id="python-basic",
+            resource_limit=ResourceLimit.default(),
+            created_at=0.0,
+        )
+        scheduler.bind_warm_container = AsyncMock(side_effect=RuntimeError("mount failed"))
+
+        result = await service.create_session(CreateSessionCommand(template_id="python-basic"))
+
+        assert result.container_id == "container-123"
+        warm_pool.record_bind_failure.assert_called_once()
+        scheduler.destroy_container.assert_awaited_once_with("sandbox-warm-bad")
+
+    @pytest.mark.asyncio
+    async def test_create_session_with_env_vars_bypasses_warm_pool(
+        self, session_repo, template_repo, scheduler
+    ):
+        warm_pool = self._warm_pool(None)
+        service = self._warm_service(session_repo, template_repo, scheduler, warm_pool)
+
+        await service.create_session(
+            CreateSessionCommand(template_id="python-basic", env_vars={"TOKEN": "x"})
+        )
+
+        warm_pool.claim.assert_not_called()
+        warm_pool.record_bypass.assert_called_once()
+        scheduler.create_container_for_session.assert_awaited_once()
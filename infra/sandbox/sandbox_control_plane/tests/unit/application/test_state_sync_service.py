@@ -3,6 +3,8 @@
 
 测试 StateSyncService 的状态同步逻辑。
 """
+import asyncio
+
 import pytest
 from unittest.mock import Mock, AsyncMock
 from datetime import datetime, timedelta
@@ -832,3 +834,219 @@ class TestStateSyncService:
         assert result["total"] == 0
         assert result["healthy"] == 0
         assert result["unhealthy"] == 0
+
+
+class BulkSessionRepo:
+    """支持批量查询容器 ID 的会话仓储"""
+
+    def __init__(self, container_ids, sessions):
+        self.container_ids = container_ids
+        self.sessions = sessions
+        self.queries = []
+        self.loaded = []
+        self.save = AsyncMock()
+
+    async def find_container_ids_by_status(self, statuses):
+        self.queries.append(statuses)
+        return {
+            session_id: container_id
+            for session_id, (status, container_id) in self.container_ids.items()
+            if status in statuses
+        }
+
+    async def find_by_id(self, session_id):
+        self.loaded.append(session_id)
+        return self.sessions.get(session_id)
+
+
+class ListingScheduler:
+    """支持一次列出运行中容器的调度器"""
+
+    def __init__(self, running):
+        self.running = set(running)
+        self.list_calls = 0
+        self.list_error = None
+        self.is_container_running = AsyncMock(return_value=False)
+        self.create_container = AsyncMock(return_value="new-container")
+        self.start_container = AsyncMock()
+
+    async def list_running_containers(self):
+        self.list_calls += 1
+        if self.list_error is not None:
+            raise self.list_error
+        return self.running
+
+
+def _running_session(session_id, container_id):
+    return Session(
+        id=session_id,
+        template_id="python-basic",
+        status=SessionStatus.RUNNING,
+        resource_limit=ResourceLimit.default(),
+        workspace_path=f"s3://sandbox-workspace/sessions/{session_id}",
+        runtime_type="docker",
+        container_id=container_id,
+    )
+
+
+class TestStateSyncServiceBatchReconcile:
+    """批量对比容器状态测试"""
+
+    @pytest.fixture
+    def template_repo(self):
+        repo = Mock()
+        repo.find_by_id = AsyncMock(
+            return_value=Template(
+                id="python-basic",
+                name="Python Basic",
+                image="sandbox-template-python-basic:latest",
+                base_image="python:3.11-slim",
+                pre_installed_packages=[],
+                default_resources=ResourceLimit.default(),
+            )
+        )
+        return repo
+
+    @pytest.mark.asyncio
+    async def test_periodic_health_check_lists_containers_once(self, template_repo):
+        """测试定期健康检查只列出一次容器，只对缺失的会话逐个确认并恢复"""
+        session_repo = BulkSessionRepo(
+            {
+                f"sess_{index}": ("running", f"container-{index}")
+                for index in range(50)
+            }
+            | {"sess_missing": ("running", "container-missing"), "sess_new": ("running", "")},
+            {"sess_missing": _running_session("sess_missing", "container-missing")},
+        )
+        scheduler = ListingScheduler({f"container-{index}" for index in range(50)})
+        service = StateSyncService(
+            session_repo=session_repo,
+            container_scheduler=scheduler,
+            template_repo=template_repo,
+        )
+
+        result = await service.periodic_health_check()
+
+        assert result["checked"] == 51
+        assert result["healthy"] == 50
+        assert result["unhealthy"] == 1
+        assert result["recovered"] == 1
+        assert session_repo.queries == [["running"]]
+        assert scheduler.list_calls == 1
+        scheduler.is_container_running.assert_awaited_once_with("container-missing")
+        assert session_repo.loaded == ["sess_missing"]
+        saved = session_repo.save.await_args.args[0]
+        assert saved.container_id == "new-container"
+
+    @pytest.mark.asyncio
+    async def test_periodic_health_check_skips_sessions_changed_since_query(self, template_repo):
+        """测试查询后已被终止或换了容器的会话不会被恢复"""
+        terminated = _running_session("sess_terminated", "container-1")
+        terminated.status = SessionStatus.TERMINATED
+        session_repo = BulkSessionRepo(
+            {
+                "sess_terminated": ("running", "container-1"),
+                "sess_moved": ("running", "container-2"),
+            },
+            {
+                "sess_terminated": terminated,
+                "sess_moved": _running_session("sess_moved", "container-3"),
+            },
+        )
+        scheduler = ListingScheduler(set())
+        service = StateSyncService(
+            session_repo=session_repo,
+            container_scheduler=scheduler,
+            template_repo=template_repo,
+        )
+
+        result = await service.periodic_health_check()
+
+        assert result["checked"] == 2
+        assert result["unhealthy"] == 0
+        scheduler.is_container_running.assert_not_awaited()
+        session_repo.save.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_suspect_running_on_confirmation_is_healthy(self, template_repo):
+        """测试列表中缺失但逐个确认时已运行的容器计为健康"""
+        session_repo = BulkSessionRepo(
+            {"sess_1": ("running", "container-1")},
+            {"sess_1": _running_session("sess_1", "container-1")},
+        )
+        scheduler = ListingScheduler(set())
+        scheduler.is_container_running.return_value = True
+        service = StateSyncService(
+            session_repo=session_repo,
+            container_scheduler=scheduler,
+            template_repo=template_repo,
+        )
+
+        result = await service.periodic_health_check()
+
+        assert result["healthy"] == 1
+        assert result["unhealthy"] == 0
+        scheduler.create_container.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_list_failure_falls_back_to_per_session_checks(self, template_repo):
+        """测试列出容器失败时逐个检查"""
+        session_repo = BulkSessionRepo(
+            {"sess_1": ("running", "container-1"), "sess_2": ("creating", "container-2")},
+            {
+                "sess_1": _running_session("sess_1", "container-1"),
+                "sess_2": _running_session("sess_2", "container-2"),
+            },
+        )
+        session_repo.sessions["sess_2"].status = SessionStatus.CREATING
+        scheduler = ListingScheduler(set())
+        scheduler.list_error = RuntimeError("api unavailable")
+        scheduler.is_container_running.return_value = True
+        service = StateSyncService(
+            session_repo=session_repo,
+            container_scheduler=scheduler,
+            template_repo=template_repo,
+        )
+
+        result = await service.sync_on_startup()
+
+        assert result["total"] == 2
+        assert result["healthy"] == 2
+        assert scheduler.is_container_running.await_count == 2
+        assert session_repo.queries == [["running", "creating"]]
+
+    @pytest.mark.asyncio
+    async def test_recoveries_run_concurrently_with_bound(self, template_repo):
+        """测试恢复并发执行且并发数受限"""
+        session_ids = [f"sess_{index}" for index in range(10)]
+        session_repo = BulkSessionRepo(
+            {session_id: ("running", f"container-{session_id}") for session_id in session_ids},
+            {
+                session_id: _running_session(session_id, f"container-{session_id}")
+                for session_id in session_ids
+            },
+        )
+        scheduler = ListingScheduler(set())
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_create(config):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return f"new-{config.name}"
+
+        scheduler.create_container.side_effect = slow_create
+        service = StateSyncService(
+            session_repo=session_repo,
+            container_scheduler=scheduler,
+            template_repo=template_repo,
+            recovery_concurrency=3,
+        )
+
+        result = await service.periodic_health_check()
+
+        assert result["recovered"] == 10
+        assert max_in_flight == 3
@@ -0,0 +1,260 @@
+"""
+预热池应用服务单元测试
+
+测试 WarmPoolService 的领取、按需求补充和空闲回收逻辑。
+"""
+
+import itertools
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.application.services.warm_pool_service import WarmPoolService
+from src.domain.entities.template import Template
+from src.domain.value_objects.resource_limit import ResourceLimit
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeWarmScheduler:
+    """支持按标签列出预热容器的调度服务"""
+
+    def __init__(self, warm_containers):
+        self.list_warm_containers = AsyncMock(return_value=warm_containers)
+        self.destroy_container = AsyncMock()
+
+    async def list_warm_containers(self):
+        raise NotImplementedError
+
+
+class TestWarmPoolService:
+    """预热池应用服务测试"""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def pool(self, clock):
+        return WarmPoolService(
+            enabled=True,
+            default_size=4,
+            min_size=2,
+            max_idle_time=300,
+            placeholder_workspace="s3://bucket/warm-pool/idle",
+            default_template_id="python-basic",
+            startup_timeout=60,
+            clock=clock,
+        )
+
+    @pytest.fixture
+    def scheduler(self):
+        counter = itertools.count()
+        scheduler = Mock()
+        scheduler.create_warm_container = AsyncMock(
+            side_effect=lambda **kwargs: f"sandbox-warm-{next(counter)}"
+        )
+        scheduler.get_executor_url = AsyncMock(side_effect=lambda cid: f"http://{cid}:8080")
+        scheduler.destroy_container = AsyncMock()
+        return scheduler
+
+    @pytest.fixture
+    def template_repo(self):
+        repo = Mock()
+        repo.find_by_id = AsyncMock(
+            side_effect=lambda template_id: Template(
+                id=template_id,
+                name=template_id,
+                image=f"{template_id}:latest",
+                base_image="python:3.11-slim",
+            )
+        )
+        return repo
+
+    @pytest.fixture
+    def executor_client(self):
+        client = Mock()
+        client.health_check = AsyncMock()
+        client.prefetch_dependency_layers = AsyncMock()
+        return client
+
+    async def _fill(self, pool, scheduler, template_repo, executor_client):
+        """创建并在下一轮中将容器标记为就绪"""
+        await pool.replenish(scheduler, template_repo, executor_client)
+        return await pool.replenish(scheduler, template_repo, executor_client)
+
+    @pytest.mark.asyncio
+    async def test_default_template_is_prewarmed_and_claimed(
+        self, pool, scheduler, template_repo, executor_client
+    ):
+        result = await self._fill(pool, scheduler, template_repo, executor_client)
+
+        assert result["ready"] == 2
+        assert scheduler.create_warm_container.await_count == 2
+        kwargs = scheduler.create_warm_container.await_args.kwargs
+        assert kwargs["template_id"] == "python-basic"
+        assert kwargs["image"] == "python-basic:latest"
+        assert kwargs["workspace_path"] == "s3://bucket/warm-pool/idle"
+
+        warm = await pool.claim("python-basic", ResourceLimit.default())
+        assert warm.container_id == "sandbox-warm-0"
+        # 资源规格不同的会话不能领取
+        assert await pool.claim("python-basic", ResourceLimit(cpu="2", memory="1Gi", disk="1Gi")) is None
+
+        stats = pool.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["idle"] == 1
+
+    @pytest.mark.asyncio
+    async def test_target_scales_with_recent_demand(
+        self, pool, clock, scheduler, template_repo, executor_client
+    ):
+        key = ("python-data", ResourceLimit.default())
+        assert pool.target_size(key) == 0
+
+        await pool.claim(*key)
+        assert pool.target_size(key) == 2
+        for _ in range(5):
+            await pool.claim(*key)
+        assert pool.target_size(key) == 4
+
+        clock.now += 301
+        assert pool.target_size(key) == 0
+
+    @pytest.mark.asyncio
+    async def test_surplus_idle_containers_are_evicted_after_max_idle_time(
+        self, pool, clock, scheduler, template_repo, executor_client
+    ):
+        key = ("python-data", ResourceLimit.default())
+        for _ in range(3):
+            await pool.claim(*key)
+        await self._fill(pool, scheduler, template_repo, executor_client)
+        assert pool.stats()["templates"]["python-data:1/512Mi/1Gi"]["idle"] == 3
+
+        # 需求过期后仍在空闲期内的容器保留
+        clock.now += 200
+        result = await pool.replenish(scheduler, template_repo, executor_client)
+        assert result["evicted"] == 0
+
+        clock.now += 200
+        result = await pool.replenish(scheduler, template_repo, executor_client)
+        assert result["evicted"] == 3
+        assert pool.stats()["templates"]["python-data:1/512Mi/1Gi"]["idle"] == 0
+
+    @pytest.mark.asyncio
+    async def test_containers_not_ready_within_startup_timeout_are_destroyed(
+        self, pool, clock, scheduler, template_repo, executor_client
+    ):
+        executor_client.health_check.side_effect = ConnectionError("not ready")
+        await pool.replenish(scheduler, template_repo, executor_client)
+
+        result = await pool.replenish(scheduler, template_repo, executor_client)
+        assert result["failed"] == 0
+        assert pool.stats()["starting"] == 2
+
+        clock.now += 61
+        result = await pool.replenish(scheduler, template_repo, executor_client)
+        assert result["failed"] == 2
+        assert scheduler.destroy_container.await_count == 2
+        # 同一轮补充新的容器
+        assert result["created"] == 2
+
+    @pytest.mark.asyncio
+    async def test_drain_destroys_unclaimed_containers(
+        self, pool, scheduler, template_repo, executor_client
+    ):
+        await self._fill(pool, scheduler, template_repo, executor_client)
+
+        assert await pool.drain(scheduler) == 2
+        assert scheduler.destroy_container.await_count == 2
+        assert await pool.claim("python-basic", ResourceLimit.default()) is None
+
+    @pytest.mark.asyncio
+    async def test_reclaim_orphans_skips_claimed_and_held_containers(
+        self, pool, scheduler, template_repo, executor_client
+    ):
+        await self._fill(pool, scheduler, template_repo, executor_client)
+        warm_scheduler = FakeWarmScheduler(
+            ["sandbox-warm-0", "sandbox-warm-1", "sandbox-warm-old", "sandbox-warm-claimed"]
+        )
+
+        reclaimed = await pool.reclaim_orphans(warm_scheduler, {"sandbox-warm-claimed"})
+
+        assert reclaimed == 1
+        warm_scheduler.destroy_container.assert_awaited_once_with("sandbox-warm-old")
+
+    @pytest.mark.asyncio
+    async def test_reclaim_orphans_continues_after_destroy_failure(self, pool):
+        warm_scheduler = FakeWarmScheduler(["sandbox-warm-a", "sandbox-warm-b"])
+        warm_scheduler.destroy_container.side_effect = [RuntimeError("gone"), None]
+
+        assert await pool.reclaim_orphans(warm_scheduler, set()) == 2
+        assert warm_scheduler.destroy_container.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_reclaim_orphans_without_label_listing(self, pool, scheduler):
+        assert await pool.reclaim_orphans(scheduler, set()) == 0
+        scheduler.destroy_container.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_ready_containers_prefetch_popular_dependency_layers(
+        self, clock, scheduler, template_repo, executor_client
+    ):
+        pool = WarmPoolService(
+            enabled=True,
+            default_size=4,
+            min_size=1,
+            max_idle_time=300,
+            placeholder_workspace="s3://bucket/warm-pool/idle",
+            default_template_id="python-basic",
+            prefetch_layers=2,
+            clock=clock,
+        )
+        for layer_key, count in (("layer-a", 1), ("layer-b", 3), ("layer-c", 2)):
+            for _ in range(count):
+                pool.record_dependency_layer("python-basic", layer_key)
+        pool.record_dependency_layer("python-data", "layer-d")
+
+        await self._fill(pool, scheduler, template_repo, executor_client)
+
+        executor_client.prefetch_dependency_layers.assert_awaited_once_with(
+            "http://sandbox-warm-0:8080", ["layer-b", "layer-c"]
+        )
+        assert pool.stats()["layer_prefetches"] == 2
+
+    @pytest.mark.asyncio
+    async def test_prefetch_failure_does_not_block_ready(
+        self, pool, scheduler, template_repo, executor_client
+    ):
+        pool.record_dependency_layer("python-basic", "layer-a")
+        executor_client.prefetch_dependency_layers.side_effect = ConnectionError("refused")
+
+        result = await self._fill(pool, scheduler, template_repo, executor_client)
+
+        assert result["ready"] == 2
+        assert pool.stats()["layer_prefetches"] == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled_pool_does_nothing(self, clock, scheduler, template_repo, executor_client):
+        pool = WarmPoolService(
+            enabled=False,
+            default_size=4,
+            min_size=2,
+            max_idle_time=300,
+            placeholder_workspace="s3://bucket/warm-pool/idle",
+            default_template_id="python-basic",
+            clock=clock,
+        )
+
+        await pool.replenish(scheduler, template_repo, executor_client)
+
+        scheduler.create_warm_container.assert_not_called()
+        assert pool.enabled is False
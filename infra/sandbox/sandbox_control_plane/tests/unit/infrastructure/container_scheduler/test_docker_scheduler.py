@@ -3,12 +3,17 @@ Docker 容器调度器单元测试
 
 测试 DockerScheduler 类的功能。
 """
+import json
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+from aiodocker.containers import DockerContainer
 from aiodocker.exceptions import DockerError
 
-from src.infrastructure.container_scheduler.base import ContainerConfig
+from src.infrastructure.container_scheduler.base import (
+    ContainerConfig,
+    build_workspace_bind_command,
+)
 from src.infrastructure.container_scheduler.docker_scheduler import DockerScheduler
 
 
@@ -273,6 +278,42 @@ class TestDockerScheduler:
 
         assert is_running is True
 
+    @pytest.mark.asyncio
+    async def test_list_running_containers(self, scheduler, mock_docker):
+        """测试一次调用列出运行中的容器（ID、短 ID 和名称均可匹配）"""
+        container_id = "a" * 64
+        containers_mock = Mock()
+        containers_mock.list = AsyncMock(
+            return_value=[DockerContainer(mock_docker, Id=container_id, Names=["/sandbox-sess_1"])]
+        )
+        mock_docker.containers = containers_mock
+
+        running = await scheduler.list_running_containers()
+
+        assert running == {container_id, container_id[:12], "sandbox-sess_1"}
+        containers_mock.list.assert_awaited_once_with(
+            filters=json.dumps({"status": ["running"]})
+        )
+
+    @pytest.mark.asyncio
+    async def test_list_containers_by_labels(self, scheduler, mock_docker):
+        """测试按标签列出容器名称（包括已停止的容器）"""
+        containers_mock = Mock()
+        containers_mock.list = AsyncMock(
+            return_value=[DockerContainer(mock_docker, Id="b" * 64, Names=["/sandbox-warm-abc"])]
+        )
+        mock_docker.containers = containers_mock
+
+        names = await scheduler.list_containers_by_labels(
+            {"warm-pool": "true", "warm-pool-owner": "host-1"}
+        )
+
+        assert names == ["sandbox-warm-abc"]
+        containers_mock.list.assert_awaited_once_with(
+            all=True,
+            filters=json.dumps({"label": ["warm-pool=true", "warm-pool-owner=host-1"]}),
+        )
+
     @pytest.mark.asyncio
     async def test_get_container_logs(self, scheduler, mock_docker):
         """测试获取容器日志"""
@@ -664,3 +705,47 @@ class TestDockerScheduler:
         container_config = call_args[0][0]
         assert "DEBUG=true" in container_config["Env"]
         assert "API_KEY=secret" in container_config["Env"]
+
+    def test_build_workspace_bind_command(self):
+        """测试构建工作空间重新绑定命令"""
+        command = build_workspace_bind_command("s3://my-bucket/sessions/sess_123/")
+
+        assert command[:2] == ["sh", "-c"]
+        assert 'mkdir -p "/mnt/s3-root/sessions/sess_123"' in command[2]
+        assert 'mount --bind "/mnt/s3-root/sessions/sess_123" /workspace' in command[2]
+        assert build_workspace_bind_command("/local/workspace") is None
+
+    @pytest.mark.asyncio
+    async def test_bind_workspace(self, scheduler, mock_docker):
+        """测试通过 docker exec 重新绑定工作空间"""
+        stream = Mock()
+        stream.read_out = AsyncMock(return_value=None)
+        start_cm = Mock()
+        start_cm.__aenter__ = AsyncMock(return_value=stream)
+        start_cm.__aexit__ = AsyncMock(return_value=None)
+        exec_instance = Mock()
+        exec_instance.start = Mock(return_value=start_cm)
+        exec_instance.inspect = AsyncMock(return_value={"ExitCode": 0})
+        container = Mock()
+        container.exec = AsyncMock(return_value=exec_instance)
+        mock_docker.containers = Mock()
+        mock_docker.containers.container = Mock(return_value=container)
+
+        await scheduler.bind_workspace("sandbox-warm-1", "s3://my-bucket/sessions/sess_123")
+
+        args, kwargs = container.exec.call_args
+        assert args[0][:2] == ["sh", "-c"]
+        assert kwargs["user"] == "root"
+
+        exec_instance.inspect.return_value = {"ExitCode": 1}
+        with pytest.raises(RuntimeError):
+            await scheduler.bind_workspace("sandbox-warm-1", "s3://my-bucket/sessions/sess_123")
+
+    @pytest.mark.asyncio
+    async def test_bind_workspace_skips_local_workspace(self, scheduler, mock_docker):
+        """测试非 S3 工作空间无需重新绑定"""
+        mock_docker.containers = Mock()
+
+        await scheduler.bind_workspace("sandbox-warm-1", "/workspace")
+
+        mock_docker.containers.container.assert_not_called()
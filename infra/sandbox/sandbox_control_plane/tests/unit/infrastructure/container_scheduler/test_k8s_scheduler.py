@@ -160,6 +160,39 @@ class TestK8sScheduler:
             "backup-secret",
         ]
 
+    @pytest.mark.asyncio
+    async def test_create_pod_mounts_dependency_layer_cache(
+        self,
+        scheduler,
+        mock_core_v1,
+        basic_config,
+        monkeypatch,
+    ):
+        """测试启用依赖层缓存时挂载节点本地缓存目录并开启 executor 层缓存。"""
+        monkeypatch.setenv("DEPENDENCY_LAYER_CACHE_ENABLED", "true")
+        monkeypatch.setenv("DEPENDENCY_LAYER_CACHE_HOST_PATH", "/var/lib/sandbox/layers")
+        get_settings.cache_clear()
+
+        mock_pod = Mock()
+        mock_pod.metadata = Mock()
+        mock_pod.metadata.name = "sandbox-test-session-abc123"
+        mock_core_v1.create_namespaced_pod.return_value = mock_pod
+
+        try:
+            await scheduler.create_container(basic_config)
+        finally:
+            get_settings.cache_clear()
+
+        pod = mock_core_v1.create_namespaced_pod.call_args.kwargs["body"]
+        executor_container = pod.spec.containers[0]
+        volume = next(v for v in pod.spec.volumes if v.name == "dependency-layer-cache")
+        assert volume.host_path.path == "/var/lib/sandbox/layers"
+        assert volume.host_path.type == "DirectoryOrCreate"
+        mount = next(m for m in executor_container.volume_mounts if m.name == "dependency-layer-cache")
+        assert mount.mount_path == "/opt/sandbox-layer-cache"
+        env = {var.name: var.value for var in executor_container.env}
+        assert env["DEPENDENCY_LAYER_CACHE_ENABLED"] == "true"
+
     @pytest.mark.asyncio
     async def test_create_pod_sets_owner_references_and_annotations(self, scheduler, mock_core_v1):
         """测试创建 Pod 时写入 ownerReferences 和 control plane annotations。"""
@@ -382,6 +415,63 @@ class TestK8sScheduler:
 
         assert is_running is False
 
+    @pytest.mark.asyncio
+    async def test_list_running_containers_paginates(self, scheduler, mock_core_v1):
+        """测试按标签分页列出 Pod，只返回 executor 容器运行中的 Pod"""
+
+        def pod(name, phase, terminated=None):
+            mock_pod = Mock()
+            mock_pod.metadata.name = name
+            mock_pod.status.phase = phase
+            mock_pod.status.container_statuses = [
+                Mock(state=Mock(terminated=terminated, waiting=None))
+            ]
+            mock_pod.status.container_statuses[0].name = "executor"
+            return mock_pod
+
+        mock_core_v1.list_namespaced_pod.side_effect = [
+            Mock(
+                items=[pod("sandbox-a", "Running"), pod("sandbox-b", "Pending")],
+                metadata=Mock(_continue="token-1"),
+            ),
+            Mock(
+                items=[pod("sandbox-c", "Running"), pod("sandbox-d", "Running", terminated=Mock())],
+                metadata=Mock(_continue=None),
+            ),
+        ]
+
+        running = await scheduler.list_running_containers()
+
+        assert running == {"sandbox-a", "sandbox-c"}
+        first_call, second_call = mock_core_v1.list_namespaced_pod.call_args_list
+        assert first_call.args == ("test-namespace",)
+        assert first_call.kwargs["label_selector"] == "app=sandbox-executor"
+        assert "_continue" not in first_call.kwargs
+        assert second_call.kwargs["_continue"] == "token-1"
+
+    @pytest.mark.asyncio
+    async def test_list_containers_by_labels(self, scheduler, mock_core_v1):
+        """测试按标签分页列出 Pod 名称，不区分 Pod 状态"""
+
+        def pod(name):
+            mock_pod = Mock()
+            mock_pod.metadata.name = name
+            return mock_pod
+
+        mock_core_v1.list_namespaced_pod.side_effect = [
+            Mock(items=[pod("sandbox-warm-a")], metadata=Mock(_continue="token-1")),
+            Mock(items=[pod("sandbox-warm-b")], metadata=Mock(_continue=None)),
+        ]
+
+        names = await scheduler.list_containers_by_labels(
+            {"warm-pool": "true", "warm-pool-owner": "uid-1"}
+        )
+
+        assert names == ["sandbox-warm-a", "sandbox-warm-b"]
+        first_call, second_call = mock_core_v1.list_namespaced_pod.call_args_list
+        assert first_call.kwargs["label_selector"] == "warm-pool=true,warm-pool-owner=uid-1"
+        assert second_call.kwargs["_continue"] == "token-1"
+
     @pytest.mark.asyncio
     async def test_get_container_logs(self, scheduler, mock_core_v1):
         """测试获取 Pod 日志"""
@@ -733,3 +823,45 @@ class TestK8sSchedulerExtended:
         # 应该有启动命令
         assert container.command is not None
         assert "pip3 install" in container.command[2]
+
+    @pytest.mark.asyncio
+    async def test_bind_workspace_execs_in_executor_container(self, scheduler):
+        """测试通过 pods/exec 重新绑定工作空间"""
+        resp = Mock()
+        resp.returncode = 0
+        resp.read_stdout.return_value = ""
+        resp.read_stderr.return_value = ""
+        scheduler._exec_core_v1 = Mock()
+
+        with patch(
+            "src.infrastructure.container_scheduler.k8s_scheduler.stream",
+            return_value=resp,
+        ) as mock_stream:
+            await scheduler.bind_workspace(
+                "sandbox-sandbox-warm-1", "s3://bucket/sessions/sess_123"
+            )
+
+        kwargs = mock_stream.call_args.kwargs
+        assert kwargs["name"] == "sandbox-sandbox-warm-1"
+        assert kwargs["namespace"] == "test-namespace"
+        assert kwargs["container"] == "executor"
+        assert 'mount --bind "/mnt/s3-root/sessions/sess_123" /workspace' in kwargs["command"][2]
+        resp.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_bind_workspace_raises_on_non_zero_exit(self, scheduler):
+        """测试绑定命令失败时抛出异常"""
+        resp = Mock()
+        resp.returncode = 32
+        resp.read_stdout.return_value = ""
+        resp.read_stderr.return_value = "mount: permission denied"
+        scheduler._exec_core_v1 = Mock()
+
+        with patch(
+            "src.infrastructure.container_scheduler.k8s_scheduler.stream",
+            return_value=resp,
+        ):
+            with pytest.raises(RuntimeError, match="permission denied"):
+                await scheduler.bind_workspace(
+                    "sandbox-sandbox-warm-1", "s3://bucket/sessions/sess_123"
+                )
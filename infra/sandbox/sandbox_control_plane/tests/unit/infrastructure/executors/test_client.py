@@ -391,3 +391,24 @@ class TestExecutorClient:
 
         assert result.status == "completed"
         assert mock_httpx_client.post.call_args.kwargs["timeout"] == 900
+
+    @pytest.mark.asyncio
+    async def test_prefetch_dependency_layers(self, client, mock_httpx_client):
+        """测试通知 executor 预取依赖层。"""
+        client._client = mock_httpx_client
+
+        mock_response = Mock()
+        mock_response.status_code = 202
+        mock_httpx_client.post.return_value = mock_response
+
+        await client.prefetch_dependency_layers("http://localhost:8080", ["abc", "def"])
+
+        assert mock_httpx_client.post.call_args.args[0] == (
+            "http://localhost:8080/internal/dependency-layers/prefetch"
+        )
+        assert mock_httpx_client.post.call_args.kwargs["json"] == {"layer_keys": ["abc", "def"]}
+
+        mock_response.status_code = 404
+        mock_response.text = "Not Found"
+        with pytest.raises(ExecutorResponseError):
+            await client.prefetch_dependency_layers("http://localhost:8080", ["abc"])
@@ -0,0 +1 @@
+"""Messaging unit tests package."""
@@ -0,0 +1,82 @@
+"""
+执行完成通知单元测试
+
+测试 ExecutionCompletionNotifier 的进程内唤醒、批量终态检查和超时逻辑。
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.infrastructure.messaging.execution_notifier import ExecutionCompletionNotifier
+
+
+class TestExecutionCompletionNotifier:
+    """执行完成通知测试"""
+
+    @pytest.mark.asyncio
+    async def test_notify_wakes_all_waiters(self):
+        notifier = ExecutionCompletionNotifier()
+        first = notifier.register("exec-1")
+        second = notifier.register("exec-1")
+        waits = [
+            asyncio.create_task(notifier.wait("exec-1", first, timeout=5)),
+            asyncio.create_task(notifier.wait("exec-1", second, timeout=5)),
+        ]
+        await asyncio.sleep(0)
+
+        assert notifier.notify("exec-1") == 2
+        assert await asyncio.gather(*waits) == [True, True]
+        assert notifier.waiting == 0
+        assert notifier.stats()["notified"] == 2
+
+    @pytest.mark.asyncio
+    async def test_notify_before_wait_is_not_lost(self):
+        notifier = ExecutionCompletionNotifier()
+        future = notifier.register("exec-1")
+
+        notifier.notify("exec-1")
+
+        assert await notifier.wait("exec-1", future, timeout=0.1) is True
+
+    @pytest.mark.asyncio
+    async def test_notify_without_waiters_is_ignored(self):
+        notifier = ExecutionCompletionNotifier()
+
+        assert notifier.notify("exec-unknown") == 0
+
+    @pytest.mark.asyncio
+    async def test_wait_timeout_unregisters_waiter(self):
+        notifier = ExecutionCompletionNotifier()
+        future = notifier.register("exec-1")
+
+        assert await notifier.wait("exec-1", future, timeout=0.01) is False
+        assert notifier.waiting == 0
+        assert notifier.stats()["timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_fallback_checks_all_waiters_in_one_query(self):
+        checker = AsyncMock(return_value={"exec-2"})
+        notifier = ExecutionCompletionNotifier(fallback_interval=0.01, terminal_checker=checker)
+        futures = {execution_id: notifier.register(execution_id) for execution_id in ("exec-1", "exec-2")}
+
+        assert await notifier.wait("exec-2", futures["exec-2"], timeout=1) is True
+
+        checked_ids = checker.await_args_list[0].args[0]
+        assert sorted(checked_ids) == ["exec-1", "exec-2"]
+        assert notifier.stats()["fallback_hits"] == 1
+        assert not futures["exec-1"].done()
+
+        notifier.unregister("exec-1", futures["exec-1"])
+        await notifier.close()
+
+    @pytest.mark.asyncio
+    async def test_fallback_check_error_is_retried(self):
+        checker = AsyncMock(side_effect=[RuntimeError("db down"), {"exec-1"}])
+        notifier = ExecutionCompletionNotifier(fallback_interval=0.01, terminal_checker=checker)
+        future = notifier.register("exec-1")
+
+        assert await notifier.wait("exec-1", future, timeout=1) is True
+        assert checker.await_count == 2
+        await notifier.close()
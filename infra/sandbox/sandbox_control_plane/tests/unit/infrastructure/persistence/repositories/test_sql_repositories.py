@@ -46,6 +46,9 @@ class FakeResult:
     def scalar(self):
         return self._scalar_value
 
+    def all(self):
+        return self._items
+
     def scalars(self):
         return FakeScalarResult(self._items)
 
@@ -196,6 +199,16 @@ class TestSqlSessionRepository:
         assert [item.id for item in by_status] == ["sess-1"]
         assert [item.id for item in by_template] == ["sess-1"]
 
+    @pytest.mark.asyncio
+    async def test_find_container_ids_by_status(self):
+        db = FakeAsyncSession(execute_results=[FakeResult([("sess-1", "container-1"), ("sess-2", None)])])
+        repo = SqlSessionRepository(db)
+
+        container_ids = await repo.find_container_ids_by_status(["running", "creating"])
+
+        assert container_ids == {"sess-1": "container-1", "sess-2": ""}
+        assert len(db.executed) == 1
+
     @pytest.mark.asyncio
     async def test_find_idle_expired_paginated_and_counts(self):
         model = SessionModel.from_entity(make_session())
@@ -6,6 +6,7 @@ Docker 调度服务单元测试
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 
+from src.infrastructure.container_scheduler.base import WARM_POOL_LABEL, WARM_POOL_OWNER_LABEL
 from src.infrastructure.schedulers.docker_scheduler_service import DockerSchedulerService
 from src.domain.services.scheduler import RuntimeNode, ScheduleRequest
 from src.domain.value_objects.resource_limit import ResourceLimit
@@ -251,6 +252,72 @@ class TestDockerSchedulerService:
 
         assert result == "sandbox-sess-123"
 
+    @pytest.mark.asyncio
+    async def test_create_warm_container(self, service, container_scheduler):
+        """测试创建预热容器"""
+        result = await service.create_warm_container(
+            warm_id="abc123",
+            template_id="python-test",
+            image="python:3.11",
+            resource_limit=ResourceLimit.default(),
+            workspace_path="s3://bucket/warm-pool/idle",
+        )
+
+        assert result == "sandbox-warm-abc123"
+        config = container_scheduler.create_container.call_args[0][0]
+        assert config.workspace_path == "s3://bucket/warm-pool/idle"
+        assert "SESSION_ID" not in config.env_vars
+        assert config.labels[WARM_POOL_LABEL] == "true"
+        assert config.labels[WARM_POOL_OWNER_LABEL] == service._warm_pool_owner
+        container_scheduler.start_container.assert_called_once_with("container-123")
+
+    @pytest.mark.asyncio
+    async def test_list_warm_containers(self, service, container_scheduler):
+        """测试按标签列出本实例创建的预热容器"""
+        container_scheduler.list_containers_by_labels = AsyncMock(
+            return_value=["sandbox-warm-abc123"]
+        )
+
+        result = await service.list_warm_containers()
+
+        assert result == ["sandbox-warm-abc123"]
+        container_scheduler.list_containers_by_labels.assert_called_once_with(
+            {WARM_POOL_LABEL: "true", WARM_POOL_OWNER_LABEL: service._warm_pool_owner}
+        )
+
+    @pytest.mark.asyncio
+    async def test_create_warm_container_removes_container_when_start_fails(
+        self, service, container_scheduler
+    ):
+        """测试预热容器启动失败时删除容器"""
+        container_scheduler.start_container.side_effect = RuntimeError("start failed")
+
+        with pytest.raises(RuntimeError):
+            await service.create_warm_container(
+                warm_id="abc123",
+                template_id="python-test",
+                image="python:3.11",
+                resource_limit=ResourceLimit.default(),
+                workspace_path="s3://bucket/warm-pool/idle",
+            )
+
+        container_scheduler.remove_container.assert_called_once_with("container-123")
+
+    @pytest.mark.asyncio
+    async def test_bind_warm_container(self, service, container_scheduler):
+        """测试将预热容器绑定到会话工作空间"""
+        container_scheduler.bind_workspace = AsyncMock()
+
+        await service.bind_warm_container(
+            container_id="sandbox-warm-abc123",
+            session_id="sess-123",
+            workspace_path="s3://bucket/sessions/sess-123",
+        )
+
+        container_scheduler.bind_workspace.assert_called_once_with(
+            "sandbox-warm-abc123", "s3://bucket/sessions/sess-123"
+        )
+
     @pytest.mark.asyncio
     async def test_destroy_container_success(self, service, container_scheduler):
         """测试成功销毁容器"""